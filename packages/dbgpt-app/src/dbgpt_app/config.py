@@ -165,6 +165,29 @@ class RagParameters(BaseParameters):
         default=3,
         metadata={"help": _("kg_extraction_batch_size")},
     )
+    kg_extraction_timeout: Optional[float] = field(
+        default=None,
+        metadata={"help": _("Timeout in seconds of each kg extraction llm call")},
+    )
+    kg_extraction_max_retries: Optional[int] = field(
+        default=2,
+        metadata={"help": _("Max retries of a failed kg extraction llm call")},
+    )
+    kg_write_batch_size: Optional[int] = field(
+        default=500,
+        metadata={"help": _("Max number of vertices or edges in one graph write")},
+    )
+    kg_community_detection: Optional[str] = field(
+        default=None,
+        metadata={
+            "help": _(
+                "Where to detect graph communities, 'local' runs an incremental "
+                "detection in process and only summarizes the changed "
+                "communities, 'graph_store' runs the graph store procedure. "
+                "Default is 'local' for the memory graph, 'graph_store' otherwise"
+            ),
+        },
+    )
     kg_community_summary_batch_size: Optional[int] = field(
         default=20,
         metadata={"help": _("kg_community_summary_batch_size")},
@@ -9,7 +9,6 @@ from typing import List, Optional, cast
 
 import pandas as pd
 from fastapi import APIRouter, Body, Depends, File, Query, UploadFile
-from fastapi.responses import StreamingResponse
 
 from dbgpt._private.config import Config
 from dbgpt.component import ComponentType
@@ -35,6 +34,8 @@ from dbgpt.util.executor_utils import (
     ExecutorFactory,
 )
 from dbgpt.util.file_client import FileClient
+from dbgpt.util.sse_utils import SSEStreamingResponse
+from dbgpt.util.stream_utils import aclosing_stream
 from dbgpt.util.tracer import SpanType, root_tracer
 from dbgpt_app.knowledge.request.request import KnowledgeSpaceRequest
 from dbgpt_app.knowledge.service import KnowledgeService
@@ -527,7 +528,7 @@ async def chat_completions(
             dialogue.ext_info.update({"model_name": dialogue.model_name})
             dialogue.ext_info.update({"incremental": dialogue.incremental})
             dialogue.ext_info.update({"temperature": dialogue.temperature})
-            return StreamingResponse(
+            return SSEStreamingResponse(
                 multi_agents.app_agent_chat(
                     conv_uid=dialogue.conv_uid,
                     chat_mode=dialogue.chat_mode,
@@ -540,6 +541,7 @@ async def chat_completions(
                 ),
                 headers=headers,
                 media_type="text/event-stream",
+                flush_interval=0,
             )
         elif dialogue.chat_mode == ChatScene.ChatFlow.value():
             flow_req = CommonLLMHttpRequestBody(
@@ -555,16 +557,18 @@ async def chat_completions(
                 app_code=dialogue.app_code,
                 incremental=dialogue.incremental,
             )
-            return StreamingResponse(
+            return SSEStreamingResponse(
                 flow_service.chat_stream_flow_str(dialogue.select_param, flow_req),
                 headers=headers,
                 media_type="text/event-stream",
+                flush_interval=0,
             )
         elif domain_type is not None and domain_type != "Normal":
-            return StreamingResponse(
+            return SSEStreamingResponse(
                 chat_with_domain_flow(dialogue, domain_type),
                 headers=headers,
                 media_type="text/event-stream",
+                flush_interval=0,
             )
 
         else:
@@ -574,13 +578,14 @@ async def chat_completions(
                 chat: BaseChat = await get_chat_instance(dialogue)
 
             if not chat.prompt_template.stream_out:
-                return StreamingResponse(
+                return SSEStreamingResponse(
                     no_stream_generator(chat, dialogue.model_name, dialogue.conv_uid),
                     headers=headers,
                     media_type="text/event-stream",
+                    flush_interval=0,
                 )
             else:
-                return StreamingResponse(
+                return SSEStreamingResponse(
                     stream_generator(
                         chat,
                         dialogue.incremental,
@@ -589,6 +594,7 @@ async def chat_completions(
                     ),
                     headers=headers,
                     media_type="text/plain",
+                    flush_interval=0,
                 )
     except Exception as e:
         logger.exception(f"Chat Exception!{dialogue}", e)
@@ -596,10 +602,11 @@ async def chat_completions(
         async def error_text(err_msg):
             yield f"data:{err_msg}\n\n"
 
-        return StreamingResponse(
+        return SSEStreamingResponse(
             error_text(str(e)),
             headers=headers,
             media_type="text/plain",
+            flush_interval=0,
         )
     finally:
         # write to recent usage app.
@@ -672,27 +679,30 @@ async def model_supports(worker_manager: WorkerManager = Depends(get_worker_mana
 async def flow_stream_generator(func, incremental: bool, model_name: str):
     stream_id = f"chatcmpl-{str(uuid.uuid1())}"
     previous_response = ""
-    async for chunk in func:
-        if chunk:
-            msg = chunk.replace("\ufffd", "")
-            if incremental:
-                incremental_output = msg[len(previous_response) :]
-                choice_data = ChatCompletionResponseStreamChoice(
-                    index=0,
-                    delta=DeltaMessage(role="assistant", content=incremental_output),
-                )
-                chunk = ChatCompletionStreamResponse(
-                    id=stream_id, choices=[choice_data], model=model_name
-                )
-                _content = json.dumps(
-                    chunk.dict(exclude_unset=True), ensure_ascii=False
-                )
-                yield f"data: {_content}\n\n"
-            else:
-                # TODO generate an openai-compatible streaming responses
-                msg = msg.replace("\n", "\\n")
-                yield f"data:{msg}\n\n"
-            previous_response = msg
+    async with aclosing_stream(func):
+        async for chunk in func:
+            if chunk:
+                msg = chunk.replace("\ufffd", "")
+                if incremental:
+                    incremental_output = msg[len(previous_response) :]
+                    choice_data = ChatCompletionResponseStreamChoice(
+                        index=0,
+                        delta=DeltaMessage(
+                            role="assistant", content=incremental_output
+                        ),
+                    )
+                    chunk = ChatCompletionStreamResponse(
+                        id=stream_id, choices=[choice_data], model=model_name
+                    )
+                    _content = json.dumps(
+                        chunk.dict(exclude_unset=True), ensure_ascii=False
+                    )
+                    yield f"data: {_content}\n\n"
+                else:
+                    # TODO generate an openai-compatible streaming responses
+                    msg = msg.replace("\n", "\\n")
+                    yield f"data:{msg}\n\n"
+                previous_response = msg
     if incremental:
         yield "data: [DONE]\n\n"
 
@@ -734,52 +744,54 @@ async def stream_generator(
     try:
         if incremental and not openai_format:
             raise ValueError("Incremental response must be openai-compatible format.")
-        async for chunk in chat.stream_call(
-            text_output=text_output, incremental=incremental
-        ):
-            if not chunk:
-                await asyncio.sleep(0.02)
-                continue
-
-            if openai_format:
-                # Must be ModelOutput
-                output: ModelOutput = cast(ModelOutput, chunk)
-                text = None
-                think_text = None
-                if output.has_text:
-                    text = output.text
-                if output.has_thinking:
-                    think_text = output.thinking_text
-                if incremental:
-                    choice_data = ChatCompletionResponseStreamChoice(
-                        index=0,
-                        delta=DeltaMessage(
-                            role="assistant", content=text, reasoning_content=think_text
-                        ),
-                    )
-                    chunk = ChatCompletionStreamResponse(
-                        id=stream_id, choices=[choice_data], model=model_name
-                    )
-                    _content = json.dumps(
-                        chunk.dict(exclude_unset=True), ensure_ascii=False
-                    )
-                    yield f"data: {_content}\n\n"
-                else:
-                    if output.usage:
-                        usage = UsageInfo(**output.usage)
+        stream = chat.stream_call(text_output=text_output, incremental=incremental)
+        async with aclosing_stream(stream):
+            async for chunk in stream:
+                if not chunk:
+                    await asyncio.sleep(0.02)
+                    continue
+
+                if openai_format:
+                    # Must be ModelOutput
+                    output: ModelOutput = cast(ModelOutput, chunk)
+                    text = None
+                    think_text = None
+                    if output.has_text:
+                        text = output.text
+                    if output.has_thinking:
+                        think_text = output.thinking_text
+                    if incremental:
+                        choice_data = ChatCompletionResponseStreamChoice(
+                            index=0,
+                            delta=DeltaMessage(
+                                role="assistant",
+                                content=text,
+                                reasoning_content=think_text,
+                            ),
+                        )
+                        chunk = ChatCompletionStreamResponse(
+                            id=stream_id, choices=[choice_data], model=model_name
+                        )
+                        _content = json.dumps(
+                            chunk.dict(exclude_unset=True), ensure_ascii=False
+                        )
+                        yield f"data: {_content}\n\n"
                     else:
-                        usage = UsageInfo()
+                        if output.usage:
+                            usage = UsageInfo(**output.usage)
+                        else:
+                            usage = UsageInfo()
+                        _content = _v1_create_completion_response(
+                            text, think_text, model_name, stream_id, usage
+                        )
+                        yield _content
+                else:
+                    msg = chunk.replace("\ufffd", "")
                     _content = _v1_create_completion_response(
-                        text, think_text, model_name, stream_id, usage
+                        msg, None, model_name, stream_id
                     )
                     yield _content
-            else:
-                msg = chunk.replace("\ufffd", "")
-                _content = _v1_create_completion_response(
-                    msg, None, model_name, stream_id
-                )
-                yield _content
-            await asyncio.sleep(0.02)
+                await asyncio.sleep(0.02)
         if incremental:
             yield "data: [DONE]\n\n"
         span.end()
@@ -848,16 +860,21 @@ async def chat_with_domain_flow(dialogue: ConversationVo, domain_type: str):
         sys_code=dialogue.sys_code,
         incremental=dialogue.incremental,
     )
-    async for output in safe_chat_stream_with_dag_task(end_task, request, False):
-        text = output.gen_text_with_thinking()
-        if text:
-            text = text.replace("\n", "\\n")
-        if output.error_code != 0:
-            yield _v1_create_completion_response(
-                f"[SERVER_ERROR]{text}", None, dialogue.model_name, dialogue.conv_uid
-            )
-            break
-        else:
-            yield _v1_create_completion_response(
-                text, None, dialogue.model_name, dialogue.conv_uid
-            )
+    stream = safe_chat_stream_with_dag_task(end_task, request, False)
+    async with aclosing_stream(stream):
+        async for output in stream:
+            text = output.gen_text_with_thinking()
+            if text:
+                text = text.replace("\n", "\\n")
+            if output.error_code != 0:
+                yield _v1_create_completion_response(
+                    f"[SERVER_ERROR]{text}",
+                    None,
+                    dialogue.model_name,
+                    dialogue.conv_uid,
+                )
+                break
+            else:
+                yield _v1_create_completion_response(
+                    text, None, dialogue.model_name, dialogue.conv_uid
+                )
@@ -6,7 +6,7 @@ from typing import AsyncIterator, Optional
 
 from fastapi import APIRouter, Body, Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from starlette.responses import JSONResponse, StreamingResponse
+from starlette.responses import JSONResponse
 
 from dbgpt._private.pydantic import model_to_dict, model_to_json
 from dbgpt.component import SystemApp, logger
@@ -22,6 +22,8 @@ from dbgpt.core.schema.api import (
 )
 from dbgpt.model.cluster.apiserver.api import APISettings
 from dbgpt.util.executor_utils import blocking_func_to_async
+from dbgpt.util.sse_utils import SSEStreamingResponse
+from dbgpt.util.stream_utils import aclosing_stream
 from dbgpt.util.tracer import SpanType, root_tracer
 from dbgpt_app.openapi.api_v1.api_v1 import (
     CHAT_FACTORY,
@@ -106,21 +108,23 @@ async def chat_completions(
                     }
                 },
             )
-        return StreamingResponse(
+        return SSEStreamingResponse(
             chat_app_stream_wrapper(
                 request=request,
             ),
             headers=headers,
             media_type="text/event-stream",
+            flush_interval=0,
         )
     elif request.chat_mode == ChatMode.CHAT_AWEL_FLOW.value:
         if not request.stream:
             return await chat_flow_wrapper(request)
         else:
-            return StreamingResponse(
+            return SSEStreamingResponse(
                 chat_flow_stream_wrapper(request),
                 headers=headers,
                 media_type="text/event-stream",
+                flush_interval=0,
             )
     elif (
         request.chat_mode is None
@@ -141,7 +145,7 @@ async def chat_completions(
             # TODO: Adapt to the new chat interface
             return await no_stream_wrapper(request, chat)
         else:
-            return StreamingResponse(
+            return SSEStreamingResponse(
                 stream_generator(
                     chat,
                     request.incremental,
@@ -151,6 +155,7 @@ async def chat_completions(
                 ),
                 headers=headers,
                 media_type="text/event-stream",
+                flush_interval=0,
             )
     else:
         raise HTTPException(
@@ -308,8 +313,10 @@ async def chat_flow_stream_wrapper(
     flow_req = request.to_common_llm_http_request_body()
     flow_uid = request.chat_param
 
-    async for output in flow_service.chat_stream_openai(flow_uid, flow_req):
-        yield output
+    stream = flow_service.chat_stream_openai(flow_uid, flow_req)
+    async with aclosing_stream(stream):
+        async for output in stream:
+            yield output
 
 
 def check_chat_request(request: ChatCompletionRequestBody = Body()):
@@ -33,6 +33,7 @@ from dbgpt.util import get_or_create_event_loop
 from dbgpt.util.annotations import Deprecated
 from dbgpt.util.executor_utils import ExecutorFactory, blocking_func_to_async
 from dbgpt.util.retry import async_retry
+from dbgpt.util.stream_utils import aclosing_stream
 from dbgpt.util.tracer import root_tracer, trace
 from dbgpt_app.scene.base import AppScenePromptTemplateAdapter, ChatScene
 from dbgpt_app.scene.operators.app_operator import (
@@ -265,8 +266,10 @@ class BaseChat(ABC):
         self, request: ModelRequest
     ) -> AsyncIterator[ModelOutput]:
         llm_task = build_cached_chat_operator(self.llm_client, True, self.system_app)
-        async for out in await llm_task.call_stream(call_data=request):
-            yield out
+        stream = await llm_task.call_stream(call_data=request)
+        async with aclosing_stream(stream):
+            async for out in stream:
+                yield out
 
     def do_action(self, prompt_response):
         return prompt_response
@@ -364,6 +367,8 @@ class BaseChat(ABC):
             sys_code=self._chat_param.sys_code,
             chat_mode=self.chat_mode.value(),
             span_id=root_tracer.get_current_span_id(),
+            # A user is waiting for the answer
+            priority="interactive",
         )
         node = AppChatComposerOperator(
             model=self.llm_model,
@@ -423,43 +428,22 @@ class BaseChat(ABC):
         previous_thinking_text = ""
         try:
             final_output: Optional[ModelOutput] = None
-            async for output in self.call_streaming_operator(payload):
-                # Plugin research in result generation
-                final_output = output
-                model_output = (
-                    self.prompt_template.output_parser.parse_model_stream_resp_ex(
-                        output,
-                        text_output=False,
-                    )
-                )
-                text_msg = model_output.text if model_output.has_text else ""
-                view_msg = self.stream_plugin_call(text_msg)
-                view_msg = model_output.gen_text_with_thinking(new_text=view_msg)
-                if text_output:
-                    full_text = view_msg
-                    # Return the incremental text
-                    delta_text = full_text[len(previous_text) :]
-                    previous_text = (
-                        full_text
-                        if len(full_text) > len(previous_text)
-                        else previous_text
-                    )
-                    yield delta_text if incremental else full_text
-                else:
-                    if model_output.has_thinking:
-                        full_thinking_text = model_output.thinking_text
-                    if model_output.has_text:
-                        full_text = model_output.text
-                    if not incremental:
-                        yield ModelOutput.build(
-                            full_text,
-                            full_thinking_text,
-                            error_code=model_output.error_code,
-                            usage=model_output.usage,
-                            finish_reason=model_output.finish_reason,
-                            metrics=model_output.metrics,
+            stream = self.call_streaming_operator(payload)
+            async with aclosing_stream(stream):
+                async for output in stream:
+                    # Plugin research in result generation
+                    final_output = output
+                    model_output = (
+                        self.prompt_template.output_parser.parse_model_stream_resp_ex(
+                            output,
+                            text_output=False,
                         )
-                    else:
+                    )
+                    text_msg = model_output.text if model_output.has_text else ""
+                    view_msg = self.stream_plugin_call(text_msg)
+                    view_msg = model_output.gen_text_with_thinking(new_text=view_msg)
+                    if text_output:
+                        full_text = view_msg
                         # Return the incremental text
                         delta_text = full_text[len(previous_text) :]
                         previous_text = (
@@ -467,22 +451,45 @@ class BaseChat(ABC):
                             if len(full_text) > len(previous_text)
                             else previous_text
                         )
-                        delta_thinking_text = full_thinking_text[
-                            len(previous_thinking_text) :
-                        ]
-                        previous_thinking_text = (
-                            full_thinking_text
-                            if len(full_thinking_text) > len(previous_thinking_text)
-                            else previous_thinking_text
-                        )
-                        yield ModelOutput.build(
-                            delta_text,
-                            delta_thinking_text,
-                            error_code=model_output.error_code,
-                            usage=model_output.usage,
-                            finish_reason=model_output.finish_reason,
-                            metrics=model_output.metrics,
-                        )
+                        yield delta_text if incremental else full_text
+                    else:
+                        if model_output.has_thinking:
+                            full_thinking_text = model_output.thinking_text
+                        if model_output.has_text:
+                            full_text = model_output.text
+                        if not incremental:
+                            yield ModelOutput.build(
+                                full_text,
+                                full_thinking_text,
+                                error_code=model_output.error_code,
+                                usage=model_output.usage,
+                                finish_reason=model_output.finish_reason,
+                                metrics=model_output.metrics,
+                            )
+                        else:
+                            # Return the incremental text
+                            delta_text = full_text[len(previous_text) :]
+                            previous_text = (
+                                full_text
+                                if len(full_text) > len(previous_text)
+                                else previous_text
+                            )
+                            delta_thinking_text = full_thinking_text[
+                                len(previous_thinking_text) :
+                            ]
+                            previous_thinking_text = (
+                                full_thinking_text
+                                if len(full_thinking_text) > len(previous_thinking_text)
+                                else previous_thinking_text
+                            )
+                            yield ModelOutput.build(
+                                delta_text,
+                                delta_thinking_text,
+                                error_code=model_output.error_code,
+                                usage=model_output.usage,
+                                finish_reason=model_output.finish_reason,
+                                metrics=model_output.metrics,
+                            )
             ai_response_text, view_message = await self._handle_final_output(
                 final_output, incremental=incremental
             )
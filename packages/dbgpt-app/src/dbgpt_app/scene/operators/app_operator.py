@@ -71,7 +71,9 @@ class AppChatComposerOperator(MapOperator[ChatComposerInput, ModelRequest]):
     ):
         super().__init__(**kwargs)
         if not request_context:
-            request_context = ModelRequestContext(stream=streaming)
+            request_context = ModelRequestContext(
+                stream=streaming, priority="interactive"
+            )
         self._prompt_template = prompt
         self._llm_client = llm_client
         self._history_key = history_key
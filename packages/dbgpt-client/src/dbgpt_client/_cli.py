@@ -18,7 +18,12 @@ from dbgpt.util.console import CliLogger
 from dbgpt.util.i18n_utils import _
 
 from .client import Client
-from .flow import list_flow
+from .flow import (
+    get_flow_profile,
+    list_flow,
+    reset_flow_profile,
+    update_flow_profile,
+)
 from .flow import run_flow_cmd as client_run_flow_cmd
 
 cl = CliLogger()
@@ -304,6 +309,110 @@ def _run_flow_cmd(
     loop.run_until_complete(_client_run_cmd())
 
 
+@flow.command(name="profile")
+@add_base_flow_options
+@click.option(
+    "--enable/--disable",
+    default=None,
+    help=_("Enable or disable the AWEL profiler of the server"),
+)
+@click.option(
+    "--reset",
+    is_flag=True,
+    default=False,
+    help=_("Clear the recorded profile after showing it"),
+)
+@click.option(
+    "--json",
+    "output_json",
+    is_flag=True,
+    default=False,
+    help=_("Print the profile in json"),
+)
+def profile_flow(
+    name: str | None,
+    uid: str | None,
+    enable: bool | None = None,
+    reset: bool = False,
+    output_json: bool = False,
+):
+    """Show the AWEL profile of the operators and DAGs of the server."""
+    loop = get_or_create_event_loop()
+    client = Client()
+    if enable is not None:
+        loop.run_until_complete(update_flow_profile(client, enable))
+        cl.success(f"AWEL profiler {'enabled' if enable else 'disabled'}")
+    if name and not uid:
+        flows = loop.run_until_complete(list_flow(client, name.replace("-", "_")))
+        if not flows:
+            cl.error("Flow not found with the given name", exit_code=1)
+        uid = flows[0].uid
+    profile = loop.run_until_complete(get_flow_profile(client, uid))
+    if reset:
+        loop.run_until_complete(reset_flow_profile(client))
+    if output_json:
+        cl.print(json.dumps(profile, ensure_ascii=False, indent=2))
+        return
+    if not profile["enabled"]:
+        cl.warning("AWEL profiler is disabled, enable it with --enable")
+    if not profile["dags"]:
+        cl.info("No AWEL runs profiled")
+    for dag_id, dag in profile["dags"].items():
+        cl.print(_format_dag_profile(dag_id, dag))
+
+
+def _format_seconds(hist: Dict[str, Any], key: str) -> str:
+    value = hist.get(key)
+    return "-" if value is None else f"{value * 1000:.1f}ms"
+
+
+def _format_dag_profile(dag_id: str, dag: Dict[str, Any]) -> str:
+    from prettytable import PrettyTable
+
+    title = f"DAG {dag_id}"
+    if "runs" in dag:
+        wall_time = dag["wall_time"]
+        title += (
+            f", runs: {dag['runs']}, errors: {dag['errors']}, p50: "
+            f"{_format_seconds(wall_time, 'p50')}, p99: "
+            f"{_format_seconds(wall_time, 'p99')}"
+        )
+    table = PrettyTable(
+        [
+            "Operator",
+            "Type",
+            "Runs",
+            "Errors",
+            "Total",
+            "P50",
+            "P99",
+            "Queue P50",
+            "First Item P50",
+            "Items",
+            "Bytes",
+        ],
+        title=title,
+    )
+    for op in dag["operators"]:
+        wall_time = op["wall_time"]
+        table.add_row(
+            [
+                op["node_name"] or op["node_id"],
+                op["operator_type"],
+                op["runs"],
+                op["errors"],
+                f"{wall_time['sum']:.3f}s",
+                _format_seconds(wall_time, "p50"),
+                _format_seconds(wall_time, "p99"),
+                _format_seconds(op["queue_wait"], "p50"),
+                _format_seconds(op["first_item"], "p50"),
+                op["items"],
+                op["bytes"],
+            ]
+        )
+    return table.get_string()
+
+
 def _parse_and_check_local_dag(
     name: str,
     filepath: str | None = None,
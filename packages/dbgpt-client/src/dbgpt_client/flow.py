@@ -122,6 +122,70 @@ async def list_flow(
         raise ClientException(f"Failed to list flows: {e}")
 
 
+async def get_flow_profile(client: Client, uid: str | None = None) -> Dict[str, Any]:
+    """
+    Get the AWEL profile of the operators and DAGs.
+
+    Args:
+        client (Client): The dbgpt client.
+        uid (str): Only get the profile of the flow, all if not set.
+    Returns:
+        Dict[str, Any]: The profile of the DAGs and their operators.
+    Raises:
+        ClientException: If the request failed.
+    """
+    try:
+        res = await client.get("/awel/profile", **{"uid": uid})
+        result: Result = res.json()
+        if result["success"]:
+            return result["data"]
+        else:
+            raise ClientException(status=result["err_code"], reason=result)
+    except Exception as e:
+        raise ClientException(f"Failed to get flow profile: {e}")
+
+
+async def update_flow_profile(client: Client, enabled: bool) -> Dict[str, Any]:
+    """
+    Enable or disable the AWEL profiler.
+
+    Args:
+        client (Client): The dbgpt client.
+        enabled (bool): Whether to profile the AWEL runs.
+    Returns:
+        Dict[str, Any]: The state of the profiler.
+    Raises:
+        ClientException: If the request failed.
+    """
+    try:
+        res = await client.put("/awel/profile", {"enabled": enabled})
+        result: Result = res.json()
+        if result["success"]:
+            return result["data"]
+        else:
+            raise ClientException(status=result["err_code"], reason=result)
+    except Exception as e:
+        raise ClientException(f"Failed to update flow profile: {e}")
+
+
+async def reset_flow_profile(client: Client) -> None:
+    """
+    Clear the recorded AWEL profile.
+
+    Args:
+        client (Client): The dbgpt client.
+    Raises:
+        ClientException: If the request failed.
+    """
+    try:
+        res = await client.delete("/awel/profile")
+        result: Result = res.json()
+        if not result["success"]:
+            raise ClientException(status=result["err_code"], reason=result)
+    except Exception as e:
+        raise ClientException(f"Failed to reset flow profile: {e}")
+
+
 async def run_flow_cmd(
     client: Client,
     name: str | None = None,
@@ -0,0 +1,179 @@
+"""Bounded cache of the in-process states of the agent conversations."""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .base import GptsMessage
+
+logger = logging.getLogger(__name__)
+
+# Rough memory of a message besides its texts
+_MESSAGE_OVERHEAD_BYTES = 512
+
+
+def _estimate_message_bytes(message: GptsMessage) -> int:
+    size = _MESSAGE_OVERHEAD_BYTES
+    for text in (
+        message.content,
+        message.current_goal,
+        message.context,
+        message.review_info,
+        message.action_report,
+        message.resource_info,
+    ):
+        if text:
+            size += len(text)
+    return size
+
+
+@dataclass
+class ConversationState:
+    """The in-process state of a conversation."""
+
+    conv_id: str
+    queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+    enable_vis_message: bool = True
+    start_round: int = 0
+    messages: List[GptsMessage] = field(default_factory=list)
+    last_view: Optional[str] = None
+    completed: bool = False
+    last_access: float = field(default_factory=time.monotonic)
+    messages_bytes: int = 0
+    # The number of streams reading the queue
+    consumers: int = 0
+
+    @property
+    def estimated_bytes(self) -> int:
+        """Get the estimated memory of the state."""
+        return self.messages_bytes + (len(self.last_view) if self.last_view else 0)
+
+    def set_messages(self, messages: List[GptsMessage]):
+        """Replace the messages of the conversation."""
+        self.messages = messages
+        self.messages_bytes = sum(_estimate_message_bytes(m) for m in messages)
+
+    def append_message(self, message: GptsMessage):
+        """Append a message to the conversation."""
+        self.messages.append(message)
+        self.messages_bytes += _estimate_message_bytes(message)
+
+
+class ConversationStateCache:
+    """LRU cache of the conversation states, with idle TTL and a memory budget.
+
+    The states idle longer than the TTL are evicted, e.g. the conversations
+    abandoned without being completed. When there are too many states or they use
+    too much memory, the least recently used completed ones are evicted, the
+    running conversations are kept even over the limits. A state read by a stream
+    is never evicted, its queue would never get the end of the conversation. The
+    messages of an evicted conversation can be reloaded from the message memory.
+    """
+
+    def __init__(
+        self,
+        max_conversations: int = 1000,
+        ttl: Optional[float] = 3600,
+        max_memory_mb: Optional[float] = 512,
+    ):
+        """Create a conversation state cache.
+
+        Args:
+            max_conversations(int): The max number of conversations cached.
+            ttl(Optional[float]): The seconds a conversation is kept after its last
+                access, never expire if not set.
+            max_memory_mb(Optional[float]): The memory budget of the cached
+                conversations in MB, no budget if not set. The memory is estimated
+                by the size of the message texts.
+        """
+        self._max_conversations = max(1, max_conversations)
+        self._ttl = ttl
+        self._max_bytes = int(max_memory_mb * 1024 * 1024) if max_memory_mb else None
+        self._states: "OrderedDict[str, ConversationState]" = OrderedDict()
+        self._evictions = 0
+        self._expirations = 0
+
+    def __contains__(self, conv_id: str) -> bool:
+        """Whether the conversation is cached."""
+        return conv_id in self._states
+
+    def __len__(self) -> int:
+        """Get the number of cached conversations."""
+        return len(self._states)
+
+    def get(self, conv_id: str) -> Optional[ConversationState]:
+        """Get the state of a conversation and mark it as recently used."""
+        state = self._states.get(conv_id)
+        if state is not None:
+            state.last_access = time.monotonic()
+            self._states.move_to_end(conv_id)
+        return state
+
+    def put(self, state: ConversationState) -> ConversationState:
+        """Cache the state of a conversation, evict the others if needed."""
+        state.last_access = time.monotonic()
+        self._states[state.conv_id] = state
+        self._states.move_to_end(state.conv_id)
+        self.evict()
+        return state
+
+    def pop(self, conv_id: str) -> Optional[ConversationState]:
+        """Remove the state of a conversation."""
+        return self._states.pop(conv_id, None)
+
+    @property
+    def estimated_bytes(self) -> int:
+        """Get the estimated memory of all the cached conversations."""
+        return sum(state.estimated_bytes for state in self._states.values())
+
+    def evict(self):
+        """Evict the expired conversations, then the least recently used ones."""
+        if self._ttl is not None:
+            deadline = time.monotonic() - self._ttl
+            for conv_id, state in list(self._states.items()):
+                if state.last_access > deadline:
+                    break
+                if state.consumers:
+                    continue
+                self._states.pop(conv_id)
+                self._expirations += 1
+                logger.info(f"Evict expired conversation state {conv_id}")
+
+        total_bytes = self.estimated_bytes if self._max_bytes else 0
+        while len(self._states) > 1 and (
+            len(self._states) > self._max_conversations
+            or (self._max_bytes and total_bytes > self._max_bytes)
+        ):
+            victim = self._pick_victim()
+            if victim is None:
+                # All the other conversations are running
+                break
+            state = self._states.pop(victim)
+            total_bytes -= state.estimated_bytes
+            self._evictions += 1
+            logger.info(
+                f"Evict conversation state {victim}, {len(self._states)} "
+                f"conversations are cached"
+            )
+
+    def _pick_victim(self) -> Optional[str]:
+        # The most recently used one is kept, it is the one being accessed
+        candidates = list(self._states.items())[:-1]
+        for conv_id, state in candidates:
+            if state.completed and not state.consumers:
+                return conv_id
+        return None
+
+    def metrics(self) -> Dict[str, int]:
+        """Get the gauges and counters of the cache."""
+        return {
+            "conversations": len(self._states),
+            "estimated_bytes": self.estimated_bytes,
+            "max_conversations": self._max_conversations,
+            "max_bytes": self._max_bytes or 0,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+        }
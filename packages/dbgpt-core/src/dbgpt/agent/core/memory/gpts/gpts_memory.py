@@ -3,10 +3,10 @@
 import asyncio
 import json
 import logging
-from asyncio import Queue
-from collections import defaultdict
 from concurrent.futures import Executor, ThreadPoolExecutor
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
+
+from cachetools import LRUCache
 
 from dbgpt.util.executor_utils import blocking_func_to_async
 from dbgpt.vis.client import VisAgentMessages, VisAgentPlans, VisAppLink, vis_client
@@ -14,13 +14,31 @@ from dbgpt.vis.client import VisAgentMessages, VisAgentPlans, VisAppLink, vis_cl
 from ...action.base import ActionOutput
 from ...schema import Status
 from .base import GptsMessage, GptsMessageMemory, GptsPlansMemory
+from .conversation_cache import ConversationState, ConversationStateCache
 from .default_gpts_memory import DefaultGptsMessageMemory, DefaultGptsPlansMemory
 
 NONE_GOAL_PREFIX: str = "none_goal_count_"
+# Max rendered vis fragments cached, shared by all the conversations
+_VIS_FRAGMENT_CACHE_SIZE = 4096
+# The settings of a conversation are tiny, they are kept for many more
+# conversations than the states, to restore the evicted states
+_SETTINGS_PER_CONVERSATION_STATE = 10
 
 logger = logging.getLogger(__name__)
 
 
+def _message_vis_key(message: GptsMessage) -> Tuple:
+    """Get the fields of a message rendered in its vis fragment."""
+    return (
+        message.sender,
+        message.receiver,
+        message.model_name,
+        message.content,
+        message.action_report,
+        message.resource_info,
+    )
+
+
 class GptsMemory:
     """GPTs memory."""
 
@@ -29,8 +47,23 @@ class GptsMemory:
         plans_memory: Optional[GptsPlansMemory] = None,
         message_memory: Optional[GptsMessageMemory] = None,
         executor: Optional[Executor] = None,
+        max_conversations: int = 1000,
+        conversation_ttl: Optional[float] = 3600,
+        max_memory_mb: Optional[float] = 512,
     ):
-        """Create a memory to store plans and messages."""
+        """Create a memory to store plans and messages.
+
+        Args:
+            plans_memory(Optional[GptsPlansMemory]): The plans memory.
+            message_memory(Optional[GptsMessageMemory]): The message memory.
+            executor(Optional[Executor]): The executor to access the memories.
+            max_conversations(int): The max number of conversations kept in
+                process.
+            conversation_ttl(Optional[float]): The seconds a conversation is kept in
+                process after its last access, never expire if not set.
+            max_memory_mb(Optional[float]): The memory budget of the conversations
+                kept in process in MB, no budget if not set.
+        """
         self._plans_memory: GptsPlansMemory = (
             plans_memory if plans_memory is not None else DefaultGptsPlansMemory()
         )
@@ -38,10 +71,19 @@ class GptsMemory:
             message_memory if message_memory is not None else DefaultGptsMessageMemory()
         )
         self._executor = executor or ThreadPoolExecutor(max_workers=2)
-        self.messages_cache: defaultdict = defaultdict(list)
-        self.channels: defaultdict = defaultdict(Queue)
-        self.enable_vis_map: defaultdict = defaultdict(bool)
-        self.start_round_map: defaultdict = defaultdict(int)
+        # The messages, queue and settings of the conversations in process
+        self._conversations = ConversationStateCache(
+            max_conversations=max_conversations,
+            ttl=conversation_ttl,
+            max_memory_mb=max_memory_mb,
+        )
+        # The settings of the conversations, (enable_vis_message, start_round)
+        self._settings: LRUCache = LRUCache(
+            maxsize=max(1, max_conversations) * _SETTINGS_PER_CONVERSATION_STATE
+        )
+        # Rendered vis fragments of message groups and plans, keyed by their
+        # contents, so a new message does not re-render the whole conversation.
+        self._vis_fragments: LRUCache = LRUCache(maxsize=_VIS_FRAGMENT_CACHE_SIZE)
 
     @property
     def plans_memory(self) -> GptsPlansMemory:
@@ -61,47 +103,69 @@ class GptsMemory:
         start_round: int = 0,
     ):
         """Gpt memory init."""
-        self.channels[conv_id] = asyncio.Queue()
-        self.enable_vis_map[conv_id] = enable_vis_message
-        self.messages_cache[conv_id] = history_messages if history_messages else []
-        self.start_round_map[conv_id] = start_round
+        state = ConversationState(
+            conv_id=conv_id,
+            enable_vis_message=enable_vis_message,
+            start_round=start_round,
+        )
+        state.set_messages(history_messages if history_messages else [])
+        self._settings[conv_id] = (enable_vis_message, start_round)
+        self._conversations.put(state)
 
     def enable_vis_message(self, conv_id):
         """Enable conversation message vis tag."""
-        return self.enable_vis_map[conv_id] if conv_id in self.enable_vis_map else True
+        state = self._conversations.get(conv_id)
+        return state.enable_vis_message if state else True
 
     def queue(self, conv_id: str):
         """Get conversation message queue."""
-        return self.channels[conv_id] if conv_id in self.channels else None
+        state = self._conversations.get(conv_id)
+        return state.queue if state else None
 
     def clear(self, conv_id: str):
         """Clear gpt memory."""
-        # clear last message queue
-        queue = self.channels.pop(conv_id)  # noqa
-        del queue
-        # clear messages cache'
-        if self.messages_cache.get(conv_id):
-            cache = self.messages_cache.pop(conv_id)  # noqa
-            del cache
-
-        # clear vis_enable_tag
-        vis_enable_tag = self.enable_vis_map.pop(conv_id)  # noqa
-        del vis_enable_tag
-
-        # clear start_roun
-        start_round = self.start_round_map.pop(conv_id)  # noqa
-        del start_round
+        self._conversations.pop(conv_id)
+        self._settings.pop(conv_id, None)
+
+    def metrics(self) -> Dict[str, int]:
+        """Get the gauges of the conversations kept in process."""
+        return self._conversations.metrics()
+
+    async def _get_or_load_state(self, conv_id: str) -> ConversationState:
+        """Get the state of a conversation, reload its messages if not cached."""
+        state = self._conversations.get(conv_id)
+        if state is None:
+            messages = await blocking_func_to_async(
+                self._executor, self.message_memory.get_by_conv_id, conv_id
+            )
+            # It may be created while loading
+            state = self._conversations.get(conv_id)
+            if state is None:
+                enable_vis_message, start_round = self._settings.get(conv_id, (True, 0))
+                state = ConversationState(
+                    conv_id=conv_id,
+                    enable_vis_message=enable_vis_message,
+                    start_round=start_round,
+                )
+                state.set_messages(list(messages or []))
+                self._conversations.put(state)
+        return state
 
     async def push_message(self, conv_id: str, temp_msg: Optional[str] = None):
         """Push conversation message."""
-        queue = self.queue(conv_id)
-        enable_vis_tag = self.enable_vis_message(conv_id=conv_id)
+        state = await self._get_or_load_state(conv_id)
+        queue = state.queue
+        enable_vis_tag = state.enable_vis_message
         if enable_vis_tag:
             # 如果有临时消息内容需要push 拼接再最末尾，否则直接从短期记忆中发布最后消息
             message_view = await self.app_link_chat_message(conv_id)
             if temp_msg:
                 temp_view = await self.agent_stream_message(temp_msg)
                 message_view = message_view + "\n" + temp_view
+            if state.last_view == message_view:
+                # Nothing changed, no need to send the whole view again
+                return
+            state.last_view = message_view
             await queue.put(message_view)
 
         else:
@@ -115,13 +179,15 @@ class GptsMemory:
 
     async def complete(self, conv_id: str):
         """Complete conversation message."""
-        queue = self.queue(conv_id)
-
-        await queue.put("[DONE]")
+        state = await self._get_or_load_state(conv_id)
+        state.completed = True
+        await state.queue.put("[DONE]")
 
     async def append_message(self, conv_id: str, message: GptsMessage):
         """Append message."""
-        self.messages_cache[conv_id].append(message)
+        state = await self._get_or_load_state(conv_id)
+        state.append_message(message)
+        self._conversations.evict()
         await blocking_func_to_async(
             self._executor, self.message_memory.append, message
         )
@@ -131,7 +197,8 @@ class GptsMemory:
 
     async def get_messages(self, conv_id: str) -> List[GptsMessage]:
         """Get message by conv_id."""
-        messages = self.messages_cache[conv_id]
+        state = self._conversations.get(conv_id)
+        messages = state.messages if state else []
         if not messages:
             messages = await blocking_func_to_async(
                 self._executor, self.message_memory.get_by_conv_id, conv_id
@@ -142,7 +209,8 @@ class GptsMemory:
         self, conv_id: str, agent_role: str
     ) -> List[GptsMessage]:
         """Get agent messages."""
-        gpt_messages = self.messages_cache[conv_id]
+        state = self._conversations.get(conv_id)
+        gpt_messages = state.messages if state else []
         result = []
         for gpt_message in gpt_messages:
             if gpt_message.sender == agent_role or gpt_messages.receiver == agent_role:
@@ -267,7 +335,8 @@ class GptsMemory:
 
     async def simple_message(self, conv_id: str):
         """Get agent simple message."""
-        messages_cache = self.messages_cache[conv_id]
+        state = self._conversations.get(conv_id)
+        messages_cache = state.messages if state else None
         if messages_cache and len(messages_cache) > 0:
             messages = messages_cache
         else:
@@ -302,15 +371,11 @@ class GptsMemory:
     async def app_link_chat_message(self, conv_id: str):
         """Get app link chat message."""
         messages = []
-        if conv_id in self.messages_cache:
-            messages_cache = self.messages_cache[conv_id]
+        state = self._conversations.get(conv_id)
+        if state is not None:
+            messages_cache = state.messages
             if messages_cache and len(messages_cache) > 0:
-                start_round = (
-                    self.start_round_map[conv_id]
-                    if conv_id in self.start_round_map
-                    else 0
-                )
-                messages = messages_cache[start_round:]
+                messages = messages_cache[state.start_round :]
         else:
             messages = await blocking_func_to_async(
                 self._executor, self.message_memory.get_by_conv_id, conv_id=conv_id
@@ -375,6 +440,20 @@ class GptsMemory:
     ):
         if messages is None or len(messages) <= 0:
             return ""
+        cache_key = (
+            "agents",
+            is_last_message,
+            tuple(_message_vis_key(message) for message in messages),
+        )
+        fragment = self._vis_fragments.get(cache_key)
+        if fragment is None:
+            fragment = await self._render_agents_vis(messages, is_last_message)
+            self._vis_fragments[cache_key] = fragment
+        return fragment
+
+    async def _render_agents_vis(
+        self, messages: List[GptsMessage], is_last_message: bool = False
+    ):
         messages_view = []
         for message in messages:
             action_report_str = message.action_report
@@ -404,7 +483,20 @@ class GptsMemory:
     async def _messages_to_plan_vis(self, messages: List[Dict]):
         if messages is None or len(messages) <= 0:
             return ""
-        return await vis_client.get(VisAgentPlans.vis_tag()).display(content=messages)
+        cache_key = (
+            "plans",
+            tuple(
+                (m["name"], m["num"], m["status"], m["agent"], m["markdown"])
+                for m in messages
+            ),
+        )
+        fragment = self._vis_fragments.get(cache_key)
+        if fragment is None:
+            fragment = await vis_client.get(VisAgentPlans.vis_tag()).display(
+                content=messages
+            )
+            self._vis_fragments[cache_key] = fragment
+        return fragment
 
     async def _messages_to_app_link_vis(
         self, link_message: GptsMessage, lanucher_message: Optional[GptsMessage] = None
@@ -451,14 +543,30 @@ class GptsMemory:
         conv_id: str,
     ):
         """Get chat messages."""
-        while True:
-            queue = self.queue(conv_id)
-            if not queue:
-                break
-            item = await queue.get()
-            if item == "[DONE]":
-                queue.task_done()
-                break
-            else:
-                yield item
+        state = self._conversations.get(conv_id)
+        if state is None:
+            return
+        # The state is not evicted while it is read
+        state.consumers += 1
+        try:
+            queue = state.queue
+            # Stop if the conversation is cleared
+            while self._conversations.get(conv_id) is state:
+                item = await queue.get()
+                done = item == "[DONE]"
+                # Every item is a whole view of the conversation, only the latest
+                # one of the items already queued needs to be sent.
+                while not done and not queue.empty():
+                    next_item = queue.get_nowait()
+                    if next_item == "[DONE]":
+                        done = True
+                    else:
+                        item = next_item
+                if item != "[DONE]":
+                    yield item
+                if done:
+                    queue.task_done()
+                    break
                 await asyncio.sleep(0.005)
+        finally:
+            state.consumers -= 1
@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from dbgpt.agent.core.memory.gpts import GptsMemory, GptsMessage
+
+
+def _message(content: str, goal: str, rounds: int) -> GptsMessage:
+    return GptsMessage(
+        conv_id="conv1",
+        sender="Planner",
+        receiver="DataScientist",
+        role="assistant",
+        content=content,
+        current_goal=goal,
+        rounds=rounds,
+    )
+
+
+@pytest.fixture
+def memory():
+    memory = GptsMemory()
+    memory.init("conv1")
+    return memory
+
+
+@pytest.mark.asyncio
+async def test_push_message_reuses_fragments(memory: GptsMemory, monkeypatch):
+    rendered = []
+    render = memory._render_agents_vis
+
+    async def _render(messages, is_last_message=False):
+        rendered.append([m.content for m in messages])
+        return await render(messages, is_last_message)
+
+    monkeypatch.setattr(memory, "_render_agents_vis", _render)
+    await memory.append_message("conv1", _message("step 1", "goal 1", 1))
+    await memory.append_message("conv1", _message("step 2", "goal 2", 2))
+    rendered.clear()
+    await memory.append_message("conv1", _message("step 3", "goal 3", 3))
+    # The groups of the old goals are not rendered again
+    assert ["step 1"] not in rendered
+    assert ["step 2"] not in rendered
+    assert ["step 3"] in rendered
+
+    view = await memory.app_link_chat_message("conv1")
+    for step in ["step 1", "step 2", "step 3"]:
+        assert step in view
+
+
+@pytest.mark.asyncio
+async def test_push_message_skips_unchanged_view(memory: GptsMemory):
+    await memory.append_message("conv1", _message("step 1", "goal 1", 1))
+    await memory.push_message("conv1")
+    assert memory.queue("conv1").qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_chat_messages_sends_latest_view(memory: GptsMemory):
+    await memory.append_message("conv1", _message("step 1", "goal 1", 1))
+    await memory.append_message("conv1", _message("step 2", "goal 2", 2))
+    await memory.complete("conv1")
+    views = [view async for view in memory.chat_messages("conv1")]
+    assert len(views) == 1
+    assert "step 2" in views[0]
+
+
+@pytest.mark.asyncio
+async def test_conversations_bounded():
+    memory = GptsMemory(max_conversations=2)
+    for conv_id in ["conv1", "conv2", "conv3"]:
+        memory.init(conv_id, enable_vis_message=False, start_round=1)
+        message = _message(f"{conv_id} step", "goal", 1)
+        message.conv_id = conv_id
+        await memory.append_message(conv_id, message)
+        await memory.complete(conv_id)
+    assert memory.metrics()["conversations"] == 2
+    assert memory.metrics()["evictions"] == 1
+    assert memory.queue("conv1") is None
+
+    # The messages of the evicted conversation are reloaded from message memory
+    message = _message("conv1 step 2", "goal", 2)
+    await memory.append_message("conv1", message)
+    messages = await memory.get_messages("conv1")
+    assert [m.content for m in messages] == ["conv1 step", "conv1 step 2"]
+    # And its settings are restored
+    assert not memory.enable_vis_message("conv1")
+    assert memory._conversations.get("conv1").start_round == 1
+
+
+@pytest.mark.asyncio
+async def test_running_conversations_not_evicted():
+    memory = GptsMemory(max_conversations=1)
+    memory.init("conv1")
+    views = memory.chat_messages("conv1")
+    read = asyncio.create_task(views.__anext__())
+    await asyncio.sleep(0.01)
+    # conv1 is running and read, it is kept over the limit
+    memory.init("conv2")
+    assert memory.queue("conv1") is not None
+    await memory.append_message("conv1", _message("step 1", "goal 1", 1))
+    assert "step 1" in await read
+    await memory.complete("conv1")
+    assert [view async for view in views] == []
+
+    # The completed conversation without consumer can be evicted
+    memory.init("conv3")
+    assert memory.queue("conv1") is None
+
+
+@pytest.mark.asyncio
+async def test_conversations_evict_completed_first():
+    memory = GptsMemory(max_conversations=2)
+    memory.init("conv1")
+    memory.init("conv2")
+    await memory.complete("conv2")
+    memory.queue("conv1")
+    memory.init("conv3")
+    assert memory.queue("conv1") is not None
+    assert memory.queue("conv2") is None
+
+
+def test_conversations_ttl(monkeypatch):
+    from dbgpt.agent.core.memory.gpts import conversation_cache
+
+    now = [1000.0]
+    monkeypatch.setattr(conversation_cache.time, "monotonic", lambda: now[0])
+    memory = GptsMemory(conversation_ttl=60)
+    memory.init("conv1")
+    now[0] += 30
+    memory.init("conv2")
+    now[0] += 40
+    memory.init("conv3")
+    assert memory.queue("conv1") is None
+    assert memory.queue("conv2") is not None
+    assert memory.metrics()["expirations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_conversations_memory_budget():
+    memory = GptsMemory(max_memory_mb=0.01)
+    big = [_message("x" * 4096, "goal", i) for i in range(2)]
+    memory.init("conv1", history_messages=big)
+    await memory.complete("conv1")
+    memory.init("conv2", history_messages=list(big))
+    assert memory.queue("conv1") is None
+    assert memory.metrics()["conversations"] == 1
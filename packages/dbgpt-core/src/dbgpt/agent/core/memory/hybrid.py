@@ -324,4 +324,5 @@ class HybridMemory(Memory, Generic[T]):
 
         # TODO
         """
+        await self._long_term_memory.flush()
         return []
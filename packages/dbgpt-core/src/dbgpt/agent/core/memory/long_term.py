@@ -4,6 +4,8 @@ from concurrent.futures import Executor
 from datetime import datetime
 from typing import Any, Dict, Generic, List, Optional
 
+import numpy as np
+
 from dbgpt.core import Chunk
 from dbgpt.rag.retriever.time_weighted import TimeWeightedEmbeddingRetriever
 from dbgpt.storage.vector_store.base import VectorStoreBase
@@ -21,19 +23,112 @@ _METADATA_SESSION_ID = "session_id"
 _METADAT_IMPORTANCE = "importance"
 
 
+def _to_timestamp(value: Any, default: float) -> float:
+    """Convert a time in the metadata to a POSIX timestamp."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class _MemoryIndex:
+    """Array-backed index of the memory stream, for the vectorized scoring.
+
+    The position of a row is the position of the memory in the memory stream. The
+    memories appended to the stream are indexed incrementally, the index is rebuilt
+    if the stream is replaced.
+    """
+
+    def __init__(self):
+        self.stream: Optional[List[Chunk]] = None
+        self.size = 0
+        # Last accessed POSIX timestamps, NaN means the current time
+        self.last_accessed = np.empty(0, dtype=np.float64)
+        # Sum of the other score keys in the metadata
+        self.extra_scores = np.empty(0, dtype=np.float64)
+        # Whether the memory can be retrieved
+        self.retrievable = np.empty(0, dtype=bool)
+
+    def sync(self, stream: List[Chunk], other_score_keys: List[str]):
+        """Index the memories not indexed yet."""
+        if stream is not self.stream or len(stream) < self.size:
+            self.stream = stream
+            self.size = 0
+        new_docs = stream[self.size :]
+        if not new_docs:
+            return
+        last_accessed = np.empty(len(new_docs), dtype=np.float64)
+        extra_scores = np.zeros(len(new_docs), dtype=np.float64)
+        retrievable = np.empty(len(new_docs), dtype=bool)
+        for i, doc in enumerate(new_docs):
+            value = doc.metadata.get(_METADATA_LAST_ACCESSED_AT)
+            if value is None:
+                value = doc.metadata.get("created_at")
+            last_accessed[i] = _to_timestamp(value, np.nan)
+            for key in other_score_keys:
+                if key in doc.metadata:
+                    extra_scores[i] += doc.metadata[key]
+            retrievable[i] = (
+                _METADATA_BUFFER_IDX in doc.metadata
+                and doc.content.find(_FORGET_PLACEHOLDER) == -1
+                and doc.content.find(_MERGE_PLACEHOLDER) == -1
+            )
+        self.last_accessed = np.concatenate(
+            [self.last_accessed[: self.size], last_accessed]
+        )
+        self.extra_scores = np.concatenate(
+            [self.extra_scores[: self.size], extra_scores]
+        )
+        self.retrievable = np.concatenate([self.retrievable[: self.size], retrievable])
+        self.size = len(stream)
+
+    def scores(
+        self,
+        relevance: np.ndarray,
+        decay_rate: float,
+        current_time: float,
+    ) -> np.ndarray:
+        """Compute the combined scores of all the memories."""
+        hours_passed = (current_time - self.last_accessed) / 3600
+        hours_passed = np.nan_to_num(hours_passed, nan=0.0)
+        return (1.0 - decay_rate) ** hours_passed + self.extra_scores + relevance
+
+
 class LongTermRetriever(TimeWeightedEmbeddingRetriever):
-    """Long-term retriever with persistence support."""
+    """Long-term retriever with persistence support.
 
-    def __init__(self, now: datetime, **kwargs):
+    The memory stream is scored with an array-backed index in one vectorized pass,
+    and the access times updated by the retrievals are persisted in batches.
+    """
+
+    def __init__(self, now: datetime, persist_batch_size: int = 32, **kwargs):
         """Create a long-term retriever.
 
         Args:
             now: Current datetime to use for time-based calculations
+            persist_batch_size: The number of access time updates to persist
+                together, call `flush` to persist the pending ones
             **kwargs: Additional arguments passed to TimeWeightedEmbeddingRetriever
         """
         self.now = now
+        self._persist_batch_size = max(1, persist_batch_size)
+        self._pending_access_updates = 0
+        self._memory_index = _MemoryIndex()
         super().__init__(**kwargs)
 
+    def _save_memory_stream(self) -> None:
+        self._pending_access_updates = 0
+        super()._save_memory_stream()
+
+    def flush(self) -> None:
+        """Persist the pending access time updates of the memory stream."""
+        if self._pending_access_updates:
+            self._save_memory_stream()
+
     @mutable
     def _retrieve(
         self, query: str, filters: Optional[MetadataFilters] = None
@@ -55,58 +150,49 @@ class LongTermRetriever(TimeWeightedEmbeddingRetriever):
             # with custom adjustments for long-term memory
             return self._retrieve_vector_store_only(query, filters, current_time)
 
-        # Process all memories in memory_stream
-        docs_and_scores = {}
-        for doc in self.memory_stream:
-            if _METADATA_BUFFER_IDX in doc.metadata:
-                buffer_idx = doc.metadata[_METADATA_BUFFER_IDX]
-                docs_and_scores[buffer_idx] = (doc, self.default_salience)
-
-        # If a doc is considered salient, update the salience score
-        docs_and_scores.update(self.get_salient_docs(query, filters))
-
-        # If no documents found and we're in vector store only mode, fall back
-        if not docs_and_scores and self._use_vector_store_only:
-            return self._retrieve_vector_store_only(query, filters, current_time)
+        stream = self.memory_stream
+        index = self._memory_index
+        index.sync(stream, self.other_score_keys)
+
+        relevance = np.full(index.size, self.default_salience or 0.0)
+        # The salient documents not in the memory stream, scored one by one
+        outside_docs = []
+        for buffer_idx, (doc, score) in self.get_salient_docs(query, filters).items():
+            if 0 <= buffer_idx < index.size:
+                relevance[buffer_idx] = score or 0.0
+            elif (
+                doc.content.find(_FORGET_PLACEHOLDER) == -1
+                and doc.content.find(_MERGE_PLACEHOLDER) == -1
+            ):
+                outside_docs.append(
+                    (doc, self._get_combined_score(doc, score, current_time))
+                )
 
-        # Calculate combined scores for all documents
-        rescored_docs = [
-            (doc, self._get_combined_score(doc, relevance, current_time))
-            for doc, relevance in docs_and_scores.values()
-        ]
+        now_ts = current_time.timestamp()
+        scores = index.scores(relevance, self.decay_rate, now_ts)
+        candidates = np.flatnonzero(index.retrievable)
+        if len(candidates) > self._k:
+            top = np.argpartition(-scores[candidates], self._k - 1)[: self._k]
+            candidates = candidates[top]
+        # Stable sort, the earlier memories first on ties
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
 
-        # Sort by score
-        rescored_docs.sort(key=lambda x: x[1], reverse=True)
+        ranked = [(stream[i], scores[i], int(i)) for i in candidates]
+        if outside_docs:
+            ranked.extend((doc, score, -1) for doc, score in outside_docs)
+            ranked.sort(key=lambda x: x[1], reverse=True)
 
         result = []
-        retrieved_num = 0
+        for doc, _, pos in ranked[: self._k]:
+            doc.metadata[_METADATA_LAST_ACCESSED_AT] = current_time
+            if pos >= 0:
+                index.last_accessed[pos] = now_ts
+                self._pending_access_updates += 1
+            result.append(doc)
 
-        # Process documents in order of score
-        for doc, _ in rescored_docs:
-            # Skip documents that are marked for forgetting or merging
-            if (
-                retrieved_num < self._k
-                and doc.content.find(_FORGET_PLACEHOLDER) == -1
-                and doc.content.find(_MERGE_PLACEHOLDER) == -1
-            ):
-                retrieved_num += 1
-
-                # Get the document from memory stream
-                if _METADATA_BUFFER_IDX in doc.metadata and 0 <= doc.metadata[
-                    _METADATA_BUFFER_IDX
-                ] < len(self.memory_stream):
-                    buffered_doc = self.memory_stream[
-                        doc.metadata[_METADATA_BUFFER_IDX]
-                    ]
-                    buffered_doc.metadata[_METADATA_LAST_ACCESSED_AT] = current_time
-                    result.append(buffered_doc)
-                else:
-                    # Handle case where buffer_idx is invalid
-                    doc.metadata[_METADATA_LAST_ACCESSED_AT] = current_time
-                    result.append(doc)
-
-        # Save memory stream after updating access times
-        self._save_memory_stream()
+        # Persist the access times in batches instead of on every retrieval
+        if self._pending_access_updates >= self._persist_batch_size:
+            self._save_memory_stream()
 
         return result
 
@@ -319,10 +405,15 @@ class LongTermMemory(Memory, Generic[T]):
             )
         return retrieved_memories
 
+    async def flush(self) -> None:
+        """Persist the pending access time updates of the retriever."""
+        await blocking_func_to_async(self.executor, self.memory_retriever.flush)
+
     @mutable
     async def clear(self) -> List[T]:
         """Clear the memory.
 
         TODO: Implement this method.
         """
+        await self.flush()
         return []
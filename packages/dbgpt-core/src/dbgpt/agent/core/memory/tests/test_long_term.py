@@ -0,0 +1,115 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+
+from dbgpt.core import Chunk
+
+from ..long_term import LongTermMemory, LongTermRetriever
+
+
+class _Storage:
+    def __init__(self, docs: List[Chunk]):
+        self.docs = docs
+        self.saves = 0
+
+    def get_all_documents(self) -> List[Chunk]:
+        return self.docs
+
+    def save_documents(self, documents: List[Chunk]) -> bool:
+        self.saves += 1
+        return True
+
+
+def _make_docs(now: datetime, hours: List[float]) -> List[Chunk]:
+    return [
+        Chunk(
+            content=f"[{i}] memory {i}",
+            metadata={
+                "buffer_idx": i,
+                "last_accessed_at": (now - timedelta(hours=h)).timestamp(),
+                "importance": 0.0,
+            },
+        )
+        for i, h in enumerate(hours)
+    ]
+
+
+def _make_retriever(now, docs, salient=None, **kwargs):
+    index_store = MagicMock()
+    index_store.similar_search_with_scores.return_value = salient or []
+    storage = _Storage(docs)
+    retriever = LongTermRetriever(
+        now=now, index_store=index_store, external_storage=storage, **kwargs
+    )
+    return retriever, storage
+
+
+def test_retrieve_by_recency():
+    now = datetime(2024, 1, 1, 12)
+    docs = _make_docs(now, [100, 1, 50, 0, 10])
+    retriever, _ = _make_retriever(now, docs)
+
+    result = retriever._retrieve("query")
+    assert [d.metadata["buffer_idx"] for d in result] == [3, 1, 4, 2]
+    assert all(d.metadata["last_accessed_at"] == now for d in result)
+    # The index is updated with the access times
+    assert retriever._retrieve("query")[0].metadata["buffer_idx"] in (1, 2, 3, 4)
+
+
+def test_retrieve_with_salience_and_skip_forgotten():
+    now = datetime(2024, 1, 1, 12)
+    docs = _make_docs(now, [0, 0, 0, 0, 0, 0])
+    docs[1].content = "[FORGET]"
+    salient = [
+        Chunk(content="x", metadata={"buffer_idx": 5}, score=0.9),
+        Chunk(content="x", metadata={"buffer_idx": 1}, score=0.95),
+        Chunk(content="outside", metadata={"buffer_idx": 100}, score=0.5),
+    ]
+    retriever, _ = _make_retriever(now, docs, salient=salient)
+
+    result = retriever._retrieve("query")
+    assert [d.content for d in result][:2] == ["[5] memory 5", "outside"]
+    assert "[FORGET]" not in [d.content for d in result]
+    assert len(result) == 4
+
+
+def test_retrieve_new_memories_indexed():
+    now = datetime(2024, 1, 1, 12)
+    docs = _make_docs(now, [5, 5])
+    retriever, _ = _make_retriever(now, docs)
+    assert len(retriever._retrieve("query")) == 2
+
+    retriever.memory_stream.extend(_make_docs(now, [5, 5, 0]))
+    retriever.memory_stream[-1].metadata["buffer_idx"] = 4
+    result = retriever._retrieve("query")
+    assert result[0] is retriever.memory_stream[4]
+
+
+@pytest.mark.parametrize("batch_size,expected_saves", [(1, 3), (8, 2), (32, 1)])
+def test_access_times_persisted_in_batches(batch_size, expected_saves):
+    now = datetime(2024, 1, 1, 12)
+    docs = _make_docs(now, [1, 2, 3, 4])
+    retriever, storage = _make_retriever(now, docs, persist_batch_size=batch_size)
+
+    for _ in range(3):
+        retriever._retrieve("query")
+    retriever.flush()
+    assert storage.saves == expected_saves
+    retriever.flush()
+    assert storage.saves == expected_saves
+
+
+@pytest.mark.asyncio
+async def test_clear_memory_flushes_access_times():
+    now = datetime(2024, 1, 1, 12)
+    retriever, storage = _make_retriever(now, _make_docs(now, [1, 2]))
+    memory = LongTermMemory(ThreadPoolExecutor(1), MagicMock(), now=now)
+    memory.memory_retriever = retriever
+
+    retriever._retrieve("query")
+    assert storage.saves == 0
+    await memory.clear()
+    assert storage.saves == 1
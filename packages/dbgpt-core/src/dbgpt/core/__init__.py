@@ -31,6 +31,7 @@ from dbgpt.core.interface.message import (  # noqa: F401
     HumanMessage,
     MessageIdentifier,
     MessageStorageItem,
+    MessageTokenLedger,
     ModelMessage,
     ModelMessageRoleType,
     OnceConversation,
@@ -82,6 +83,7 @@ __ALL__ = [
     "AIMessage",
     "HumanMessage",
     "MessageStorageItem",
+    "MessageTokenLedger",
     "ConversationIdentifier",
     "MessageIdentifier",
     "PromptTemplate",
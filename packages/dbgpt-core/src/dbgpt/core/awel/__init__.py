@@ -40,6 +40,7 @@ from .task.base import (
     TaskState,
     is_empty_data,
 )
+from .task.stream_broadcast import SlowConsumerPolicy, StreamBroadcast
 from .task.task_impl import (
     BaseInputSource,
     DefaultInputContext,
@@ -99,6 +100,8 @@ __all__ = [
     "DefaultInputContext",
     "SimpleTaskOutput",
     "SimpleStreamTaskOutput",
+    "StreamBroadcast",
+    "SlowConsumerPolicy",
     "StreamifyAbsOperator",
     "UnstreamifyAbsOperator",
     "TransformStreamAbsOperator",
@@ -22,6 +22,7 @@ from typing import (
     Optional,
     Sequence,
     Set,
+    Tuple,
     Union,
     cast,
 )
@@ -369,6 +370,8 @@ class DAGNode(DAGLifecycle, DependencyMixin, ViewMixin, ABC):
             node_id (str): The node id
         """
         self._node_id = node_id
+        if self._dag:
+            self._dag._clear_cached_nodes()
 
     def __hash__(self) -> int:
         """Return the hash value of current DAGNode.
@@ -479,6 +482,8 @@ class DAGNode(DAGLifecycle, DependencyMixin, ViewMixin, ABC):
 
                 self._downstream.append(node)
                 node._upstream.append(self)
+        # The edges changed, even if all the nodes were in the DAG already
+        dag._clear_cached_nodes()
 
     def __repr__(self):
         """Return the representation of current DAGNode."""
@@ -636,6 +641,7 @@ class DAGContext:
         streaming_call: bool = False,
         node_name_to_ids: Optional[Dict[str, str]] = None,
         dag_variables: Optional[DAGVariables] = None,
+        stream_branches: Optional[Dict[Tuple[str, str], TaskContext]] = None,
     ) -> None:
         """Initialize a DAGContext.
 
@@ -646,6 +652,9 @@ class DAGContext:
                 Defaults to False.
             node_name_to_ids (Optional[Dict[str, str]], optional): The node name to node
             dag_variables (Optional[DAGVariables], optional): The DAG variables.
+            stream_branches (Optional[Dict[Tuple[str, str], TaskContext]], optional):
+                The branches of the stream outputs broadcast to multiple downstream
+                nodes, by the upstream node id and the downstream node id.
         """
         if not node_name_to_ids:
             node_name_to_ids = {}
@@ -657,6 +666,9 @@ class DAGContext:
         self._event_loop_task_id = event_loop_task_id
         self._dag_variables = dag_variables
         self._share_data_lock = asyncio.Lock()
+        self._stream_branches: Dict[Tuple[str, str], TaskContext] = (
+            stream_branches if stream_branches is not None else {}
+        )
 
     @property
     def _task_outputs(self) -> Dict[str, TaskContext]:
@@ -812,6 +824,10 @@ class DAG:
         self._lock = asyncio.Lock()
         self._event_loop_task_id_to_ctx: Dict[int, DAGContext] = {}
         self._default_dag_variables = default_dag_variables
+        # The compiled execution plans by the end node id, see `JobManager`
+        self._execution_plans: Dict[str, Any] = {}
+        # Increased when the graph changes, to discard the plans compiled before
+        self._graph_version = 0
 
     def _append_node(self, node: DAGNode) -> None:
         if node.node_id in self.node_map:
@@ -826,9 +842,15 @@ class DAG:
         if not node_id:
             raise ValueError("Node id can't be None")
         self.node_map[node_id] = node
-        # clear cached nodes
+        self._clear_cached_nodes()
+
+    def _clear_cached_nodes(self) -> None:
+        """Clear the nodes and the execution plans cached for the old graph."""
         self._root_nodes = []
         self._leaf_nodes = []
+        self._trigger_nodes = []
+        self._execution_plans = {}
+        self._graph_version += 1
 
     def _new_node_id(self) -> str:
         return str(uuid.uuid4())
@@ -46,6 +46,20 @@ class DAGMetadata(BaseModel):
         return dict_value
 
 
+class DAGListener:
+    """The listener of the DAGs registered to or unregistered from DAGManager.
+
+    The callbacks are called with the lock of DAGManager held, they should be fast
+    and must not call DAGManager.
+    """
+
+    def on_register(self, dag: DAG, alias_name: Optional[str] = None) -> None:
+        """Execute after a DAG is registered."""
+
+    def on_unregister(self, dag: DAG) -> None:
+        """Execute after a DAG is unregistered."""
+
+
 class DAGManager(BaseComponent):
     """The component of DAGManager."""
 
@@ -69,11 +83,24 @@ class DAGManager(BaseComponent):
         self._dag_metadata_map: Dict[str, DAGMetadata] = {}
         self._tags_to_dag_ids: Dict[str, Dict[str, Set[str]]] = {}
         self._trigger_manager: Optional["DefaultTriggerManager"] = None
+        self._listeners: List[DAGListener] = []
 
     def init_app(self, system_app: SystemApp):
         """Initialize the DAGManager."""
         self.system_app = system_app
 
+    def add_listener(self, listener: DAGListener):
+        """Add a listener of the DAGs registered and unregistered."""
+        with self.lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def remove_listener(self, listener: DAGListener):
+        """Remove a listener of the DAGs registered and unregistered."""
+        with self.lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
     def load_dags(self):
         """Load DAGs from dag_dirs."""
         dags = self.dag_loader.load_dags()
@@ -126,6 +153,8 @@ class DAGManager(BaseComponent):
                     if tag_key not in self._tags_to_dag_ids:
                         self._tags_to_dag_ids[tag_key] = defaultdict(set)
                     self._tags_to_dag_ids[tag_key][tag_value].add(dag_id)
+            for listener in self._listeners:
+                listener.on_register(dag, alias_name)
 
     def unregister_dag(self, dag_id: str):
         """Unregister a DAG."""
@@ -158,6 +187,8 @@ class DAGManager(BaseComponent):
                 for tag_key, tag_value in metadata.tags.items():
                     if tag_key in self._tags_to_dag_ids:
                         self._tags_to_dag_ids[tag_key][tag_value].remove(dag_id)
+            for listener in self._listeners:
+                listener.on_unregister(dag)
 
     def get_dag(
         self, dag_id: Optional[str] = None, alias_name: Optional[str] = None
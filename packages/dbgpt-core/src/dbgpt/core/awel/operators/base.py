@@ -13,7 +13,9 @@ from typing import (
     Dict,
     Generic,
     Iterator,
+    List,
     Optional,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -33,7 +35,7 @@ from ..dag.base import DAG, DAGContext, DAGNode, DAGVar, DAGVariables
 from ..task.base import EMPTY_DATA, OUT, T, TaskOutput, is_empty_data
 
 if TYPE_CHECKING:
-    from ...interface.variables import VariablesProvider
+    from ...interface.variables import VariablesPlaceHolder, VariablesProvider
 
 logger = logging.getLogger(__name__)
 
@@ -167,6 +169,9 @@ class BaseOperator(DAGNode, ABC, Generic[OUT], metaclass=BaseOperatorMeta):
     streaming_operator: bool = False
     incremental_output: bool = False
     output_format: Optional[str] = None
+    # The buffer of the stream output broadcast to multiple downstream nodes
+    stream_buffer_size: int = 1024
+    slow_consumer_policy: str = "spill"
 
     def __init__(
         self,
@@ -193,6 +198,10 @@ class BaseOperator(DAGNode, ABC, Generic[OUT], metaclass=BaseOperatorMeta):
             self.incremental_output = bool(kwargs["incremental_output"])
         if "output_format" in kwargs:
             self.output_format = kwargs["output_format"]
+        if "stream_buffer_size" in kwargs:
+            self.stream_buffer_size = int(kwargs["stream_buffer_size"])
+        if "slow_consumer_policy" in kwargs:
+            self.slow_consumer_policy = kwargs["slow_consumer_policy"]
         self._runner: WorkflowRunner = runner
         self._dag_ctx: Optional[DAGContext] = None
         self._can_skip_in_branch = can_skip_in_branch
@@ -412,6 +421,32 @@ class BaseOperator(DAGNode, ABC, Generic[OUT], metaclass=BaseOperatorMeta):
         """Check if the operator can be skipped in the branch."""
         return self._can_skip_in_branch
 
+    def _variables_placeholders(
+        self,
+    ) -> List[Tuple[str, "VariablesPlaceHolder", Optional[Dict[str, str]]]]:
+        """Get the attributes of the operator to be resolved from the variables.
+
+        Returns:
+            List[Tuple[str, VariablesPlaceHolder, Optional[Dict[str, str]]]]: The
+                attribute name, the placeholder and its default identifier map.
+        """
+        from ...interface.variables import VariablesIdentifier, VariablesPlaceHolder
+
+        placeholders = []
+        for attr, value in self.__dict__.items():
+            # Handle all attributes that are VariablesPlaceHolder
+            if isinstance(value, VariablesPlaceHolder):
+                default_identifier_map = None
+                id_key = VariablesIdentifier.from_str_identifier(value.full_key)
+                if (
+                    id_key.scope == VARIABLES_SCOPE_FLOW_PRIVATE
+                    and id_key.scope_key is None
+                    and self.dag
+                ):
+                    default_identifier_map = {"scope_key": self.dag.dag_id}
+                placeholders.append((attr, value, default_identifier_map))
+        return placeholders
+
     async def _resolve_variables(self, dag_ctx: DAGContext):
         """Resolve variables in the operator.
 
@@ -421,11 +456,7 @@ class BaseOperator(DAGNode, ABC, Generic[OUT], metaclass=BaseOperatorMeta):
         Args:
             dag_ctx (DAGContext): The context of the DAG when this node is run.
         """
-        from ...interface.variables import (
-            VariablesIdentifier,
-            VariablesPlaceHolder,
-            is_variable_string,
-        )
+        from ...interface.variables import VariablesPlaceHolder, is_variable_string
 
         if not self._variables_provider:
             return
@@ -452,42 +483,67 @@ class BaseOperator(DAGNode, ABC, Generic[OUT], metaclass=BaseOperatorMeta):
         if dag_ctx._dag_variables:
             dag_provider = dag_ctx._dag_variables.to_provider()
 
-        # TODO: Resolve variables parallel
-        for attr, value in self.__dict__.items():
-            # Handle all attributes that are VariablesPlaceHolder
-            if isinstance(value, VariablesPlaceHolder):
-                resolved_value: Any = None
-                default_identifier_map = None
-                id_key = VariablesIdentifier.from_str_identifier(value.full_key)
-                if (
-                    id_key.scope == VARIABLES_SCOPE_FLOW_PRIVATE
-                    and id_key.scope_key is None
-                    and self.dag
-                ):
-                    default_identifier_map = {"scope_key": self.dag.dag_id}
+        async def _resolve(
+            attr: str,
+            value: VariablesPlaceHolder,
+            default_identifier_map: Optional[Dict[str, str]],
+        ) -> Any:
+            resolved_value: Any = None
+            if dag_provider:
+                # First try to resolve the variable with the DAG variables
+                resolved_value = await value.async_parse(
+                    dag_provider,
+                    ignore_not_found_error=True,
+                    default_identifier_map=default_identifier_map,
+                )
+            if resolved_value is None:
+                resolved_value = await value.async_parse(
+                    self._variables_provider,
+                    default_identifier_map=default_identifier_map,
+                )
+                logger.debug(
+                    f"Resolve variable {attr} with value {resolved_value} for "
+                    f"{self} from system variables"
+                )
+            else:
+                logger.debug(
+                    f"Resolve variable {attr} with value {resolved_value} for "
+                    f"{self} from DAG variables"
+                )
+            return resolved_value
 
-                if dag_provider:
-                    # First try to resolve the variable with the DAG variables
-                    resolved_value = await value.async_parse(
-                        dag_provider,
-                        ignore_not_found_error=True,
-                        default_identifier_map=default_identifier_map,
-                    )
-                if resolved_value is None:
-                    resolved_value = await value.async_parse(
-                        self._variables_provider,
-                        default_identifier_map=default_identifier_map,
-                    )
-                    logger.debug(
-                        f"Resolve variable {attr} with value {resolved_value} for "
-                        f"{self} from system variables"
-                    )
-                else:
-                    logger.debug(
-                        f"Resolve variable {attr} with value {resolved_value} for "
-                        f"{self} from DAG variables"
-                    )
-                setattr(self, attr, resolved_value)
+        # Resolve the variables concurrently
+        placeholders = self._variables_placeholders()
+        resolved_values = await asyncio.gather(
+            *(_resolve(*placeholder) for placeholder in placeholders)
+        )
+        for (attr, _, _), resolved_value in zip(placeholders, resolved_values):
+            setattr(self, attr, resolved_value)
+
+
+async def _prefetch_variables(nodes: List["BaseOperator"]) -> None:
+    """Load the variables of the operators of a DAG in batches before running it."""
+    from ...interface.variables import VariablesIdentifier
+
+    providers: Dict[int, "VariablesProvider"] = {}
+    identifiers: Dict[int, List[VariablesIdentifier]] = {}
+    for node in nodes:
+        provider = node._variables_provider
+        if not provider:
+            continue
+        for _, value, default_identifier_map in node._variables_placeholders():
+            providers[id(provider)] = provider
+            identifiers.setdefault(id(provider), []).append(
+                VariablesIdentifier.from_str_identifier(
+                    value.full_key, default_identifier_map
+                )
+            )
+    for provider_id, provider in providers.items():
+        try:
+            await provider.async_prefetch(identifiers[provider_id])
+        except Exception as e:
+            # The variables are loaded one by one when resolving them
+            logger.warning(f"Prefetch variables failed: {e}")
 
 
 def initialize_runner(runner: WorkflowRunner):
@@ -3,7 +3,8 @@
 import asyncio
 import logging
 import uuid
-from typing import Dict, List, Optional, cast
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, cast
 
 from ..dag.base import DAGLifecycle
 from ..operators.base import CALL_DATA, BaseOperator
@@ -11,6 +12,56 @@ from ..operators.base import CALL_DATA, BaseOperator
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """The compiled execution plan of a DAG from its end node.
+
+    It is compiled once and cached in the DAG until the graph changes, so the
+    requests to the same end node do not walk the graph again.
+    """
+
+    end_node: BaseOperator
+    # All the upstream nodes of the end node and itself, in topological order
+    nodes: List[BaseOperator]
+    root_nodes: List[BaseOperator]
+    node_name_to_ids: Dict[str, str]
+
+
+def get_execution_plan(end_node: BaseOperator) -> ExecutionPlan:
+    """Get the execution plan from the end node, compile it if not cached.
+
+    Args:
+        end_node (BaseOperator): The end node of the DAG.
+    """
+    dag = end_node.dag
+    if dag is None:
+        return _compile_execution_plan(end_node)
+    plan = dag._execution_plans.get(end_node.node_id)
+    if plan is not None:
+        return plan
+    graph_version = dag._graph_version
+    plan = _compile_execution_plan(end_node)
+    # Do not cache the plan if the graph changed while compiling it
+    if dag._graph_version == graph_version:
+        dag._execution_plans[end_node.node_id] = plan
+    return plan
+
+
+def _compile_execution_plan(end_node: BaseOperator) -> ExecutionPlan:
+    nodes = _build_from_end_node(end_node)
+    root_nodes = _get_root_nodes(nodes)
+    node_name_to_ids = {}
+    for node in nodes:
+        if node.node_name is not None:
+            node_name_to_ids[node.node_name] = node.node_id
+    return ExecutionPlan(
+        end_node=end_node,
+        nodes=nodes,
+        root_nodes=root_nodes,
+        node_name_to_ids=node_name_to_ids,
+    )
+
+
 class JobManager(DAGLifecycle):
     """Job manager for DAG.
 
@@ -53,16 +104,15 @@ class JobManager(DAGLifecycle):
             call_data (Optional[CALL_DATA], optional): The call data of the end node.
                 Defaults to None.
         """
-        nodes = _build_from_end_node(end_node)
-        root_nodes = _get_root_nodes(nodes)
-        id2call_data = _save_call_data(root_nodes, call_data)
-
-        node_name_to_ids = {}
-        for node in nodes:
-            if node.node_name is not None:
-                node_name_to_ids[node.node_name] = node.node_id
-
-        return JobManager(root_nodes, nodes, end_node, id2call_data, node_name_to_ids)
+        plan = get_execution_plan(end_node)
+        id2call_data = _save_call_data(plan.root_nodes, call_data)
+        return JobManager(
+            plan.root_nodes,
+            plan.nodes,
+            end_node,
+            id2call_data,
+            plan.node_name_to_ids,
+        )
 
     def get_call_data_by_id(self, node_id: str) -> Optional[Dict]:
         """Get the call data by node id.
@@ -110,16 +160,27 @@ def _save_call_data(
 
 
 def _build_from_end_node(end_node: BaseOperator) -> List[BaseOperator]:
-    """Build all nodes from the end node."""
-    nodes = []
-    if isinstance(end_node, BaseOperator) and not end_node._node_id:
-        end_node.set_node_id(str(uuid.uuid4()))
-    nodes.append(end_node)
-    for node in end_node.upstream:
-        node = cast(BaseOperator, node)
-        nodes += _build_from_end_node(node)
+    """Build all nodes from the end node, in topological order without repeat."""
+    nodes: List[BaseOperator] = []
+    visited: Set[int] = set()
+    # Iterative post-order walk, the upstream nodes of a node are added before it
+    stack = [(end_node, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            nodes.append(node)
+            continue
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+        if isinstance(node, BaseOperator) and not node._node_id:
+            node.set_node_id(str(uuid.uuid4()))
+        stack.append((node, True))
+        for upstream in reversed(node.upstream):
+            if id(upstream) not in visited:
+                stack.append((cast(BaseOperator, upstream), False))
     return nodes
 
 
 def _get_root_nodes(nodes: List[BaseOperator]) -> List[BaseOperator]:
-    return list(set(filter(lambda x: not x.upstream, nodes)))
+    return [node for node in nodes if not node.upstream]
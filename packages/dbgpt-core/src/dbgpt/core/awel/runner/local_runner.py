@@ -5,18 +5,31 @@ This runner will run the workflow in the current process.
 
 import asyncio
 import logging
+import time
 import traceback
-from typing import Any, Dict, List, Optional, Set, cast
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
 
 from dbgpt.component import SystemApp
 from dbgpt.util.tracer import root_tracer
 
 from ..dag.base import DAGContext, DAGVar, DAGVariables
-from ..operators.base import CALL_DATA, BaseOperator, WorkflowRunner
+from ..operators.base import (
+    CALL_DATA,
+    BaseOperator,
+    WorkflowRunner,
+    _prefetch_variables,
+)
 from ..operators.common_operator import BranchOperator
 from ..task.base import SKIP_DATA, TaskContext, TaskState
-from ..task.task_impl import DefaultInputContext, DefaultTaskContext, SimpleTaskOutput
+from ..task.stream_broadcast import StreamBroadcast
+from ..task.task_impl import (
+    DefaultInputContext,
+    DefaultTaskContext,
+    SimpleStreamTaskOutput,
+    SimpleTaskOutput,
+)
 from .job_manager import JobManager
+from .profiler import get_awel_profiler
 
 logger = logging.getLogger(__name__)
 
@@ -67,11 +80,13 @@ class DefaultWorkflowRunner(WorkflowRunner):
             # Create DAG context
             node_outputs: Dict[str, TaskContext] = {}
             share_data: Dict[str, Any] = {}
+            stream_branches: Dict[Tuple[str, str], TaskContext] = {}
             event_loop_task_id = id(asyncio.current_task())
         else:
             # Share node output with exist dag context
             node_outputs = exist_dag_ctx._node_to_outputs
             share_data = exist_dag_ctx._share_data
+            stream_branches = exist_dag_ctx._stream_branches
             event_loop_task_id = exist_dag_ctx._event_loop_task_id
             if dag_variables and exist_dag_ctx._dag_variables:
                 # Merge dag variables, prefer the `dag_variables` in the parameter
@@ -86,6 +101,7 @@ class DefaultWorkflowRunner(WorkflowRunner):
             streaming_call=streaming_call,
             node_name_to_ids=job_manager._node_name_to_ids,
             dag_variables=dag_variables,
+            stream_branches=stream_branches,
         )
         # if node.dag:
         #     self._running_dag_ctx[node.dag.dag_id] = dag_ctx
@@ -100,20 +116,38 @@ class DefaultWorkflowRunner(WorkflowRunner):
             # Save dag context
             await node.dag._save_dag_ctx(dag_ctx)
         await job_manager.before_dag_run()
+        # Load the variables of all the operators together, instead of one by one
+        await _prefetch_variables(job_manager._all_nodes)
 
-        with root_tracer.start_span(
-            "dbgpt.awel.workflow.run_workflow",
-            metadata={
-                "exist_dag_ctx": exist_dag_ctx is not None,
-                "event_loop_task_id": event_loop_task_id,
-                "streaming_call": streaming_call,
-                "awel_node_id": node.node_id,
-                "awel_node_name": node.node_name,
-            },
-        ):
-            await self._execute_node(
-                job_manager, node, dag_ctx, node_outputs, skip_node_ids, system_app
-            )
+        profiler = get_awel_profiler()
+        # The sub DAGs are profiled as part of their parent DAG
+        profile_dag = profiler.enabled and exist_dag_ctx is None
+        start_time = time.perf_counter() if profile_dag else 0.0
+        error: Optional[BaseException] = None
+        try:
+            with root_tracer.start_span(
+                "dbgpt.awel.workflow.run_workflow",
+                metadata={
+                    "exist_dag_ctx": exist_dag_ctx is not None,
+                    "event_loop_task_id": event_loop_task_id,
+                    "streaming_call": streaming_call,
+                    "awel_node_id": node.node_id,
+                    "awel_node_name": node.node_name,
+                },
+            ):
+                await self._execute_node(
+                    job_manager, node, dag_ctx, node_outputs, skip_node_ids, system_app
+                )
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if profile_dag:
+                profiler.record_dag(
+                    node.dag.dag_id if node.dag else "",
+                    time.perf_counter() - start_time,
+                    error,
+                )
         if not streaming_call and node.dag and exist_dag_ctx is None:
             # streaming call not work for dag end
             # if exist_dag_ctx is not None, it means current dag is a sub dag
@@ -149,8 +183,18 @@ class DefaultWorkflowRunner(WorkflowRunner):
                     system_app,
                 )
 
+        profiling = get_awel_profiler().enabled
+        # All the upstream operators finished, the node is ready to run
+        ready_time = time.perf_counter() if profiling else 0.0
+        # The upstream stream outputs broadcast to multiple downstream nodes have a
+        # branch for each of them
+        branches = [
+            dag_ctx._stream_branches.pop((upstream_node.node_id, node.node_id), None)
+            for upstream_node in node.upstream
+        ]
         inputs = [
-            node_outputs[upstream_node.node_id] for upstream_node in node.upstream
+            branch or node_outputs[upstream_node.node_id]
+            for branch, upstream_node in zip(branches, node.upstream)
         ]
         input_ctx = DefaultInputContext(inputs)
         # Log task, get log index(plus 1 every time)
@@ -167,6 +211,10 @@ class DefaultWorkflowRunner(WorkflowRunner):
         task_ctx.set_current_state(TaskState.RUNNING)
 
         if node.node_id in skip_node_ids:
+            # Release the branches, the other downstream nodes do not wait for them
+            for branch in branches:
+                if branch is not None:
+                    await branch.task_output.output_stream.aclose()  # type: ignore
             task_ctx.set_current_state(TaskState.SKIP)
             task_ctx.set_task_output(SimpleTaskOutput(SKIP_DATA))
             node_outputs[node.node_id] = task_ctx
@@ -189,8 +237,14 @@ class DefaultWorkflowRunner(WorkflowRunner):
             with root_tracer.start_span(
                 "dbgpt.awel.workflow.run_operator", metadata=run_metadata
             ) as span:
-                await node._run(dag_ctx, task_ctx.log_id)
+                if profiling:
+                    await self._run_node_with_profiler(
+                        node, dag_ctx, task_ctx, ready_time
+                    )
+                else:
+                    await node._run(dag_ctx, task_ctx.log_id)
                 node_outputs[node.node_id] = dag_ctx.current_task_context
+                self._broadcast_stream(job_manager, node, dag_ctx)
                 task_ctx.set_current_state(TaskState.SUCCESS)
 
                 run_metadata["skip_node_ids"] = ",".join(skip_node_ids)
@@ -211,6 +265,83 @@ class DefaultWorkflowRunner(WorkflowRunner):
             task_ctx.set_current_state(TaskState.FAILED)
             raise e
 
+    def _broadcast_stream(
+        self, job_manager: JobManager, node: BaseOperator, dag_ctx: DAGContext
+    ):
+        """Broadcast the stream output to the downstream nodes of the workflow.
+
+        Every downstream node reads all the items of the stream from its own branch,
+        instead of taking the items from one stream in turn.
+        """
+        if len(node.downstream) < 2:
+            return
+        task_ctx = dag_ctx.current_task_context
+        output = task_ctx.task_output
+        if not isinstance(output, SimpleStreamTaskOutput) or output.is_empty:
+            return
+        node_ids = {n.node_id for n in job_manager._all_nodes}
+        consumers = [n for n in node.downstream if n.node_id in node_ids]
+        if len(consumers) < 2:
+            return
+        broadcast: StreamBroadcast = StreamBroadcast(
+            output.output_stream,
+            len(consumers),
+            buffer_size=node.stream_buffer_size,
+            policy=node.slow_consumer_policy,
+        )
+        for consumer, stream in zip(consumers, broadcast.consumers):
+            branch = task_ctx.new_ctx()
+            branch.task_output.set_output(stream)
+            dag_ctx._stream_branches[(node.node_id, consumer.node_id)] = branch
+
+    async def _run_node_with_profiler(
+        self,
+        node: BaseOperator,
+        dag_ctx: DAGContext,
+        task_ctx: DefaultTaskContext,
+        ready_time: float,
+    ):
+        dag_id = node.dag.dag_id if node.dag else ""
+        operator_type = type(node).__name__
+        start_time = time.perf_counter()
+        queue_wait = start_time - ready_time
+        try:
+            await node._run(dag_ctx, task_ctx.log_id)
+        except Exception as e:
+            get_awel_profiler().record_operator(
+                dag_id,
+                node.node_id,
+                node.node_name,
+                operator_type,
+                time.perf_counter() - start_time,
+                queue_wait,
+                e,
+            )
+            raise
+        output = dag_ctx.current_task_context.task_output
+        if isinstance(output, SimpleStreamTaskOutput) and not output.is_empty:
+            # The run is recorded when the stream is consumed
+            output.set_output(
+                get_awel_profiler().profile_stream(
+                    output.output_stream,
+                    dag_id,
+                    node.node_id,
+                    node.node_name,
+                    operator_type,
+                    start_time,
+                    queue_wait,
+                )
+            )
+        else:
+            get_awel_profiler().record_operator(
+                dag_id,
+                node.node_id,
+                node.node_name,
+                operator_type,
+                time.perf_counter() - start_time,
+                queue_wait,
+            )
+
 
 def _skip_current_downstream_by_node_name(
     branch_node: BranchOperator, skip_nodes: List[str], skip_node_ids: Set[str]
@@ -0,0 +1,242 @@
+"""Profiler of the operators and DAGs run by the workflow runner.
+
+The profiler keeps rolling histograms of the run times in memory, it is disabled by
+default. When disabled, the runner only checks a flag for each operator.
+"""
+
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from dbgpt.util.histogram import RollingHistogram
+from dbgpt.util.stream_utils import aclosing_stream
+
+
+class _RunStats:
+    """The stats of the runs of an operator or a DAG."""
+
+    def __init__(self, window_seconds: float, num_slots: int):
+        self.runs = 0
+        self.errors = 0
+        self.exceptions: Dict[str, int] = {}
+        self.last_error: Optional[str] = None
+        self.wall_time = RollingHistogram(window_seconds, num_slots)
+
+    def record(self, wall_time: float, error: Optional[BaseException]) -> None:
+        self.runs += 1
+        self.wall_time.record(wall_time)
+        if error is not None:
+            self.errors += 1
+            name = type(error).__name__
+            self.exceptions[name] = self.exceptions.get(name, 0) + 1
+            self.last_error = f"{name}: {error}"
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "exceptions": dict(self.exceptions),
+            "last_error": self.last_error,
+            "wall_time": self.wall_time.snapshot(),
+        }
+
+
+class _OperatorStats(_RunStats):
+    def __init__(
+        self, node_id: str, node_name: Optional[str], operator_type: str, *args
+    ):
+        super().__init__(*args)
+        self.node_id = node_id
+        self.node_name = node_name
+        self.operator_type = operator_type
+        self.items = 0
+        self.bytes = 0
+        self.queue_wait = RollingHistogram(*args)
+        self.first_item = RollingHistogram(*args)
+
+    def snapshot(self) -> Dict[str, Any]:
+        result = {
+            "node_id": self.node_id,
+            "node_name": self.node_name,
+            "operator_type": self.operator_type,
+        }
+        result.update(super().snapshot())
+        result.update(
+            items=self.items,
+            bytes=self.bytes,
+            queue_wait=self.queue_wait.snapshot(),
+            first_item=self.first_item.snapshot(),
+        )
+        return result
+
+
+def _size_of(item: Any) -> int:
+    if isinstance(item, (bytes, bytearray)):
+        return len(item)
+    if not isinstance(item, str):
+        # E.g. ModelOutput
+        item = getattr(item, "text", None)
+        if not isinstance(item, str):
+            return 0
+    return len(item.encode("utf-8"))
+
+
+class AWELProfiler:
+    """Profiler of the operators and DAGs.
+
+    For each operator, it records the wall time, the queue wait (from the upstream
+    operators finished to the operator started), the time to the first item and the
+    items and bytes of the output stream, and the exceptions. The wall time of a
+    stream operator lasts until its stream is consumed. For each DAG, it records the
+    wall time to its output and the exceptions.
+    """
+
+    def __init__(
+        self, enabled: bool = False, window_seconds: float = 300, num_slots: int = 10
+    ):
+        """Create an AWEL profiler.
+
+        Args:
+            enabled(bool): Whether to profile the runs.
+            window_seconds(float): The seconds of the rolling window of the
+                histograms.
+            num_slots(int): The number of slots the window is split into.
+        """
+        self._enabled = enabled
+        self._hist_args = (window_seconds, num_slots)
+        self._lock = threading.Lock()
+        self._dags: Dict[str, _RunStats] = {}
+        self._operators: Dict[Tuple[str, str], _OperatorStats] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether to profile the runs."""
+        return self._enabled
+
+    def enable(self) -> None:
+        """Start profiling the runs."""
+        self._enabled = True
+
+    def disable(self) -> None:
+        """Stop profiling the runs, the recorded stats are kept."""
+        self._enabled = False
+
+    def reset(self) -> None:
+        """Clear the recorded stats."""
+        with self._lock:
+            self._dags.clear()
+            self._operators.clear()
+
+    def _get_operator_stats(
+        self, dag_id: str, node_id: str, node_name: Optional[str], operator_type: str
+    ) -> _OperatorStats:
+        key = (dag_id, node_id)
+        stats = self._operators.get(key)
+        if stats is None:
+            stats = _OperatorStats(node_id, node_name, operator_type, *self._hist_args)
+            self._operators[key] = stats
+        return stats
+
+    def record_operator(
+        self,
+        dag_id: str,
+        node_id: str,
+        node_name: Optional[str],
+        operator_type: str,
+        wall_time: float,
+        queue_wait: float,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Record a run of an operator which does not output a stream."""
+        with self._lock:
+            stats = self._get_operator_stats(dag_id, node_id, node_name, operator_type)
+            stats.queue_wait.record(queue_wait)
+            stats.record(wall_time, error)
+
+    async def profile_stream(
+        self,
+        stream: AsyncIterator[Any],
+        dag_id: str,
+        node_id: str,
+        node_name: Optional[str],
+        operator_type: str,
+        start_time: float,
+        queue_wait: float,
+    ) -> AsyncIterator[Any]:
+        """Wrap the output stream of an operator to record its run when consumed.
+
+        Args:
+            start_time(float): The `time.perf_counter()` the operator started.
+        """
+        items, size, first_item = 0, 0, None
+        error: Optional[BaseException] = None
+        try:
+            async with aclosing_stream(stream):
+                async for item in stream:
+                    if first_item is None:
+                        first_item = time.perf_counter() - start_time
+                    items += 1
+                    size += _size_of(item)
+                    yield item
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            wall_time = time.perf_counter() - start_time
+            with self._lock:
+                stats = self._get_operator_stats(
+                    dag_id, node_id, node_name, operator_type
+                )
+                stats.queue_wait.record(queue_wait)
+                if first_item is not None:
+                    stats.first_item.record(first_item)
+                stats.items += items
+                stats.bytes += size
+                stats.record(wall_time, error)
+
+    def record_dag(
+        self, dag_id: str, wall_time: float, error: Optional[BaseException] = None
+    ) -> None:
+        """Record a run of a DAG."""
+        with self._lock:
+            stats = self._dags.get(dag_id)
+            if stats is None:
+                stats = _RunStats(*self._hist_args)
+                self._dags[dag_id] = stats
+            stats.record(wall_time, error)
+
+    def snapshot(self, dag_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get the stats of the DAGs and their operators.
+
+        Args:
+            dag_id(Optional[str]): Only get the stats of the DAG, all the DAGs if not
+                set.
+
+        Returns:
+            Dict[str, Any]: The stats by DAG id, the operators of a DAG are sorted
+                by their total wall time, the slowest first.
+        """
+        with self._lock:
+            dags: Dict[str, Dict[str, Any]] = {}
+            for _dag_id, stats in self._dags.items():
+                if dag_id is None or _dag_id == dag_id:
+                    dags[_dag_id] = stats.snapshot()
+                    dags[_dag_id]["operators"] = []
+            for (_dag_id, _), op_stats in self._operators.items():
+                if dag_id is not None and _dag_id != dag_id:
+                    continue
+                if _dag_id not in dags:
+                    dags[_dag_id] = {"operators": []}
+                dags[_dag_id]["operators"].append(op_stats.snapshot())
+        for dag in dags.values():
+            operators: List[Dict[str, Any]] = dag["operators"]
+            operators.sort(key=lambda op: op["wall_time"]["sum"], reverse=True)
+        return {"enabled": self._enabled, "dags": dags}
+
+
+_DEFAULT_PROFILER = AWELProfiler()
+
+
+def get_awel_profiler() -> AWELProfiler:
+    """Get the profiler used by the default workflow runner."""
+    return _DEFAULT_PROFILER
@@ -0,0 +1,62 @@
+import pytest
+
+from ... import DAG, InputOperator, JoinOperator, MapOperator, SimpleCallDataInputSource
+from ..job_manager import JobManager, get_execution_plan
+
+
+def _build_diamond_dag(depth: int):
+    with DAG("test_diamond") as dag:
+        input_node = InputOperator(SimpleCallDataInputSource(), task_name="input")
+        node = input_node
+        for i in range(depth):
+            left = MapOperator(lambda x: x + 1, task_name=f"left_{i}")
+            right = MapOperator(lambda x: x * 2, task_name=f"right_{i}")
+            join = JoinOperator(lambda a, b: a + b, task_name=f"join_{i}")
+            node >> left >> join
+            node >> right >> join
+            node = join
+    return dag, input_node, node
+
+
+def test_execution_plan_deduplicated():
+    _, input_node, end_node = _build_diamond_dag(10)
+    plan = get_execution_plan(end_node)
+
+    assert len(plan.nodes) == 31
+    assert len({node.node_id for node in plan.nodes}) == 31
+    assert plan.root_nodes == [input_node]
+    assert plan.nodes[0] is input_node
+    assert plan.nodes[-1] is end_node
+    positions = {node.node_id: i for i, node in enumerate(plan.nodes)}
+    for node in plan.nodes:
+        for upstream in node.upstream:
+            assert positions[upstream.node_id] < positions[node.node_id]
+    assert plan.node_name_to_ids["join_9"] == end_node.node_id
+
+    job_manager = JobManager.build_from_end_node(end_node, {"data": 1})
+    assert job_manager.get_call_data_by_id(input_node.node_id) == {"data": 1}
+
+
+def test_execution_plan_cached_until_dag_changed():
+    dag, _, end_node = _build_diamond_dag(2)
+    plan = get_execution_plan(end_node)
+    assert get_execution_plan(end_node) is plan
+
+    with dag:
+        extra_input = InputOperator(SimpleCallDataInputSource(), task_name="extra")
+    assert get_execution_plan(end_node) is not plan
+    plan = get_execution_plan(end_node)
+
+    # Only the edges change
+    extra_input >> end_node
+    new_plan = get_execution_plan(end_node)
+    assert new_plan is not plan
+    assert extra_input in new_plan.root_nodes
+
+
+@pytest.mark.asyncio
+async def test_run_diamond_dag():
+    _, _, end_node = _build_diamond_dag(3)
+    # (1 + 1) + 1 * 2 = 4, (4 + 1) + 4 * 2 = 13, (13 + 1) + 13 * 2 = 40
+    assert await end_node.call(call_data=1) == 40
+    assert await end_node.call(call_data=1) == 40
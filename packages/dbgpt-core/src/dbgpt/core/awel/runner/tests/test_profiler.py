@@ -0,0 +1,98 @@
+from typing import AsyncIterator
+
+import pytest
+
+from ... import (
+    DAG,
+    InputOperator,
+    MapOperator,
+    SimpleCallDataInputSource,
+    StreamifyAbsOperator,
+)
+from ..profiler import get_awel_profiler
+
+
+class NumberStreamOperator(StreamifyAbsOperator[int, str]):
+    async def streamify(self, n: int) -> AsyncIterator[str]:
+        for i in range(n):
+            yield str(i)
+
+
+@pytest.fixture
+def profiler():
+    profiler = get_awel_profiler()
+    profiler.reset()
+    profiler.enable()
+    yield profiler
+    profiler.disable()
+    profiler.reset()
+
+
+@pytest.mark.asyncio
+async def test_profile_operators(profiler):
+    with DAG("test_profile_operators") as dag:
+        input_node = InputOperator(SimpleCallDataInputSource(), task_name="input")
+        map_node = MapOperator(lambda x: x * 2, task_name="double")
+        input_node >> map_node
+    for i in range(3):
+        assert await map_node.call(i) == i * 2
+
+    snapshot = profiler.snapshot(dag.dag_id)
+    dag_stats = snapshot["dags"][dag.dag_id]
+    assert dag_stats["runs"] == 3
+    assert dag_stats["wall_time"]["count"] == 3
+    operators = {op["node_name"]: op for op in dag_stats["operators"]}
+    assert set(operators) == {"input", "double"}
+    assert operators["double"]["runs"] == 3
+    assert operators["double"]["operator_type"] == "MapOperator"
+    assert operators["double"]["queue_wait"]["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_profile_stream(profiler):
+    with DAG("test_profile_stream") as dag:
+        input_node = InputOperator(SimpleCallDataInputSource())
+        stream_node = NumberStreamOperator(task_name="numbers")
+        input_node >> stream_node
+    items = [item async for item in await stream_node.call_stream(12)]
+    assert len(items) == 12
+
+    operators = profiler.snapshot()["dags"][dag.dag_id]["operators"]
+    stats = next(op for op in operators if op["node_name"] == "numbers")
+    assert stats["runs"] == 1
+    assert stats["items"] == 12
+    assert stats["bytes"] == 10 + 2 * 2
+    assert stats["first_item"]["count"] == 1
+    assert stats["first_item"]["max"] <= stats["wall_time"]["max"]
+
+
+@pytest.mark.asyncio
+async def test_profile_error(profiler):
+    def fail(x):
+        raise ValueError("Map failed")
+
+    with DAG("test_profile_error") as dag:
+        input_node = InputOperator(SimpleCallDataInputSource())
+        map_node = MapOperator(fail, task_name="fail")
+        input_node >> map_node
+    with pytest.raises(ValueError):
+        await map_node.call(1)
+
+    dag_stats = profiler.snapshot()["dags"][dag.dag_id]
+    assert dag_stats["errors"] == 1
+    stats = next(op for op in dag_stats["operators"] if op["node_name"] == "fail")
+    assert stats["errors"] == 1
+    assert stats["exceptions"] == {"ValueError": 1}
+    assert stats["last_error"] == "ValueError: Map failed"
+
+
+@pytest.mark.asyncio
+async def test_profiler_disabled():
+    profiler = get_awel_profiler()
+    assert not profiler.enabled
+    with DAG("test_profiler_disabled"):
+        input_node = InputOperator(SimpleCallDataInputSource())
+        map_node = MapOperator(lambda x: x)
+        input_node >> map_node
+    await map_node.call(1)
+    assert "test_profiler_disabled" not in profiler.snapshot()["dags"]
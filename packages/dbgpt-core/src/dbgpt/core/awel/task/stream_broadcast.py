@@ -0,0 +1,249 @@
+"""Bounded broadcast of a stream to multiple consumers."""
+
+import asyncio
+import logging
+import pickle
+import tempfile
+from collections import deque
+from enum import Enum
+from typing import IO, AsyncIterator, Deque, Dict, Generic, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SlowConsumerPolicy(str, Enum):
+    """What to do when a consumer lags the buffer size behind the fastest one."""
+
+    # The fastest consumer waits for the slowest one
+    BLOCK = "block"
+    # The slowest consumer skips the items out of the buffer
+    DROP = "drop"
+    # The items out of the buffer are written to a temporary file for the slow
+    # consumers
+    SPILL = "spill"
+
+
+class StreamBroadcast(Generic[T]):
+    """Broadcast an async stream to a fixed number of consumers.
+
+    Every consumer reads all the items of the stream, the source stream is read
+    once and only when a consumer needs a new item. At most `buffer_size` items
+    are kept in memory, what happens when a consumer lags further behind depends
+    on the slow consumer policy.
+
+    With the `block` policy, a consumer that never reads blocks the others, so the
+    consumers must be read concurrently. The `spill` policy works for the
+    consumers read one after another, the items must be picklable to be spilled,
+    the others are kept in memory.
+
+    Examples:
+        .. code-block:: python
+
+            broadcast = StreamBroadcast(llm_stream, 2, buffer_size=32)
+            to_user, to_log = broadcast.consumers
+            await asyncio.gather(send(to_user), save(to_log))
+    """
+
+    def __init__(
+        self,
+        stream: AsyncIterator[T],
+        num_consumers: int,
+        buffer_size: int = 1024,
+        policy: SlowConsumerPolicy | str = SlowConsumerPolicy.SPILL,
+        spill_dir: Optional[str] = None,
+    ):
+        """Create a stream broadcast.
+
+        Args:
+            stream (AsyncIterator[T]): The source stream.
+            num_consumers (int): The number of consumers.
+            buffer_size (int, optional): The max items kept in memory. Defaults to
+                1024.
+            policy (SlowConsumerPolicy | str, optional): The slow consumer policy.
+                Defaults to spill.
+            spill_dir (Optional[str], optional): The directory of the spill file,
+                the default temporary directory if not set.
+        """
+        if num_consumers < 1:
+            raise ValueError("StreamBroadcast needs at least one consumer")
+        self._source = stream.__aiter__()
+        self._buffer_size = max(1, buffer_size)
+        self._policy = SlowConsumerPolicy(policy)
+        self._spill_dir = spill_dir
+        self._cond = asyncio.Condition()
+        # The items in memory, the first one is the item `self._base`
+        self._buffer: Deque[T] = deque()
+        self._base = 0
+        self._positions = [0] * num_consumers
+        self._active = [True] * num_consumers
+        self._producing = False
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._spill_file: Optional[IO[bytes]] = None
+        self._spilled: Dict[int, int] = {}
+        # The items not picklable, kept in memory with the spill policy
+        self._unspillable: Dict[int, T] = {}
+        self._dropped = [0] * num_consumers
+        self._spilled_count = 0
+        self._consumers: List[AsyncIterator[T]] = [
+            _BroadcastConsumer(self, i) for i in range(num_consumers)
+        ]
+
+    @property
+    def consumers(self) -> List[AsyncIterator[T]]:
+        """Get the streams of the consumers."""
+        return self._consumers
+
+    def metrics(self) -> Dict[str, int]:
+        """Get the gauges and counters of the broadcast."""
+        return {
+            "produced": self._base + len(self._buffer),
+            "buffered": len(self._buffer),
+            "spilled": self._spilled_count,
+            "dropped": sum(self._dropped),
+            "active_consumers": sum(self._active),
+        }
+
+    async def _next(self, index: int):
+        while True:
+            async with self._cond:
+                if not self._active[index]:
+                    return False, None
+                pos = self._positions[index]
+                if pos < self._base:
+                    # The item is out of the buffer
+                    if pos in self._spilled or pos in self._unspillable:
+                        self._positions[index] += 1
+                        item = self._read_spilled(pos)
+                        self._trim()
+                        return True, item
+                    self._dropped[index] += self._base - pos
+                    self._positions[index] = pos = self._base
+                if pos < self._base + len(self._buffer):
+                    self._positions[index] += 1
+                    item = self._buffer[pos - self._base]
+                    self._trim()
+                    self._cond.notify_all()
+                    return True, item
+                if self._done:
+                    if self._error is not None:
+                        raise self._error
+                    return False, None
+                if self._producing:
+                    await self._cond.wait()
+                    continue
+                if (
+                    self._policy == SlowConsumerPolicy.BLOCK
+                    and len(self._buffer) >= self._buffer_size
+                ):
+                    await self._cond.wait()
+                    continue
+                self._producing = True
+            # Read the source without the lock, the buffered items can be read
+            # by the other consumers meanwhile
+            try:
+                item = await self._source.__anext__()
+                end, error = False, None
+            except StopAsyncIteration:
+                end, error = True, None
+            except Exception as e:
+                end, error = True, e
+            async with self._cond:
+                self._producing = False
+                if end:
+                    self._done = True
+                    self._error = error
+                else:
+                    self._buffer.append(item)
+                    if len(self._buffer) > self._buffer_size:
+                        self._evict()
+                self._cond.notify_all()
+
+    def _evict(self):
+        """Move the oldest item out of the buffer."""
+        item = self._buffer.popleft()
+        pos = self._base
+        self._base += 1
+        if self._policy != SlowConsumerPolicy.SPILL:
+            return
+        if not any(
+            active and p <= pos for active, p in zip(self._active, self._positions)
+        ):
+            return
+        try:
+            data = pickle.dumps(item)
+        except Exception as e:
+            logger.warning(f"Can not spill stream item, keep it in memory: {e}")
+            self._unspillable[pos] = item
+            return
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(dir=self._spill_dir)
+        self._spill_file.seek(0, 2)
+        self._spilled[pos] = self._spill_file.tell()
+        self._spill_file.write(len(data).to_bytes(8, "little"))
+        self._spill_file.write(data)
+        self._spilled_count += 1
+
+    def _read_spilled(self, pos: int) -> T:
+        if pos in self._unspillable:
+            return self._unspillable[pos]
+        assert self._spill_file is not None
+        self._spill_file.seek(self._spilled[pos])
+        size = int.from_bytes(self._spill_file.read(8), "little")
+        return pickle.loads(self._spill_file.read(size))
+
+    def _trim(self):
+        """Remove the items all the active consumers have read."""
+        positions = [p for p, active in zip(self._positions, self._active) if active]
+        min_pos = min(positions) if positions else self._base + len(self._buffer)
+        while self._buffer and self._base < min_pos:
+            self._buffer.popleft()
+            self._base += 1
+        for spilled in (self._spilled, self._unspillable):
+            for pos in [p for p in spilled if p < min_pos]:
+                del spilled[pos]
+
+    async def _close_consumer(self, index: int):
+        async with self._cond:
+            if not self._active[index]:
+                return
+            self._active[index] = False
+            self._trim()
+            self._cond.notify_all()
+            if any(self._active):
+                return
+            close_source = not self._done and not self._producing
+            self._done = True
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+        if close_source and hasattr(self._source, "aclose"):
+            await self._source.aclose()  # type: ignore
+
+
+class _BroadcastConsumer(AsyncIterator[T]):
+    """The stream of a consumer, closing it releases its items."""
+
+    def __init__(self, broadcast: StreamBroadcast[T], index: int):
+        self._broadcast = broadcast
+        self._index = index
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self
+
+    async def __anext__(self) -> T:
+        try:
+            has_item, item = await self._broadcast._next(self._index)
+        except BaseException:
+            await self.aclose()
+            raise
+        if not has_item:
+            await self.aclose()
+            raise StopAsyncIteration
+        return item
+
+    async def aclose(self) -> None:
+        """Stop reading the stream."""
+        await self._broadcast._close_consumer(self._index)
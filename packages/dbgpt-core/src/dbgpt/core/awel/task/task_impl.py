@@ -20,6 +20,8 @@ from typing import (
     cast,
 )
 
+from dbgpt.util.stream_utils import aclosing_stream
+
 from .base import (
     _EMPTY_DATA_TYPE,
     EMPTY_DATA,
@@ -214,12 +216,13 @@ class SimpleStreamTaskOutput(TaskOutput[T], Generic[T]):
         is_async = asyncio.iscoroutinefunction(map_func)
 
         async def new_iter() -> AsyncIterator[OUT]:
-            async for out in self.output_stream:
-                if is_async:
-                    new_out: OUT = await map_func(out)
-                else:
-                    new_out = cast(OUT, map_func(out))
-                yield new_out
+            async with aclosing_stream(self.output_stream):
+                async for out in self.output_stream:
+                    if is_async:
+                        new_out: OUT = await map_func(out)
+                    else:
+                        new_out = cast(OUT, map_func(out))
+                    yield new_out
 
         return SimpleStreamTaskOutput(new_iter())
 
@@ -0,0 +1,135 @@
+import asyncio
+from typing import AsyncIterator, List
+
+import pytest
+
+from .. import (
+    DAG,
+    InputOperator,
+    JoinOperator,
+    ReduceStreamOperator,
+    SimpleInputSource,
+    SlowConsumerPolicy,
+    StreamBroadcast,
+)
+
+
+async def _numbers(n: int, produced: List[int]) -> AsyncIterator[int]:
+    for i in range(n):
+        produced.append(i)
+        yield i
+
+
+async def _read_all(stream: AsyncIterator[int]) -> List[int]:
+    return [i async for i in stream]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_concurrent_consumers():
+    produced: List[int] = []
+    broadcast = StreamBroadcast(
+        _numbers(100, produced), 3, buffer_size=4, policy="block"
+    )
+    results = await asyncio.gather(*(_read_all(c) for c in broadcast.consumers))
+    assert results == [list(range(100))] * 3
+    # The source is read once
+    assert produced == list(range(100))
+    assert broadcast.metrics()["active_consumers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_broadcast_block():
+    produced: List[int] = []
+    broadcast = StreamBroadcast(
+        _numbers(100, produced), 2, buffer_size=4, policy="block"
+    )
+    fast, slow = broadcast.consumers
+    fast_items = []
+
+    async def _read_fast():
+        async for i in fast:
+            fast_items.append(i)
+
+    task = asyncio.create_task(_read_fast())
+    await asyncio.sleep(0.01)
+    # The fast consumer waits for the slow one
+    assert fast_items == [0, 1, 2, 3]
+    assert broadcast.metrics()["buffered"] == 4
+    assert await _read_all(slow) == list(range(100))
+    await task
+    assert fast_items == list(range(100))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("policy", [SlowConsumerPolicy.SPILL, "spill"])
+async def test_broadcast_spill(policy):
+    broadcast = StreamBroadcast(_numbers(100, []), 2, buffer_size=4, policy=policy)
+    first, second = broadcast.consumers
+    assert await _read_all(first) == list(range(100))
+    metrics = broadcast.metrics()
+    assert metrics["buffered"] == 4
+    assert metrics["spilled"] == 96
+    assert await _read_all(second) == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_broadcast_drop():
+    broadcast = StreamBroadcast(_numbers(100, []), 2, buffer_size=4, policy="drop")
+    first, second = broadcast.consumers
+    assert await _read_all(first) == list(range(100))
+    assert await _read_all(second) == list(range(96, 100))
+    assert broadcast.metrics()["dropped"] == 96
+
+
+@pytest.mark.asyncio
+async def test_broadcast_error():
+    async def _fail():
+        yield 1
+        raise ValueError("Stream failed")
+
+    broadcast = StreamBroadcast(_fail(), 2)
+    for consumer in broadcast.consumers:
+        with pytest.raises(ValueError, match="Stream failed"):
+            await _read_all(consumer)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_close():
+    closed = False
+
+    async def _endless():
+        nonlocal closed
+        try:
+            i = 0
+            while True:
+                yield i
+                i += 1
+        finally:
+            closed = True
+
+    broadcast = StreamBroadcast(_endless(), 2, policy="block")
+    first, second = broadcast.consumers
+    await second.aclose()
+    async for i in first:
+        if i == 10:
+            break
+    await first.aclose()
+    assert closed
+    assert broadcast.metrics()["active_consumers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_broadcast_in_dag():
+    async def _stream():
+        for i in range(100):
+            yield i
+
+    with DAG("test_broadcast_in_dag"):
+        input_node = InputOperator(SimpleInputSource(_stream()), stream_buffer_size=8)
+        sum_node = ReduceStreamOperator(lambda x, y: x + y)
+        count_node = ReduceStreamOperator(lambda x, y: x + 1 if y else x)
+        join_node = JoinOperator(lambda a, b: (a, b))
+        input_node >> sum_node >> join_node
+        input_node >> count_node >> join_node
+    # Both the downstream nodes read all the items
+    assert await join_node.call() == (sum(range(100)), 99)
@@ -1,3 +1,4 @@
+import asyncio
 from typing import AsyncIterator
 
 import pytest
@@ -10,6 +11,7 @@ from dbgpt.core.awel import (
     TransformStreamAbsOperator,
 )
 from dbgpt.core.awel.trigger.iterator_trigger import IteratorTrigger
+from dbgpt.core.awel.util.cache_util import MemoryCacheStorage
 
 
 class NumberProducerOperator(StreamifyAbsOperator[int, int]):
@@ -138,3 +140,125 @@ async def test_parallel_safe():
         trigger_task >> number_task >> task
     stream_results = await trigger_task.trigger(parallel_num=3)
     await _check_stream_results(stream_results, 4)
+
+
+class SlowSquareOperator(MapOperator[int, int]):
+    """Sleep longer for the smaller numbers, count the numbers in flight."""
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def map(self, n: int) -> int:
+        cls = SlowSquareOperator
+        cls.in_flight += 1
+        cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            await asyncio.sleep(0.01 * (4 - n % 4))
+            return n * n
+        finally:
+            cls.in_flight -= 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_trigger_iter(ordered: bool):
+    SlowSquareOperator.in_flight = SlowSquareOperator.max_in_flight = 0
+    with DAG("test_trigger_iter"):
+        trigger_task = IteratorTrigger(data=[0, 1, 2, 3], show_progress=False)
+        task = SlowSquareOperator()
+        trigger_task >> task
+    results = [r async for r in trigger_task.trigger_iter(4, ordered=ordered)]
+    if ordered:
+        assert results == [(0, 0), (1, 1), (2, 4), (3, 9)]
+    else:
+        # The larger numbers finish first
+        assert results == [(3, 9), (2, 4), (1, 1), (0, 0)]
+    assert SlowSquareOperator.max_in_flight == 4
+
+
+@pytest.mark.asyncio
+async def test_trigger_iter_backpressure():
+    SlowSquareOperator.in_flight = SlowSquareOperator.max_in_flight = 0
+    read = []
+
+    def data():
+        for i in range(20):
+            read.append(i)
+            yield i
+
+    with DAG("test_trigger_iter_backpressure"):
+        trigger_task = IteratorTrigger(data=data(), show_progress=False)
+        task = SlowSquareOperator()
+        trigger_task >> task
+    results = trigger_task.trigger_iter(parallel_num=3)
+    assert await results.__anext__() is not None
+    # Nothing more is read until the consumer asks for the next result
+    await asyncio.sleep(0.1)
+    assert len(read) == 3
+    await results.aclose()
+    assert SlowSquareOperator.in_flight == 0
+
+    trigger_task._iter_data = range(20)
+    results = [r async for r in trigger_task.trigger_iter(parallel_num=3)]
+    assert len(results) == 20
+    assert SlowSquareOperator.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_trigger_iter_stream():
+    with DAG("test_trigger_iter_stream"):
+        trigger_task = IteratorTrigger(
+            data=[0, 1, 2, 3], streaming_call=True, show_progress=False
+        )
+        number_task = NumberProducerOperator()
+        task = MyStreamingOperator()
+        trigger_task >> number_task >> task
+    stream_results = [r async for r in trigger_task.trigger_iter(parallel_num=2)]
+    await _check_stream_results(stream_results, 4)
+
+
+@pytest.mark.asyncio
+async def test_trigger_iter_cache_and_retry():
+    calls = []
+
+    def flaky(n: int) -> int:
+        calls.append(n)
+        if calls.count(n) == 1:
+            raise ValueError("First call failed")
+        return n * n
+
+    cache = MemoryCacheStorage()
+    with DAG("test_trigger_iter_cache_and_retry"):
+        trigger_task = IteratorTrigger(
+            data=[1, 2],
+            show_progress=False,
+            max_retries=1,
+            retry_delay=0,
+            cache_storage=cache,
+            cache_key_fn=lambda n: f"square_{n}",
+            cache_enabled=True,
+        )
+        task = MapOperator(flaky)
+        trigger_task >> task
+    results = [r async for r in trigger_task.trigger_iter(ordered=True)]
+    assert results == [(1, 1), (2, 4)]
+    assert len(calls) == 4
+
+    results = [r async for r in trigger_task.trigger_iter(ordered=True)]
+    assert results == [(1, 1), (2, 4)]
+    # Read from the cache
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_trigger_iter_error():
+    def fail(n: int) -> int:
+        raise ValueError(f"Failed {n}")
+
+    with DAG("test_trigger_iter_error"):
+        trigger_task = IteratorTrigger(data=[0, 1], show_progress=False)
+        task = MapOperator(fail)
+        trigger_task >> task
+    with pytest.raises(RuntimeError, match="Failed after 0 retries"):
+        async for _ in trigger_task.trigger_iter():
+            pass
@@ -1,5 +1,6 @@
 """Http trigger for AWEL."""
 
+import dataclasses
 import json
 import logging
 from enum import Enum
@@ -301,6 +302,8 @@ class CommonLLMHttpRequestBody(BaseHttpBody):
             chat_mode=self.chat_mode,
             chat_param=self.chat_param,
             extra=self.extra,
+            # The chat requests of the users
+            priority="interactive",
         )
 
 
@@ -422,9 +425,22 @@ class HttpTrigger(Trigger):
         status_code: Optional[int] = 200,
         router_tags: Optional[List[str | Enum]] = None,
         register_to_app: bool = False,
+        stream_flush_interval: float = 0.02,
+        stream_max_frame_bytes: int = 16384,
+        stream_gzip: bool = False,
         **kwargs,
     ) -> None:
-        """Initialize a HttpTrigger."""
+        """Initialize a HttpTrigger.
+
+        Args:
+            stream_flush_interval (float): The max seconds an item of the streaming
+                response waits to be sent with the following items, 0 means sending
+                every item at once. Defaults to 0.02.
+            stream_max_frame_bytes (int): The max bytes of the items sent together.
+                Defaults to 16384.
+            stream_gzip (bool): Whether to compress the streaming response if the
+                client accepts gzip. Defaults to False.
+        """
         super().__init__(**kwargs)
         if not endpoint.startswith("/"):
             endpoint = "/" + endpoint
@@ -445,6 +461,11 @@ class HttpTrigger(Trigger):
         self._response_media_type = response_media_type
         self._end_node: Optional[BaseOperator] = None
         self._register_to_app = register_to_app
+        self._stream_options = _StreamOptions(
+            flush_interval=stream_flush_interval,
+            max_frame_bytes=stream_max_frame_bytes,
+            gzip=_parse_bool(stream_gzip),
+        )
 
     async def trigger(self, **kwargs) -> Any:
         """Trigger the DAG. Not used in HttpTrigger."""
@@ -611,6 +632,7 @@ class HttpTrigger(Trigger):
                 streaming_response,
                 self._response_headers,
                 self._response_media_type,
+                self._stream_options,
             )
 
         def create_route_function(name, req_body_cls: Optional["RequestBody"]):
@@ -703,15 +725,26 @@ class HttpTrigger(Trigger):
         return dynamic_route_function
 
 
+@dataclasses.dataclass
+class _StreamOptions:
+    """The options of the streaming response."""
+
+    flush_interval: float = 0.02
+    max_frame_bytes: int = 16384
+    gzip: bool = False
+
+
 async def _trigger_dag(
     body: Any,
     dag: DAG,
     streaming_response: Optional[bool] = False,
     response_headers: Optional[Dict[str, str]] = None,
     response_media_type: Optional[str] = None,
+    stream_options: Optional[_StreamOptions] = None,
 ) -> Any:
     from fastapi import BackgroundTasks
-    from fastapi.responses import StreamingResponse
+
+    from dbgpt.util.sse_utils import SSEStreamingResponse
 
     span_id = root_tracer._parse_span_id(body)
 
@@ -748,11 +781,15 @@ async def _trigger_dag(
 
         background_tasks = BackgroundTasks()
         background_tasks.add_task(_after_dag_end)
-        return StreamingResponse(
+        stream_options = stream_options or _StreamOptions()
+        return SSEStreamingResponse(
             trace_generator,
             headers=headers,
             media_type=media_type,
             background=background_tasks,
+            flush_interval=stream_options.flush_interval,
+            max_frame_bytes=stream_options.max_frame_bytes,
+            gzip=stream_options.gzip,
         )
 
 
@@ -2,10 +2,12 @@
 
 import asyncio
 import logging
+from collections import deque
 from typing import (
     Any,
     AsyncIterator,
     Callable,
+    Deque,
     Iterator,
     List,
     Optional,
@@ -150,6 +152,200 @@ class IteratorTrigger(Trigger[List[Tuple[Any, Any]]]):
         except Exception as e:
             logger.warning(f"Cache storage error for key {cache_key}: {str(e)}")
 
+    def _get_end_node(self) -> BaseOperator:
+        dag = self.dag
+        if not dag:
+            raise ValueError("DAG is not set for IteratorTrigger")
+        leaf_nodes = dag.leaf_nodes
+        if len(leaf_nodes) != 1:
+            raise ValueError("IteratorTrigger just support one leaf node in dag")
+        return cast(BaseOperator, leaf_nodes[0])
+
+    async def _call_stream(
+        self, end_node: BaseOperator, call_data: Any, cache_key: Optional[str] = None
+    ) -> AsyncIterator[Any]:
+        """Process streaming data with optional caching."""
+        # If caching is enabled and we have a cache key, try to get cached results
+        if cache_key is not None:
+            cached_result = await self._get_cached_result(cache_key)
+            if cached_result is not None:
+                # For streaming cached results, we need to yield each item
+                for item in cached_result:
+                    yield item
+                return
+
+        # Store results for caching if needed
+        cached_items = []
+        try:
+            async for out in await end_node.call_stream(call_data):
+                # Store the result for caching
+                if cache_key is not None:
+                    cached_items.append(out)
+                yield out
+        finally:
+            # Cache the collection of results after processing is complete
+            if cache_key is not None and cached_items:
+                await self._store_in_cache(cache_key, cached_items)
+            if self.dag:
+                await self.dag._after_dag_end(end_node.current_event_loop_task_id)
+
+    async def _run_node(
+        self, end_node: BaseOperator, call_data: Any
+    ) -> Tuple[Any, Any]:
+        """Run the dag with one input data, with the cache and retry logic."""
+        # Generate cache key if caching is enabled
+        cache_key = await self._get_cache_key(call_data)
+
+        if self._streaming_call:
+            # Streaming calls
+            if self._timeout:
+                stream_generator = self._call_stream(end_node, call_data, cache_key)
+                task_output = await asyncio.wait_for(
+                    anext(stream_generator.__aiter__()), timeout=self._timeout
+                )
+
+                # Create a combined generator that includes the first item and
+                # the rest
+                async def combined_generator():
+                    yield task_output
+                    async for item in stream_generator:
+                        yield item
+
+                return call_data, combined_generator()
+            else:
+                return call_data, self._call_stream(end_node, call_data, cache_key)
+
+        # Non-streaming call with cache and retry logic
+        # Try to get from cache first if caching is enabled
+        if cache_key is not None:
+            cached_result = await self._get_cached_result(cache_key)
+            if cached_result is not None:
+                logger.info(f"Cache hit for key {cache_key}")
+                # For non-streaming calls, just return the cached result
+                # directly
+                # For streaming calls that were previously cached, recreate the
+                # stream
+                if isinstance(cached_result, list) and self._streaming_call:
+                    return call_data, stream_from_cached_data(cached_result)
+                return call_data, cached_result
+
+        # If not cached or cache miss, proceed with regular execution
+        max_retries = self._max_retries
+        attempts = 0
+        while True:
+            try:
+                if self._timeout:
+                    task_output = await asyncio.wait_for(
+                        end_node.call(call_data), timeout=self._timeout
+                    )
+                else:
+                    task_output = await end_node.call(call_data)
+
+                # Cache the result if caching is enabled
+                if cache_key is not None:
+                    await self._store_in_cache(cache_key, task_output)
+
+                return call_data, task_output
+            except (Exception, asyncio.TimeoutError) as e:
+                attempts += 1
+                if attempts > max_retries:
+                    raise RuntimeError(
+                        f"Failed after {max_retries} retries: {str(e)}"
+                    ) from e
+                await asyncio.sleep(self._retry_delay)
+                logger.warning(
+                    f"Failed attempt {attempts}/{max_retries} for task "
+                    f"{end_node.node_id}: {str(e)}"
+                )
+
+    async def trigger_iter(
+        self,
+        parallel_num: Optional[int] = None,
+        ordered: bool = False,
+        **kwargs,
+    ) -> AsyncIterator[Tuple[Any, Any]]:
+        """Trigger the dag with iterator data, yield the results as they complete.
+
+        Unlike :meth:`trigger`, the input data is read lazily and the results are
+        not kept, so it fits the large batch jobs. At most `parallel_num` inputs
+        are in flight, the finished results not consumed yet included, so a slow
+        consumer pauses the reading of the input data.
+
+        If the dag is a streaming call, the output is an async iterator.
+
+        Examples:
+            .. code-block:: python
+
+                with DAG("test_dag") as dag:
+                    trigger_task = IteratorTrigger(range(1000), parallel_num=8)
+                    task = MapOperator(lambda x: x * x)
+                    trigger_task >> task
+
+                async for data, output in trigger_task.trigger_iter():
+                    print(data, output)
+
+        Args:
+            parallel_num (Optional[int], optional): The max inputs in flight.
+                Defaults to the `parallel_num` of the trigger.
+            ordered (bool, optional): Whether to yield the results in the order of
+                the input data, a finished result waits for the earlier ones.
+                Defaults to False, yield in the order of completion.
+
+        Yields:
+            Tuple[Any, Any]: The input data and the output data of the leaf node.
+
+        Raises:
+            RuntimeError: If an input failed after the retries, the inputs in
+                flight are cancelled.
+        """
+        end_node = self._get_end_node()
+        max_in_flight = max(1, parallel_num or self._parallel_num)
+        data_iter = _to_async_iterator(self._iter_data, self.node_id).__aiter__()
+        pending: Deque[asyncio.Task] = deque()
+        exhausted = False
+
+        progress = None
+        if self._show_progress:
+            from tqdm.asyncio import tqdm_asyncio
+
+            progress = tqdm_asyncio()
+
+        async def _fill():
+            nonlocal exhausted
+            while not exhausted and len(pending) < max_in_flight:
+                try:
+                    data = await data_iter.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending.append(asyncio.create_task(self._run_node(end_node, data)))
+
+        try:
+            await _fill()
+            while pending:
+                if ordered:
+                    task = pending.popleft()
+                    result = await task
+                else:
+                    done, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    # Keep the input order among the tasks finished together
+                    task = next(t for t in pending if t in done)
+                    pending.remove(task)
+                    result = task.result()
+                if progress is not None:
+                    progress.update(1)
+                yield result
+                await _fill()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            if progress is not None:
+                progress.close()
+
     async def trigger(
         self, parallel_num: Optional[int] = None, **kwargs
     ) -> List[Tuple[Any, Any]]:
@@ -195,109 +391,12 @@ class IteratorTrigger(Trigger[List[Tuple[Any, Any]]]):
                 The first element of the tuple is the input data, the second element is
                 the output data of the leaf node.
         """
-        dag = self.dag
-        if not dag:
-            raise ValueError("DAG is not set for IteratorTrigger")
-        leaf_nodes = dag.leaf_nodes
-        if len(leaf_nodes) != 1:
-            raise ValueError("IteratorTrigger just support one leaf node in dag")
-        end_node = cast(BaseOperator, leaf_nodes[0])
-        streaming_call = self._streaming_call
+        end_node = self._get_end_node()
         semaphore = asyncio.Semaphore(parallel_num or self._parallel_num)
-        task_id = self.node_id
-        max_retries = self._max_retries
-
-        async def call_stream(call_data: Any, cache_key: Optional[str] = None):
-            """Process streaming data with optional caching."""
-            # If caching is enabled and we have a cache key, try to get cached results
-            if cache_key is not None:
-                cached_result = await self._get_cached_result(cache_key)
-                if cached_result is not None:
-                    # For streaming cached results, we need to yield each item
-                    for item in cached_result:
-                        yield item
-                    return
-
-            # Store results for caching if needed
-            cached_items = []
-            try:
-                async for out in await end_node.call_stream(call_data):
-                    # Store the result for caching
-                    if cache_key is not None:
-                        cached_items.append(out)
-                    yield out
-            finally:
-                # Cache the collection of results after processing is complete
-                if cache_key is not None and cached_items:
-                    await self._store_in_cache(cache_key, cached_items)
-                await dag._after_dag_end(end_node.current_event_loop_task_id)
 
         async def run_node_with_control(call_data: Any) -> Tuple[Any, Any]:
             async with semaphore:
-                # Generate cache key if caching is enabled
-                cache_key = await self._get_cache_key(call_data)
-
-                if streaming_call:
-                    # Streaming calls
-                    if self._timeout:
-                        stream_generator = call_stream(call_data, cache_key)
-                        task_output = await asyncio.wait_for(
-                            anext(stream_generator.__aiter__()), timeout=self._timeout
-                        )
-
-                        # Create a combined generator that includes the first item and
-                        # the rest
-                        async def combined_generator():
-                            yield task_output
-                            async for item in stream_generator:
-                                yield item
-
-                        return call_data, combined_generator()
-                    else:
-                        return call_data, call_stream(call_data, cache_key)
-
-                # Non-streaming call with cache and retry logic
-                # Try to get from cache first if caching is enabled
-                if cache_key is not None:
-                    cached_result = await self._get_cached_result(cache_key)
-                    if cached_result is not None:
-                        logger.info(f"Cache hit for key {cache_key}")
-                        # For non-streaming calls, just return the cached result
-                        # directly
-                        # For streaming calls that were previously cached, recreate the
-                        # stream
-                        if isinstance(cached_result, list) and self._streaming_call:
-                            return call_data, stream_from_cached_data(cached_result)
-                        return call_data, cached_result
-
-                # If not cached or cache miss, proceed with regular execution
-                nonlocal max_retries
-                attempts = 0
-                while True:
-                    try:
-                        if self._timeout:
-                            task_output = await asyncio.wait_for(
-                                end_node.call(call_data), timeout=self._timeout
-                            )
-                        else:
-                            task_output = await end_node.call(call_data)
-
-                        # Cache the result if caching is enabled
-                        if cache_key is not None:
-                            await self._store_in_cache(cache_key, task_output)
-
-                        return call_data, task_output
-                    except (Exception, asyncio.TimeoutError) as e:
-                        attempts += 1
-                        if attempts > max_retries:
-                            raise RuntimeError(
-                                f"Failed after {max_retries} retries: {str(e)}"
-                            ) from e
-                        await asyncio.sleep(self._retry_delay)
-                        logger.warning(
-                            f"Failed attempt {attempts}/{max_retries} for task "
-                            f"{end_node.node_id}: {str(e)}"
-                        )
+                return await self._run_node(end_node, call_data)
 
         tasks = []
 
@@ -308,7 +407,7 @@ class IteratorTrigger(Trigger[List[Tuple[Any, Any]]]):
         else:
             async_module = asyncio  # type: ignore
 
-        async for data in _to_async_iterator(self._iter_data, task_id):
+        async for data in _to_async_iterator(self._iter_data, self.node_id):
             tasks.append(run_node_with_control(data))
         results: List[Tuple[Any, Any]] = await async_module.gather(*tasks)
         return results
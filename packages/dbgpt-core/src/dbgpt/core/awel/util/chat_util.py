@@ -4,6 +4,8 @@ import json
 import traceback
 from typing import Any, AsyncIterator, Dict, Optional
 
+from dbgpt.util.stream_utils import aclosing_stream
+
 from ...interface.llm import ModelInferenceMetrics, ModelOutput
 from ...schema.api import (
     ChatCompletionResponse,
@@ -54,17 +56,19 @@ async def safe_chat_with_dag_task(
         error_code = 0
         text = ""
         thinking_text = ""
-        async for output in safe_chat_stream_with_dag_task(
+        stream = safe_chat_stream_with_dag_task(
             task, request, False, covert_to_str=covert_to_str
-        ):
-            finish_reason = output.finish_reason
-            usage = output.usage
-            metrics = output.metrics
-            error_code = output.error_code
-            if output.has_text:
-                text = output.text
-            if output.has_thinking:
-                thinking_text = output.thinking_text
+        )
+        async with aclosing_stream(stream):
+            async for output in stream:
+                finish_reason = output.finish_reason
+                usage = output.usage
+                metrics = output.metrics
+                error_code = output.error_code
+                if output.has_text:
+                    text = output.text
+                if output.has_thinking:
+                    thinking_text = output.thinking_text
         return ModelOutput.build(
             text,
             thinking_text,
@@ -95,10 +99,12 @@ async def safe_chat_stream_with_dag_task(
         ModelOutput: The model output.
     """
     try:
-        async for output in chat_stream_with_dag_task(
+        stream = chat_stream_with_dag_task(
             task, request, incremental, covert_to_str=covert_to_str
-        ):
-            yield output
+        )
+        async with aclosing_stream(stream):
+            async for output in stream:
+                yield output
     except Exception as e:
         simple_error_msg = str(e)
         if not simple_error_msg:
@@ -159,83 +165,87 @@ async def chat_stream_with_dag_task(
         ):
             full_text = ""
             full_thinking_text = ""
-            async for output in await task.call_stream(request):
-                model_output = parse_openai_output(output)
-                # The output of the OpenAI streaming API is incremental
-                if model_output.has_thinking:
-                    full_thinking_text += model_output.thinking_text
-                if model_output.has_text:
-                    full_text += model_output.text
-                model_output.incremental = incremental
-                if not incremental:
-                    model_output = ModelOutput.build(
-                        full_text,
-                        full_thinking_text,
-                        error_code=model_output.error_code,
-                        usage=model_output.usage,
-                        finish_reason=model_output.finish_reason,
-                    )
-                yield model_output
-                if not model_output.success:
-                    break
+            stream = await task.call_stream(request)
+            async with aclosing_stream(stream):
+                async for output in stream:
+                    model_output = parse_openai_output(output)
+                    # The output of the OpenAI streaming API is incremental
+                    if model_output.has_thinking:
+                        full_thinking_text += model_output.thinking_text
+                    if model_output.has_text:
+                        full_text += model_output.text
+                    model_output.incremental = incremental
+                    if not incremental:
+                        model_output = ModelOutput.build(
+                            full_text,
+                            full_thinking_text,
+                            error_code=model_output.error_code,
+                            usage=model_output.usage,
+                            finish_reason=model_output.finish_reason,
+                        )
+                    yield model_output
+                    if not model_output.success:
+                        break
         else:
             full_text = ""
             full_thinking_text = ""
             previous_text = ""
             previous_thinking_text = ""
-            async for output in await task.call_stream(request):
-                model_output = parse_single_output(
-                    output, is_sse, covert_to_str=covert_to_str
-                )
-                model_output.incremental = incremental
-                if task.incremental_output:
-                    # Output is incremental, append the text
-                    if model_output.has_thinking:
-                        full_thinking_text += model_output.thinking_text
-                    if model_output.has_text:
-                        full_text += model_output.text
-                else:
-                    # Output is not incremental, last output is the full text
-                    if model_output.has_thinking:
-                        full_thinking_text = model_output.thinking_text
-
-                    if model_output.has_text:
-                        full_text = model_output.text
-                if not incremental:
-                    # Return the full text
-                    model_output = ModelOutput.build(
-                        full_text,
-                        full_thinking_text,
-                        error_code=model_output.error_code,
-                        usage=model_output.usage,
-                        finish_reason=model_output.finish_reason,
-                    )
-                else:
-                    # Return the incremental text
-                    delta_text = full_text[len(previous_text) :]
-                    previous_text = (
-                        full_text
-                        if len(full_text) > len(previous_text)
-                        else previous_text
-                    )
-                    delta_thinking_text = full_thinking_text[
-                        len(previous_thinking_text) :
-                    ]
-                    previous_thinking_text = (
-                        full_thinking_text
-                        if len(full_thinking_text) > len(previous_thinking_text)
-                        else previous_thinking_text
-                    )
-                    model_output = ModelOutput.build(
-                        delta_text,
-                        delta_thinking_text,
-                        error_code=model_output.error_code,
-                        usage=model_output.usage,
-                        finish_reason=model_output.finish_reason,
+            stream = await task.call_stream(request)
+            async with aclosing_stream(stream):
+                async for output in stream:
+                    model_output = parse_single_output(
+                        output, is_sse, covert_to_str=covert_to_str
                     )
-                yield model_output
-                if not model_output.success:
-                    break
+                    model_output.incremental = incremental
+                    if task.incremental_output:
+                        # Output is incremental, append the text
+                        if model_output.has_thinking:
+                            full_thinking_text += model_output.thinking_text
+                        if model_output.has_text:
+                            full_text += model_output.text
+                    else:
+                        # Output is not incremental, last output is the full text
+                        if model_output.has_thinking:
+                            full_thinking_text = model_output.thinking_text
+
+                        if model_output.has_text:
+                            full_text = model_output.text
+                    if not incremental:
+                        # Return the full text
+                        model_output = ModelOutput.build(
+                            full_text,
+                            full_thinking_text,
+                            error_code=model_output.error_code,
+                            usage=model_output.usage,
+                            finish_reason=model_output.finish_reason,
+                        )
+                    else:
+                        # Return the incremental text
+                        delta_text = full_text[len(previous_text) :]
+                        previous_text = (
+                            full_text
+                            if len(full_text) > len(previous_text)
+                            else previous_text
+                        )
+                        delta_thinking_text = full_thinking_text[
+                            len(previous_thinking_text) :
+                        ]
+                        previous_thinking_text = (
+                            full_thinking_text
+                            if len(full_thinking_text) > len(previous_thinking_text)
+                            else previous_thinking_text
+                        )
+                        model_output = ModelOutput.build(
+                            delta_text,
+                            delta_thinking_text,
+                            error_code=model_output.error_code,
+                            usage=model_output.usage,
+                            finish_reason=model_output.finish_reason,
+                        )
+                    yield model_output
+                    if not model_output.success:
+                        break
 
 
 def parse_single_output(
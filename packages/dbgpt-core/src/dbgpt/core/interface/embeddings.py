@@ -120,6 +120,14 @@ class Embeddings(ABC):
     def embed_query(self, text: str) -> List[float]:
         """Embed query text."""
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed multiple query texts.
+
+        The queries are embedded one by one by default, the subclasses can
+        override it to embed them in one call.
+        """
+        return [self.embed_query(text) for text in texts]
+
     async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
         """Asynchronous Embed search docs."""
         return await asyncio.get_running_loop().run_in_executor(
@@ -131,3 +139,9 @@ class Embeddings(ABC):
         return await asyncio.get_running_loop().run_in_executor(
             None, self.embed_query, text
         )
+
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronous Embed multiple query texts."""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.embed_queries, texts
+        )
@@ -1,5 +1,6 @@
 """The interface for LLM."""
 
+import asyncio
 import collections
 import copy
 import logging
@@ -237,6 +238,9 @@ class ModelRequestContext:
     is_reasoning_model: Optional[bool] = False
     """Whether the model is a reasoning model."""
 
+    priority: Optional[str] = None
+    """The priority class of the model request, interactive, default or batch."""
+
 
 @dataclass
 @PublicAPI(stability="beta")
@@ -254,6 +258,8 @@ class ModelOutput:
     usage: Optional[Dict[str, Any]] = None
     metrics: Optional[ModelInferenceMetrics] = None
     """Some metrics for model inference"""
+    seq: Optional[int] = None
+    """The sequence number of an incremental output in its stream, starts from 0"""
 
     def __init__(
         self,
@@ -282,6 +288,7 @@ class ModelOutput:
                 "finish_reason",
                 "usage",
                 "metrics",
+                "seq",
             ]:
                 setattr(self, k, v)
 
@@ -296,6 +303,7 @@ class ModelOutput:
             "finish_reason": self.finish_reason,
             "usage": self.usage,
             "metrics": self.metrics,
+            "seq": self.seq,
         }
 
     @property
@@ -1089,6 +1097,24 @@ class LLMClient(ABC):
             int: The number of tokens.
         """
 
+    async def count_tokens(self, model: str, prompts: List[str]) -> List[int]:
+        """Count the number of tokens of each prompt.
+
+        The subclasses can override it to count all the prompts in one request.
+
+        Args:
+            model(str): The model name.
+            prompts(List[str]): The prompts.
+
+        Returns:
+            List[int]: The number of tokens of each prompt.
+        """
+        return list(
+            await asyncio.gather(
+                *(self.count_token(model, prompt) for prompt in prompts)
+            )
+        )
+
     async def covert_message(
         self,
         request: ModelRequest,
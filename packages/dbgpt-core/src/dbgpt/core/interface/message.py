@@ -5,7 +5,20 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from collections.abc import Iterable
 from datetime import datetime
-from typing import Callable, Dict, List, Optional, Tuple, Union, cast
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+from cachetools import LRUCache
 
 from dbgpt._private.pydantic import BaseModel, Field, model_to_dict
 from dbgpt.core.interface.media import MediaContent
@@ -591,24 +604,136 @@ def _messages_to_str(
     """
     str_messages = []
     for message in messages:
-        role = None
-        if isinstance(message, HumanMessage):
-            role = human_prefix
-        elif isinstance(message, AIMessage):
-            role = ai_prefix
-        elif isinstance(message, SystemMessage):
-            role = system_prefix
-        elif isinstance(message, ViewMessage):
-            pass
-        elif isinstance(message, ModelMessage):
-            role = message.role
-        else:
-            raise ValueError(f"Got unsupported message type: {message}")
-        if role:
-            str_messages.append(f"{role}: {message.content}")
+        str_message = _message_to_str(message, human_prefix, ai_prefix, system_prefix)
+        if str_message is not None:
+            str_messages.append(str_message)
     return "\n".join(str_messages)
 
 
+def _message_to_str(
+    message: Union[BaseMessage, ModelMessage],
+    human_prefix: str = "Human",
+    ai_prefix: str = "AI",
+    system_prefix: str = "System",
+) -> Optional[str]:
+    """Convert a message to str, None if it is not passed to the model."""
+    role = None
+    if isinstance(message, HumanMessage):
+        role = human_prefix
+    elif isinstance(message, AIMessage):
+        role = ai_prefix
+    elif isinstance(message, SystemMessage):
+        role = system_prefix
+    elif isinstance(message, ViewMessage):
+        pass
+    elif isinstance(message, ModelMessage):
+        role = message.role
+    else:
+        raise ValueError(f"Got unsupported message type: {message}")
+    if not role:
+        return None
+    return f"{role}: {message.content}"
+
+
+class MessageTokenLedger:
+    """Token counts of the messages, cached by message and model.
+
+    A conversation only grows by a few messages every round, the token count of
+    its history is the sum of the cached counts of the old messages and the counts
+    of the new ones, instead of counting the whole history again.
+
+    The total is counted as the messages converted by `_messages_to_str`, which
+    joins them with one newline (one token) between each two messages.
+
+    Examples:
+        .. code-block:: python
+
+            ledger = MessageTokenLedger(llm_client.count_tokens)
+            if not await ledger.fits_in_context(model, messages, 4096):
+                ...
+    """
+
+    def __init__(
+        self,
+        count_tokens_func: Callable[[str, List[str]], Awaitable[List[int]]],
+        max_entries: int = 10000,
+        counts: Optional[MutableMapping[Tuple[str, int, int], int]] = None,
+    ):
+        """Create a message token ledger.
+
+        Args:
+            count_tokens_func (Callable[[str, List[str]], Awaitable[List[int]]]):
+                Count the tokens of each prompt with a model in one call, the
+                arguments are the model name and the prompts, e.g.
+                `LLMClient.count_tokens`.
+            max_entries (int): The max number of cached message counts.
+            counts (Optional[MutableMapping[Tuple[str, int, int], int]]): The
+                cache of the message counts. The ledgers created for the same
+                conversation in every round can share one cache.
+        """
+        self._count_tokens_func = count_tokens_func
+        self._counts: MutableMapping[Tuple[str, int, int], int] = (
+            counts if counts is not None else LRUCache(maxsize=max_entries)
+        )
+
+    async def count_messages(
+        self, model: str, messages: Sequence[Union[BaseMessage, ModelMessage]]
+    ) -> List[int]:
+        """Count the tokens of each message.
+
+        The messages which are not passed to the model are counted as 0.
+        """
+        results = [0] * len(messages)
+        misses: Dict[Tuple[str, int, int], List[int]] = {}
+        miss_texts: Dict[Tuple[str, int, int], str] = {}
+        for i, message in enumerate(messages):
+            text = _message_to_str(message)
+            if text is None:
+                continue
+            key = (model, len(text), hash(text))
+            count = self._counts.get(key)
+            if count is not None:
+                results[i] = count
+            elif key in misses:
+                misses[key].append(i)
+            else:
+                misses[key] = [i]
+                miss_texts[key] = text
+        if misses:
+            keys = list(misses.keys())
+            counts = await self._count_tokens_func(
+                model, [miss_texts[key] for key in keys]
+            )
+            for key, count in zip(keys, counts):
+                if count < 0:
+                    # Counting failed, do not cache it
+                    count = len(miss_texts[key])
+                else:
+                    self._counts[key] = count
+                for i in misses[key]:
+                    results[i] = count
+        return results
+
+    async def total_tokens(
+        self, model: str, messages: Sequence[Union[BaseMessage, ModelMessage]]
+    ) -> int:
+        """Count the tokens of the messages as the prompt of the model."""
+        counts = await self.count_messages(model, messages)
+        num_passed = sum(
+            1 for message in messages if _message_to_str(message) is not None
+        )
+        return sum(counts) + max(0, num_passed - 1)
+
+    async def fits_in_context(
+        self,
+        model: str,
+        messages: Sequence[Union[BaseMessage, ModelMessage]],
+        max_tokens: int,
+    ) -> bool:
+        """Whether the messages fit in the max tokens, e.g. the context window."""
+        return await self.total_tokens(model, messages) <= max_tokens
+
+
 def _message_from_dict(message: Dict) -> BaseMessage:
     _type = message["type"]
     if _type == "human":
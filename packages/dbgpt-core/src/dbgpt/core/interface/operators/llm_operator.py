@@ -35,6 +35,7 @@ from dbgpt.core.interface.llm import (
 from dbgpt.core.interface.message import ModelMessage
 from dbgpt.util.function_utils import rearrange_args_by_type
 from dbgpt.util.i18n_utils import _
+from dbgpt.util.stream_utils import aclosing_stream
 
 RequestInput = Union[
     ModelRequest,
@@ -344,9 +345,12 @@ class BaseStreamingLLMOperator(
             self.SHARE_DATA_KEY_MODEL_NAME, request.model, overwrite=True
         )
         model_output = None
-        async for output in self.llm_client.generate_stream(request):  # type: ignore
-            model_output = output
-            yield output
+        stream = self.llm_client.generate_stream(request)  # type: ignore
+        # Stop the generation when the downstream stops reading
+        async with aclosing_stream(stream):
+            async for output in stream:
+                model_output = output
+                yield output
         if model_output:
             await self.save_model_output(self.current_dag_context, model_output)
 
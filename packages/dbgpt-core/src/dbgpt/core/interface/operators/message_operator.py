@@ -5,6 +5,8 @@ import uuid
 from abc import ABC
 from typing import Any, Callable, Dict, List, Optional, Union, cast
 
+from cachetools import LRUCache
+
 from dbgpt.core import (
     InMemoryStorage,
     LLMClient,
@@ -20,7 +22,7 @@ from dbgpt.core.awel import BaseOperator, MapOperator
 from dbgpt.core.awel.flow import IOField, OperatorCategory, Parameter, ViewMetadata
 from dbgpt.core.interface.message import (
     BaseMessage,
-    _messages_to_str,
+    MessageTokenLedger,
     _MultiRoundMessageMapper,
     _split_messages_by_round,
 )
@@ -28,6 +30,10 @@ from dbgpt.util.i18n_utils import _
 
 logger = logging.getLogger(__name__)
 
+# The token counts of the messages, keyed by the model and the message. The
+# operators are rebuilt in every round, so the counts are kept at the module level.
+_message_token_counts: LRUCache = LRUCache(maxsize=10000)
+
 
 class BaseConversationOperator(BaseOperator, ABC):
     """Base class for conversation operators."""
@@ -555,32 +561,31 @@ class TokenBufferedConversationMapperOperator(ConversationMapperOperator):
         self._max_token_limit = max_token_limit
         self._eviction_policy = eviction_policy
         self._message_mapper = message_mapper
+        # The token counts of the messages are cached across the rounds
+        self._token_ledger = MessageTokenLedger(
+            llm_client.count_tokens, counts=_message_token_counts
+        )
         super().__init__(**kwargs)
 
     async def map_messages(self, messages: List[BaseMessage]) -> List[BaseMessage]:
         """Map multi round messages to a list of BaseMessage."""
         eviction_policy = self._eviction_policy or self.eviction_policy
         messages_by_round: List[List[BaseMessage]] = _split_messages_by_round(messages)
-        messages_str = _messages_to_str(_merge_multi_round_messages(messages_by_round))
         model_name = self._model
         if not model_name:
             model_name = await self.current_dag_context.get_from_share_data(
                 self.SHARE_DATA_KEY_CONV_MODEL_NAME
             )
-        # Fist time, we count the token of the messages
-        current_tokens = await self._llm_client.count_token(model_name, messages_str)
-
-        while current_tokens > self._max_token_limit:
+        # Only the messages not seen before are counted, the evicted messages
+        # do not need to be counted again.
+        while messages_by_round and not await self._token_ledger.fits_in_context(
+            model_name,
+            _merge_multi_round_messages(messages_by_round),
+            self._max_token_limit,
+        ):
             # Evict the messages by round after all tokens are not greater than the max
             # token limit
-            # TODO: We should find a high performance way to do this
             messages_by_round = eviction_policy(messages_by_round)
-            messages_str = _messages_to_str(
-                _merge_multi_round_messages(messages_by_round)
-            )
-            current_tokens = await self._llm_client.count_token(
-                model_name, messages_str
-            )
         message_mapper = self._message_mapper or self.map_multi_round_messages
         return message_mapper(messages_by_round)
 
@@ -1,9 +1,13 @@
 from typing import List
+from unittest.mock import MagicMock
 
 import pytest
 
 from dbgpt.core.interface.message import AIMessage, BaseMessage, HumanMessage
-from dbgpt.core.operators import BufferedConversationMapperOperator
+from dbgpt.core.operators import (
+    BufferedConversationMapperOperator,
+    TokenBufferedConversationMapperOperator,
+)
 
 
 @pytest.fixture
@@ -153,3 +157,34 @@ async def test_buffered_conversation_keep_start_end_rounds(messages: List[BaseMe
             keep_end_rounds=-1,
         )
         await operator.map_messages(messages)
+
+
+@pytest.mark.asyncio
+async def test_token_buffered_conversation(messages: List[BaseMessage]):
+    calls = []
+
+    async def count_tokens(model: str, prompts: List[str]) -> List[int]:
+        calls.append(prompts)
+        return [len(prompt.split()) for prompt in prompts]
+
+    llm_client = MagicMock()
+    llm_client.count_tokens = count_tokens
+    operator = TokenBufferedConversationMapperOperator(
+        model="test_token_buffered", llm_client=llm_client, max_token_limit=20
+    )
+    # The first round is evicted, the messages are counted in one call
+    assert await operator.map_messages(messages) == messages[2:]
+    assert len(calls) == 1
+    assert len(calls[0]) == len(messages)
+
+    # The operator is rebuilt in the next round, only the new messages are counted
+    calls.clear()
+    operator = TokenBufferedConversationMapperOperator(
+        model="test_token_buffered", llm_client=llm_client, max_token_limit=20
+    )
+    new_messages = messages + [
+        HumanMessage(content="Tell me more", round_index=4),
+        AIMessage(content="Sure", round_index=4),
+    ]
+    assert await operator.map_messages(new_messages) == new_messages[4:]
+    assert calls == [["Human: Tell me more", "AI: Sure"]]
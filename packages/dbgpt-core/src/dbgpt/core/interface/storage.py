@@ -170,12 +170,23 @@ class StorageError(Exception):
         super().__init__(message)
 
 
+def _match_conditions(data: Any, conditions: Dict[str, Any]) -> bool:
+    for key, value in conditions.items():
+        if isinstance(value, (list, tuple, set)):
+            if getattr(data, key) not in value:
+                return False
+        elif getattr(data, key) != value:
+            return False
+    return True
+
+
 @PublicAPI(stability="beta")
 class QuerySpec:
     """The query specification for querying data from the storage.
 
     Attributes:
-        conditions (Dict[str, Any]): The conditions for querying data
+        conditions (Dict[str, Any]): The conditions for querying data, a list value
+            matches any of its items
         limit (int): The maximum number of data to return
         offset (int): The offset of the data to return
     """
@@ -473,9 +484,7 @@ class InMemoryStorage(StorageInterface[T, T]):
         result = []
         for serialized_data in self._data.values():
             data = cast(T, self._serializer.deserialize(serialized_data, cls))
-            if all(
-                getattr(data, key) == value for key, value in spec.conditions.items()
-            ):
+            if _match_conditions(data, spec.conditions):
                 result.append(data)
 
         # Apply limit and offset
@@ -498,8 +507,6 @@ class InMemoryStorage(StorageInterface[T, T]):
         count = 0
         for serialized_data in self._data.values():
             data = self._serializer.deserialize(serialized_data, cls)
-            if all(
-                getattr(data, key) == value for key, value in spec.conditions.items()
-            ):
+            if _match_conditions(data, spec.conditions):
                 count += 1
         return count
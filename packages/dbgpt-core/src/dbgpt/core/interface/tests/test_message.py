@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import List
 
 import pytest
 
@@ -9,6 +10,7 @@ from dbgpt.core.interface.message import (
     HumanMessage,
     MessageIdentifier,
     MessageStorageItem,
+    MessageTokenLedger,
     ModelMessage,
     ModelMessageRoleType,
     OnceConversation,
@@ -476,3 +478,41 @@ def test_to_openai_messages_convert_to_compatible_format(
         {"role": "assistant", "content": ai_model_message.content},
         {"role": "user", "content": human_model_message.content},
     ]
+
+
+@pytest.mark.asyncio
+async def test_message_token_ledger():
+    prompts = []
+
+    async def count_tokens(model: str, texts: List[str]) -> List[int]:
+        prompts.extend((model, text) for text in texts)
+        return [len(text.split()) for text in texts]
+
+    ledger = MessageTokenLedger(count_tokens)
+    messages = [
+        ModelMessage(role=ModelMessageRoleType.SYSTEM, content="Be helpful"),
+        ModelMessage(role=ModelMessageRoleType.HUMAN, content="Hello there"),
+        ModelMessage(role=ModelMessageRoleType.AI, content="Hi"),
+    ]
+    assert await ledger.count_messages("m1", messages) == [3, 3, 2]
+    # Two newlines between the three messages passed to the model
+    assert await ledger.total_tokens("m1", messages) == 10
+    assert await ledger.fits_in_context("m1", messages, 10)
+    assert not await ledger.fits_in_context("m1", messages, 9)
+    assert len(prompts) == 3
+
+    # The counts are cached by model
+    await ledger.count_messages("m2", messages[:1])
+    assert prompts[-1] == ("m2", "system: Be helpful")
+    assert len(prompts) == 4
+
+
+@pytest.mark.asyncio
+async def test_message_token_ledger_view_message():
+    async def count_tokens(model: str, texts: List[str]) -> List[int]:
+        return [len(text.split()) for text in texts]
+
+    ledger = MessageTokenLedger(count_tokens)
+    messages = [HumanMessage(content="Hello"), ViewMessage(content="Not passed")]
+    assert await ledger.count_messages("m1", messages) == [2, 0]
+    assert await ledger.total_tokens("m1", messages) == 2
@@ -1,7 +1,10 @@
+import asyncio
 import base64
 import os
+import time
 from itertools import product
 
+import pytest
 from cryptography.fernet import Fernet
 
 from ..variables import (
@@ -325,3 +328,112 @@ def test_variable_string_round_trip():
         parsed_result = parse_variable(input_str, enable_escape=enable_escape)
         built_result = build_variable_string(parsed_result, enable_escape=enable_escape)
         assert built_result == input_str, f"Round trip test case {i} failed with escape"
+
+
+class _CountingStorage(InMemoryStorage):
+    def __init__(self):
+        super().__init__()
+        self.loads = 0
+        self.queries = 0
+
+    def load(self, resource_id, cls):
+        self.loads += 1
+        return super().load(resource_id, cls)
+
+    def query(self, spec, cls):
+        self.queries += 1
+        return super().query(spec, cls)
+
+
+def _save_secret(provider: StorageVariablesProvider, full_key: str, value: str):
+    id = VariablesIdentifier.from_str_identifier(full_key)
+    provider.save(
+        StorageVariables.from_identifier(id, value, "str", "", category="secret")
+    )
+
+
+def test_storage_variables_provider_cache():
+    storage = _CountingStorage()
+    provider = StorageVariablesProvider(storage, SimpleEncryption())
+    _save_secret(provider, "${key:name@global}", "secret_value")
+
+    assert provider.get("${key:name@global}") == "secret_value"
+    assert provider.get("${key:name@global}") == "secret_value"
+    assert storage.loads == 1
+    # Not found is cached too
+    assert provider.get("${key:missing@global}", None) is None
+    assert provider.get("${key:missing@global}", None) is None
+    assert storage.loads == 2
+
+    # Saving invalidates the cache
+    _save_secret(provider, "${key:name@global}", "new_value")
+    assert provider.get("${key:name@global}") == "new_value"
+    assert storage.loads == 3
+
+
+def test_storage_variables_provider_cache_ttl():
+    storage = _CountingStorage()
+    provider = StorageVariablesProvider(storage, SimpleEncryption(), cache_ttl=0.05)
+    _save_secret(provider, "${key:name@global}", "secret_value")
+
+    assert provider.get("${key:name@global}") == "secret_value"
+    time.sleep(0.1)
+    assert provider.get("${key:name@global}") == "secret_value"
+    assert storage.loads == 2
+
+
+def test_storage_variables_provider_no_cache():
+    storage = _CountingStorage()
+    provider = StorageVariablesProvider(storage, SimpleEncryption(), cache_ttl=None)
+    _save_secret(provider, "${key:name@global}", "secret_value")
+
+    assert provider.get("${key:name@global}") == "secret_value"
+    assert provider.get("${key:name@global}") == "secret_value"
+    assert storage.loads == 2
+
+
+@pytest.mark.asyncio
+async def test_storage_variables_provider_prefetch():
+    storage = _CountingStorage()
+    provider = StorageVariablesProvider(storage, SimpleEncryption())
+    for i in range(5):
+        _save_secret(provider, f"${{key:name_{i}@global}}", f"value_{i}")
+    _save_secret(provider, "${other_key:name@global}", "other_value")
+
+    full_keys = [f"${{key:name_{i}@global}}" for i in range(6)] + [
+        "${other_key:name@global}"
+    ]
+    await provider.async_prefetch(
+        [VariablesIdentifier.from_str_identifier(k) for k in full_keys]
+    )
+    # The variables of all the keys are loaded in one query
+    assert storage.queries == 1
+    assert storage.loads == 0
+
+    values = await asyncio.gather(
+        *(provider.async_get(k, default_value=None) for k in full_keys)
+    )
+    assert values == [f"value_{i}" for i in range(5)] + [None, "other_value"]
+    # The missing variable is cached too
+    assert storage.loads == 0
+
+
+def test_storage_variables_provider_prefetch_disabled():
+    full_keys = ["${key:enabled@global}", "${other_key:disabled@global}"]
+
+    def _make_provider():
+        provider = StorageVariablesProvider(_CountingStorage(), SimpleEncryption())
+        for full_key in full_keys:
+            id = VariablesIdentifier.from_str_identifier(full_key)
+            variable = StorageVariables.from_identifier(id, full_key, "str", "")
+            variable.enabled = 0 if "disabled" in full_key else 1
+            provider.save(variable)
+        return provider
+
+    loaded = _make_provider()
+    prefetched = _make_provider()
+    prefetched.prefetch([VariablesIdentifier.from_str_identifier(k) for k in full_keys])
+    # The disabled variables are not resolved, with or without prefetching
+    for provider in [loaded, prefetched]:
+        assert provider.get(full_keys[0], None) == full_keys[0]
+        assert provider.get(full_keys[1], None) is None
@@ -1,13 +1,18 @@
 """Variables Module."""
 
 import base64
+import copy
 import dataclasses
 import hashlib
 import json
 import os
+import threading
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 
+from cachetools import TTLCache
+
 from dbgpt.component import BaseComponent, ComponentType, SystemApp
 from dbgpt.util.executor_utils import (
     DefaultExecutorFactory,
@@ -24,6 +29,9 @@ from .storage import (
 )
 
 _EMPTY_DEFAULT_VALUE = "_EMPTY_DEFAULT_VALUE"
+# Cached for the variables not found in the storage
+_NOT_FOUND = object()
+_CACHE_MISS = object()
 
 BUILTIN_VARIABLES_CORE_FLOWS = "dbgpt.core.flow.flows"
 BUILTIN_VARIABLES_CORE_FLOW_NODES = "dbgpt.core.flow.nodes"
@@ -413,6 +421,12 @@ class VariablesProvider(BaseComponent, ABC):
         """Whether the variables provider support async."""
         return False
 
+    async def async_prefetch(self, identifiers: List["VariablesIdentifier"]) -> None:
+        """Load the variables to be resolved soon, in as few queries as possible.
+
+        It is just a hint, the providers without cache do nothing.
+        """
+
     def _convert_to_value_type(self, var: StorageVariables):
         """Convert the variable to the value type."""
         if var.value is None:
@@ -490,7 +504,12 @@ class VariablesPlaceHolder:
 
 
 class StorageVariablesProvider(VariablesProvider):
-    """The storage variables provider."""
+    """The storage variables provider.
+
+    The resolved values, the decrypted secrets included, are cached in memory for
+    `cache_ttl` seconds. Saving a variable invalidates the cache, the variables
+    changed by other processes are seen after the cache expires.
+    """
 
     def __init__(
         self,
@@ -498,20 +517,87 @@ class StorageVariablesProvider(VariablesProvider):
         encryption: Optional[Encryption] = None,
         system_app: Optional[SystemApp] = None,
         key: Optional[str] = None,
+        cache_ttl: Optional[float] = 60,
+        cache_size: int = 1024,
     ):
-        """Initialize the storage variables provider."""
+        """Initialize the storage variables provider.
+
+        Args:
+            storage (Optional[StorageInterface]): The storage of the variables.
+            encryption (Optional[Encryption]): The encryption of the secrets.
+            system_app (Optional[SystemApp]): The system app.
+            key (Optional[str]): The key of the default encryption.
+            cache_ttl (Optional[float]): The seconds to cache the resolved values,
+                no cache if not set or 0.
+            cache_size (int): The max number of the cached values.
+        """
         if storage is None:
             storage = InMemoryStorage()
         self.system_app = system_app
         self.encryption = encryption or SimpleEncryption(key)
 
         self.storage = storage
+        self._cache: Optional[TTLCache] = (
+            TTLCache(maxsize=cache_size, ttl=cache_ttl) if cache_ttl else None
+        )
+        self._cache_lock = threading.Lock()
+        # Increased on every save, the values loaded before are not cached
+        self._version = 0
         super().__init__(system_app)
 
     def init_app(self, system_app: SystemApp):
         """Initialize the storage variables provider."""
         self.system_app = system_app
 
+    def _get_cached(self, identifier: VariablesIdentifier) -> Any:
+        if self._cache is None:
+            return _CACHE_MISS
+        with self._cache_lock:
+            value = self._cache.get(identifier.str_identifier, _CACHE_MISS)
+        if isinstance(value, (dict, list)):
+            # Do not share the mutable values between the callers
+            return copy.deepcopy(value)
+        return value
+
+    def _set_cached(
+        self, identifier: VariablesIdentifier, value: Any, version: int
+    ) -> None:
+        if self._cache is None:
+            return
+        with self._cache_lock:
+            if version == self._version:
+                if isinstance(value, (dict, list)):
+                    value = copy.deepcopy(value)
+                self._cache[identifier.str_identifier] = value
+
+    def _resolve_value(self, variable: StorageVariables) -> Any:
+        variable.value = self.deserialize_value(variable.value)
+        if (
+            variable.value is not None
+            and variable.category == "secret"
+            and variable.encryption_method
+            and variable.salt
+        ):
+            variable.value = self.encryption.decrypt(variable.value, variable.salt)
+        return self._convert_to_value_type(variable)
+
+    def _load(self, identifier: VariablesIdentifier) -> Any:
+        """Load the value of a variable, `_NOT_FOUND` if not exists."""
+        value = self._get_cached(identifier)
+        if value is not _CACHE_MISS:
+            return value
+        version = self._version
+        variable: Optional[StorageVariables] = self.storage.load(
+            identifier, StorageVariables
+        )
+        if variable is None or variable.enabled != 1:
+            # The disabled variables are not resolved
+            value = _NOT_FOUND
+        else:
+            value = self._resolve_value(variable)
+        self._set_cached(identifier, value, version)
+        return value
+
     def get(
         self,
         full_key: str,
@@ -520,20 +606,68 @@ class StorageVariablesProvider(VariablesProvider):
     ) -> Any:
         """Query variables from storage."""
         key = VariablesIdentifier.from_str_identifier(full_key, default_identifier_map)
-        variable: Optional[StorageVariables] = self.storage.load(key, StorageVariables)
-        if variable is None:
+        value = self._load(key)
+        if value is _NOT_FOUND:
             if default_value == _EMPTY_DEFAULT_VALUE:
                 raise ValueError(f"Variable {full_key} not found")
             return default_value
-        variable.value = self.deserialize_value(variable.value)
-        if (
-            variable.value is not None
-            and variable.category == "secret"
-            and variable.encryption_method
-            and variable.salt
+        return value
+
+    def prefetch(self, identifiers: List[VariablesIdentifier]) -> None:
+        """Load the variables not cached yet into the cache.
+
+        The variables of the same scope are loaded in one query whatever their keys
+        are, only the enabled variables are resolved, like `_load`.
+        """
+        if self._cache is None:
+            return
+        groups: Dict[Tuple, List[VariablesIdentifier]] = defaultdict(list)
+        for identifier in identifiers:
+            if self._get_cached(identifier) is _CACHE_MISS:
+                group_key = (
+                    identifier.scope,
+                    identifier.scope_key,
+                    identifier.sys_code,
+                    identifier.user_name,
+                )
+                groups[group_key].append(identifier)
+        for (scope, scope_key, sys_code, user_name), group in groups.items():
+            version = self._version
+            if len(group) == 1:
+                self._load(group[0])
+                continue
+            variables = self.storage.query(
+                QuerySpec(
+                    conditions={
+                        "key": sorted({i.key for i in group}),
+                        "name": sorted({i.name for i in group}),
+                        "scope": scope,
+                        "scope_key": scope_key,
+                        "sys_code": sys_code,
+                        "user_name": user_name,
+                        "enabled": 1,
+                    }
+                ),
+                StorageVariables,
+            )
+            by_key_name: Dict[Tuple[str, str], StorageVariables] = {}
+            for variable in variables:
+                by_key_name.setdefault((variable.key, variable.name), variable)
+            for identifier in group:
+                variable = by_key_name.get((identifier.key, identifier.name))
+                value = (
+                    _NOT_FOUND if variable is None else self._resolve_value(variable)
+                )
+                self._set_cached(identifier, value, version)
+
+    async def async_prefetch(self, identifiers: List[VariablesIdentifier]) -> None:
+        """Load the variables not cached yet into the cache async."""
+        if self._cache is None or all(
+            self._get_cached(identifier) is not _CACHE_MISS
+            for identifier in identifiers
         ):
-            variable.value = self.encryption.decrypt(variable.value, variable.salt)
-        return self._convert_to_value_type(variable)
+            return
+        await blocking_func_to_async_no_executor(self.prefetch, identifiers)
 
     async def async_get(
         self,
@@ -542,16 +676,13 @@ class StorageVariablesProvider(VariablesProvider):
         default_identifier_map: Optional[Dict[str, str]] = None,
     ) -> Any:
         """Query variables from storage async."""
-        # Try to get variables from storage
-        value = await blocking_func_to_async_no_executor(
-            self.get,
-            full_key,
-            default_value=None,
-            default_identifier_map=default_identifier_map,
-        )
-        if value is not None:
-            return value
         key = VariablesIdentifier.from_str_identifier(full_key, default_identifier_map)
+        # Try to get variables from cache, then from storage
+        value = self._get_cached(key)
+        if value is _CACHE_MISS:
+            value = await blocking_func_to_async_no_executor(self._load, key)
+        if value is not None and value is not _NOT_FOUND:
+            return value
         # Get all builtin variables
         variables = await self.async_get_variables(
             key=key.key,
@@ -584,6 +715,14 @@ class StorageVariablesProvider(VariablesProvider):
         variables_item.value = self.serialize_value(variables_item.value)
 
         self.storage.save_or_update(variables_item)
+        self.clear_cache()
+
+    def clear_cache(self) -> None:
+        """Clear the cached values, the values loading now are not cached."""
+        with self._cache_lock:
+            self._version += 1
+            if self._cache is not None:
+                self._cache.clear()
 
     def get_variables(
         self,
@@ -8,7 +8,7 @@ import asyncio
 import json
 import logging
 import os
-from typing import Any, Dict, Generator, List, Optional
+from typing import Any, AsyncIterator, Dict, Generator, List, Optional, Tuple
 
 import shortuuid
 from fastapi import APIRouter, Depends, HTTPException
@@ -48,7 +48,16 @@ from dbgpt.core.schema.api import (
 from dbgpt.model.base import ModelInstance
 from dbgpt.model.cluster.manager_base import WorkerManager, WorkerManagerFactory
 from dbgpt.model.cluster.registry import ModelRegistry
-from dbgpt.model.parameter import ModelAPIServerParameters, WorkerType
+from dbgpt.model.parameter import (
+    ModelAPIServerParameters,
+    RemoteWorkerClientParameters,
+    WorkerType,
+)
+from dbgpt.model.utils.embedding_utils import (
+    ENCODING_FORMAT_BASE64,
+    ENCODING_FORMAT_FLOAT,
+    encode_embeddings,
+)
 from dbgpt.util.chat_util import transform_to_sse
 from dbgpt.util.fastapi import create_app
 from dbgpt.util.tracer import initialize_tracer, root_tracer, trace
@@ -303,13 +312,11 @@ class APIServer(BaseComponent):
         worker_manager = self.get_worker_manager()
         id = f"chatcmpl-{shortuuid.random()}"
         finish_stream_events = []
-        curr_usage = UsageInfo()
-        last_usage = UsageInfo()
+        # Only the new text of each output is needed
+        params = {**params, "incremental": True}
+        # The latest usage of each choice
+        usages = [UsageInfo() for _ in range(n)]
         for i in range(n):
-            last_usage.prompt_tokens += curr_usage.prompt_tokens
-            last_usage.completion_tokens += curr_usage.completion_tokens
-            last_usage.total_tokens += curr_usage.total_tokens
-
             # First chunk with role
             choice_data = ChatCompletionResponseStreamChoice(
                 index=i,
@@ -320,16 +327,12 @@ class APIServer(BaseComponent):
                 id=id,
                 choices=[choice_data],
                 model=model_name,
-                usage=last_usage,
+                usage=UsageInfo(),
             )
             yield transform_to_sse(chunk)
 
-            delta_text = ""
-            previous_text = ""
-            thinking_text = ""
-            previous_thinking_text = ""
-            full_text = ""
-
+        async def _choice_stream() -> AsyncIterator[ModelOutput]:
+            text_parts = []
             span = root_tracer.start_span(
                 "API.chat_completion_stream_generator",
                 metadata={
@@ -337,71 +340,56 @@ class APIServer(BaseComponent):
                     "params": json.dumps(params, ensure_ascii=False),
                 },
             )
-
-            async for model_output in worker_manager.generate_stream(params):
-                model_output: ModelOutput = model_output
-                if model_output.error_code != 0:
-                    yield transform_to_sse(model_output.to_dict())
-                    yield transform_to_sse("[DONE]")
-                    return
-                if model_output.has_text:
-                    full_text = model_output.text
-                    decoded_unicode = model_output.text.replace("\ufffd", "")
-                    delta_text = decoded_unicode[len(previous_text) :]
-                    previous_text = (
-                        decoded_unicode
-                        if len(decoded_unicode) > len(previous_text)
-                        else previous_text
-                    )
-                if model_output.has_thinking:
-                    decoded_unicode = model_output.thinking_text.replace("\ufffd", "")
-                    thinking_text = decoded_unicode[len(previous_thinking_text) :]
-                    previous_thinking_text = (
-                        decoded_unicode
-                        if len(decoded_unicode) > len(previous_thinking_text)
-                        else previous_thinking_text
-                    )
-
-                if not delta_text:
-                    delta_text = None
-                if not thinking_text:
-                    thinking_text = None
-
-                has_usage = False
-                if model_output.usage:
-                    curr_usage = UsageInfo.model_validate(model_output.usage)
-                    has_usage = True
-                    usage = UsageInfo(
-                        prompt_tokens=last_usage.prompt_tokens
-                        + curr_usage.prompt_tokens,
-                        total_tokens=last_usage.total_tokens + curr_usage.total_tokens,
-                        completion_tokens=last_usage.completion_tokens
-                        + curr_usage.completion_tokens,
-                    )
-                else:
-                    usage = UsageInfo()
-                choice_data = ChatCompletionResponseStreamChoice(
-                    index=i,
-                    delta=DeltaMessage(
-                        content=delta_text, reasoning_content=thinking_text
-                    ),
-                    finish_reason=model_output.finish_reason,
-                )
-                chunk = ChatCompletionStreamResponse(
-                    id=id, choices=[choice_data], model=model_name or "", usage=usage
+            try:
+                async for model_output in worker_manager.generate_stream({**params}):
+                    if model_output.has_text:
+                        text_parts.append(model_output.text)
+                    yield model_output
+            finally:
+                span.end(
+                    metadata={
+                        "full_text": "".join(text_parts),
+                    }
                 )
-                if delta_text is None and thinking_text is None:
-                    if model_output.finish_reason is not None:
-                        finish_stream_events.append(chunk)
-                    if not has_usage:
-                        continue
-
-                yield transform_to_sse(chunk)
-            span.end(
-                metadata={
-                    "full_text": full_text,
-                }
+
+        # The choices are generated concurrently, their chunks are interleaved
+        async for i, model_output in _merge_streams(
+            [_choice_stream() for _ in range(n)]
+        ):
+            model_output: ModelOutput = model_output
+            if model_output.error_code != 0:
+                yield transform_to_sse(model_output.to_dict())
+                yield transform_to_sse("[DONE]")
+                return
+            delta_text = model_output.text if model_output.has_text else None
+            thinking_text = model_output.thinking_text
+            if not delta_text:
+                delta_text = None
+            if not thinking_text:
+                thinking_text = None
+
+            has_usage = False
+            if model_output.usage:
+                usages[i] = UsageInfo.model_validate(model_output.usage)
+                has_usage = True
+                usage = _sum_usage(usages)
+            else:
+                usage = UsageInfo()
+            choice_data = ChatCompletionResponseStreamChoice(
+                index=i,
+                delta=DeltaMessage(content=delta_text, reasoning_content=thinking_text),
+                finish_reason=model_output.finish_reason,
+            )
+            chunk = ChatCompletionStreamResponse(
+                id=id, choices=[choice_data], model=model_name or "", usage=usage
             )
+            if delta_text is None and thinking_text is None:
+                if model_output.finish_reason is not None:
+                    finish_stream_events.append(chunk)
+                if not has_usage:
+                    continue
+
+            yield transform_to_sse(chunk)
 
         # There is not "content" field in the last delta message, so exclude_none to
         # exclude field "content".
@@ -459,65 +447,53 @@ class APIServer(BaseComponent):
         id = f"cmpl-{shortuuid.random()}"
         finish_stream_events = []
         params["span_id"] = root_tracer.get_current_span_id()
-        curr_usage = UsageInfo()
-        last_usage = UsageInfo()
-        for text in request.prompt:
-            for i in range(request.n):
-                params["prompt"] = text
-                previous_text = ""
-                last_usage.prompt_tokens += curr_usage.prompt_tokens
-                last_usage.completion_tokens += curr_usage.completion_tokens
-                last_usage.total_tokens += curr_usage.total_tokens
-
-                async for model_output in worker_manager.generate_stream(params):
-                    model_output: ModelOutput = model_output
-                    if model_output.error_code != 0:
-                        yield transform_to_sse(model_output.to_dict())
-                        yield transform_to_sse("[DONE]")
-                        return
-                    decoded_unicode = model_output.text.replace("\ufffd", "")
-                    delta_text = decoded_unicode[len(previous_text) :]
-                    previous_text = (
-                        decoded_unicode
-                        if len(decoded_unicode) > len(previous_text)
-                        else previous_text
-                    )
-
-                    if len(delta_text) == 0:
-                        delta_text = None
-
-                    choice_data = CompletionResponseStreamChoice(
-                        index=i,
-                        text=delta_text or "",
-                        # TODO: logprobs
-                        logprobs=None,
-                        finish_reason=model_output.finish_reason,
-                    )
-                    if model_output.usage:
-                        curr_usage = UsageInfo.model_validate(model_output.usage)
-                        usage = UsageInfo(
-                            prompt_tokens=last_usage.prompt_tokens
-                            + curr_usage.prompt_tokens,
-                            total_tokens=last_usage.total_tokens
-                            + curr_usage.total_tokens,
-                            completion_tokens=last_usage.completion_tokens
-                            + curr_usage.completion_tokens,
-                        )
-                    else:
-                        usage = UsageInfo()
-                    chunk = CompletionStreamResponse(
-                        id=id,
-                        object="text_completion",
-                        choices=[choice_data],
-                        model=request.model,
-                        usage=UsageInfo.model_validate(usage),
-                    )
-                    if delta_text is None:
-                        if model_output.finish_reason is not None:
-                            finish_stream_events.append(chunk)
-                        continue
-                    yield transform_to_sse(chunk)
-                last_usage = curr_usage
+        # Only the new text of each output is needed
+        params["incremental"] = True
+        choice_params = [
+            {**params, "prompt": text}
+            for text in request.prompt
+            for _ in range(request.n)
+        ]
+        # The latest usage of each choice
+        usages = [UsageInfo() for _ in choice_params]
+
+        # The choices are generated concurrently, their chunks are interleaved
+        async for i, model_output in _merge_streams(
+            [worker_manager.generate_stream(p) for p in choice_params]
+        ):
+            model_output: ModelOutput = model_output
+            if model_output.error_code != 0:
+                yield transform_to_sse(model_output.to_dict())
+                yield transform_to_sse("[DONE]")
+                return
+            delta_text = model_output.text if model_output.has_text else ""
+            if len(delta_text) == 0:
+                delta_text = None
+
+            choice_data = CompletionResponseStreamChoice(
+                index=i,
+                text=delta_text or "",
+                # TODO: logprobs
+                logprobs=None,
+                finish_reason=model_output.finish_reason,
+            )
+            if model_output.usage:
+                usages[i] = UsageInfo.model_validate(model_output.usage)
+                usage = _sum_usage(usages)
+            else:
+                usage = UsageInfo()
+            chunk = CompletionStreamResponse(
+                id=id,
+                object="text_completion",
+                choices=[choice_data],
+                model=request.model,
+                usage=usage,
+            )
+            if delta_text is None:
+                if model_output.finish_reason is not None:
+                    finish_stream_events.append(chunk)
+                continue
+            yield transform_to_sse(chunk)
         # There is not "content" field in the last delta message, so exclude_none to
         # exclude field "content".
         for finish_chunk in finish_stream_events:
@@ -613,6 +589,55 @@ class APIServer(BaseComponent):
         return scores[0]
 
 
+def _sum_usage(usages: List[UsageInfo]) -> UsageInfo:
+    """Sum the usage of the choices."""
+    usage = UsageInfo()
+    for choice_usage in usages:
+        for usage_key, usage_value in model_to_dict(choice_usage).items():
+            total = (getattr(usage, usage_key) or 0) + (usage_value or 0)
+            setattr(usage, usage_key, total)
+    return usage
+
+
+async def _merge_streams(
+    streams: List[AsyncIterator[Any]],
+) -> AsyncIterator[Tuple[int, Any]]:
+    """Iterate the streams concurrently.
+
+    Yields the index of the stream and the item, in the order the items come. If
+    a stream fails, the others are cancelled and the exception is raised.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=len(streams))
+    stream_end = object()
+
+    async def _drain(index: int, stream: AsyncIterator[Any]):
+        try:
+            async for item in stream:
+                await queue.put((index, item, None))
+            await queue.put((index, stream_end, None))
+        except Exception as e:
+            await queue.put((index, stream_end, e))
+
+    tasks = [
+        asyncio.create_task(_drain(index, stream))
+        for index, stream in enumerate(streams)
+    ]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            index, item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is stream_end:
+                remaining -= 1
+                continue
+            yield index, item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
 def get_api_server() -> APIServer:
     api_server = global_system_app.get_component(
         ComponentType.MODEL_API_SERVER, APIServer, default_component=None
@@ -644,6 +669,7 @@ async def create_chat_completion(
             ModelMessage.from_openai_messages(request.messages)
         ),
         "echo": False,
+        "context": {"priority": "interactive"},
     }
     if request.temperature:
         params["temperature"] = request.temperature
@@ -716,6 +742,7 @@ async def create_completion(
         "presence_penalty": request.presence_penalty,
         "frequency_penalty": request.frequency_penalty,
         "user": request.user,
+        "context": {"priority": "interactive"},
         # "use_beam_search": request.use_beam_search,
         # "beam_size": request.beam_size,
     }
@@ -737,6 +764,13 @@ async def create_completion(
 async def create_embeddings(
     request: EmbeddingsRequest, api_server: APIServer = Depends(get_api_server)
 ):
+    encoding_format = request.encoding_format or ENCODING_FORMAT_FLOAT
+    if encoding_format not in (ENCODING_FORMAT_FLOAT, ENCODING_FORMAT_BASE64):
+        return create_error_response(
+            ErrorCode.PARAM_OUT_OF_RANGE,
+            f"{encoding_format} is not a valid value for 'encoding_format', must be "
+            f"'{ENCODING_FORMAT_FLOAT}' or '{ENCODING_FORMAT_BASE64}'",
+        )
     await api_server.get_model_instances_or_raise(request.model, worker_type="text2vec")
     texts = request.input
     if isinstance(texts, str):
@@ -764,7 +798,7 @@ async def create_embeddings(
                 "embedding": emb,
                 "index": num_batch * batch_size + i,
             }
-            for i, emb in enumerate(embeddings)
+            for i, emb in enumerate(encode_embeddings(embeddings, encoding_format))
         ]
     return model_to_dict(
         EmbeddingsResponse(data=data, model=request.model, usage=UsageInfo()),
@@ -802,7 +836,11 @@ async def create_relevance(
     )
 
 
-def _initialize_all(controller_addr: str, system_app: SystemApp):
+def _initialize_all(
+    controller_addr: str,
+    system_app: SystemApp,
+    client_params: Optional[RemoteWorkerClientParameters] = None,
+):
     from dbgpt.model.cluster.controller.controller import ModelRegistryClient
     from dbgpt.model.cluster.worker.manager import _DefaultWorkerManagerFactory
     from dbgpt.model.cluster.worker.remote_manager import RemoteWorkerManager
@@ -818,7 +856,7 @@ def _initialize_all(controller_addr: str, system_app: SystemApp):
     registry = system_app.get_component(
         ComponentType.MODEL_REGISTRY, ModelRegistry, default_component=None
     )
-    worker_manager = RemoteWorkerManager(registry)
+    worker_manager = RemoteWorkerManager(registry, client_params=client_params)
 
     # Register worker manager component if not exist
     system_app.get_component(
@@ -891,7 +929,11 @@ def initialize_apiserver(
         logger.warning(message)
         return create_error_response(ErrorCode.VALIDATION_TYPE_ERROR, message)
 
-    _initialize_all(apiserver_params.controller_addr, system_app)
+    _initialize_all(
+        apiserver_params.controller_addr,
+        system_app,
+        client_params=apiserver_params.remote_client,
+    )
 
     if not embedded_mod:
         import uvicorn
@@ -1,13 +1,16 @@
+import json
+
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 
-from dbgpt.component import SystemApp
+from dbgpt.component import ComponentType, SystemApp
 from dbgpt.model.cluster.apiserver.api import (
     ModelList,
     api_settings,
     initialize_apiserver,
 )
+from dbgpt.model.cluster.manager_base import WorkerManagerFactory
 from dbgpt.model.cluster.tests.conftest import _new_cluster
 from dbgpt.model.cluster.worker.manager import _DefaultWorkerManagerFactory
 from dbgpt.model.parameter import ModelAPIServerParameters
@@ -96,3 +99,56 @@ async def test_chat_completions(client: AsyncClient, expected_messages):
         await chat_completion("/api/v1/chat/completions", chat_data, client)
         == expected_messages
     )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "client",
+    [{"stream_messags": ["Hello", " world."]}],
+    indirect=["client"],
+)
+async def test_chat_completions_stream_n(client: AsyncClient):
+    chat_data = {
+        "model": "test-model-name-0",
+        "messages": [{"role": "user", "content": "Hello"}],
+        "stream": True,
+        "n": 3,
+    }
+    texts = {}
+    async with client.stream(
+        "POST", "/api/v1/chat/completions", json=chat_data
+    ) as response:
+        async for line in response.aiter_lines():
+            if not line.startswith("data: ") or line == "data: [DONE]":
+                continue
+            chunk = json.loads(line[len("data: ") :])
+            for choice in chunk["choices"]:
+                content = choice["delta"].get("content") or ""
+                texts[choice["index"]] = texts.get(choice["index"], "") + content
+    assert sorted(texts) == [0, 1, 2]
+    assert len(set(texts.values())) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "client",
+    [{"stream_messags": ["Hello", " world."], "num_workers": 1}],
+    indirect=["client"],
+)
+async def test_chat_completions_interactive(client: AsyncClient, system_app):
+    chat_data = {
+        "model": "test-model-name-0",
+        "messages": [{"role": "user", "content": "Hello"}],
+        "stream": True,
+    }
+    async for _ in chat_completion_stream(
+        "/api/v1/chat/completions", chat_data, client
+    ):
+        pass
+    worker_manager = system_app.get_component(
+        ComponentType.WORKER_MANAGER_FACTORY, WorkerManagerFactory
+    ).create()
+    # The chat requests are admitted as the interactive requests
+    for metrics in worker_manager.admission_metrics().values():
+        assert metrics["classes"]["interactive"]["admitted"] == 1
+        assert metrics["classes"]["default"]["admitted"] == 0
@@ -34,6 +34,8 @@ class PromptRequest(BaseModel):
     frequency_penalty: Optional[float] = None
     chat_model: Optional[bool] = True
     """Whether to use chat model"""
+    incremental: bool = False
+    """Whether to stream incremental outputs, each one only carries the new text"""
 
 
 class EmbeddingsRequest(BaseModel):
@@ -43,6 +45,8 @@ class EmbeddingsRequest(BaseModel):
     span_id: Optional[str] = None
     query: Optional[str] = None
     """For rerank model, query is required"""
+    encoding_format: Optional[str] = None
+    """The encoding format of the response embeddings, "float" or "base64"."""
 
 
 class CountTokenRequest(BaseModel):
@@ -50,6 +54,11 @@ class CountTokenRequest(BaseModel):
     prompt: str
 
 
+class CountTokensRequest(BaseModel):
+    model: str
+    prompts: List[str]
+
+
 class ModelMetadataRequest(BaseModel):
     model: str
 
@@ -14,6 +14,7 @@ from dbgpt.core.interface.llm import (
 from dbgpt.model.cluster.manager_base import WorkerManager
 from dbgpt.model.parameter import WorkerType
 from dbgpt.util.i18n_utils import _
+from dbgpt.util.stream_utils import aclosing_stream
 
 
 @register_resource(
@@ -87,8 +88,10 @@ class DefaultLLMClient(LLMClient):
         if not message_converter and self._auto_covert_message:
             message_converter = DefaultMessageConverter()
         request = await self.covert_message(request, message_converter)
-        async for output in self.worker_manager.generate_stream(request.to_dict()):
-            yield output
+        stream = self.worker_manager.generate_stream(request.to_dict())
+        async with aclosing_stream(stream):
+            async for output in stream:
+                yield output
 
     async def models(self) -> List[ModelMetadata]:
         instances = await self.worker_manager.get_all_model_instances(
@@ -109,6 +112,11 @@ class DefaultLLMClient(LLMClient):
     async def count_token(self, model: str, prompt: str) -> int:
         return await self.worker_manager.count_token({"model": model, "prompt": prompt})
 
+    async def count_tokens(self, model: str, prompts: List[str]) -> List[int]:
+        return await self.worker_manager.count_tokens(
+            {"model": model, "prompts": prompts}
+        )
+
 
 @register_resource(
     label=_("Remote LLM Client"),
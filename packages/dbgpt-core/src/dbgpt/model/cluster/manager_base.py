@@ -10,6 +10,7 @@ from dbgpt.core import ModelMetadata, ModelOutput
 from dbgpt.core.interface.parameter import BaseDeployModelParameters
 from dbgpt.model.base import WorkerApplyOutput, WorkerSupportedModel
 from dbgpt.model.cluster.base import WorkerApplyRequest, WorkerStartupRequest
+from dbgpt.model.cluster.worker.admission import AdmissionScheduler
 from dbgpt.model.cluster.worker_base import ModelWorker
 from dbgpt.model.parameter import ModelWorkerParameters
 from dbgpt.util.parameter_utils import ParameterDescription
@@ -25,7 +26,7 @@ class WorkerRunData:
     worker_params: ModelWorkerParameters
     model_params: BaseDeployModelParameters
     stop_event: asyncio.Event
-    semaphore: asyncio.Semaphore = None
+    scheduler: AdmissionScheduler = None
     command_args: List[str] = None
     _heartbeat_future: Optional[Future] = None
     _last_heartbeat: Optional[datetime] = None
@@ -117,7 +118,12 @@ class WorkerManager(ABC):
     async def generate_stream(
         self, params: Dict, **kwargs
     ) -> AsyncIterator[ModelOutput]:
-        """Generate stream result, chat scene"""
+        """Generate stream result, chat scene
+
+        The outputs are cumulative, each one carries the full text generated so
+        far, unless `params["incremental"]` is true, then each output only
+        carries the new text, with its sequence number in `seq`.
+        """
 
     @abstractmethod
     async def generate(self, params: Dict) -> ModelOutput:
@@ -147,6 +153,23 @@ class WorkerManager(ABC):
             int: token count
         """
 
+    async def count_tokens(self, params: Dict) -> List[int]:
+        """Count token of each prompt
+
+        Args:
+            params (Dict): parameters, eg.
+                {"prompts": ["hello", "hi"], "model": "vicuna-13b-v1.5"}
+
+        Returns:
+            List[int]: token count of each prompt
+        """
+        prompts = params.get("prompts", [])
+        return list(
+            await asyncio.gather(
+                *(self.count_token({**params, "prompt": p}) for p in prompts)
+            )
+        )
+
     @abstractmethod
     async def get_model_metadata(self, params: Dict) -> ModelMetadata:
         """Get model metadata
@@ -0,0 +1,260 @@
+"""Priority and fair-share admission control in front of a model worker.
+
+The requests are admitted in the order of their priority classes, the interactive
+requests first. Within a class, the tenants (users or systems) take turns, so a
+tenant sending many requests does not starve the others. The batch requests can
+use all the free slots of an idle worker, but only a part of the slots while the
+requests of higher priorities are running or waiting, the rest are kept for them.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from dbgpt.util.histogram import RollingHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class RequestPriority(str, Enum):
+    """The priority class of a model request, from the highest to the lowest."""
+
+    # The requests a user is waiting for, e.g. chat
+    INTERACTIVE = "interactive"
+    DEFAULT = "default"
+    # The background jobs, e.g. knowledge graph extraction, summarization
+    BATCH = "batch"
+
+    @classmethod
+    def parse(cls, value: Optional[str]) -> "RequestPriority":
+        """Parse the priority, the unknown values are the default priority."""
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls(value)
+        except ValueError:
+            return cls.DEFAULT
+
+
+_PRIORITIES = list(RequestPriority)
+
+
+class AdmissionRejectedError(Exception):
+    """The request is rejected because the queue of the worker is full."""
+
+
+class _Waiter:
+    def __init__(self, priority: RequestPriority, tenant: str):
+        self.priority = priority
+        self.tenant = tenant
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.enqueued_at = time.monotonic()
+
+
+class _ClassStats:
+    def __init__(self):
+        self.running = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.queue_wait = RollingHistogram()
+
+
+class AdmissionScheduler:
+    """Admit the requests of a model worker by priority and fair share.
+
+    At most `concurrency` requests run at the same time, the others wait in the
+    queue. When the queue is full, a new request is rejected at once, unless a
+    request of a lower priority can be evicted from the queue.
+
+    Examples:
+        .. code-block:: python
+
+            scheduler = AdmissionScheduler(concurrency=5)
+            async with scheduler.admit("interactive", tenant="alice"):
+                output = await worker.async_generate(params)
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 5,
+        max_queue_size: int = 1024,
+        batch_concurrency_ratio: float = 0.5,
+    ):
+        """Create an admission scheduler.
+
+        Args:
+            concurrency (int): The max number of the running requests.
+            max_queue_size (int): The max number of the waiting requests, 0 means
+                the requests are rejected when all the slots are busy.
+            batch_concurrency_ratio (float): The ratio of the slots the batch
+                requests can use while the requests of higher priorities are running
+                or waiting, at least one slot.
+        """
+        self._concurrency = max(1, concurrency)
+        self._max_queue_size = max(0, max_queue_size)
+        self._batch_concurrency = max(
+            1, min(self._concurrency, int(self._concurrency * batch_concurrency_ratio))
+        )
+        self._running = 0
+        self._queued = 0
+        # The waiters of each class, grouped by tenant in the round-robin order
+        self._queues: Dict[RequestPriority, "OrderedDict[str, Deque[_Waiter]]"] = {
+            p: OrderedDict() for p in _PRIORITIES
+        }
+        self._stats = {p: _ClassStats() for p in _PRIORITIES}
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        priority: Optional[str] = None,
+        tenant: Optional[str] = None,
+    ) -> AsyncIterator[None]:
+        """Wait until the request is admitted, release its slot when leaving.
+
+        Args:
+            priority (Optional[str]): The priority class, the default priority if
+                not set.
+            tenant (Optional[str]): The tenant of the request, e.g. the user name.
+
+        Raises:
+            AdmissionRejectedError: If the queue is full.
+        """
+        priority = RequestPriority.parse(priority)
+        await self._acquire(priority, tenant or "")
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get the gauges, counters and queue wait times of each priority class."""
+        classes = {}
+        for p in _PRIORITIES:
+            stats = self._stats[p]
+            classes[p.value] = {
+                "queued": sum(len(q) for q in self._queues[p].values()),
+                "running": stats.running,
+                "admitted": stats.admitted,
+                "rejected": stats.rejected,
+                "queue_wait": stats.queue_wait.snapshot(),
+            }
+        return {
+            "concurrency": self._concurrency,
+            "running": self._running,
+            "queued": self._queued,
+            "classes": classes,
+        }
+
+    def _can_run(self, priority: RequestPriority) -> bool:
+        if self._running >= self._concurrency:
+            return False
+        if priority == RequestPriority.BATCH and self._contended():
+            return self._stats[priority].running < self._batch_concurrency
+        return True
+
+    def _contended(self) -> bool:
+        """Whether any request above the batch priority is running or waiting."""
+        batch_running = self._stats[RequestPriority.BATCH].running
+        return self._running > batch_running or self._has_waiters(
+            RequestPriority.DEFAULT
+        )
+
+    def _has_waiters(self, priority: RequestPriority) -> bool:
+        """Whether any request of the priority or a higher one is waiting."""
+        for p in _PRIORITIES:
+            if self._queues[p]:
+                return True
+            if p == priority:
+                return False
+        return False
+
+    def _start(self, priority: RequestPriority, wait: float) -> None:
+        self._running += 1
+        stats = self._stats[priority]
+        stats.running += 1
+        stats.admitted += 1
+        stats.queue_wait.record(wait)
+
+    async def _acquire(self, priority: RequestPriority, tenant: str) -> None:
+        if not self._has_waiters(priority) and self._can_run(priority):
+            self._start(priority, 0.0)
+            return
+        if self._queued >= self._max_queue_size and not self._evict(priority):
+            self._stats[priority].rejected += 1
+            raise AdmissionRejectedError(
+                f"Too many requests, the queue of the model is full "
+                f"({self._max_queue_size} waiting)"
+            )
+        waiter = _Waiter(priority, tenant)
+        self._queues[priority].setdefault(tenant, deque()).append(waiter)
+        self._queued += 1
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted before the cancellation, give back the slot
+                if waiter.future.exception() is None:
+                    self._release(priority)
+            else:
+                self._remove(waiter)
+            raise
+
+    def _remove(self, waiter: _Waiter) -> None:
+        tenants = self._queues[waiter.priority]
+        waiters = tenants.get(waiter.tenant)
+        if waiters is None or waiter not in waiters:
+            return
+        waiters.remove(waiter)
+        if not waiters:
+            del tenants[waiter.tenant]
+        self._queued -= 1
+
+    def _evict(self, priority: RequestPriority) -> bool:
+        """Reject the newest waiter of the lowest class below the priority."""
+        for p in reversed(_PRIORITIES):
+            if p == priority:
+                return False
+            tenants = self._queues[p]
+            if not tenants:
+                continue
+            # The tenant with the most waiters gives up its newest one
+            tenant = max(tenants, key=lambda t: len(tenants[t]))
+            waiter = tenants[tenant][-1]
+            self._remove(waiter)
+            self._stats[p].rejected += 1
+            waiter.future.set_exception(
+                AdmissionRejectedError(
+                    "Too many requests, evicted by a request of higher priority"
+                )
+            )
+            return True
+        return False
+
+    def _release(self, priority: RequestPriority) -> None:
+        self._running -= 1
+        self._stats[priority].running -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit the waiters while there are free slots."""
+        now = time.monotonic()
+        for p in _PRIORITIES:
+            tenants = self._queues[p]
+            while tenants and self._can_run(p):
+                # Take the first waiter of the next tenant, then move the tenant
+                # to the end
+                tenant, waiters = next(iter(tenants.items()))
+                waiter = waiters.popleft()
+                if waiters:
+                    tenants.move_to_end(tenant)
+                else:
+                    del tenants[tenant]
+                self._queued -= 1
+                self._start(p, now - waiter.enqueued_at)
+                waiter.future.set_result(None)
+            if self._running >= self._concurrency:
+                return
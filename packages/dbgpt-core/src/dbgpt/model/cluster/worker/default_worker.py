@@ -23,6 +23,7 @@ from dbgpt.model.proxy.base import TiktokenProxyTokenizer
 from dbgpt.util.executor_utils import blocking_func_to_async_no_executor
 from dbgpt.util.model_utils import _clear_model_cache, _get_current_cuda_memory
 from dbgpt.util.parameter_utils import _get_dict_from_obj
+from dbgpt.util.stream_utils import aclosing_stream, closing_stream
 from dbgpt.util.system_utils import get_system_info
 from dbgpt.util.tracer import SpanType, SpanTypeRunName, root_tracer
 
@@ -175,26 +176,29 @@ class DefaultModelWorker(ModelWorker):
             is_first_generate = True
 
             context_len = params.get("context_len") or self.context_len
-            for output in generate_stream_func(
+            stream = generate_stream_func(
                 self.model, self.tokenizer, params, get_device(), context_len
-            ):
-                (
-                    model_output,
-                    incremental_output,
-                    output_str,
-                    current_metrics,
-                ) = self._handle_output(
-                    output,
-                    previous_response,
-                    model_context,
-                    last_metrics,
-                    is_first_generate,
-                )
-                if is_first_generate:
-                    is_first_generate = False
-                previous_response = output_str
-                last_metrics = current_metrics
-                yield model_output
+            )
+            # Stop the generation when the consumer stops reading
+            with closing_stream(stream):
+                for output in stream:
+                    (
+                        model_output,
+                        incremental_output,
+                        output_str,
+                        current_metrics,
+                    ) = self._handle_output(
+                        output,
+                        previous_response,
+                        model_context,
+                        last_metrics,
+                        is_first_generate,
+                    )
+                    if is_first_generate:
+                        is_first_generate = False
+                    previous_response = output_str
+                    last_metrics = current_metrics
+                    yield model_output
             logger.info(
                 f"\n\nfull stream output:\n{previous_response}\n\nmodel "
                 f"generate_stream params:\n{params}\n"
@@ -265,6 +269,16 @@ class DefaultModelWorker(ModelWorker):
         )
         return cnt
 
+    async def async_count_tokens(self, prompts: List[str]) -> List[int]:
+        from dbgpt.model.proxy.llms.proxy_model import ProxyModel
+
+        if isinstance(self.model, ProxyModel) and self.model.proxy_llm_client:
+            return await self.model.proxy_llm_client.count_tokens(
+                self.model.proxy_llm_client.default_model, prompts
+            )
+
+        return await blocking_func_to_async_no_executor(self.count_tokens, prompts)
+
     def get_model_metadata(self, params: Dict) -> ModelMetadata:
         ext_metadata = ModelExtraMedata(
             prompt_roles=self.llm_adapter.get_prompt_roles(),
@@ -302,27 +316,30 @@ class DefaultModelWorker(ModelWorker):
 
             last_metrics = ModelInferenceMetrics.create_metrics()
             is_first_generate = True
-            async for output in generate_stream_func(
+            stream = generate_stream_func(
                 self.model, self.tokenizer, params, get_device(), context_len
-            ):
-                (
-                    model_output,
-                    incremental_output,
-                    output_str,
-                    current_metrics,
-                ) = self._handle_output(
-                    output,
-                    previous_response,
-                    model_context,
-                    last_metrics,
-                    is_first_generate,
-                )
-                if is_first_generate:
-                    is_first_generate = False
-
-                previous_response = output_str
-                last_metrics = current_metrics
-                yield model_output
+            )
+            # Stop the generation when the consumer stops reading
+            async with aclosing_stream(stream):
+                async for output in stream:
+                    (
+                        model_output,
+                        incremental_output,
+                        output_str,
+                        current_metrics,
+                    ) = self._handle_output(
+                        output,
+                        previous_response,
+                        model_context,
+                        last_metrics,
+                        is_first_generate,
+                    )
+                    if is_first_generate:
+                        is_first_generate = False
+
+                    previous_response = output_str
+                    last_metrics = current_metrics
+                    yield model_output
             logger.info(
                 f"\n\nfull stream output:\n{previous_response}\n\nmodel "
                 f"generate_stream params:\n{params}\n"
@@ -0,0 +1,140 @@
+"""Shared keep-alive HTTP clients for calling the remote model workers."""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Optional, Tuple
+
+from dbgpt.model.parameter import RemoteWorkerClientParameters
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _ClientStats:
+    requests: int = 0
+    errors: int = 0
+    in_flight: int = 0
+
+
+class WorkerClientPool:
+    """One lifecycle-managed `httpx.AsyncClient` per remote worker address.
+
+    Each client keeps its connections alive, so the requests to the same worker
+    reuse them instead of paying the TCP (and TLS) setup every time. The clients
+    are bound to the event loop they are created in.
+    """
+
+    def __init__(self, params: Optional[RemoteWorkerClientParameters] = None):
+        """Create a worker client pool.
+
+        Args:
+            params(Optional[RemoteWorkerClientParameters]): The client
+                configuration, the default configuration if not set.
+        """
+        self._params = params or RemoteWorkerClientParameters()
+        self._clients: Dict[Tuple[str, int], "httpx.AsyncClient"] = {}
+        self._stats: Dict[str, _ClientStats] = {}
+
+    @property
+    def params(self) -> RemoteWorkerClientParameters:
+        """Get the client configuration."""
+        return self._params
+
+    def get_client(self, base_url: str) -> "httpx.AsyncClient":
+        """Get the client of a worker address, create it if not exists."""
+        key = (base_url, id(asyncio.get_running_loop()))
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = self._create_client()
+            self._clients[key] = client
+        return client
+
+    @asynccontextmanager
+    async def request(self, base_url: str) -> AsyncIterator["httpx.AsyncClient"]:
+        """Get the client of a worker address and count the request in metrics."""
+        stats = self._stats.setdefault(base_url, _ClientStats())
+        stats.requests += 1
+        stats.in_flight += 1
+        try:
+            yield self.get_client(base_url)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+
+    def metrics(self) -> Dict[str, Dict[str, int]]:
+        """Get the metrics of the clients, by worker address."""
+        metrics: Dict[str, Dict[str, int]] = {}
+        for base_url, stats in self._stats.items():
+            metrics[base_url] = {
+                "requests": stats.requests,
+                "errors": stats.errors,
+                "in_flight": stats.in_flight,
+                "connections": 0,
+                "idle_connections": 0,
+            }
+        for (base_url, _), client in self._clients.items():
+            if base_url not in metrics or client.is_closed:
+                continue
+            # The connections are not part of the public API of httpx
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            for conn in getattr(pool, "connections", []):
+                metrics[base_url]["connections"] += 1
+                if conn.is_idle():
+                    metrics[base_url]["idle_connections"] += 1
+        return metrics
+
+    async def aclose(self):
+        """Close all the clients of the current event loop.
+
+        The clients of the other event loops can not be closed here, they are
+        just dropped.
+        """
+        loop_id = id(asyncio.get_running_loop())
+        clients, self._clients = self._clients, {}
+        for (base_url, client_loop_id), client in clients.items():
+            if client_loop_id != loop_id or client.is_closed:
+                continue
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Close http client of {base_url} failed: {e}")
+
+    def _create_client(self) -> "httpx.AsyncClient":
+        import httpx
+
+        params = self._params
+        if params.http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                raise ImportError(
+                    "HTTP/2 of the remote worker client requires h2, please install "
+                    "it with `pip install httpx[http2]`"
+                )
+        return httpx.AsyncClient(
+            http2=bool(params.http2),
+            limits=httpx.Limits(
+                max_connections=params.max_connections,
+                max_keepalive_connections=params.max_keepalive_connections,
+                keepalive_expiry=params.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(params.timeout, connect=params.connect_timeout),
+        )
+
+
+_DEFAULT_POOL: Optional[WorkerClientPool] = None
+
+
+def get_default_client_pool() -> WorkerClientPool:
+    """Get the client pool shared by the remote workers without their own pool."""
+    global _DEFAULT_POOL
+    if _DEFAULT_POOL is None:
+        _DEFAULT_POOL = WorkerClientPool()
+    return _DEFAULT_POOL
@@ -12,7 +12,6 @@ from dataclasses import asdict
 from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
 
 from fastapi import APIRouter
-from fastapi.responses import StreamingResponse
 
 from dbgpt.component import SystemApp
 from dbgpt.configs.model_config import LOGDIR
@@ -28,6 +27,7 @@ from dbgpt.model.cluster.base import (
     WORKER_MANAGER_SERVICE_NAME,
     WORKER_MANAGER_SERVICE_TYPE,
     CountTokenRequest,
+    CountTokensRequest,
     EmbeddingsRequest,
     ModelMetadataRequest,
     PromptRequest,
@@ -42,18 +42,26 @@ from dbgpt.model.cluster.manager_base import (
 )
 from dbgpt.model.cluster.registry import ModelRegistry
 from dbgpt.model.cluster.storage import ModelStorage, ModelStorageItem
+from dbgpt.model.cluster.worker.admission import (
+    AdmissionRejectedError,
+    AdmissionScheduler,
+)
 from dbgpt.model.cluster.worker_base import ModelWorker
 from dbgpt.model.parameter import (
     ModelsDeployParameters,
     ModelWorkerParameters,
     WorkerType,
 )
+from dbgpt.model.utils.embedding_utils import encode_embeddings
 from dbgpt.model.utils.llm_utils import list_supported_models
+from dbgpt.model.utils.stream_utils import to_cumulative_stream, to_incremental_stream
 from dbgpt.util.fastapi import create_app, register_event_handler
 from dbgpt.util.parameter_utils import (
     ParameterDescription,
     _get_dict_from_obj,
 )
+from dbgpt.util.sse_utils import SSEStreamingResponse
+from dbgpt.util.stream_utils import aclosing_stream, iterate_in_threadpool
 from dbgpt.util.system_utils import get_system_info
 from dbgpt.util.tracer import SpanType, SpanTypeRunName, initialize_tracer, root_tracer
 from dbgpt.util.tracer.tracer_impl import TracerParameters
@@ -85,6 +93,15 @@ async def _async_heartbeat_sender(
             await asyncio.sleep(heartbeat_interval)
 
 
+def _admit(worker_run_data: WorkerRunData, params: Dict):
+    """Wait for a slot of the worker by the priority and tenant of the request."""
+    context = params.get("context")
+    if not isinstance(context, dict):
+        context = {}
+    tenant = context.get("user_name") or context.get("sys_code")
+    return worker_run_data.scheduler.admit(context.get("priority"), tenant)
+
+
 class LocalWorkerManager(WorkerManager):
     def __init__(
         self,
@@ -132,7 +149,7 @@ class LocalWorkerManager(WorkerManager):
             worker_params=None,
             model_params=None,
             stop_event=asyncio.Event(),
-            semaphore=None,
+            scheduler=None,
             command_args=None,
         )
 
@@ -239,6 +256,16 @@ class LocalWorkerManager(WorkerManager):
             else 5
         )
 
+        admission_params = getattr(worker_params, "admission", None)
+        if admission_params is not None:
+            scheduler = AdmissionScheduler(
+                concurrency,
+                max_queue_size=admission_params.max_queue_size,
+                batch_concurrency_ratio=admission_params.batch_concurrency_ratio,
+            )
+        else:
+            scheduler = AdmissionScheduler(concurrency)
+
         worker_run_data = WorkerRunData(
             host=self.host,
             port=self.port,
@@ -248,7 +275,7 @@ class LocalWorkerManager(WorkerManager):
             worker_params=worker_params,
             model_params=deploy_model_params,
             stop_event=asyncio.Event(),
-            semaphore=asyncio.Semaphore(concurrency),
+            scheduler=scheduler,
             command_args=command_args,
         )
         instances = self.workers.get(worker_key)
@@ -457,21 +484,31 @@ class LocalWorkerManager(WorkerManager):
                     error_code=1,
                 )
                 return
-            async with worker_run_data.semaphore:
-                if worker_run_data.worker.support_async():
-                    async for outout in worker_run_data.worker.async_generate_stream(
-                        params
-                    ):
-                        yield outout
-                else:
-                    if not async_wrapper:
-                        from starlette.concurrency import iterate_in_threadpool
-
-                        async_wrapper = iterate_in_threadpool
-                    async for output in async_wrapper(
-                        worker_run_data.worker.generate_stream(params)
-                    ):
-                        yield output
+            try:
+                async with _admit(worker_run_data, params):
+                    if worker_run_data.worker.support_async():
+                        stream = worker_run_data.worker.async_generate_stream(params)
+                    else:
+                        # Closes the worker's generator when the consumer stops early
+                        stream = (async_wrapper or iterate_in_threadpool)(
+                            worker_run_data.worker.generate_stream(params)
+                        )
+                    # Incremental outputs are opt-in, the legacy consumers get the
+                    # cumulative outputs
+                    if params.get("incremental"):
+                        stream = to_incremental_stream(stream)
+                    else:
+                        stream = to_cumulative_stream(stream)
+                    # The generation is stopped and the slot is released as soon
+                    # as the consumer stops reading, e.g. the client disconnected
+                    async with aclosing_stream(stream):
+                        async for output in stream:
+                            yield output
+            except AdmissionRejectedError as e:
+                yield ModelOutput(
+                    text=f"**LLMServer Generate Error, Please CheckErrorInfo.**: {e}",
+                    error_code=1,
+                )
 
     async def generate(self, params: Dict) -> ModelOutput:
         """Generate non stream result"""
@@ -486,13 +523,19 @@ class LocalWorkerManager(WorkerManager):
                     text=f"**LLMServer Generate Error, Please CheckErrorInfo.**: {e}",
                     error_code=1,
                 )
-            async with worker_run_data.semaphore:
-                if worker_run_data.worker.support_async():
-                    return await worker_run_data.worker.async_generate(params)
-                else:
-                    return await self.run_blocking_func(
-                        worker_run_data.worker.generate, params
-                    )
+            try:
+                async with _admit(worker_run_data, params):
+                    if worker_run_data.worker.support_async():
+                        return await worker_run_data.worker.async_generate(params)
+                    else:
+                        return await self.run_blocking_func(
+                            worker_run_data.worker.generate, params
+                        )
+            except AdmissionRejectedError as e:
+                return ModelOutput(
+                    text=f"**LLMServer Generate Error, Please CheckErrorInfo.**: {e}",
+                    error_code=1,
+                )
 
     async def embeddings(self, params: Dict) -> List[List[float]]:
         """Embed input"""
@@ -505,7 +548,7 @@ class LocalWorkerManager(WorkerManager):
                 worker_run_data = await self._get_model(params, worker_type=worker_type)
             except Exception as e:
                 raise e
-            async with worker_run_data.semaphore:
+            async with _admit(worker_run_data, params):
                 if worker_run_data.worker.support_async():
                     return await worker_run_data.worker.async_embeddings(params)
                 else:
@@ -529,7 +572,7 @@ class LocalWorkerManager(WorkerManager):
             except Exception as e:
                 raise e
             prompt = params.get("prompt")
-            async with worker_run_data.semaphore:
+            async with _admit(worker_run_data, params):
                 if worker_run_data.worker.support_async():
                     return await worker_run_data.worker.async_count_token(prompt)
                 else:
@@ -537,6 +580,22 @@ class LocalWorkerManager(WorkerManager):
                         worker_run_data.worker.count_token, prompt
                     )
 
+    async def count_tokens(self, params: Dict) -> List[int]:
+        """Count token of each prompt with one request to the worker"""
+        with root_tracer.start_span(
+            "WorkerManager.count_tokens", params.get("span_id")
+        ) as span:
+            params["span_id"] = span.span_id
+            worker_run_data = await self._get_model(params)
+            prompts = params.get("prompts", [])
+            async with _admit(worker_run_data, params):
+                if worker_run_data.worker.support_async():
+                    return await worker_run_data.worker.async_count_tokens(prompts)
+                else:
+                    return await self.run_blocking_func(
+                        worker_run_data.worker.count_tokens, prompts
+                    )
+
     async def get_model_metadata(self, params: Dict) -> ModelMetadata:
         """Get model metadata"""
         with root_tracer.start_span(
@@ -547,7 +606,7 @@ class LocalWorkerManager(WorkerManager):
                 worker_run_data = await self._get_model(params)
             except Exception as e:
                 raise e
-            async with worker_run_data.semaphore:
+            async with _admit(worker_run_data, params):
                 if worker_run_data.worker.support_async():
                     return await worker_run_data.worker.async_get_model_metadata(params)
                 else:
@@ -555,6 +614,22 @@ class LocalWorkerManager(WorkerManager):
                         worker_run_data.worker.get_model_metadata, params
                     )
 
+    def admission_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get the admission metrics of the workers, by worker key."""
+        metrics = {}
+        for worker_key, instances in self.workers.items():
+            for instance in instances:
+                if instance.scheduler is not None:
+                    metrics[worker_key] = instance.scheduler.metrics()
+        return metrics
+
+    def http_client_metrics(self) -> Dict[str, Dict[str, int]]:
+        """Get the metrics of the HTTP clients of the workers, by address.
+
+        The local workers are called in process, without HTTP clients.
+        """
+        return {}
+
     async def worker_apply(self, apply_req: WorkerApplyRequest) -> WorkerApplyOutput:
         if apply_req.apply_type == WorkerApplyType.START:
             apply_func: Callable[[WorkerApplyRequest], Awaitable[WorkerApplyOutput]] = (
@@ -825,8 +900,10 @@ class WorkerManagerAdapter(WorkerManager):
     async def generate_stream(
         self, params: Dict, **kwargs
     ) -> AsyncIterator[ModelOutput]:
-        async for output in self.worker_manager.generate_stream(params, **kwargs):
-            yield output
+        stream = self.worker_manager.generate_stream(params, **kwargs)
+        async with aclosing_stream(stream):
+            async for output in stream:
+                yield output
 
     async def generate(self, params: Dict) -> ModelOutput:
         return await self.worker_manager.generate(params)
@@ -840,9 +917,22 @@ class WorkerManagerAdapter(WorkerManager):
     async def count_token(self, params: Dict) -> int:
         return await self.worker_manager.count_token(params)
 
+    async def count_tokens(self, params: Dict) -> List[int]:
+        return await self.worker_manager.count_tokens(params)
+
     async def get_model_metadata(self, params: Dict) -> ModelMetadata:
         return await self.worker_manager.get_model_metadata(params)
 
+    def admission_metrics(self) -> Dict[str, Dict[str, Any]]:
+        if isinstance(self.worker_manager, LocalWorkerManager):
+            return self.worker_manager.admission_metrics()
+        return {}
+
+    def http_client_metrics(self) -> Dict[str, Dict[str, int]]:
+        if isinstance(self.worker_manager, LocalWorkerManager):
+            return self.worker_manager.http_client_metrics()
+        return {}
+
     async def worker_apply(self, apply_req: WorkerApplyRequest) -> WorkerApplyOutput:
         return await self.worker_manager.worker_apply(apply_req)
 
@@ -868,12 +958,10 @@ router = APIRouter()
 
 
 async def generate_json_stream(params):
-    from starlette.concurrency import iterate_in_threadpool
-
-    async for output in worker_manager.generate_stream(
-        params, async_wrapper=iterate_in_threadpool
-    ):
-        yield json.dumps(asdict(output), ensure_ascii=False).encode() + b"\0"
+    stream = worker_manager.generate_stream(params)
+    async with aclosing_stream(stream):
+        async for output in stream:
+            yield json.dumps(asdict(output), ensure_ascii=False).encode() + b"\0"
 
 
 @router.post("/worker/generate_stream")
@@ -883,7 +971,9 @@ async def api_generate_stream(request: PromptRequest):
     if "span_id" not in params and span_id:
         params["span_id"] = span_id
     generator = generate_json_stream(params)
-    return StreamingResponse(generator)
+    # The generation is stopped when the client, e.g. a RemoteModelWorker, closes
+    # the connection
+    return SSEStreamingResponse(generator, flush_interval=0)
 
 
 @router.post("/worker/generate")
@@ -898,10 +988,14 @@ async def api_generate(request: PromptRequest):
 @router.post("/worker/embeddings")
 async def api_embeddings(request: EmbeddingsRequest):
     params = request.dict(exclude_none=True)
+    encoding_format = params.pop("encoding_format", None)
     span_id = root_tracer.get_current_span_id()
     if "span_id" not in params and span_id:
         params["span_id"] = span_id
-    return await worker_manager.embeddings(params)
+    embeddings = await worker_manager.embeddings(params)
+    if encoding_format:
+        return encode_embeddings(embeddings, encoding_format)
+    return embeddings
 
 
 @router.post("/worker/count_token")
@@ -913,6 +1007,15 @@ async def api_count_token(request: CountTokenRequest):
     return await worker_manager.count_token(params)
 
 
+@router.post("/worker/count_tokens")
+async def api_count_tokens(request: CountTokensRequest):
+    params = request.dict(exclude_none=True)
+    span_id = root_tracer.get_current_span_id()
+    if "span_id" not in params and span_id:
+        params["span_id"] = span_id
+    return await worker_manager.count_tokens(params)
+
+
 @router.post("/worker/model_metadata")
 async def api_get_model_metadata(request: ModelMetadataRequest):
     params = request.dict(exclude_none=True)
@@ -922,6 +1025,18 @@ async def api_get_model_metadata(request: ModelMetadataRequest):
     return await worker_manager.get_model_metadata(params)
 
 
+@router.get("/worker/admission/metrics")
+async def api_admission_metrics():
+    """Get the queue and wait time metrics of the local model workers."""
+    return worker_manager.admission_metrics()
+
+
+@router.get("/worker/http_client/metrics")
+async def api_http_client_metrics():
+    """Get the request and connection metrics of the remote worker clients."""
+    return worker_manager.http_client_metrics()
+
+
 @router.post("/worker/apply")
 async def api_worker_apply(request: WorkerApplyRequest):
     return await worker_manager.worker_apply(request)
@@ -1275,7 +1390,9 @@ def initialize_worker_manager_in_client(
             raise ValueError("Controller can`t be None")
         logger.info(f"Worker params: {worker_params}")
         client = ModelRegistryClient(worker_params.controller_addr)
-        worker_manager.worker_manager = RemoteWorkerManager(client)
+        worker_manager.worker_manager = RemoteWorkerManager(
+            client, client_params=worker_params.remote_client
+        )
         worker_manager.after_start(start_listener)
         initialize_controller(
             app=app,
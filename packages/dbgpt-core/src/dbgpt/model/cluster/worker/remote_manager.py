@@ -1,5 +1,5 @@
 import asyncio
-from typing import Any, Callable, List
+from typing import Any, Callable, Dict, List, Optional
 
 from dbgpt.model.base import ModelInstance, WorkerApplyOutput, WorkerSupportedModel
 from dbgpt.model.cluster.base import (
@@ -9,14 +9,21 @@ from dbgpt.model.cluster.base import (
     WorkerStartupRequest,
 )
 from dbgpt.model.cluster.registry import ModelRegistry
+from dbgpt.model.cluster.worker.http_client import WorkerClientPool
 from dbgpt.model.cluster.worker.manager import LocalWorkerManager, WorkerRunData, logger
 from dbgpt.model.cluster.worker.remote_worker import RemoteModelWorker
-from dbgpt.model.parameter import WorkerType
+from dbgpt.model.parameter import RemoteWorkerClientParameters, WorkerType
 
 
 class RemoteWorkerManager(LocalWorkerManager):
-    def __init__(self, model_registry: ModelRegistry = None) -> None:
+    def __init__(
+        self,
+        model_registry: ModelRegistry = None,
+        client_params: Optional[RemoteWorkerClientParameters] = None,
+    ) -> None:
         super().__init__(model_registry=model_registry)
+        # Shared by all the remote workers, one keep-alive client per address
+        self._client_pool = WorkerClientPool(client_params)
 
     async def start(self):
         for listener in self.start_listeners:
@@ -26,7 +33,11 @@ class RemoteWorkerManager(LocalWorkerManager):
                 listener(self)
 
     async def stop(self, ignore_exception: bool = False):
-        pass
+        await self._client_pool.aclose()
+
+    def http_client_metrics(self) -> Dict[str, Dict[str, int]]:
+        """Get the metrics of the HTTP clients of the remote workers, by address."""
+        return self._client_pool.metrics()
 
     async def _fetch_from_worker(
         self,
@@ -39,21 +50,17 @@ class RemoteWorkerManager(LocalWorkerManager):
         success_handler: Callable = None,
         error_handler: Callable = None,
     ) -> Any:
-        # Lazy import to avoid high time cost
-        import httpx
-
-        url = worker_run_data.worker.worker_addr + endpoint
-        headers = {**worker_run_data.worker.headers, **(additional_headers or {})}
-        timeout = worker_run_data.worker.timeout
+        worker: RemoteModelWorker = worker_run_data.worker
+        url = worker.worker_addr + endpoint
+        headers = {**worker.headers, **(additional_headers or {})}
 
-        async with httpx.AsyncClient() as client:
+        async with self._client_pool.request(worker.base_url) as client:
             request = client.build_request(
                 method,
                 url,
                 json=json,  # using json for data to ensure it sends as application/json
                 params=params,
                 headers=headers,
-                timeout=timeout,
             )
 
             response = await client.send(request)
@@ -146,7 +153,7 @@ class RemoteWorkerManager(LocalWorkerManager):
         return worker_instances
 
     def _build_single_worker_instance(self, model_name: str, instance: ModelInstance):
-        worker = RemoteModelWorker()
+        worker = RemoteModelWorker(client_pool=self._client_pool)
         worker.load_worker(model_name, host=instance.host, port=instance.port)
         wr = WorkerRunData(
             host=instance.host,
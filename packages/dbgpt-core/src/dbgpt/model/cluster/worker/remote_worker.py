@@ -1,25 +1,36 @@
 import json
 import logging
-from typing import Dict, Iterator, List
+from typing import Dict, Iterator, List, Optional
 
 from dbgpt.core import ModelMetadata, ModelOutput
+from dbgpt.model.cluster.worker.http_client import (
+    WorkerClientPool,
+    get_default_client_pool,
+)
 from dbgpt.model.cluster.worker_base import ModelWorker
+from dbgpt.model.utils.embedding_utils import ENCODING_FORMAT_BASE64, decode_embeddings
+from dbgpt.model.utils.stream_utils import DeltaDecoder
 from dbgpt.util.tracer import DBGPT_TRACER_SPAN_ID, root_tracer
 
 logger = logging.getLogger(__name__)
 
 
 class RemoteModelWorker(ModelWorker):
-    def __init__(self) -> None:
+    def __init__(self, client_pool: Optional[WorkerClientPool] = None) -> None:
         self.headers = {}
-        # TODO Configured by ModelParameters
-        self.timeout = 3600
+        self._client_pool = client_pool or get_default_client_pool()
+        self.timeout = self._client_pool.params.timeout
+        self.model_name = None
         self.host = None
         self.port = None
 
     @property
     def worker_addr(self) -> str:
-        return f"http://{self.host}:{self.port}/api/worker"
+        return f"{self.base_url}/api/worker"
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
 
     def support_async(self) -> bool:
         return True
@@ -28,6 +39,7 @@ class RemoteModelWorker(ModelWorker):
     #     return None
 
     def load_worker(self, model_name: str, **kwargs):
+        self.model_name = model_name
         self.host = kwargs.get("host")
         self.port = kwargs.get("port")
 
@@ -44,9 +56,12 @@ class RemoteModelWorker(ModelWorker):
 
     async def async_generate_stream(self, params: Dict) -> Iterator[ModelOutput]:
         """Asynchronous generate stream"""
-        import httpx
-
-        async with httpx.AsyncClient() as client:
+        # Always ask the remote worker for incremental outputs, so the bytes sent
+        # do not grow with the generation, and rebuild the cumulative outputs
+        # here if the caller wants them
+        decoder = None if params.get("incremental") else DeltaDecoder()
+        params = {**params, "incremental": True}
+        async with self._client_pool.request(self.base_url) as client:
             delimiter = b"\0"
             buffer = b""
             url = self.worker_addr + "/generate_stream"
@@ -56,7 +71,6 @@ class RemoteModelWorker(ModelWorker):
                 url,
                 headers=self._get_trace_headers(),
                 json=params,
-                timeout=self.timeout,
             ) as response:
                 async for raw_chunk in response.aiter_raw():
                     buffer += raw_chunk
@@ -66,7 +80,8 @@ class RemoteModelWorker(ModelWorker):
                             continue
                         chunk = chunk.decode()
                         data = json.loads(chunk)
-                        yield ModelOutput(**data)
+                        output = ModelOutput(**data)
+                        yield decoder.decode(output) if decoder else output
 
     def generate(self, params: Dict) -> ModelOutput:
         """Generate non stream"""
@@ -74,16 +89,13 @@ class RemoteModelWorker(ModelWorker):
 
     async def async_generate(self, params: Dict) -> ModelOutput:
         """Asynchronous generate non stream"""
-        import httpx
-
-        async with httpx.AsyncClient() as client:
+        async with self._client_pool.request(self.base_url) as client:
             url = self.worker_addr + "/generate"
             logger.debug(f"Send async_generate to url {url}, params: {params}")
             response = await client.post(
                 url,
                 headers=self._get_trace_headers(),
                 json=params,
-                timeout=self.timeout,
             )
             if response.status_code not in [200, 201]:
                 raise Exception(f"Request to {url} failed, error: {response.text}")
@@ -93,16 +105,26 @@ class RemoteModelWorker(ModelWorker):
         raise NotImplementedError
 
     async def async_count_token(self, prompt: str) -> int:
-        import httpx
-
-        async with httpx.AsyncClient() as client:
+        async with self._client_pool.request(self.base_url) as client:
             url = self.worker_addr + "/count_token"
             logger.debug(f"Send async_count_token to url {url}, params: {prompt}")
             response = await client.post(
                 url,
                 headers=self._get_trace_headers(),
                 json={"prompt": prompt},
-                timeout=self.timeout,
+            )
+            if response.status_code not in [200, 201]:
+                raise Exception(f"Request to {url} failed, error: {response.text}")
+            return response.json()
+
+    async def async_count_tokens(self, prompts: List[str]) -> List[int]:
+        async with self._client_pool.request(self.base_url) as client:
+            url = self.worker_addr + "/count_tokens"
+            logger.debug(f"Send async_count_tokens to url {url}, params: {prompts}")
+            response = await client.post(
+                url,
+                headers=self._get_trace_headers(),
+                json={"model": self.model_name, "prompts": prompts},
             )
             if response.status_code not in [200, 201]:
                 raise Exception(f"Request to {url} failed, error: {response.text}")
@@ -110,9 +132,7 @@ class RemoteModelWorker(ModelWorker):
 
     async def async_get_model_metadata(self, params: Dict) -> ModelMetadata:
         """Asynchronously get model metadata"""
-        import httpx
-
-        async with httpx.AsyncClient() as client:
+        async with self._client_pool.request(self.base_url) as client:
             url = self.worker_addr + "/model_metadata"
             logger.debug(
                 f"Send async_get_model_metadata to url {url}, params: {params}"
@@ -121,7 +141,6 @@ class RemoteModelWorker(ModelWorker):
                 url,
                 headers=self._get_trace_headers(),
                 json=params,
-                timeout=self.timeout,
             )
             if response.status_code not in [200, 201]:
                 raise Exception(f"Request to {url} failed, error: {response.text}")
@@ -140,29 +159,27 @@ class RemoteModelWorker(ModelWorker):
         response = requests.post(
             url,
             headers=self._get_trace_headers(),
-            json=params,
+            json={**params, "encoding_format": ENCODING_FORMAT_BASE64},
             timeout=self.timeout,
         )
         if response.status_code not in [200, 201]:
             raise Exception(f"Request to {url} failed, error: {response.text}")
-        return response.json()
+        return decode_embeddings(response.json())
 
     async def async_embeddings(self, params: Dict) -> List[List[float]]:
         """Asynchronous get embeddings for input"""
-        import httpx
-
-        async with httpx.AsyncClient() as client:
+        async with self._client_pool.request(self.base_url) as client:
             url = self.worker_addr + "/embeddings"
             logger.debug(f"Send async_embeddings to url {url}")
+            # The workers which do not know the encoding format return float lists
             response = await client.post(
                 url,
                 headers=self._get_trace_headers(),
-                json=params,
-                timeout=self.timeout,
+                json={**params, "encoding_format": ENCODING_FORMAT_BASE64},
             )
             if response.status_code not in [200, 201]:
                 raise Exception(f"Request to {url} failed, error: {response.text}")
-            return response.json()
+            return decode_embeddings(response.json())
 
     def _get_trace_headers(self):
         span_id = root_tracer.get_current_span_id()
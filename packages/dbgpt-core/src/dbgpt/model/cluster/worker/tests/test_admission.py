@@ -0,0 +1,156 @@
+import asyncio
+from typing import List, Optional
+
+import pytest
+
+from ..admission import AdmissionRejectedError, AdmissionScheduler
+
+
+async def _run(
+    scheduler: AdmissionScheduler,
+    order: List[str],
+    name: str,
+    priority: Optional[str] = None,
+    tenant: Optional[str] = None,
+    release: Optional[asyncio.Event] = None,
+):
+    async with scheduler.admit(priority, tenant):
+        order.append(name)
+        if release is not None:
+            await release.wait()
+
+
+async def _start(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    # Let the task enter the queue
+    await asyncio.sleep(0)
+    return task
+
+
+@pytest.mark.asyncio
+async def test_admit_by_priority():
+    scheduler = AdmissionScheduler(concurrency=1)
+    order: List[str] = []
+    release = asyncio.Event()
+    running = await _start(_run(scheduler, order, "first", release=release))
+    tasks = [
+        await _start(_run(scheduler, order, "batch", "batch")),
+        await _start(_run(scheduler, order, "default")),
+        await _start(_run(scheduler, order, "interactive", "interactive")),
+    ]
+    assert scheduler.metrics()["queued"] == 3
+    release.set()
+    await asyncio.gather(running, *tasks)
+    assert order == ["first", "interactive", "default", "batch"]
+    metrics = scheduler.metrics()
+    assert metrics["running"] == 0
+    assert metrics["classes"]["batch"]["admitted"] == 1
+    assert metrics["classes"]["interactive"]["queue_wait"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fair_share_between_tenants():
+    scheduler = AdmissionScheduler(concurrency=1)
+    order: List[str] = []
+    release = asyncio.Event()
+    running = await _start(_run(scheduler, order, "first", release=release))
+    tasks = []
+    for i in range(3):
+        tasks.append(await _start(_run(scheduler, order, f"a{i}", tenant="a")))
+    tasks.append(await _start(_run(scheduler, order, "b0", tenant="b")))
+    release.set()
+    await asyncio.gather(running, *tasks)
+    # The tenant b does not wait for all the requests of the tenant a
+    assert order == ["first", "a0", "b0", "a1", "a2"]
+
+
+@pytest.mark.asyncio
+async def test_batch_concurrency_limit():
+    scheduler = AdmissionScheduler(concurrency=4, batch_concurrency_ratio=0.5)
+    order: List[str] = []
+    release = asyncio.Event()
+    tasks = [
+        await _start(_run(scheduler, order, "chat", "interactive", release=release))
+    ]
+    tasks += [
+        await _start(_run(scheduler, order, f"batch{i}", "batch", release=release))
+        for i in range(4)
+    ]
+    # The interactive request is running, the batch requests are limited
+    assert order == ["chat", "batch0", "batch1"]
+    # The slot kept for the interactive requests
+    tasks.append(
+        await _start(
+            _run(scheduler, order, "interactive", "interactive", release=release)
+        )
+    )
+    assert order[-1] == "interactive"
+    release.set()
+    await asyncio.gather(*tasks)
+    assert len(order) == 6
+
+
+@pytest.mark.asyncio
+async def test_batch_use_idle_slots():
+    scheduler = AdmissionScheduler(concurrency=4, batch_concurrency_ratio=0.5)
+    order: List[str] = []
+    releases = [asyncio.Event() for _ in range(4)]
+    tasks = [
+        await _start(_run(scheduler, order, f"batch{i}", "batch", release=releases[i]))
+        for i in range(4)
+    ]
+    # No other requests, the batch requests use all the slots
+    assert order == ["batch0", "batch1", "batch2", "batch3"]
+    interactive = await _start(_run(scheduler, order, "interactive", "interactive"))
+    batch = await _start(_run(scheduler, order, "batch4", "batch"))
+    assert scheduler.metrics()["queued"] == 2
+    # The first free slot goes to the interactive request
+    releases[0].set()
+    await interactive
+    assert order[4] == "interactive"
+    # The interactive request is done, the worker is idle for the batch again
+    releases[1].set()
+    await batch
+    assert order[5] == "batch4"
+    for release in releases[2:]:
+        release.set()
+    await asyncio.gather(*tasks)
+    assert scheduler.metrics()["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_reject_when_queue_full():
+    scheduler = AdmissionScheduler(concurrency=1, max_queue_size=1)
+    order: List[str] = []
+    release = asyncio.Event()
+    running = await _start(_run(scheduler, order, "first", release=release))
+    batch = await _start(_run(scheduler, order, "batch", "batch"))
+    # The queue is full, the new batch request is rejected at once
+    with pytest.raises(AdmissionRejectedError):
+        await _run(scheduler, order, "batch2", "batch")
+    # The batch request is evicted by the interactive request
+    interactive = await _start(_run(scheduler, order, "interactive", "interactive"))
+    with pytest.raises(AdmissionRejectedError):
+        await batch
+    release.set()
+    await asyncio.gather(running, interactive)
+    assert order == ["first", "interactive"]
+    assert scheduler.metrics()["classes"]["batch"]["rejected"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cancel_waiting_request():
+    scheduler = AdmissionScheduler(concurrency=1)
+    order: List[str] = []
+    release = asyncio.Event()
+    running = await _start(_run(scheduler, order, "first", release=release))
+    waiting = await _start(_run(scheduler, order, "cancelled"))
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert scheduler.metrics()["queued"] == 0
+    release.set()
+    await running
+    await _run(scheduler, order, "next")
+    assert order == ["first", "next"]
+    assert scheduler.metrics()["running"] == 0
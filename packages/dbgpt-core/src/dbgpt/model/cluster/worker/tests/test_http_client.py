@@ -0,0 +1,81 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from dbgpt.model.cluster.worker import manager
+from dbgpt.model.cluster.worker.http_client import WorkerClientPool
+from dbgpt.model.cluster.worker.remote_manager import RemoteWorkerManager
+from dbgpt.model.cluster.worker.remote_worker import RemoteModelWorker
+from dbgpt.model.parameter import RemoteWorkerClientParameters
+
+
+def _mock_pool(handler) -> WorkerClientPool:
+    pool = WorkerClientPool(RemoteWorkerClientParameters(timeout=30))
+    pool._create_client = lambda: httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    )
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_client_per_address():
+    pool = WorkerClientPool(RemoteWorkerClientParameters(max_connections=4))
+    client = pool.get_client("http://127.0.0.1:8001")
+    assert pool.get_client("http://127.0.0.1:8001") is client
+    assert pool.get_client("http://127.0.0.1:8002") is not client
+    assert client.timeout.read == 3600
+    assert client.timeout.connect == 10
+
+    await pool.aclose()
+    assert client.is_closed
+    assert pool.get_client("http://127.0.0.1:8001") is not client
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_remote_worker_reuses_client():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/count_token"):
+            return httpx.Response(200, json=3)
+        return httpx.Response(500, text="error")
+
+    pool = _mock_pool(handler)
+    worker = RemoteModelWorker(client_pool=pool)
+    worker.load_worker("mock", host="127.0.0.1", port=8001)
+    assert worker.timeout == 30
+
+    assert await worker.async_count_token("a b c") == 3
+    assert await worker.async_count_token("a b c") == 3
+    with pytest.raises(Exception):
+        await worker.async_get_model_metadata({"model": "mock"})
+
+    metrics = pool.metrics()["http://127.0.0.1:8001"]
+    assert metrics["requests"] == 3
+    assert metrics["errors"] == 1
+    assert metrics["in_flight"] == 0
+    assert len(pool._clients) == 1
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_http_client_metrics_api(monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=3)
+
+    remote_manager = RemoteWorkerManager()
+    remote_manager._client_pool = _mock_pool(handler)
+    worker = RemoteModelWorker(client_pool=remote_manager._client_pool)
+    worker.load_worker("mock", host="127.0.0.1", port=8001)
+    assert await worker.async_count_token("a b c") == 3
+    monkeypatch.setattr(manager.worker_manager, "worker_manager", remote_manager)
+
+    app = FastAPI()
+    app.include_router(manager.router, prefix="/api")
+    response = TestClient(app).get("/api/worker/http_client/metrics")
+
+    assert response.status_code == 200
+    metrics = response.json()["http://127.0.0.1:8001"]
+    assert metrics["requests"] == 1
+    assert metrics["errors"] == 0
+    await remote_manager.stop()
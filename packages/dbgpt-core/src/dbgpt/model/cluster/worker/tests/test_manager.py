@@ -1,5 +1,7 @@
+import threading
 from dataclasses import asdict
 from typing import List, Tuple
+from unittest.mock import patch
 
 import pytest
 
@@ -413,6 +415,68 @@ async def test_generate_stream(
         assert text == expected_messages
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "manager_with_2_workers, expected_messages",
+    [
+        ({"stream_messages": ["Hello", " world."]}, ["Hello", " world."]),
+        ({"stream_messages": ["你好，我是", "张三。"]}, ["你好，我是", "张三。"]),
+    ],
+    indirect=["manager_with_2_workers"],
+)
+async def test_generate_stream_incremental(
+    manager_with_2_workers: Tuple[  # noqa: F811
+        LocalWorkerManager, List[Tuple[ModelWorker, ModelWorkerParameters]]
+    ],
+    expected_messages: List[str],
+):
+    manager, workers = manager_with_2_workers
+    for _, worker_params, _ in workers:
+        params = {"model": worker_params.name, "incremental": True}
+        outputs = [out async for out in manager.generate_stream(params)]
+        assert [out.text for out in outputs] == expected_messages
+        assert [out.seq for out in outputs] == list(range(len(expected_messages)))
+        assert all(out.incremental for out in outputs)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "manager_with_2_workers",
+    [{"stream_messages": ["Hello"] * 100}],
+    indirect=["manager_with_2_workers"],
+)
+async def test_generate_stream_stop_early(
+    manager_with_2_workers: Tuple[  # noqa: F811
+        LocalWorkerManager, List[Tuple[ModelWorker, ModelWorkerParameters]]
+    ],
+):
+    manager, workers = manager_with_2_workers
+    worker, worker_params, _ = workers[0]
+    closed = threading.Event()
+    generate_stream = worker.generate_stream
+
+    def _generate_stream(params):
+        try:
+            yield from generate_stream(params)
+        finally:
+            closed.set()
+
+    worker.generate_stream = _generate_stream
+    params = {"model": worker_params.name, "incremental": True}
+    worker_run_data = await manager.select_one_instance(
+        WorkerType.LLM.value, worker_params.name
+    )
+    scheduler = worker_run_data.scheduler
+    stream = manager.generate_stream(params)
+    assert (await stream.__anext__()).text == "Hello"
+    assert scheduler.metrics()["running"] == 1
+    # E.g. the client disconnected
+    await stream.aclose()
+    # The worker stops generating and the slot is released
+    assert closed.is_set()
+    assert scheduler.metrics()["running"] == 0
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "manager_with_2_workers, expected_messages",
@@ -465,6 +529,22 @@ async def test_embeddings(
         assert out == expected_embedding
 
 
+@pytest.mark.asyncio
+async def test_count_tokens(
+    manager_with_2_workers: Tuple[  # noqa: F811
+        LocalWorkerManager, List[Tuple[ModelWorker, ModelWorkerParameters]]
+    ],
+):
+    manager, workers = manager_with_2_workers
+    for wk, worker_params, _ in workers:
+        model_name = worker_params.name
+        params = {"model": model_name, "prompts": ["hello", "hi", ""]}
+        with patch.object(wk, "count_tokens", wraps=wk.count_tokens) as count_tokens:
+            assert await manager.count_tokens(params) == [5, 2, 0]
+        # All the prompts are counted in one request to the worker
+        count_tokens.assert_called_once_with(["hello", "hi", ""])
+
+
 @pytest.mark.asyncio
 async def test_parameter_descriptions(
     manager_with_2_workers: Tuple[  # noqa: F811
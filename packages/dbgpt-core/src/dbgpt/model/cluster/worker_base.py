@@ -121,6 +121,26 @@ class ModelWorker(ABC):
         """
         raise NotImplementedError
 
+    def count_tokens(self, prompts: List[str]) -> List[int]:
+        """Count token of each prompt
+        Args:
+            prompts (List[str]): prompts
+
+        Returns:
+            List[int]: token count of each prompt
+        """
+        return [self.count_token(prompt) for prompt in prompts]
+
+    async def async_count_tokens(self, prompts: List[str]) -> List[int]:
+        """Asynchronously count token of each prompt
+        Args:
+            prompts (List[str]): prompts
+
+        Returns:
+            List[int]: token count of each prompt
+        """
+        return [await self.async_count_token(prompt) for prompt in prompts]
+
     @abstractmethod
     def get_model_metadata(self, params: Dict) -> ModelMetadata:
         """Get model metadata
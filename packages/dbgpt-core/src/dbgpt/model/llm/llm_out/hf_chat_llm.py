@@ -1,8 +1,13 @@
 import logging
-from threading import Thread
+from threading import Event, Thread
 
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from transformers import (
+    AutoModelForCausalLM,
+    AutoTokenizer,
+    StoppingCriteria,
+    StoppingCriteriaList,
+)
 
 from dbgpt.core import ModelOutput
 
@@ -17,6 +22,16 @@ from ...utils.parse_utils import (
 logger = logging.getLogger(__name__)
 
 
+class _CancelledCriteria(StoppingCriteria):
+    """Stop the generation when the consumer of the stream stops reading it."""
+
+    def __init__(self, cancelled: Event):
+        self._cancelled = cancelled
+
+    def __call__(self, input_ids, scores, **kwargs) -> bool:
+        return self._cancelled.is_set()
+
+
 @torch.inference_mode()
 def huggingface_chat_generate_stream(
     model: AutoModelForCausalLM,
@@ -75,9 +90,11 @@ def huggingface_chat_generate_stream(
         input_token_count=input_token_count,
     )
 
+    cancelled = Event()
     base_kwargs = {
         "temperature": temperature,
         "streamer": streamer,
+        "stopping_criteria": StoppingCriteriaList([_CancelledCriteria(cancelled)]),
         "top_p": top_p,
         "use_cache": use_cache,
         "max_new_tokens": max_new_tokens,
@@ -117,40 +134,44 @@ def huggingface_chat_generate_stream(
     usage = None
     msg = ParsedChatMessage()
     is_first = True
-    for new_text in streamer:
-        text += new_text
-        if custom_stop_words:
-            for stop_word in custom_stop_words:
-                if text.endswith(stop_word):
-                    text = text[: -len(stop_word)]
-
-        if (
-            prompt.rstrip().endswith(think_start_token)
-            and is_reasoning_model
-            and is_first
-        ):
-            text = think_start_token + "\n" + text
-            is_first = False
-
-        msg = parse_chat_message(
-            text,
-            extract_reasoning=is_reasoning_model,
-            reasoning_patterns=reasoning_patterns,
-        )
-        perf_metrics = streamer.get_performance_metrics()
-        usage = {
-            "prompt_tokens": perf_metrics["input_token_count"],
-            "completion_tokens": perf_metrics["total_tokens_generated"],
-            "total_tokens": perf_metrics["input_token_count"]
-            + perf_metrics["total_tokens_generated"],
-        }
-        usage.update(perf_metrics)
-
-        yield ModelOutput.build(
-            msg.content,
-            msg.reasoning_content,
-            error_code=0,
-            usage=usage,
-            is_reasoning_model=is_reasoning_model,
-        )
-    thread.join()
+    try:
+        for new_text in streamer:
+            text += new_text
+            if custom_stop_words:
+                for stop_word in custom_stop_words:
+                    if text.endswith(stop_word):
+                        text = text[: -len(stop_word)]
+
+            if (
+                prompt.rstrip().endswith(think_start_token)
+                and is_reasoning_model
+                and is_first
+            ):
+                text = think_start_token + "\n" + text
+                is_first = False
+
+            msg = parse_chat_message(
+                text,
+                extract_reasoning=is_reasoning_model,
+                reasoning_patterns=reasoning_patterns,
+            )
+            perf_metrics = streamer.get_performance_metrics()
+            usage = {
+                "prompt_tokens": perf_metrics["input_token_count"],
+                "completion_tokens": perf_metrics["total_tokens_generated"],
+                "total_tokens": perf_metrics["input_token_count"]
+                + perf_metrics["total_tokens_generated"],
+            }
+            usage.update(perf_metrics)
+
+            yield ModelOutput.build(
+                msg.content,
+                msg.reasoning_content,
+                error_code=0,
+                usage=usage,
+                is_reasoning_model=is_reasoning_model,
+            )
+    finally:
+        # Closed before the end, e.g. the client disconnected, stop generating
+        cancelled.set()
+        thread.join()
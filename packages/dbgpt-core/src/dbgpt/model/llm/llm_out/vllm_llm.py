@@ -96,57 +96,65 @@ async def generate_stream(
     results_generator = model.generate(prompt, sampling_params, request_id)
     usage = None
     finish_reason = None
-    async for request_output in results_generator:
-        prompt = request_output.prompt
-        if echo:
-            text_outputs = [prompt + output.text for output in request_output.outputs]
-        else:
-            text_outputs = [output.text for output in request_output.outputs]
-        text_outputs = " ".join(text_outputs)
-
-        # Note: usage is not supported yet
-        prompt_tokens = len(request_output.prompt_token_ids)
-        completion_tokens = sum(
-            len(output.token_ids) for output in request_output.outputs
-        )
-        # If this is the first iteration, update the input token count
-        if perf_monitor.metrics.input_token_count != prompt_tokens:
-            perf_monitor.metrics.input_token_count = prompt_tokens
-
-        # Update performance metrics based on current token count
-        perf_metrics = perf_monitor.on_tokens_received(completion_tokens)
-
-        usage = {
-            "prompt_tokens": prompt_tokens,
-            "completion_tokens": completion_tokens,
-            "total_tokens": prompt_tokens + completion_tokens,
-        }
-        # Add performance metrics to usage
-        usage.update(perf_metrics)
-
-        finish_reason = (
-            request_output.outputs[0].finish_reason
-            if len(request_output.outputs) == 1
-            else [output.finish_reason for output in request_output.outputs]
-        )
-        # Check if generation is complete
-        is_complete = finish_reason is not None
-        if is_complete:
-            perf_monitor.end_generation()
-        if text_outputs:
-            # Tempora
-            if prompt.rstrip().endswith(think_start_token) and is_reasoning_model:
-                text_outputs = think_start_token + "\n" + text_outputs
-            msg = parse_chat_message(
-                text_outputs,
-                extract_reasoning=is_reasoning_model,
-                reasoning_patterns=reasoning_patterns,
+    try:
+        async for request_output in results_generator:
+            prompt = request_output.prompt
+            if echo:
+                text_outputs = [
+                    prompt + output.text for output in request_output.outputs
+                ]
+            else:
+                text_outputs = [output.text for output in request_output.outputs]
+            text_outputs = " ".join(text_outputs)
+
+            # Note: usage is not supported yet
+            prompt_tokens = len(request_output.prompt_token_ids)
+            completion_tokens = sum(
+                len(output.token_ids) for output in request_output.outputs
             )
-            yield ModelOutput.build(
-                msg.content,
-                msg.reasoning_content,
-                error_code=0,
-                usage=usage,
-                finish_reason=finish_reason,
-                is_reasoning_model=is_reasoning_model,
+            # If this is the first iteration, update the input token count
+            if perf_monitor.metrics.input_token_count != prompt_tokens:
+                perf_monitor.metrics.input_token_count = prompt_tokens
+
+            # Update performance metrics based on current token count
+            perf_metrics = perf_monitor.on_tokens_received(completion_tokens)
+
+            usage = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            }
+            # Add performance metrics to usage
+            usage.update(perf_metrics)
+
+            finish_reason = (
+                request_output.outputs[0].finish_reason
+                if len(request_output.outputs) == 1
+                else [output.finish_reason for output in request_output.outputs]
             )
+            # Check if generation is complete
+            is_complete = finish_reason is not None
+            if is_complete:
+                perf_monitor.end_generation()
+            if text_outputs:
+                # Tempora
+                if prompt.rstrip().endswith(think_start_token) and is_reasoning_model:
+                    text_outputs = think_start_token + "\n" + text_outputs
+                msg = parse_chat_message(
+                    text_outputs,
+                    extract_reasoning=is_reasoning_model,
+                    reasoning_patterns=reasoning_patterns,
+                )
+                yield ModelOutput.build(
+                    msg.content,
+                    msg.reasoning_content,
+                    error_code=0,
+                    usage=usage,
+                    finish_reason=finish_reason,
+                    is_reasoning_model=is_reasoning_model,
+                )
+    finally:
+        if finish_reason is None:
+            # The consumer stopped reading, e.g. the client disconnected, free the
+            # sequence in the engine instead of generating the answer to the end
+            await model.abort(request_id)
@@ -124,6 +124,73 @@ class ModelControllerParameters(BaseServerParameters):
     )
 
 
+@dataclass
+class RemoteWorkerClientParameters(BaseParameters):
+    """HTTP client configuration for calling the remote model workers."""
+
+    max_connections: Optional[int] = field(
+        default=100,
+        metadata={"help": _("Max number of connections to each remote worker")},
+    )
+    max_keepalive_connections: Optional[int] = field(
+        default=20,
+        metadata={
+            "help": _("Max number of idle connections kept alive to each worker")
+        },
+    )
+    keepalive_expiry: Optional[float] = field(
+        default=60.0,
+        metadata={"help": _("Seconds an idle connection is kept alive")},
+    )
+    connect_timeout: Optional[float] = field(
+        default=10.0,
+        metadata={"help": _("Timeout of connecting to the remote worker (seconds)")},
+    )
+    timeout: Optional[float] = field(
+        default=3600.0,
+        metadata={
+            "help": _(
+                "Timeout of reading, writing and waiting for a pooled connection "
+                "(seconds)"
+            )
+        },
+    )
+    http2: Optional[bool] = field(
+        default=False,
+        metadata={
+            "help": _(
+                "Whether to use HTTP/2, requires `pip install httpx[http2]`, the "
+                "worker server must support it too"
+            )
+        },
+    )
+
+
+@dataclass
+class WorkerAdmissionParameters(BaseParameters):
+    """Admission control of the requests in front of each model worker."""
+
+    max_queue_size: Optional[int] = field(
+        default=1024,
+        metadata={
+            "help": _(
+                "Max number of requests waiting for a model worker, the new requests "
+                "are rejected at once when the queue is full"
+            )
+        },
+    )
+    batch_concurrency_ratio: Optional[float] = field(
+        default=0.5,
+        metadata={
+            "help": _(
+                "Ratio of the concurrency of a model worker the batch requests can "
+                "use while other requests are running or waiting, the rest is kept "
+                "for them. The batch requests can use all the free slots otherwise"
+            )
+        },
+    )
+
+
 @dataclass
 class ModelAPIServerParameters(BaseServerParameters):
     port: Optional[int] = field(
@@ -144,6 +211,10 @@ class ModelAPIServerParameters(BaseServerParameters):
     ignore_stop_exceeds_error: Optional[bool] = field(
         default=False, metadata={"help": _("Ignore exceeds stop words error")}
     )
+    remote_client: Optional[RemoteWorkerClientParameters] = field(
+        default_factory=RemoteWorkerClientParameters,
+        metadata={"help": _("HTTP client configuration of the remote workers")},
+    )
 
 
 @dataclass
@@ -189,6 +260,14 @@ class ModelWorkerParameters(BaseServerParameters):
         default=20,
         metadata={"help": _("The interval for sending heartbeats (seconds)")},
     )
+    remote_client: Optional[RemoteWorkerClientParameters] = field(
+        default_factory=RemoteWorkerClientParameters,
+        metadata={"help": _("HTTP client configuration of the remote workers")},
+    )
+    admission: Optional[WorkerAdmissionParameters] = field(
+        default_factory=WorkerAdmissionParameters,
+        metadata={"help": _("Admission control of the requests of the models")},
+    )
 
 
 @dataclass
@@ -0,0 +1,49 @@
+import pytest
+
+from dbgpt.model.proxy import base
+from dbgpt.model.proxy.base import TiktokenProxyTokenizer
+
+
+class _FakeEncoding:
+    def __init__(self):
+        self.encoded = []
+
+    def encode_ordinary(self, text: str):
+        self.encoded.append(text)
+        return text.split()
+
+
+@pytest.fixture
+def tokenizer():
+    tokenizer = TiktokenProxyTokenizer()
+    # Avoid downloading the real encoding
+    tokenizer._cache["test-model"] = _FakeEncoding()
+    return tokenizer
+
+
+def test_count_token_cache(tokenizer):
+    encoding = tokenizer._cache["test-model"]
+    prompts = ["a b c", "d e", "a b c"]
+    assert tokenizer.count_token("test-model", prompts) == [3, 2, 3]
+    # The same prompts are encoded once
+    assert encoding.encoded == ["a b c", "d e"]
+
+    assert tokenizer.count_token("test-model", ["d e", "f"]) == [2, 1]
+    assert encoding.encoded == ["a b c", "d e", "f"]
+
+
+def test_count_token_parallel(tokenizer, monkeypatch):
+    monkeypatch.setattr(base, "_PARALLEL_ENCODE_MIN_CHARS", 1)
+    prompts = [" ".join(["w"] * i) for i in range(1, 50)]
+    assert tokenizer.count_token("test-model", prompts) == list(range(1, 50))
+
+
+@pytest.mark.asyncio
+async def test_count_token_async(tokenizer):
+    encoding = tokenizer._cache["test-model"]
+    assert tokenizer.support_async()
+    prompts = ["a b c", "d e", "a b c"]
+    assert await tokenizer.count_token_async("test-model", prompts) == [3, 2, 3]
+    assert sorted(encoding.encoded) == ["a b c", "d e"]
+    assert tokenizer.count_token("test-model", prompts) == [3, 2, 3]
+    assert len(encoding.encoded) == 2
@@ -0,0 +1,57 @@
+"""Encode and decode embeddings for transport.
+
+Embeddings are sent as float32 little-endian bytes in base64, the same as the
+`encoding_format=base64` of the OpenAI embeddings API. It is about 4 times
+smaller than the JSON float lists and much cheaper to encode and parse.
+"""
+
+import base64
+from typing import List, Sequence, Union
+
+import numpy as np
+
+ENCODING_FORMAT_FLOAT = "float"
+ENCODING_FORMAT_BASE64 = "base64"
+
+_EMBEDDING_DTYPE = np.dtype("<f4")
+
+
+def encode_embedding(
+    embedding: Sequence[float], encoding_format: str = ENCODING_FORMAT_FLOAT
+) -> Union[List[float], str]:
+    """Encode an embedding in the given format.
+
+    Raises:
+        ValueError: If the encoding format is not supported.
+    """
+    if encoding_format == ENCODING_FORMAT_FLOAT:
+        return list(embedding)
+    if encoding_format == ENCODING_FORMAT_BASE64:
+        data = np.asarray(embedding, dtype=_EMBEDDING_DTYPE).tobytes()
+        return base64.b64encode(data).decode("ascii")
+    raise ValueError(f"Unsupported embedding encoding format: {encoding_format}")
+
+
+def encode_embeddings(
+    embeddings: Sequence[Sequence[float]],
+    encoding_format: str = ENCODING_FORMAT_FLOAT,
+) -> List[Union[List[float], str]]:
+    """Encode the embeddings in the given format."""
+    return [encode_embedding(emb, encoding_format) for emb in embeddings]
+
+
+def decode_embedding(embedding: Union[Sequence[float], str]) -> List[float]:
+    """Decode an embedding, either base64 encoded or a float list."""
+    if isinstance(embedding, str):
+        data = base64.b64decode(embedding)
+        return np.frombuffer(data, dtype=_EMBEDDING_DTYPE).tolist()
+    if isinstance(embedding, list):
+        return embedding
+    return list(embedding)
+
+
+def decode_embeddings(
+    embeddings: Sequence[Union[Sequence[float], str]],
+) -> List[List[float]]:
+    """Decode the embeddings, each one either base64 encoded or a float list."""
+    return [decode_embedding(emb) for emb in embeddings]
@@ -0,0 +1,148 @@
+"""Convert model output streams between cumulative and incremental forms.
+
+Most model workers emit cumulative outputs, each one carries the full text
+generated so far. In the incremental form each output only carries the text
+generated since the previous one, with its sequence number in `seq`, so the
+bytes sent and the work done per output do not grow with the generation.
+"""
+
+import logging
+from typing import AsyncIterator, List, Optional, Tuple
+
+from dbgpt.core import ModelOutput
+from dbgpt.util.stream_utils import aclosing_stream
+
+logger = logging.getLogger(__name__)
+
+# Placeholder of the incomplete multi-byte characters at the end of a stream
+_REPLACEMENT_CHAR = "\ufffd"
+
+
+def _delta_of(text: str, pos: int) -> Tuple[str, int]:
+    """Get the text after `pos` and the new position.
+
+    Trailing replacement characters are kept back, they are usually the bytes
+    of a character not fully decoded yet, the next output completes them.
+    """
+    end = len(text)
+    while end > pos and text[end - 1] == _REPLACEMENT_CHAR:
+        end -= 1
+    if end <= pos:
+        return "", pos
+    return text[pos:end].replace(_REPLACEMENT_CHAR, ""), end
+
+
+class DeltaEncoder:
+    """Convert cumulative model outputs to incremental ones."""
+
+    def __init__(self):
+        """Create a delta encoder."""
+        self._text_pos = 0
+        self._thinking_pos = 0
+        self._seq = 0
+
+    def encode(self, output: ModelOutput) -> ModelOutput:
+        """Get the incremental output of a cumulative output.
+
+        Outputs which are already incremental just get their sequence number.
+        """
+        if output.incremental or not output.success:
+            delta = ModelOutput(
+                error_code=output.error_code,
+                content=output.content,
+                model_context=output.model_context,
+                finish_reason=output.finish_reason,
+                usage=output.usage,
+                metrics=output.metrics,
+            )
+        else:
+            text, thinking = "", ""
+            if output.has_text:
+                text, self._text_pos = _delta_of(output.text, self._text_pos)
+            if output.has_thinking:
+                thinking, self._thinking_pos = _delta_of(
+                    output.thinking_text or "", self._thinking_pos
+                )
+            delta = ModelOutput.build(
+                text=text,
+                thinking=thinking,
+                error_code=output.error_code,
+                usage=output.usage,
+                finish_reason=output.finish_reason,
+                metrics=output.metrics,
+            )
+            delta.model_context = output.model_context
+        delta.incremental = True
+        delta.seq = self._seq
+        self._seq += 1
+        return delta
+
+
+class DeltaDecoder:
+    """Convert incremental model outputs back to cumulative ones."""
+
+    def __init__(self):
+        """Create a delta decoder."""
+        self._texts: List[str] = []
+        self._thinking: List[str] = []
+        self._seq: Optional[int] = None
+
+    def decode(self, output: ModelOutput) -> ModelOutput:
+        """Get the cumulative output of an incremental output.
+
+        Raises:
+            ValueError: If an output of the stream is missing.
+        """
+        if not output.incremental:
+            return output
+        if output.seq is not None:
+            expected = 0 if self._seq is None else self._seq + 1
+            if output.seq != expected:
+                raise ValueError(
+                    f"Missing incremental model output, expect seq {expected}, "
+                    f"got {output.seq}"
+                )
+            self._seq = output.seq
+        if not output.success:
+            return ModelOutput(
+                error_code=output.error_code,
+                content=output.content,
+                model_context=output.model_context,
+                finish_reason=output.finish_reason,
+                usage=output.usage,
+                metrics=output.metrics,
+            )
+        if output.has_text:
+            self._texts.append(output.text)
+        if output.has_thinking:
+            self._thinking.append(output.thinking_text or "")
+        cumulative = ModelOutput.build(
+            text="".join(self._texts),
+            thinking="".join(self._thinking),
+            error_code=output.error_code,
+            usage=output.usage,
+            finish_reason=output.finish_reason,
+            metrics=output.metrics,
+        )
+        cumulative.model_context = output.model_context
+        return cumulative
+
+
+async def to_incremental_stream(
+    stream: AsyncIterator[ModelOutput],
+) -> AsyncIterator[ModelOutput]:
+    """Convert a cumulative model output stream to an incremental one."""
+    encoder = DeltaEncoder()
+    async with aclosing_stream(stream):
+        async for output in stream:
+            yield encoder.encode(output)
+
+
+async def to_cumulative_stream(
+    stream: AsyncIterator[ModelOutput],
+) -> AsyncIterator[ModelOutput]:
+    """Convert an incremental model output stream to a cumulative one."""
+    decoder = DeltaDecoder()
+    async with aclosing_stream(stream):
+        async for output in stream:
+            yield decoder.decode(output)
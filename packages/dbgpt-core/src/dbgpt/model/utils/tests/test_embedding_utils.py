@@ -0,0 +1,35 @@
+import base64
+
+import numpy as np
+import pytest
+
+from dbgpt.model.utils.embedding_utils import (
+    decode_embeddings,
+    encode_embedding,
+    encode_embeddings,
+)
+
+
+def test_encode_decode_base64():
+    embeddings = [[0.1, -0.5, 3.25], [1.0, 0.0, -2.0]]
+    encoded = encode_embeddings(embeddings, "base64")
+    assert all(isinstance(emb, str) for emb in encoded)
+    # Same as OpenAI's base64 format, float32 little-endian
+    raw = base64.b64decode(encoded[0])
+    assert len(raw) == 3 * 4
+    assert np.allclose(np.frombuffer(raw, dtype="<f4"), embeddings[0])
+
+    decoded = decode_embeddings(encoded)
+    assert np.allclose(decoded, embeddings)
+    assert all(isinstance(v, float) for v in decoded[0])
+
+
+def test_decode_float_lists():
+    embeddings = [[0.1, 0.2], [0.3, 0.4]]
+    assert encode_embeddings(embeddings) == embeddings
+    assert decode_embeddings(embeddings) == embeddings
+
+
+def test_encode_unsupported_format():
+    with pytest.raises(ValueError):
+        encode_embedding([0.1], "binary")
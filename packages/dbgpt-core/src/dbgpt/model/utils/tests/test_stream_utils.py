@@ -0,0 +1,67 @@
+import pytest
+
+from dbgpt.core import ModelOutput
+from dbgpt.model.utils.stream_utils import DeltaDecoder, DeltaEncoder
+
+
+def _cumulative(texts):
+    full_text = ""
+    for text in texts:
+        full_text += text
+        yield ModelOutput(text=full_text, error_code=0)
+
+
+def test_encode_decode():
+    encoder, decoder = DeltaEncoder(), DeltaDecoder()
+    texts = ["Hello", ", ", "world", "!"]
+    deltas = [encoder.encode(out) for out in _cumulative(texts)]
+    assert [d.text for d in deltas] == texts
+    assert [d.seq for d in deltas] == [0, 1, 2, 3]
+    assert all(d.incremental for d in deltas)
+
+    outputs = [decoder.decode(d) for d in deltas]
+    assert outputs[-1].text == "Hello, world!"
+    assert not outputs[-1].incremental
+
+
+def test_encode_incomplete_characters():
+    encoder = DeltaEncoder()
+    outputs = [
+        ModelOutput(text="你�", error_code=0),
+        ModelOutput(text="你好", error_code=0),
+        ModelOutput(text="你好�啊", error_code=0),
+    ]
+    assert [encoder.encode(out).text for out in outputs] == ["你", "好", "啊"]
+
+
+def test_encode_thinking():
+    encoder = DeltaEncoder()
+    first = encoder.encode(
+        ModelOutput.build(thinking="Let me", is_reasoning_model=True)
+    )
+    second = encoder.encode(ModelOutput.build(text="Hi", thinking="Let me think"))
+    assert first.thinking_text == "Let me"
+    assert second.thinking_text == " think"
+    assert second.text == "Hi"
+
+    decoder = DeltaDecoder()
+    decoder.decode(first)
+    output = decoder.decode(second)
+    assert output.thinking_text == "Let me think"
+    assert output.text == "Hi"
+
+
+def test_decode_missing_output():
+    encoder, decoder = DeltaEncoder(), DeltaDecoder()
+    deltas = [encoder.encode(out) for out in _cumulative(["a", "b", "c"])]
+    decoder.decode(deltas[0])
+    with pytest.raises(ValueError):
+        decoder.decode(deltas[2])
+
+
+def test_error_output():
+    encoder = DeltaEncoder()
+    encoder.encode(ModelOutput(text="Hello", error_code=0))
+    error = encoder.encode(ModelOutput(text="Out of memory", error_code=1))
+    assert error.text == "Out of memory"
+    assert error.error_code == 1
@@ -0,0 +1,261 @@
+"""Adaptive client-side batching for the embedding APIs."""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TokenCounter = Callable[[List[str]], List[int]]
+EmbedFunc = Callable[[List[str]], List[List[float]]]
+AsyncEmbedFunc = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+# Hints of the error messages of the requests which are too large
+_OVERSIZED_HINTS = ("too long", "too large", "too many", "maximum", "exceed")
+
+
+def _status_code(e: Exception) -> Optional[int]:
+    # aiohttp.ClientResponseError has `status`, requests.HTTPError has `response`
+    status = getattr(e, "status", None)
+    if status is None:
+        status = getattr(getattr(e, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _error_message(e: Exception) -> str:
+    response = getattr(e, "response", None)
+    text = getattr(response, "text", None)
+    if isinstance(text, str):
+        return f"{e} {text}".lower()
+    return str(e).lower()
+
+
+def is_rate_limited(e: Exception) -> bool:
+    """Whether the embedding request is rejected by the rate limit."""
+    return _status_code(e) == 429
+
+
+def is_oversized(e: Exception) -> bool:
+    """Whether the embedding request is rejected for being too large."""
+    status = _status_code(e)
+    if status == 413:
+        return True
+    if status == 400:
+        message = _error_message(e)
+        return any(hint in message for hint in _OVERSIZED_HINTS)
+    return False
+
+
+def _retry_after(e: Exception) -> Optional[float]:
+    headers = getattr(e, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(e, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class EmbeddingBatcher:
+    """Split the texts to embed into batches and send them concurrently.
+
+    The batches are limited by the number of tokens (counted by the token counter)
+    and the number of texts. A batch rejected for being too large or by the rate
+    limit is split in half and sent again, the texts of the later batches are
+    limited by the learned size. The embeddings are returned in the order of the
+    texts.
+    """
+
+    def __init__(
+        self,
+        max_batch_tokens: Optional[int] = None,
+        max_batch_size: Optional[int] = None,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+        token_counter: Optional[TokenCounter] = None,
+    ):
+        """Create an embedding batcher.
+
+        Args:
+            max_batch_tokens(Optional[int]): The max tokens of a batch, no limit if
+                not set.
+            max_batch_size(Optional[int]): The max texts of a batch, no limit if not
+                set.
+            max_concurrency(int): The max batches sent at the same time.
+            max_retries(int): The max retries of a rate limited request which can
+                not be split anymore.
+            retry_backoff(float): The base seconds to wait before retrying a rate
+                limited request, doubled on every retry.
+            token_counter(Optional[TokenCounter]): Count the tokens of the texts,
+                the count of the characters is used if not set or the count fails.
+        """
+        self._max_batch_tokens = max_batch_tokens
+        self._max_batch_size = max_batch_size
+        self._max_concurrency = max(1, max_concurrency)
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._token_counter = token_counter
+        # The batch size learned from the oversized requests
+        self._learned_batch_size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def batch_size_limit(self) -> Optional[int]:
+        """Get the current max texts of a batch."""
+        limits = [
+            limit for limit in (self._max_batch_size, self._learned_batch_size) if limit
+        ]
+        return min(limits) if limits else None
+
+    def split(self, texts: List[str]) -> List[List[int]]:
+        """Split the texts into batches of their indexes."""
+        if not texts:
+            return []
+        size_limit = self.batch_size_limit
+        token_counts = self._count_tokens(texts) if self._max_batch_tokens else None
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        for i in range(len(texts)):
+            tokens = token_counts[i] if token_counts else 0
+            if current and (
+                (size_limit and len(current) >= size_limit)
+                or (
+                    self._max_batch_tokens
+                    and current_tokens + tokens > self._max_batch_tokens
+                )
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+        batches.append(current)
+        return batches
+
+    def embed(self, texts: List[str], embed_func: EmbedFunc) -> List[List[float]]:
+        """Embed the texts in batches with a synchronous embedding function."""
+        batches = self.split(texts)
+        if not batches:
+            return []
+        results: List[Optional[List[float]]] = [None] * len(texts)
+
+        def _run(indexes: List[int]):
+            embeddings = self._embed_batch(texts, indexes, embed_func, 0)
+            for i, emb in zip(indexes, embeddings):
+                results[i] = emb
+
+        if len(batches) == 1:
+            _run(batches[0])
+        else:
+            workers = min(self._max_concurrency, len(batches))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for future in [executor.submit(_run, batch) for batch in batches]:
+                    future.result()
+        return results  # type: ignore
+
+    async def aembed(
+        self, texts: List[str], embed_func: AsyncEmbedFunc
+    ) -> List[List[float]]:
+        """Embed the texts in batches with an asynchronous embedding function."""
+        batches = self.split(texts)
+        if not batches:
+            return []
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def _run(indexes: List[int]):
+            async with semaphore:
+                embeddings = await self._aembed_batch(texts, indexes, embed_func, 0)
+            for i, emb in zip(indexes, embeddings):
+                results[i] = emb
+
+        await asyncio.gather(*(_run(batch) for batch in batches))
+        return results  # type: ignore
+
+    def _embed_batch(
+        self,
+        texts: List[str],
+        indexes: List[int],
+        embed_func: EmbedFunc,
+        retries: int,
+    ) -> List[List[float]]:
+        try:
+            return embed_func([texts[i] for i in indexes])
+        except Exception as e:
+            wait = self._on_error(e, indexes, retries)
+        if wait:
+            time.sleep(wait)
+        if len(indexes) == 1:
+            return self._embed_batch(texts, indexes, embed_func, retries + 1)
+        half = len(indexes) // 2
+        return self._embed_batch(
+            texts, indexes[:half], embed_func, retries
+        ) + self._embed_batch(texts, indexes[half:], embed_func, retries)
+
+    async def _aembed_batch(
+        self,
+        texts: List[str],
+        indexes: List[int],
+        embed_func: AsyncEmbedFunc,
+        retries: int,
+    ) -> List[List[float]]:
+        try:
+            return await embed_func([texts[i] for i in indexes])
+        except Exception as e:
+            wait = self._on_error(e, indexes, retries)
+        if wait:
+            await asyncio.sleep(wait)
+        if len(indexes) == 1:
+            return await self._aembed_batch(texts, indexes, embed_func, retries + 1)
+        half = len(indexes) // 2
+        first = await self._aembed_batch(texts, indexes[:half], embed_func, retries)
+        second = await self._aembed_batch(texts, indexes[half:], embed_func, retries)
+        return first + second
+
+    def _on_error(self, e: Exception, indexes: List[int], retries: int) -> float:
+        """Handle the error of a batch, get the seconds to wait before retrying.
+
+        Raises the error if the batch can not be retried.
+        """
+        if is_oversized(e):
+            if len(indexes) == 1:
+                raise e
+            with self._lock:
+                learned = len(indexes) // 2
+                if not self._learned_batch_size or learned < self._learned_batch_size:
+                    self._learned_batch_size = learned
+            logger.info(
+                f"Embedding batch of {len(indexes)} texts is too large, split it, "
+                f"the batch size is limited to {self._learned_batch_size}"
+            )
+            return 0
+        if is_rate_limited(e):
+            if len(indexes) == 1 and retries >= self._max_retries:
+                raise e
+            wait = _retry_after(e)
+            if wait is None:
+                wait = self._retry_backoff * (2**retries)
+            logger.info(
+                f"Embedding batch of {len(indexes)} texts is rate limited, retry "
+                f"after {wait:.2f} seconds"
+            )
+            return wait
+        raise e
+
+    def _count_tokens(self, texts: List[str]) -> List[int]:
+        counts = None
+        if self._token_counter:
+            try:
+                counts = self._token_counter(texts)
+            except Exception as e:
+                logger.warning(f"Count tokens of embedding texts failed: {e}")
+        if not counts or len(counts) != len(texts):
+            return [len(text) for text in texts]
+        # -1 means the count failed
+        return [c if c >= 0 else len(text) for c, text in zip(counts, texts)]
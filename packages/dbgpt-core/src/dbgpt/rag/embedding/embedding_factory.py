@@ -274,6 +274,10 @@ class DefaultEmbeddings(Embeddings):
         """Embed query text."""
         return self.embeddings.embed_query(text)
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed multiple query texts."""
+        return self.embeddings.embed_queries(texts)
+
     async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
         """Asynchronous Embed search docs."""
         return await self.embeddings.aembed_documents(texts)
@@ -281,3 +285,7 @@ class DefaultEmbeddings(Embeddings):
     async def aembed_query(self, text: str) -> List[float]:
         """Asynchronous Embed query text."""
         return await self.embeddings.aembed_query(text)
+
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronous Embed multiple query texts."""
+        return await self.embeddings.aembed_queries(texts)
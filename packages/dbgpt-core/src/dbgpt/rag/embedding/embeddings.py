@@ -6,7 +6,13 @@ from typing import Any, Dict, List, Optional, Type
 import aiohttp
 import requests
 
-from dbgpt._private.pydantic import EXTRA_FORBID, BaseModel, ConfigDict, Field
+from dbgpt._private.pydantic import (
+    EXTRA_FORBID,
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+)
 from dbgpt.core import EmbeddingModelMetadata, Embeddings
 from dbgpt.core.awel.flow import Parameter, ResourceCategory, register_resource
 from dbgpt.core.interface.parameter import EmbeddingDeployModelParameters
@@ -16,6 +22,8 @@ from dbgpt.model.adapter.embed_metadata import (
     EMBED_COMMON_HF_JINA_MODELS,
     EMBED_COMMON_HF_QWEN_MODELS,
 )
+from dbgpt.model.utils.embedding_utils import decode_embeddings
+from dbgpt.rag.embedding.batcher import EmbeddingBatcher
 from dbgpt.util.i18n_utils import _
 from dbgpt.util.tracer import DBGPT_TRACER_SPAN_ID, root_tracer
 
@@ -275,6 +283,10 @@ class HuggingFaceEmbeddings(BaseModel, Embeddings):
         """
         return self.embed_documents([text])[0]
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of multiple queries in one call."""
+        return self.embed_documents(texts)
+
 
 @register_resource(
     _("HuggingFace Instructor Embeddings"),
@@ -624,6 +636,10 @@ class HuggingFaceInferenceAPIEmbeddings(BaseModel, Embeddings):
         """
         return self.embed_documents([text])[0]
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of multiple queries in one call."""
+        return self.embed_documents(texts)
+
 
 def _handle_request_result(res: requests.Response) -> List[List[float]]:
     """Parse the result from a request.
@@ -645,7 +661,7 @@ def _handle_request_result(res: requests.Response) -> List[List[float]]:
     # Sort resulting embeddings by index
     sorted_embeddings = sorted(embeddings, key=lambda e: e["index"])  # type: ignore
     # Return just the embeddings
-    return [result["embedding"] for result in sorted_embeddings]
+    return decode_embeddings([result["embedding"] for result in sorted_embeddings])
 
 
 @dataclass
@@ -682,6 +698,39 @@ class OpenAPIEmbeddingDeployModelParameters(EmbeddingDeployModelParameters):
             "help": _("The timeout for the request in seconds."),
         },
     )
+    encoding_format: Optional[str] = field(
+        default=None,
+        metadata={
+            "help": _(
+                "The encoding format of the embeddings in the response, 'float' or "
+                "'base64'. The base64 format is much smaller than the float lists, "
+                "but not all the OpenAI compatible APIs support it. Default is None, "
+                "not passed to the API."
+            ),
+            "valid_values": ["float", "base64"],
+        },
+    )
+    max_batch_tokens: Optional[int] = field(
+        default=None,
+        metadata={
+            "help": _(
+                "The max tokens of the texts in one request, counted by tiktoken. "
+                "No limit if not set."
+            ),
+        },
+    )
+    max_batch_size: Optional[int] = field(
+        default=None,
+        metadata={
+            "help": _("The max number of texts in one request. No limit if not set."),
+        },
+    )
+    max_concurrency: int = field(
+        default=4,
+        metadata={
+            "help": _("The max number of requests sent at the same time."),
+        },
+    )
 
     @property
     def real_provider_model_name(self) -> str:
@@ -807,9 +856,32 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
     pass_trace_id: bool = Field(
         default=True, description="Whether to pass the trace ID to the API."
     )
+    encoding_format: Optional[str] = Field(
+        default=None,
+        description="The encoding format of the embeddings, 'float' or 'base64'. "
+        "Not passed to the API if not set.",
+    )
+    max_batch_tokens: Optional[int] = Field(
+        default=None,
+        description="The max tokens of the texts in one request, counted by "
+        "tiktoken. No limit if not set.",
+    )
+    max_batch_size: Optional[int] = Field(
+        default=None,
+        description="The max number of texts in one request. No limit if not set.",
+    )
+    max_concurrency: int = Field(
+        default=4, description="The max number of requests sent at the same time."
+    )
+    max_retries: int = Field(
+        default=3, description="The max retries of a rate limited request."
+    )
 
     session: Optional[requests.Session] = None
 
+    _batcher: EmbeddingBatcher = PrivateAttr()
+    _tokenizer: Optional[Any] = PrivateAttr(default=None)
+
     def __init__(self, **kwargs):
         """Initialize the OpenAPIEmbeddings."""
         try:
@@ -828,6 +900,13 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
             session.headers.update({"Authorization": f"Bearer {api_key}"})
         kwargs["session"] = session
         super().__init__(**kwargs)
+        self._batcher = EmbeddingBatcher(
+            max_batch_tokens=self.max_batch_tokens,
+            max_batch_size=self.max_batch_size,
+            max_concurrency=self.max_concurrency,
+            max_retries=self.max_retries,
+            token_counter=self._count_tokens if self.max_batch_tokens else None,
+        )
 
     @classmethod
     def param_class(cls) -> Type[OpenAPIEmbeddingDeployModelParameters]:
@@ -843,11 +922,30 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
             api_key=parameters.api_key,
             model_name=parameters.real_provider_model_name,
             timeout=parameters.timeout,
+            encoding_format=parameters.encoding_format,
+            max_batch_tokens=parameters.max_batch_tokens,
+            max_batch_size=parameters.max_batch_size,
+            max_concurrency=parameters.max_concurrency,
         )
 
+    def _count_tokens(self, texts: List[str]) -> List[int]:
+        from dbgpt.model.proxy.base import TiktokenProxyTokenizer
+
+        if self._tokenizer is None:
+            self._tokenizer = TiktokenProxyTokenizer()
+        return self._tokenizer.count_token(self.model_name, texts)
+
+    def _request_body(self, texts: List[str]) -> Dict[str, Any]:
+        body: Dict[str, Any] = {"input": texts, "model": self.model_name}
+        if self.encoding_format:
+            body["encoding_format"] = self.encoding_format
+        return body
+
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """Get the embeddings for a list of texts.
 
+        The texts are sent in batches, see `EmbeddingBatcher`.
+
         Args:
             texts (Documents): A list of texts to get embeddings for.
 
@@ -861,13 +959,17 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
         if self.pass_trace_id and current_span_id:
             # Set the trace ID if available
             headers[DBGPT_TRACER_SPAN_ID] = current_span_id
-        res = self.session.post(  # type: ignore
-            self.api_url,
-            json={"input": texts, "model": self.model_name},
-            timeout=self.timeout,
-            headers=headers,
-        )
-        return _handle_request_result(res)
+
+        def _embed(batch: List[str]) -> List[List[float]]:
+            res = self.session.post(  # type: ignore
+                self.api_url,
+                json=self._request_body(batch),
+                timeout=self.timeout,
+                headers=headers,
+            )
+            return _handle_request_result(res)
+
+        return self._batcher.embed(texts, _embed)
 
     def embed_query(self, text: str) -> List[float]:
         """Compute query embeddings using a OpenAPI embedding model.
@@ -883,6 +985,8 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
     async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
         """Asynchronous Embed search docs.
 
+        The texts are sent in batches, see `EmbeddingBatcher`.
+
         Args:
             texts: A list of texts to get embeddings for.
 
@@ -898,22 +1002,44 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
         async with aiohttp.ClientSession(
             headers=headers, timeout=aiohttp.ClientTimeout(total=self.timeout)
         ) as session:
-            async with session.post(
-                self.api_url, json={"input": texts, "model": self.model_name}
-            ) as resp:
-                resp.raise_for_status()
-                data = await resp.json()
-                if "data" not in data:
-                    raise RuntimeError(data["detail"])
-                embeddings = data["data"]
-                sorted_embeddings = sorted(embeddings, key=lambda e: e["index"])
-                return [result["embedding"] for result in sorted_embeddings]
+
+            async def _embed(batch: List[str]) -> List[List[float]]:
+                async with session.post(
+                    self.api_url, json=self._request_body(batch)
+                ) as resp:
+                    if resp.status >= 400:
+                        # Keep the error message, it tells why the request fails
+                        raise aiohttp.ClientResponseError(
+                            resp.request_info,
+                            resp.history,
+                            status=resp.status,
+                            message=await resp.text(),
+                            headers=resp.headers,
+                        )
+                    data = await resp.json()
+                    if "data" not in data:
+                        raise RuntimeError(data["detail"])
+                    embeddings = data["data"]
+                    sorted_embeddings = sorted(embeddings, key=lambda e: e["index"])
+                    return decode_embeddings(
+                        [result["embedding"] for result in sorted_embeddings]
+                    )
+
+            return await self._batcher.aembed(texts, _embed)
 
     async def aembed_query(self, text: str) -> List[float]:
         """Asynchronous Embed query text."""
         embeddings = await self.aembed_documents([text])
         return embeddings[0]
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of multiple queries in batches."""
+        return self.embed_documents(texts)
+
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronous Embed multiple query texts in batches."""
+        return await self.aembed_documents(texts)
+
 
 register_embedding_adapter(
     HuggingFaceEmbeddings,
@@ -0,0 +1,101 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from dbgpt.rag.embedding.batcher import EmbeddingBatcher
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code: int, text: str = "", headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = MagicMock(status_code=status_code, text=text, headers=headers)
+
+
+def _embed(texts):
+    return [[float(len(text))] for text in texts]
+
+
+def test_split_by_tokens_and_size():
+    batcher = EmbeddingBatcher(
+        max_batch_tokens=10, max_batch_size=3, token_counter=lambda ts: [5] * len(ts)
+    )
+    assert batcher.split(["a"] * 5) == [[0, 1], [2, 3], [4]]
+
+    batcher = EmbeddingBatcher(max_batch_size=3)
+    assert batcher.split(["a"] * 7) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert EmbeddingBatcher().split(["a"] * 7) == [list(range(7))]
+
+
+def test_split_token_count_fallback():
+    # The count of characters is used if the count fails
+    batcher = EmbeddingBatcher(max_batch_tokens=4, token_counter=lambda ts: [-1] * 3)
+    assert batcher.split(["ab", "cd", "efgh"]) == [[0, 1], [2]]
+
+
+def test_embed_preserves_order():
+    texts = ["a" * i for i in range(1, 20)]
+    batcher = EmbeddingBatcher(max_batch_size=4, max_concurrency=3)
+    assert batcher.embed(texts, _embed) == _embed(texts)
+
+
+def test_embed_halves_oversized_batches():
+    sizes = []
+
+    def embed(texts):
+        sizes.append(len(texts))
+        if len(texts) > 2:
+            raise _HTTPError(413)
+        return _embed(texts)
+
+    texts = ["a" * i for i in range(1, 9)]
+    batcher = EmbeddingBatcher()
+    assert batcher.embed(texts, embed) == _embed(texts)
+    assert sizes[:3] == [8, 4, 2]
+    # The later batches are limited by the learned size
+    assert batcher.batch_size_limit == 2
+    sizes.clear()
+    batcher.embed(texts, embed)
+    assert sizes == [2, 2, 2, 2]
+
+
+def test_embed_oversized_single_text():
+    def embed(texts):
+        raise _HTTPError(400, text="input is too long")
+
+    with pytest.raises(_HTTPError):
+        EmbeddingBatcher().embed(["a"], embed)
+
+
+def test_embed_other_errors_not_retried():
+    embed = MagicMock(side_effect=_HTTPError(401))
+    with pytest.raises(_HTTPError):
+        EmbeddingBatcher().embed(["a", "b"], embed)
+    assert embed.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_aembed_rate_limited():
+    calls = []
+
+    async def embed(texts):
+        calls.append(len(texts))
+        if len(calls) <= 2:
+            raise _HTTPError(429, headers={"Retry-After": "0"})
+        await asyncio.sleep(0)
+        return _embed(texts)
+
+    texts = ["a", "bb", "ccc", "dddd"]
+    batcher = EmbeddingBatcher(retry_backoff=0)
+    assert await batcher.aembed(texts, embed) == _embed(texts)
+    assert calls[:3] == [4, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_aembed_rate_limited_retries_exhausted():
+    async def embed(texts):
+        raise _HTTPError(429)
+
+    batcher = EmbeddingBatcher(max_retries=2, retry_backoff=0)
+    with pytest.raises(_HTTPError):
+        await batcher.aembed(["a", "b"], embed)
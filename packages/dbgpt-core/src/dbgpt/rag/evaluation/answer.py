@@ -13,7 +13,7 @@ from dbgpt.core.interface.evaluation import (
     EvaluationResult,
     Evaluator,
 )
-from dbgpt.core.interface.llm import LLMClient, ModelRequest
+from dbgpt.core.interface.llm import LLMClient, ModelRequest, ModelRequestContext
 
 logger = logging.getLogger(__name__)
 
@@ -125,7 +125,11 @@ class LLMEvaluationMetric(EvaluationMetric):
             logger.info(f"Using model {self._model_name} to evaluate")
 
         model_messages = ModelMessage.from_base_messages(messages)
-        request = ModelRequest(model=self._model_name, messages=model_messages)
+        request = ModelRequest(
+            model=self._model_name,
+            messages=model_messages,
+            context=ModelRequestContext(priority="batch"),
+        )
         response = await self._llm_client.generate(request=request)
 
         if not response.success:
@@ -3,7 +3,13 @@
 from typing import List, Optional
 
 from dbgpt._private.llm_metadata import LLMMetadata
-from dbgpt.core import Chunk, LLMClient, ModelMessageRoleType, ModelRequest
+from dbgpt.core import (
+    Chunk,
+    LLMClient,
+    ModelMessageRoleType,
+    ModelRequest,
+    ModelRequestContext,
+)
 from dbgpt.rag.extractor.base import Extractor
 from dbgpt.util import utils
 from dbgpt.util.chat_util import run_async_tasks
@@ -164,7 +170,11 @@ class SummaryExtractor(Extractor):
 
             prompt = prompt_template.format(context=chunk_text)
             messages = [ModelMessage(role=ModelMessageRoleType.HUMAN, content=prompt)]
-            request = ModelRequest(model=self._model_name, messages=messages)
+            request = ModelRequest(
+                model=self._model_name,
+                messages=messages,
+                context=ModelRequestContext(priority="batch"),
+            )
             tasks.append(self._llm_client.generate(request))  # type ignore
         summary_results = await run_async_tasks(
             tasks=tasks, concurrency_limit=self._concurrency_limit_with_llm
@@ -5,7 +5,14 @@ import logging
 from abc import ABC, abstractmethod
 from typing import List, Optional
 
-from dbgpt.core import HumanPromptTemplate, LLMClient, ModelMessage, ModelRequest
+from dbgpt.core import (
+    HumanPromptTemplate,
+    LLMClient,
+    ModelMessage,
+    ModelOutput,
+    ModelRequest,
+    ModelRequestContext,
+)
 from dbgpt.rag.transformer.base import ExtractorBase
 
 logger = logging.getLogger(__name__)
@@ -14,6 +21,10 @@ logger = logging.getLogger(__name__)
 class LLMExtractor(ExtractorBase, ABC):
     """LLMExtractor class."""
 
+    # The priority class of the requests, the extractors run in the background
+    # use the batch priority
+    priority: Optional[str] = None
+
     def __init__(self, llm_client: LLMClient, model_name: str, prompt_template: str):
         """Initialize the LLMExtractor."""
         self._llm_client = llm_client
@@ -58,6 +69,28 @@ class LLMExtractor(ExtractorBase, ABC):
         if limit and limit < 1:
             raise ValueError("optional argument limit >= 1")
 
+        response_text = await self._generate(text, history)
+        if not response_text:
+            return []
+        return self._parse_response(response_text, limit)
+
+    async def _generate(self, text: str, history: str = None) -> Optional[str]:
+        """Request the LLM and return the response text.
+
+        Returns None if the request failed or the response has no text.
+        """
+        response = await self._request_llm(text, history)
+
+        if not response.success:
+            code = str(response.error_code)
+            reason = response.text
+            logger.error(f"request llm failed ({code}) {reason}")
+            return None
+
+        return response.text if response.has_text else None
+
+    async def _request_llm(self, text: str, history: str = None) -> ModelOutput:
+        """Request the LLM and return the model output."""
         template = HumanPromptTemplate.from_template(self._prompt_template)
 
         messages = (
@@ -75,19 +108,12 @@ class LLMExtractor(ExtractorBase, ABC):
             logger.info(f"Using model {self._model_name} to extract")
 
         model_messages = ModelMessage.from_base_messages(messages)
-        request = ModelRequest(model=self._model_name, messages=model_messages)
-        response = await self._llm_client.generate(request=request)
-
-        if not response.success:
-            code = str(response.error_code)
-            reason = response.text
-            logger.error(f"request llm failed ({code}) {reason}")
-            return []
-
-        if response.has_text:
-            return self._parse_response(response.text, limit)
-        else:
-            return []
+        request = ModelRequest(
+            model=self._model_name,
+            messages=model_messages,
+            context=ModelRequestContext(priority=self.priority),
+        )
+        return await self._llm_client.generate(request=request)
 
     def truncate(self):
         """Do nothing by default."""
@@ -3,7 +3,13 @@
 import logging
 from abc import ABC
 
-from dbgpt.core import HumanPromptTemplate, LLMClient, ModelMessage, ModelRequest
+from dbgpt.core import (
+    HumanPromptTemplate,
+    LLMClient,
+    ModelMessage,
+    ModelRequest,
+    ModelRequestContext,
+)
 from dbgpt.rag.transformer.base import SummarizerBase
 
 logger = logging.getLogger(__name__)
@@ -32,7 +38,11 @@ class LLMSummarizer(SummarizerBase, ABC):
             logger.info(f"Using model {self._model_name} to extract")
 
         model_messages = ModelMessage.from_base_messages(messages)
-        request = ModelRequest(model=self._model_name, messages=model_messages)
+        request = ModelRequest(
+            model=self._model_name,
+            messages=model_messages,
+            context=ModelRequestContext(priority="batch"),
+        )
         response = await self._llm_client.generate(request=request)
 
         if not response.success:
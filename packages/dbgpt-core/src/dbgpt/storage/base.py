@@ -245,6 +245,66 @@ class IndexStoreBase(ABC):
             self.similar_search_with_scores, query, topk, score_threshold, filters
         )
 
+    def batch_similar_search_with_scores(
+        self,
+        texts: List[str],
+        topk: int,
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[List[Chunk]]:
+        """Similar search with scores for multiple queries.
+
+        Index stores that support multi-vector queries should override this
+        method to search all the queries in one round trip.
+
+        Args:
+            texts(List[str]): The query texts.
+            topk(int): The number of similar documents to return for each query.
+            score_threshold(float): Optional, a floating point value between 0 to 1
+            filters(Optional[MetadataFilters]): metadata filters.
+        Return:
+            List[List[Chunk]]: The similar documents, in the same order as texts.
+        """
+        return [
+            self.similar_search_with_scores(text, topk, score_threshold, filters)
+            for text in texts
+        ]
+
+    async def abatch_similar_search_with_scores(
+        self,
+        texts: List[str],
+        topk: int,
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> List[List[Chunk]]:
+        """Async similar search with scores for multiple queries.
+
+        The queries are searched concurrently, at most `max_concurrency` at a time.
+
+        Args:
+            texts(List[str]): The query texts.
+            topk(int): The number of similar documents to return for each query.
+            score_threshold(float): Optional, a floating point value between 0 to 1
+            filters(Optional[MetadataFilters]): metadata filters.
+            max_concurrency(Optional[int]): Max number of concurrent searches,
+                no limit if not set.
+
+        Return:
+            List[List[Chunk]]: The similar documents, in the same order as texts.
+        """
+        if not texts:
+            return []
+        semaphore = asyncio.Semaphore(max_concurrency or len(texts))
+
+        async def _search(text: str) -> List[Chunk]:
+            async with semaphore:
+                return await self.asimilar_search_with_scores(
+                    text, topk, score_threshold, filters
+                )
+
+        return list(await asyncio.gather(*(_search(text) for text in texts)))
+
     def full_text_search(
         self, text: str, topk: int, filters: Optional[MetadataFilters] = None
     ) -> List[Chunk]:
@@ -12,6 +12,7 @@ from dbgpt.core.awel import (
     StreamifyAbsOperator,
     TransformStreamAbsOperator,
 )
+from dbgpt.util.stream_utils import aclosing_stream
 
 from .llm_cache import LLMCacheClient, LLMCacheKey, LLMCacheValue
 from .manager import CacheManager
@@ -191,13 +192,14 @@ class ModelStreamSaveCacheOperator(
         """
         llm_cache_key: Optional[LLMCacheKey] = None
         outputs = []
-        async for out in input_value:
-            if not llm_cache_key:
-                llm_cache_key = await self.current_dag_context.get_from_share_data(
-                    _LLM_MODEL_INPUT_VALUE_KEY
-                )
-            outputs.append(out)
-            yield out
+        async with aclosing_stream(input_value):
+            async for out in input_value:
+                if not llm_cache_key:
+                    llm_cache_key = await self.current_dag_context.get_from_share_data(
+                        _LLM_MODEL_INPUT_VALUE_KEY
+                    )
+                outputs.append(out)
+                yield out
         if llm_cache_key and _is_success_model_output(outputs):
             llm_cache_value: LLMCacheValue = self._client.new_value(output=outputs)
             await self._client.set(llm_cache_key, llm_cache_value)
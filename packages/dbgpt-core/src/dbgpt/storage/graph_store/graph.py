@@ -5,12 +5,33 @@ import json
 import logging
 import re
 from abc import ABC, abstractmethod
+from array import array
 from collections import defaultdict
 from enum import Enum
-from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 logger = logging.getLogger(__name__)
 
+K = TypeVar("K", bound=Hashable)
+E = TypeVar("E", bound=Hashable)
+
+# The adjacency index is rebuilt after the graph has been searched once per this
+# many vertices and edges without a change, so the rebuild cost is amortized over
+# the searches. Until then, the searches traverse the edge maps directly.
+_ADJACENCY_INDEX_ELEMS_PER_SEARCH = 8
+
 
 class GraphElemType(Enum):
     """Type of element in graph."""
@@ -297,6 +318,13 @@ class MemoryGraph(Graph):
         self._oes: Any = defaultdict(lambda: defaultdict(set))
         self._ies: Any = defaultdict(lambda: defaultdict(set))
 
+        # compact adjacency index for traversal, rebuilt lazily when the searches
+        # outnumber the changes
+        self._version = 0
+        self._adjacency: Optional["_AdjacencyIndex"] = None
+        self._stale_searches = 0
+        self._stale_version = 0
+
     @property
     def vertex_count(self):
         """Return the number of vertices in the graph."""
@@ -316,6 +344,7 @@ class MemoryGraph(Graph):
                 self._vs[vertex.vid].props.update(vertex.props)
         else:
             self._vs[vertex.vid] = vertex
+            self._version += 1
 
         # update metadata
         self._vertex_prop_keys.update(vertex.props.keys())
@@ -339,6 +368,7 @@ class MemoryGraph(Graph):
         # update metadata
         self._edge_prop_keys.update(edge.props.keys())
         self._edge_count += 1
+        self._version += 1
         return True
 
     def upsert_graph(self, graph: "MemoryGraph"):
@@ -420,6 +450,7 @@ class MemoryGraph(Graph):
         for vid in vids:
             self.del_neighbor_edges(vid, Direction.BOTH)
             self._vs.pop(vid, None)
+        self._version += 1
 
     def del_edges(self, sid: str, tid: str, name: str, **props):
         """Delete edges."""
@@ -428,8 +459,10 @@ class MemoryGraph(Graph):
         def remove_matches(es: Set[Edge]):
             return set(
                 filter(
-                    lambda e: not (
-                        (name == e.name if name else True) and e.has_props(**props)
+                    lambda e: (
+                        not (
+                            (name == e.name if name else True) and e.has_props(**props)
+                        )
                     ),
                     es,
                 )
@@ -439,6 +472,7 @@ class MemoryGraph(Graph):
         self._ies[tid][sid] = remove_matches(self._ies[tid][sid])
 
         self._edge_count -= old_edge_cnt - len(self._oes[sid][tid])
+        self._version += 1
 
     def del_neighbor_edges(self, vid: str, direction: Direction = Direction.OUT):
         """Delete all neighbor edges."""
@@ -454,6 +488,7 @@ class MemoryGraph(Graph):
 
         if direction in [Direction.IN, Direction.BOTH]:
             del_index(self._ies, self._oes)
+        self._version += 1
 
     def search(
         self,
@@ -462,52 +497,83 @@ class MemoryGraph(Graph):
         depth: Optional[int] = None,
         fan: Optional[int] = None,
         limit: Optional[int] = None,
+        frontier_limit: Optional[int] = None,
     ) -> "MemoryGraph":
-        """Search the graph from a vertex with specified parameters."""
-        subgraph = MemoryGraph()
-
-        for vid in vids:
-            self.__search(vid, direct, depth, fan, limit, 0, set(), subgraph)
+        """Search the graph from vertices with specified parameters.
+
+        The search is an iterative breadth-first traversal, so it neither hits the
+        recursion limit nor copies vertices and edges into the subgraph hop by
+        hop. It runs over the compact adjacency index when the graph is searched
+        much more often than it changes, over the edge maps otherwise.
+
+        Args:
+            vids(List[str]): The start vertex ids.
+            direct(Direction): The direction of edges to follow.
+            depth(Optional[int]): Max number of hops, no limit if not set.
+            fan(Optional[int]): Max number of edges followed from each vertex.
+            limit(Optional[int]): Max number of edges in the result, the traversal
+                stops as soon as it is reached.
+            frontier_limit(Optional[int]): Max number of vertices expanded in each
+                hop after the start vertices.
+        """
+        index = self._adjacency_index()
+        if index is not None:
+            visited, edges = index.traverse(
+                vids, direct, depth, fan, limit, frontier_limit
+            )
+        else:
+            visited, edges = _breadth_first(
+                (vid for vid in vids if vid in self._vs),
+                lambda vid: self._neighbors(vid, direct),
+                depth,
+                fan,
+                limit,
+                frontier_limit,
+            )
 
+        subgraph = MemoryGraph()
+        for vid in visited:
+            subgraph.upsert_vertex(self.get_vertex(vid))
+        for edge in edges:
+            subgraph.append_edge(edge)
         return subgraph
 
-    def __search(
-        self,
-        vid: str,
-        direct: Direction,
-        depth: Optional[int],
-        fan: Optional[int],
-        limit: Optional[int],
-        _depth: int,
-        _visited: Set,
-        _subgraph: "MemoryGraph",
-    ):
-        if vid in _visited or depth and _depth >= depth:
-            return
-
-        # visit vertex
-        if not self.has_vertex(vid):
-            return
-        _subgraph.upsert_vertex(self.get_vertex(vid))
-        _visited.add(vid)
-
-        # visit edges
-        nids = set()
-        for edge in self.get_neighbor_edges(vid, direct, fan):
-            if limit and _subgraph.edge_count >= limit:
-                return
-
-            # append edge success then visit new vertex
-            if _subgraph.append_edge(edge):
-                nid = edge.nid(vid)
-                if nid not in _visited:
-                    nids.add(nid)
-
-        # next hop
-        for nid in nids:
-            self.__search(
-                nid, direct, depth, fan, limit, _depth + 1, _visited, _subgraph
+    def _adjacency_index(self) -> Optional["_AdjacencyIndex"]:
+        """Return the adjacency index, None if it is stale and not worth rebuilding.
+
+        A single change followed by a search does not rebuild the index over the
+        whole graph, it is rebuilt when enough searches have run since the last
+        change.
+        """
+        if self._adjacency is not None and self._adjacency.version == self._version:
+            return self._adjacency
+        if self._stale_version != self._version:
+            self._stale_version = self._version
+            self._stale_searches = 0
+        self._stale_searches += 1
+        size = len(self._vs) + self._edge_count
+        if self._stale_searches * _ADJACENCY_INDEX_ELEMS_PER_SEARCH < size:
+            return None
+        self._adjacency = _AdjacencyIndex(self)
+        return self._adjacency
+
+    def _neighbors(self, vid: str, direct: Direction) -> Iterator[Tuple[str, Edge]]:
+        """Return (neighbor id, edge) pairs of a vertex from the edge maps."""
+        if direct == Direction.OUT:
+            return ((nid, e) for nid, es in self._oes.get(vid, {}).items() for e in es)
+        if direct == Direction.IN:
+            return ((nid, e) for nid, es in self._ies.get(vid, {}).items() for e in es)
+        if direct == Direction.BOTH:
+            oes = self._neighbors(vid, Direction.OUT)
+            # self loops are both out and in edges
+            ies = ((n, e) for n, e in self._neighbors(vid, Direction.IN) if n != vid)
+            return (
+                ne
+                for pair in itertools.zip_longest(oes, ies)
+                for ne in pair
+                if ne is not None
             )
+        raise ValueError(f"Invalid direction: {direct}")
 
     def schema(self) -> Dict[str, Any]:
         """Return schema."""
@@ -548,6 +614,8 @@ class MemoryGraph(Graph):
         self._vertex_prop_keys.clear()
         self._edge_prop_keys.clear()
         self._edge_count = 0
+        self._version += 1
+        self._adjacency = None
 
         # clean data and index
         self._vs.clear()
@@ -576,3 +644,145 @@ class MemoryGraph(Graph):
         digraph = digraph.replace('digraph ""', f"digraph {name}")
         digraph = re.sub(r"key=\d+,?\s*", "", digraph)
         return digraph
+
+
+class _AdjacencyIndex:
+    """Compact adjacency index of a MemoryGraph.
+
+    Vertices are numbered with integer ids, and the out and in edges of each
+    vertex are kept in CSR arrays: the neighbors of vertex `i` are
+    `targets[offsets[i]:offsets[i + 1]]`. Each edge has an integer id, which is
+    its position in the out-edge arrays.
+    """
+
+    def __init__(self, graph: MemoryGraph):
+        self.version = graph._version
+        self.vids: List[str] = list(graph._vs.keys())
+        self.ids: Dict[str, int] = {vid: i for i, vid in enumerate(self.vids)}
+        self.edges: List[Edge] = []
+
+        edge_ids: Dict[int, int] = {}
+        self.out_offsets, self.out_targets, self.out_edges = self._build(
+            graph._oes, edge_ids, is_out=True
+        )
+        self.in_offsets, self.in_targets, self.in_edges = self._build(
+            graph._ies, edge_ids, is_out=False
+        )
+
+    def _build(
+        self, index: Dict[str, Dict[str, Set[Edge]]], edge_ids: Dict[int, int], is_out
+    ) -> Tuple[array, array, array]:
+        offsets = array("q", [0])
+        targets = array("q")
+        eids = array("q")
+        for vid in self.vids:
+            for nid, es in index.get(vid, {}).items():
+                n = self.ids.get(nid)
+                if n is None:
+                    continue
+                for edge in es:
+                    if is_out:
+                        edge_ids[id(edge)] = len(self.edges)
+                        self.edges.append(edge)
+                    eid = edge_ids.get(id(edge))
+                    if eid is None:
+                        continue
+                    targets.append(n)
+                    eids.append(eid)
+            offsets.append(len(targets))
+        return offsets, targets, eids
+
+    def neighbors(self, v: int, direct: Direction) -> Iterator[Tuple[int, int]]:
+        """Return (neighbor id, edge id) pairs of a vertex."""
+        if direct == Direction.OUT:
+            start, end = self.out_offsets[v], self.out_offsets[v + 1]
+            return zip(self.out_targets[start:end], self.out_edges[start:end])
+        if direct == Direction.IN:
+            start, end = self.in_offsets[v], self.in_offsets[v + 1]
+            return zip(self.in_targets[start:end], self.in_edges[start:end])
+        if direct == Direction.BOTH:
+            oes = self.neighbors(v, Direction.OUT)
+            # self loops are both out and in edges
+            ies = ((n, e) for n, e in self.neighbors(v, Direction.IN) if n != v)
+            return (
+                ne
+                for pair in itertools.zip_longest(oes, ies)
+                for ne in pair
+                if ne is not None
+            )
+        raise ValueError(f"Invalid direction: {direct}")
+
+    def traverse(
+        self,
+        vids: List[str],
+        direct: Direction,
+        depth: Optional[int] = None,
+        fan: Optional[int] = None,
+        limit: Optional[int] = None,
+        frontier_limit: Optional[int] = None,
+    ) -> Tuple[List[str], List[Edge]]:
+        """Traverse breadth first from vertices, level by level.
+
+        Returns:
+            Tuple[List[str], List[Edge]]: The visited vertex ids and the edges
+                followed, in visiting order.
+        """
+        visited, eids = _breadth_first(
+            (v for v in map(self.ids.get, vids) if v is not None),
+            lambda v: self.neighbors(v, direct),
+            depth,
+            fan,
+            limit,
+            frontier_limit,
+        )
+        return [self.vids[v] for v in visited], [self.edges[e] for e in eids]
+
+
+def _breadth_first(
+    starts: Iterable[K],
+    neighbors: Callable[[K], Iterator[Tuple[K, E]]],
+    depth: Optional[int] = None,
+    fan: Optional[int] = None,
+    limit: Optional[int] = None,
+    frontier_limit: Optional[int] = None,
+) -> Tuple[List[K], List[E]]:
+    """Traverse breadth first from vertices, level by level.
+
+    Returns:
+        Tuple[List[K], List[E]]: The visited vertices and the edges followed, in
+            visiting order.
+    """
+    visited: Set[K] = set()
+    seen_edges: Set[E] = set()
+    visited_vertices: List[K] = []
+    edges: List[E] = []
+
+    frontier: List[K] = []
+    for v in starts:
+        if v not in visited:
+            visited.add(v)
+            frontier.append(v)
+
+    level = 0
+    while frontier and not (depth and level >= depth):
+        if frontier_limit and level > 0:
+            frontier = frontier[:frontier_limit]
+        next_frontier: List[K] = []
+        for v in frontier:
+            visited_vertices.append(v)
+            vertex_neighbors = neighbors(v)
+            if fan:
+                vertex_neighbors = itertools.islice(vertex_neighbors, fan)
+            for n, e in vertex_neighbors:
+                if limit and len(edges) >= limit:
+                    return visited_vertices, edges
+                if e in seen_edges:
+                    continue
+                seen_edges.add(e)
+                edges.append(e)
+                if n not in visited:
+                    visited.add(n)
+                    next_frontier.append(n)
+        frontier = next_frontier
+        level += 1
+    return visited_vertices, edges
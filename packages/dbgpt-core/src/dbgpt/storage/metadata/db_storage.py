@@ -109,6 +109,17 @@ class SQLAlchemyStorage(StorageInterface[T, BaseModel]):
             if model_instance:
                 session.delete(model_instance)
 
+    def _filter_conditions(self, query: BaseQuery, conditions: Dict) -> BaseQuery:
+        for key, value in conditions.items():
+            if value is None:
+                continue
+            column = getattr(self._model_class, key)
+            if isinstance(value, (list, tuple, set)):
+                query = query.filter(column.in_(value))
+            else:
+                query = query.filter(column == value)
+        return query
+
     def query(self, spec: QuerySpec, cls: Type[T]) -> List[T]:
         """Query data from the storage.
 
@@ -118,9 +129,7 @@ class SQLAlchemyStorage(StorageInterface[T, BaseModel]):
         """
         with self.session() as session:
             query = session.query(self._model_class)
-            for key, value in spec.conditions.items():
-                if value is not None:
-                    query = query.filter(getattr(self._model_class, key) == value)
+            query = self._filter_conditions(query, spec.conditions)
             if spec.limit is not None:
                 query = query.limit(spec.limit)
             if spec.offset is not None:
@@ -140,7 +149,5 @@ class SQLAlchemyStorage(StorageInterface[T, BaseModel]):
         """
         with self.session() as session:
             query = session.query(self._model_class)
-            for key, value in spec.conditions.items():
-                if value is not None:
-                    query = query.filter(getattr(self._model_class, key) == value)
+            query = self._filter_conditions(query, spec.conditions)
             return query.count()
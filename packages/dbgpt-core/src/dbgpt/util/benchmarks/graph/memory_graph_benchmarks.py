@@ -0,0 +1,124 @@
+"""Benchmark of MemoryGraph search on large random graphs.
+
+The searches run twice, over the adjacency index and over the edge maps (the
+path taken when the graph changes more often than it is searched).
+
+Run with:
+
+    cd packages/dbgpt-core/src
+    python dbgpt/util/benchmarks/graph/memory_graph_benchmarks.py \
+        --vertices 200000 --edges 2000000 --depth 3 --fan 50
+"""
+
+import argparse
+import random
+import time
+from typing import List, Optional
+
+from dbgpt.storage.graph_store.graph import (
+    Direction,
+    Edge,
+    MemoryGraph,
+    _AdjacencyIndex,
+)
+
+
+def build_graph(vertices: int, edges: int, seed: int) -> MemoryGraph:
+    """Build a random graph with a few hub vertices."""
+    rnd = random.Random(seed)
+    graph = MemoryGraph()
+    hubs = max(1, vertices // 1000)
+    for i in range(edges):
+        # one edge in ten starts from a hub, like popular entities in a kg
+        sid = rnd.randrange(hubs) if i % 10 == 0 else rnd.randrange(vertices)
+        tid = rnd.randrange(vertices)
+        graph.append_edge(Edge(f"v{sid}", f"v{tid}", "relation"))
+    return graph
+
+
+def run_search(
+    graph: MemoryGraph,
+    index: Optional[_AdjacencyIndex],
+    starts: List[str],
+    direct: Direction,
+    depth: int,
+    fan: int,
+    limit: int,
+    frontier_limit: int,
+) -> List[float]:
+    """Search from each start vertex, return the latencies in ms.
+
+    The searches run over the given adjacency index, or over the edge maps if it
+    is None.
+    """
+    # Pin the search path instead of letting the graph decide when to build the
+    # index
+    graph._adjacency_index = lambda: index
+    latencies = []
+    for vid in starts:
+        start = time.perf_counter()
+        graph.search(
+            [vid],
+            direct,
+            depth=depth or None,
+            fan=fan or None,
+            limit=limit or None,
+            frontier_limit=frontier_limit or None,
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+    del graph._adjacency_index
+    return latencies
+
+
+def report(name: str, latencies: List[float]):
+    """Print the latency percentiles of the searches."""
+    latencies = sorted(latencies)
+    print(
+        f"{name}: {len(latencies)} searches, "
+        f"avg: {sum(latencies) / len(latencies):.2f}ms, "
+        f"p50: {latencies[len(latencies) // 2]:.2f}ms, "
+        f"p99: {latencies[int(len(latencies) * 0.99)]:.2f}ms, "
+        f"max: {latencies[-1]:.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vertices", type=int, default=100000)
+    parser.add_argument("--edges", type=int, default=1000000)
+    parser.add_argument("--direction", type=str, default="BOTH")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fan", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=0)
+    parser.add_argument("--frontier_limit", type=int, default=0)
+    parser.add_argument("--searches", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    graph = build_graph(args.vertices, args.edges, args.seed)
+    print(
+        f"Built graph with {graph.vertex_count} vertices and {graph.edge_count} "
+        f"edges in {time.perf_counter() - start:.2f}s"
+    )
+
+    start = time.perf_counter()
+    index = _AdjacencyIndex(graph)
+    print(f"Built adjacency index in {time.perf_counter() - start:.2f}s")
+
+    rnd = random.Random(args.seed)
+    starts = [f"v{rnd.randrange(args.vertices)}" for _ in range(args.searches)]
+    search_args = (
+        starts,
+        Direction[args.direction.upper()],
+        args.depth,
+        args.fan,
+        args.limit,
+        args.frontier_limit,
+    )
+    report("indexed", run_search(graph, index, *search_args))
+    report("scan", run_search(graph, None, *search_args))
+
+
+if __name__ == "__main__":
+    main()
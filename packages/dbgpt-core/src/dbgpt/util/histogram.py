@@ -0,0 +1,93 @@
+"""Histogram of the latencies in a rolling time window."""
+
+import time
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+# The upper bounds of the histogram buckets in seconds, from 1ms to about 17 minutes
+_BUCKET_BOUNDS: Tuple[float, ...] = tuple(0.001 * 2**i for i in range(21))
+_PERCENTILES = (50, 90, 99)
+
+
+class _Slot:
+    """The histogram of a time slot."""
+
+    __slots__ = ("index", "counts", "total", "min", "max")
+
+    def __init__(self, index: int):
+        self.index = index
+        # The last bucket is for the values larger than all the bounds
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+
+def _bucket_index(value: float) -> int:
+    for i, bound in enumerate(_BUCKET_BOUNDS):
+        if value <= bound:
+            return i
+    return len(_BUCKET_BOUNDS)
+
+
+class RollingHistogram:
+    """Histogram of the values recorded in a rolling time window.
+
+    The window is split into slots, each slot is a histogram with fixed exponential
+    buckets. The slots out of the window are dropped, so the memory is bounded by
+    the number of slots. The percentiles are estimated by the bucket bounds.
+    """
+
+    def __init__(self, window_seconds: float = 300, num_slots: int = 10):
+        """Create a rolling histogram.
+
+        Args:
+            window_seconds(float): The seconds of the window.
+            num_slots(int): The number of slots the window is split into.
+        """
+        self._num_slots = max(1, num_slots)
+        self._slot_seconds = window_seconds / self._num_slots
+        self._slots: Deque[_Slot] = deque(maxlen=self._num_slots)
+
+    def _current_index(self) -> int:
+        return int(time.monotonic() // self._slot_seconds)
+
+    def record(self, value: float) -> None:
+        """Record a value."""
+        index = self._current_index()
+        if not self._slots or self._slots[-1].index != index:
+            self._slots.append(_Slot(index))
+        slot = self._slots[-1]
+        slot.counts[_bucket_index(value)] += 1
+        slot.total += value
+        slot.min = min(slot.min, value)
+        slot.max = max(slot.max, value)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Get the count, sum, min, max, mean and percentiles in the window."""
+        oldest = self._current_index() - self._num_slots
+        counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        total, min_value, max_value = 0.0, float("inf"), 0.0
+        for slot in self._slots:
+            if slot.index <= oldest:
+                continue
+            for i, c in enumerate(slot.counts):
+                counts[i] += c
+            total += slot.total
+            min_value = min(min_value, slot.min)
+            max_value = max(max_value, slot.max)
+        count = sum(counts)
+        result: Dict[str, float] = {"count": count, "sum": total}
+        if not count:
+            return result
+        result.update(min=min_value, max=max_value, mean=total / count)
+        for p in _PERCENTILES:
+            rank = count * p / 100
+            cumulative = 0
+            for i, c in enumerate(counts):
+                cumulative += c
+                if cumulative >= rank:
+                    bound = _BUCKET_BOUNDS[i] if i < len(_BUCKET_BOUNDS) else max_value
+                    result[f"p{p}"] = min(max(bound, min_value), max_value)
+                    break
+        return result
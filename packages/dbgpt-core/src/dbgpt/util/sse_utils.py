@@ -0,0 +1,199 @@
+"""The SSE streaming response of the HTTP APIs and the AWEL HTTP triggers.
+
+It requires starlette, import it only when a streaming response is created.
+"""
+
+import asyncio
+import json
+import logging
+import zlib
+from functools import partial
+from typing import Any, AsyncIterator, List, Mapping, Optional
+
+import anyio
+from starlette.background import BackgroundTask
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from dbgpt._private.pydantic import BaseModel, model_to_json
+
+logger = logging.getLogger(__name__)
+
+# The boilerplate of the SSE events, encoded once
+_SSE_DATA_PREFIX = b"data: "
+_SSE_EVENT_END = b"\n\n"
+
+
+def _encode_item(item: Any, charset: str) -> bytes:
+    """Encode an item of the stream.
+
+    The strings and bytes are sent as they are, the operators format them. The
+    models and the dicts are sent as the json data of a SSE event.
+    """
+    if isinstance(item, bytes):
+        return item
+    if isinstance(item, str):
+        return item.encode(charset)
+    if isinstance(item, (bytearray, memoryview)):
+        return bytes(item)
+    if isinstance(item, BaseModel):
+        data = model_to_json(item, exclude_unset=True)
+    elif isinstance(item, (dict, list)):
+        data = json.dumps(item, ensure_ascii=False)
+    else:
+        return str(item).encode(charset)
+    return _SSE_DATA_PREFIX + data.encode(charset) + _SSE_EVENT_END
+
+
+def _accepts_gzip(scope: Scope) -> bool:
+    for key, value in scope.get("headers", []):
+        if key == b"accept-encoding":
+            return b"gzip" in value.lower()
+    return False
+
+
+class SSEStreamingResponse(StreamingResponse):
+    """Streaming response which coalesces the items into frames.
+
+    The first item is sent at once, the following items are sent together when
+    they arrive within the flush interval, a frame is sent at once when it reaches
+    the max frame size. If gzip is enabled and accepted by the client, every frame
+    is compressed and flushed.
+
+    When the client disconnects, the stream is cancelled and closed, so the DAG
+    behind it stops instead of running to the end.
+    """
+
+    def __init__(
+        self,
+        content: AsyncIterator[Any],
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+        flush_interval: float = 0.02,
+        max_frame_bytes: int = 16384,
+        gzip: bool = False,
+        gzip_level: int = 6,
+    ) -> None:
+        """Create a SSE streaming response.
+
+        Args:
+            content (AsyncIterator[Any]): The stream of the response.
+            flush_interval (float): The max seconds an item waits to be sent, 0
+                means sending every item at once.
+            max_frame_bytes (int): The max bytes of a frame.
+            gzip (bool): Whether to compress the response if the client accepts
+                gzip.
+            gzip_level (int): The compression level of gzip.
+        """
+        super().__init__(content, status_code, headers, media_type, background)
+        self._flush_interval = flush_interval
+        self._max_frame_bytes = max_frame_bytes
+        self._gzip = gzip
+        self._gzip_level = gzip_level
+        self._compressor: Optional[Any] = None
+        self._pending_item: Optional[asyncio.Future] = None
+        self.disconnected = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Send the response, stop the stream when the client disconnects."""
+        if self._gzip and _accepts_gzip(scope):
+            self._compressor = zlib.compressobj(self._gzip_level, zlib.DEFLATED, 31)
+            self.raw_headers = [
+                (k, v) for k, v in self.raw_headers if k != b"content-length"
+            ]
+            self.raw_headers.append((b"content-encoding", b"gzip"))
+            self.raw_headers.append((b"vary", b"Accept-Encoding"))
+        try:
+            async with anyio.create_task_group() as task_group:
+
+                async def wrap(func) -> None:
+                    await func()
+                    task_group.cancel_scope.cancel()
+
+                task_group.start_soon(wrap, partial(self.stream_response, send))
+                await wrap(partial(self._listen_for_disconnect, receive))
+        finally:
+            await self._close_stream()
+        if self.background is not None:
+            await self.background()
+
+    async def _listen_for_disconnect(self, receive: Receive) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                self.disconnected = True
+                return
+
+    async def _close_stream(self) -> None:
+        """Close the stream, the DAG behind it is stopped."""
+        pending, self._pending_item = self._pending_item, None
+        if pending is not None:
+            if not pending.done():
+                pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        if self.disconnected:
+            logger.info("Client disconnected, stop the streaming response")
+        aclose = getattr(self.body_iterator, "aclose", None)
+        if aclose is not None:
+            try:
+                await aclose()
+            except Exception as e:
+                logger.warning(f"Close the stream of the response failed: {e}")
+
+    async def _send_frame(self, send: Send, frame: List[bytes]) -> None:
+        data = b"".join(frame)
+        if self._compressor is not None:
+            data = self._compressor.compress(data) + self._compressor.flush(
+                zlib.Z_SYNC_FLUSH
+            )
+        await send({"type": "http.response.body", "body": data, "more_body": True})
+
+    async def stream_response(self, send: Send) -> None:
+        """Send the frames of the stream."""
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        await self._stream_frames(send)
+        tail = self._compressor.flush() if self._compressor is not None else b""
+        await send({"type": "http.response.body", "body": tail, "more_body": False})
+
+    async def _stream_frames(self, send: Send) -> None:
+        loop = asyncio.get_running_loop()
+        iterator = self.body_iterator.__aiter__()
+        frame: List[bytes] = []
+        frame_size = 0
+        last_flush = float("-inf")
+        self._pending_item = asyncio.ensure_future(iterator.__anext__())
+        while True:
+            timeout = None
+            if frame:
+                timeout = max(0.0, last_flush + self._flush_interval - loop.time())
+            done, _ = await asyncio.wait({self._pending_item}, timeout=timeout)
+            if done:
+                pending, self._pending_item = self._pending_item, None
+                try:
+                    item = pending.result()
+                except StopAsyncIteration:
+                    break
+                # Read the next item in a task while the frame is sent, so the
+                # cancellation on disconnect reaches the producers of the stream
+                self._pending_item = asyncio.ensure_future(iterator.__anext__())
+                data = _encode_item(item, self.charset)
+                frame.append(data)
+                frame_size += len(data)
+                if (
+                    frame_size < self._max_frame_bytes
+                    and loop.time() - last_flush < self._flush_interval
+                ):
+                    continue
+            await self._send_frame(send, frame)
+            frame, frame_size = [], 0
+            last_flush = loop.time()
+        if frame:
+            await self._send_frame(send, frame)
@@ -0,0 +1,80 @@
+"""Helpers to stop the producers of a stream when its consumer stops early.
+
+When a consumer stops reading a stream, e.g. the HTTP client disconnects, only the
+outermost async generator is closed, the streams it reads are left suspended until
+they are garbage collected, and the model behind them keeps generating. Every layer
+which reads a stream should close it when leaving.
+"""
+
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+@asynccontextmanager
+async def aclosing_stream(stream: AsyncIterator[T]) -> AsyncIterator[AsyncIterator[T]]:
+    """Close the stream when leaving the context, like `contextlib.aclosing`.
+
+    The streams without `aclose` are left as they are.
+
+    Examples:
+        .. code-block:: python
+
+            async def upper(stream: AsyncIterator[str]) -> AsyncIterator[str]:
+                async with aclosing_stream(stream):
+                    async for text in stream:
+                        yield text.upper()
+    """
+    try:
+        yield stream
+    finally:
+        aclose = getattr(stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+@contextmanager
+def closing_stream(stream: Iterable[T]) -> Iterator[Iterable[T]]:
+    """Close the blocking stream when leaving the context, if it can be closed."""
+    try:
+        yield stream
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+
+
+class _StopIteration(Exception):
+    pass
+
+
+def _next(iterator: Iterator[T]) -> T:
+    # StopIteration can not be raised into a future
+    try:
+        return next(iterator)
+    except StopIteration:
+        raise _StopIteration
+
+
+async def iterate_in_threadpool(iterator: Iterator[T]) -> AsyncIterator[T]:
+    """Iterate a blocking iterator in the thread pool.
+
+    Unlike `starlette.concurrency.iterate_in_threadpool`, the iterator is closed in
+    the thread pool when the consumer stops early, so a generator running a model
+    stops generating.
+    """
+    import anyio
+
+    try:
+        while True:
+            try:
+                # Not cancellable, the iterator is never closed while running
+                yield await anyio.to_thread.run_sync(_next, iterator)
+            except _StopIteration:
+                break
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            with anyio.CancelScope(shield=True):
+                await anyio.to_thread.run_sync(close)
@@ -0,0 +1,17 @@
+from ..histogram import RollingHistogram
+
+
+def test_rolling_histogram():
+    hist = RollingHistogram(window_seconds=60, num_slots=6)
+    assert hist.snapshot() == {"count": 0, "sum": 0.0}
+    for _ in range(90):
+        hist.record(0.001)
+    for _ in range(10):
+        hist.record(1.0)
+    snapshot = hist.snapshot()
+    assert snapshot["count"] == 100
+    assert snapshot["min"] == 0.001
+    assert snapshot["max"] == 1.0
+    assert snapshot["p50"] == 0.001
+    assert snapshot["p90"] == 0.001
+    assert 0.5 < snapshot["p99"] <= 1.0
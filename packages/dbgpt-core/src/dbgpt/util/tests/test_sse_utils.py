@@ -0,0 +1,149 @@
+import asyncio
+import gzip
+from typing import Any, AsyncIterator, Dict, List
+
+import pytest
+
+from ..sse_utils import SSEStreamingResponse
+
+
+async def _call(
+    response: SSEStreamingResponse, headers=None, disconnect_after: int = -1
+) -> List[Dict[str, Any]]:
+    """Call the response as an ASGI app, return the sent messages."""
+    messages: List[Dict[str, Any]] = []
+    disconnect = asyncio.Event()
+
+    async def receive():
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+        if len(messages) == disconnect_after:
+            disconnect.set()
+
+    scope = {"type": "http", "headers": headers or []}
+    await response(scope, receive, send)
+    return messages
+
+
+def _bodies(messages: List[Dict[str, Any]]) -> List[bytes]:
+    return [m["body"] for m in messages if m["type"] == "http.response.body"]
+
+
+async def _tokens(n: int, delay: float = 0) -> AsyncIterator[str]:
+    for i in range(n):
+        if delay:
+            await asyncio.sleep(delay)
+        yield f"data: {i}\n\n"
+
+
+@pytest.mark.asyncio
+async def test_sse_coalesce_frames():
+    response = SSEStreamingResponse(_tokens(100), flush_interval=0.5)
+    bodies = _bodies(await _call(response))
+    # The first item is sent at once, the others in the next frame
+    assert bodies[0] == b"data: 0\n\n"
+    assert len(bodies) == 3
+    assert b"".join(bodies) == b"".join(f"data: {i}\n\n".encode() for i in range(100))
+    assert bodies[-1] == b""
+
+
+@pytest.mark.asyncio
+async def test_sse_max_frame_bytes():
+    response = SSEStreamingResponse(
+        _tokens(100), flush_interval=0.5, max_frame_bytes=100
+    )
+    bodies = _bodies(await _call(response))
+    assert all(len(body) < 100 + 16 for body in bodies)
+    assert len(bodies) > 3
+
+
+@pytest.mark.asyncio
+async def test_sse_no_coalesce():
+    response = SSEStreamingResponse(_tokens(5), flush_interval=0)
+    bodies = _bodies(await _call(response))
+    assert bodies == [f"data: {i}\n\n".encode() for i in range(5)] + [b""]
+
+
+@pytest.mark.asyncio
+async def test_sse_encode_dict():
+    async def _stream():
+        yield {"text": "你好"}
+        yield b"raw"
+
+    response = SSEStreamingResponse(_stream(), flush_interval=0)
+    bodies = _bodies(await _call(response))
+    assert bodies[0] == 'data: {"text": "你好"}\n\n'.encode()
+    assert bodies[1] == b"raw"
+
+
+@pytest.mark.asyncio
+async def test_sse_gzip():
+    response = SSEStreamingResponse(_tokens(10, 0.01), flush_interval=0, gzip=True)
+    messages = await _call(response, headers=[(b"accept-encoding", b"gzip, br")])
+    headers = dict(messages[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    data = gzip.decompress(b"".join(_bodies(messages)))
+    assert data == b"".join(f"data: {i}\n\n".encode() for i in range(10))
+
+    # Not compressed if the client does not accept gzip
+    response = SSEStreamingResponse(_tokens(10), flush_interval=0, gzip=True)
+    messages = await _call(response)
+    assert b"content-encoding" not in dict(messages[0]["headers"])
+
+
+@pytest.mark.asyncio
+async def test_sse_close_stream_on_disconnect():
+    closed = asyncio.Event()
+    after_end = []
+
+    async def _endless():
+        try:
+            i = 0
+            while True:
+                await asyncio.sleep(0.01)
+                yield f"data: {i}\n\n"
+                i += 1
+        finally:
+            closed.set()
+
+    async def _after_end():
+        after_end.append(True)
+
+    from starlette.background import BackgroundTask
+
+    response = SSEStreamingResponse(
+        _endless(), flush_interval=0.02, background=BackgroundTask(_after_end)
+    )
+    messages = await asyncio.wait_for(_call(response, disconnect_after=3), 5)
+    assert response.disconnected
+    assert closed.is_set()
+    assert after_end == [True]
+    assert not any(m.get("more_body") is False for m in messages)
+
+
+@pytest.mark.asyncio
+async def test_sse_close_nested_streams_on_disconnect():
+    closed = []
+
+    async def _model():
+        try:
+            while True:
+                await asyncio.sleep(0.01)
+                yield "token"
+        finally:
+            closed.append("model")
+
+    async def _chat():
+        try:
+            async for token in _model():
+                yield f"data: {token}\n\n"
+        finally:
+            closed.append("chat")
+
+    response = SSEStreamingResponse(_chat(), flush_interval=0)
+    await asyncio.wait_for(_call(response, disconnect_after=3), 5)
+    # The cancellation reaches the model stream, not only the outermost one
+    assert closed == ["model", "chat"]
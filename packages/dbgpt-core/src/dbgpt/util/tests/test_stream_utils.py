@@ -0,0 +1,97 @@
+import threading
+from typing import AsyncIterator, Iterator, List
+
+import pytest
+
+from dbgpt.util.stream_utils import (
+    aclosing_stream,
+    closing_stream,
+    iterate_in_threadpool,
+)
+
+
+async def _numbers(closed: List[str], name: str) -> AsyncIterator[int]:
+    try:
+        for i in range(100):
+            yield i
+    finally:
+        closed.append(name)
+
+
+async def _double(stream: AsyncIterator[int], closed: List[str]):
+    try:
+        async with aclosing_stream(stream):
+            async for i in stream:
+                yield i * 2
+    finally:
+        closed.append("double")
+
+
+@pytest.mark.asyncio
+async def test_aclosing_stream():
+    closed: List[str] = []
+    stream = _double(_numbers(closed, "numbers"), closed)
+    assert await stream.__anext__() == 0
+    assert await stream.__anext__() == 2
+    await stream.aclose()
+    # The inner stream is closed with the outer one
+    assert closed == ["numbers", "double"]
+
+
+@pytest.mark.asyncio
+async def test_aclosing_stream_without_aclose():
+    class _Stream:
+        def __init__(self):
+            self._items = iter([1, 2])
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            try:
+                return next(self._items)
+            except StopIteration:
+                raise StopAsyncIteration
+
+    stream = _Stream()
+    async with aclosing_stream(stream):
+        assert [i async for i in stream] == [1, 2]
+
+
+def test_closing_stream():
+    closed = []
+
+    def _gen() -> Iterator[int]:
+        try:
+            yield from range(10)
+        finally:
+            closed.append(True)
+
+    with closing_stream(_gen()) as stream:
+        for i in stream:
+            if i == 2:
+                break
+    assert closed == [True]
+    with closing_stream([1, 2]) as stream:
+        assert list(stream) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_iterate_in_threadpool_stop_early():
+    closed_in: List[int] = []
+    main_thread = threading.get_ident()
+
+    def _gen() -> Iterator[int]:
+        try:
+            yield from range(100)
+        finally:
+            closed_in.append(threading.get_ident())
+
+    stream = iterate_in_threadpool(_gen())
+    assert [await stream.__anext__() for _ in range(3)] == [0, 1, 2]
+    await stream.aclose()
+    # The generator is closed in the thread pool
+    assert len(closed_in) == 1
+    assert closed_in[0] != main_thread
+
+    assert [i async for i in iterate_in_threadpool(iter([1, 2]))] == [1, 2]
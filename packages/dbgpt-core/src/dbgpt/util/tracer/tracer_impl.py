@@ -12,6 +12,7 @@ from dbgpt.configs.model_config import resolve_root_path
 from dbgpt.util.i18n_utils import _
 from dbgpt.util.module_utils import import_from_checked_string
 from dbgpt.util.parameter_utils import BaseParameters
+from dbgpt.util.stream_utils import aclosing_stream
 from dbgpt.util.tracer.base import (
     Span,
     SpanStorage,
@@ -193,8 +194,9 @@ class TracerManager:
         async def wrapper():
             span = self.start_span(operation_name, parent_span_id, span_type, metadata)
             try:
-                async for item in generator:
-                    yield item
+                async with aclosing_stream(generator):
+                    async for item in generator:
+                        yield item
             finally:
                 span.end()
 
@@ -1,21 +1,38 @@
 """GraphExtractor class."""
 
 import asyncio
+import hashlib
 import logging
 import re
-from typing import Dict, List, Optional
+from typing import (
+    AsyncIterator,
+    Dict,
+    List,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from cachetools import LRUCache
 
-from dbgpt.core import Chunk, LLMClient
+from dbgpt.core import Chunk, Embeddings, LLMClient
 from dbgpt.rag.transformer.llm_extractor import LLMExtractor
 from dbgpt.storage.graph_store.graph import Edge, Graph, MemoryGraph, Vertex
 from dbgpt.storage.vector_store.base import VectorStoreBase
 
 logger = logging.getLogger(__name__)
 
+# Raw LLM responses of extractions, keyed by the hash of model, prompt and text.
+# It is shared by all extractors, so rebuilding a graph skips unchanged chunks.
+_EXTRACTION_CACHE: MutableMapping[str, str] = LRUCache(maxsize=10000)
+
 
 class GraphExtractor(LLMExtractor):
     """GraphExtractor class."""
 
+    priority = "batch"
+
     def __init__(
         self,
         llm_client: LLMClient,
@@ -26,8 +43,30 @@ class GraphExtractor(LLMExtractor):
         max_threads: Optional[int] = 1,
         top_k: Optional[int] = 5,
         score_threshold: Optional[float] = 0.7,
+        embedding_fn: Optional[Embeddings] = None,
+        max_search_concurrency: Optional[int] = 16,
+        extract_timeout: Optional[float] = None,
+        extract_max_retries: Optional[int] = 0,
+        extraction_cache: Optional[MutableMapping[str, str]] = None,
+        enable_extraction_cache: bool = True,
     ):
-        """Initialize the GraphExtractor."""
+        """Initialize the GraphExtractor.
+
+        Args:
+            embedding_fn(Optional[Embeddings]): Embedding function used to find
+                similar chunks among the texts loaded together, if not set, only
+                the chunks already in history are used as context.
+            max_search_concurrency(Optional[int]): Max number of concurrent
+                similarity searches on chunk history.
+            extract_timeout(Optional[float]): Timeout in seconds of each LLM
+                extraction call, no timeout if not set.
+            extract_max_retries(Optional[int]): Max number of retries of a failed
+                or timed out LLM extraction call.
+            extraction_cache(Optional[MutableMapping[str, str]]): Cache of LLM
+                responses keyed by the hash of the chunk text, prompt and model, a
+                process-wide LRU cache is used if not set.
+            enable_extraction_cache(bool): Whether to cache the LLM responses.
+        """
         super().__init__(llm_client, model_name, GRAPH_EXTRACT_PT_CN)
         self._chunk_history = chunk_history
 
@@ -38,40 +77,111 @@ class GraphExtractor(LLMExtractor):
         self._max_threads = max_threads
         self._topk = top_k
         self._score_threshold = score_threshold
+        self._embedding_fn = embedding_fn
+        self._max_search_concurrency = max_search_concurrency
+        self._extract_timeout = extract_timeout
+        self._extract_max_retries = extract_max_retries or 0
+        self._extraction_cache: Optional[MutableMapping[str, str]] = None
+        if enable_extraction_cache:
+            self._extraction_cache = (
+                extraction_cache if extraction_cache is not None else _EXTRACTION_CACHE
+            )
 
     async def aload_chunk_context(
         self, texts: List[str], file_id: Optional[str] = None
     ) -> Dict[str, str]:
-        """Load chunk context."""
-        text_context_map: Dict[str, str] = {}
+        """Load chunk context.
 
-        for text in texts:
-            # Load similar chunks
-            chunks = await self._chunk_history.asimilar_search_with_scores(
-                text, self._topk, self._score_threshold
-            )
+        The similar chunks of all texts are searched in one batch, and all texts
+        are saved to chunk history in one bulk load afterwards.
+        """
+        # Keep the first occurrence of each text, the map is keyed by text
+        unique_texts = list(dict.fromkeys(texts))
+        if not unique_texts:
+            return {}
+
+        # Load similar chunks
+        history_chunks = await self._chunk_history.abatch_similar_search_with_scores(
+            unique_texts,
+            self._topk,
+            self._score_threshold,
+            max_concurrency=self._max_search_concurrency,
+        )
+        if self._embedding_fn:
+            # The texts are not in history yet, link each text to the similar
+            # texts before it, as if they were loaded one by one
+            batch_chunks = await self._asimilar_preceding_texts(unique_texts)
+            history_chunks = [
+                sorted(
+                    chunks + preceding,
+                    key=lambda chunk: chunk.score,
+                    reverse=True,
+                )[: self._topk]
+                for chunks, preceding in zip(history_chunks, batch_chunks)
+            ]
+
+        text_context_map: Dict[str, str] = {}
+        history_docs: List[Chunk] = []
+        for text, chunks in zip(unique_texts, history_chunks):
             history = [
                 f"Section {i + 1}:\n{chunk.content}" for i, chunk in enumerate(chunks)
             ]
-
-            # Save chunk to history
             # here we save the file_id into the metadata
-            await self._chunk_history.aload_document_with_limit(
-                [
-                    Chunk(
-                        content=text,
-                        metadata={"relevant_cnt": len(history), "file_id": file_id},
-                    )
-                ],
-                self._max_chunks_once_load,
-                self._max_threads,
+            history_docs.append(
+                Chunk(
+                    content=text,
+                    metadata={"relevant_cnt": len(history), "file_id": file_id},
+                )
             )
 
             # Save chunk context to map
             context = "\n".join(history) if history else ""
             text_context_map[text] = context
+
+        # Save chunks to history
+        await self._chunk_history.aload_document_with_limit(
+            history_docs,
+            self._max_chunks_once_load,
+            self._max_threads,
+        )
         return text_context_map
 
+    async def _asimilar_preceding_texts(self, texts: List[str]) -> List[List[Chunk]]:
+        """Find the similar texts loaded before each text in the same batch.
+
+        Each text is embedded as a query and as a document, as if it was searched
+        in and then loaded to the chunk history. The scores are cosine
+        similarities, the same kind as the scores of the chunk history.
+        """
+        import numpy as np
+
+        if len(texts) < 2:
+            return [[] for _ in texts]
+
+        def _normalize(embeddings: List[List[float]]):
+            array = np.array(embeddings, dtype=np.float32)
+            norms = np.linalg.norm(array, axis=1, keepdims=True)
+            return array / np.where(norms == 0, 1, norms)
+
+        query_embeddings, doc_embeddings = await asyncio.gather(
+            self._embedding_fn.aembed_queries(texts),
+            self._embedding_fn.aembed_documents(texts),
+        )
+        scores = _normalize(query_embeddings) @ _normalize(doc_embeddings).T
+
+        results: List[List[Chunk]] = []
+        for i in range(len(texts)):
+            preceding = scores[i, :i]
+            top = np.argsort(-preceding)[: self._topk]
+            results.append(
+                [
+                    Chunk(content=texts[j], score=float(preceding[j]))
+                    for j in top
+                    if preceding[j] >= (self._score_threshold or 0.0)
+                ]
+            )
+        return results
+
     async def extract(self, text: str, limit: Optional[int] = None) -> List:
         """Extract graphs from text.
 
@@ -93,50 +203,148 @@ class GraphExtractor(LLMExtractor):
     ) -> Optional[List[List[Graph]]]:
         """Extract graphs from chunks in batches.
 
+        `batch_size` is the max number of in-flight LLM calls, see
+        `aextract_iter`.
+
         Returns list of graphs in same order as input texts (text <-> graphs).
         """
-        if batch_size < 1:
-            raise ValueError("batch_size >= 1")
-
-        # 1. Load chunk context
-        text_context_map = await self.aload_chunk_context(texts, file_id)
-
         # Pre-allocate results list to maintain order
         graphs_list: List[List[Graph]] = [None] * len(texts)
+        async for idx, graphs in self.aextract_iter(
+            texts, max_in_flight=batch_size, limit=limit, file_id=file_id
+        ):
+            graphs_list[idx] = graphs
 
-        n_texts = len(texts)
-
-        for batch_idx in range(0, n_texts, batch_size):
-            start_idx = batch_idx
-            end_idx = min(start_idx + batch_size, n_texts)
-            batch_texts = texts[start_idx:end_idx]
+        assert all(x is not None for x in graphs_list), "All positions should be filled"
+        return graphs_list
 
-            # 2. Create tasks with their original indices
-            extraction_tasks = [
-                (
-                    idx,
-                    self._extract(text, text_context_map[text], limit),
+    async def aextract_iter(
+        self,
+        texts: List[str],
+        max_in_flight: int = 1,
+        limit: Optional[int] = None,
+        file_id: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[int, List[Graph]]]:
+        """Extract graphs from chunks, yielding results as they complete.
+
+        A sliding window keeps at most `max_in_flight` LLM calls running, a new
+        call starts as soon as one finishes, so one slow call does not stall the
+        others. The chunk context of all the texts is loaded first, the texts with
+        a cached extraction are yielded without calling the LLM.
+
+        Args:
+            texts(List[str]): The texts to extract.
+            max_in_flight(int): Max number of concurrent LLM calls.
+            limit(Optional[int]): Max number of relationships of each text.
+            file_id(Optional[str]): The file id saved to chunk history.
+
+        Yields:
+            Tuple[int, List[Graph]]: The index of the text and its graphs.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight >= 1")
+        # limit check
+        if limit and limit < 1:
+            raise ValueError("optional argument limit >= 1")
+
+        # Group the indexes by text, each distinct text is extracted once
+        text_indexes: Dict[str, List[int]] = {}
+        for idx, text in enumerate(texts):
+            text_indexes.setdefault(text, []).append(idx)
+
+        # 1. Load chunk context, the cached texts are saved to chunk history too
+        text_context_map = await self.aload_chunk_context(list(text_indexes), file_id)
+
+        # 2. Yield the cached extractions
+        pending_texts: List[str] = []
+        for text, indexes in text_indexes.items():
+            response = self._get_cached_extraction(text)
+            if response is None:
+                pending_texts.append(text)
+                continue
+            for idx in indexes:
+                yield idx, self._parse_response(response, limit)
+        if not pending_texts:
+            return
+        logger.info(
+            f"Extracting graphs from {len(pending_texts)} chunks, "
+            f"{len(text_indexes) - len(pending_texts)} chunks hit the cache"
+        )
+
+        # 3. Extract in a sliding window, results are yielded as they complete
+        text_iter = iter(pending_texts)
+        running: Dict[asyncio.Task, str] = {}
+        try:
+            while True:
+                for text in text_iter:
+                    task = asyncio.create_task(
+                        self._aextract_with_retry(text, text_context_map[text])
+                    )
+                    running[task] = text
+                    if len(running) >= max_in_flight:
+                        break
+                if not running:
+                    break
+
+                done: Set[asyncio.Task]
+                done, _ = await asyncio.wait(
+                    running.keys(), return_when=asyncio.FIRST_COMPLETED
                 )
-                for idx, text in enumerate(batch_texts, start=start_idx)
-            ]
+                for task in done:
+                    text = running.pop(task)
+                    response = task.result()
+                    for idx in text_indexes[text]:
+                        yield (
+                            idx,
+                            (self._parse_response(response, limit) if response else []),
+                        )
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def _aextract_with_retry(self, text: str, history: str) -> Optional[str]:
+        """Request the LLM with timeout and retry, and cache the response."""
+        retries = 0
+        while True:
+            try:
+                output = await asyncio.wait_for(
+                    self._request_llm(text, history), self._extract_timeout
+                )
+                if not output.success:
+                    # A failed response is retried like an error
+                    raise RuntimeError(
+                        f"request llm failed ({output.error_code}) {output.text}"
+                    )
+                response = output.text if output.has_text else None
+                break
+            except (Exception, asyncio.TimeoutError) as e:
+                if retries >= self._extract_max_retries:
+                    raise RuntimeError(f"Failed to extract graph: {e}") from e
+                retries += 1
+                logger.warning(
+                    f"Extract graph failed ({e!r}), retry {retries}/"
+                    f"{self._extract_max_retries}"
+                )
+                await asyncio.sleep(min(2 ** (retries - 1), 10))
 
-            # 3. Process extraction in parallel while keeping track of indices
-            batch_results = await asyncio.gather(
-                *(task for _, task in extraction_tasks), return_exceptions=True
-            )
+        if response and self._extraction_cache is not None:
+            self._extraction_cache[self._extraction_cache_key(text)] = response
+        return response
 
-            # 4. Place results in the correct positions
-            for (idx, _), graphs in zip(extraction_tasks, batch_results):
-                if isinstance(graphs, Exception):
-                    raise RuntimeError(f"Failed to extract graph: {graphs}")
-                if not isinstance(graphs, list) or not all(
-                    isinstance(g, Graph) for g in graphs
-                ):
-                    raise RuntimeError(f"Invalid graph extraction result: {graphs}")
-                graphs_list[idx] = graphs
+    def _extraction_cache_key(self, text: str) -> str:
+        """Return the cache key of the text, prompt and model.
 
-        assert all(x is not None for x in graphs_list), "All positions should be filled"
-        return graphs_list
+        The chunk context is not a part of the key, it changes after every load
+        as the chunk history grows, so a rebuild would never hit the cache.
+        """
+        content = "\0".join([self._model_name or "", self._prompt_template, text])
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _get_cached_extraction(self, text: str) -> Optional[str]:
+        if self._extraction_cache is None or not self._model_name:
+            # The default model is unknown until the first request
+            return None
+        return self._extraction_cache.get(self._extraction_cache_key(text))
 
     def _parse_response(self, text: str, limit: Optional[int] = None) -> List[Graph]:
         graph = MemoryGraph()
@@ -218,7 +426,7 @@ GRAPH_EXTRACT_PT_CN = (
     "- 如果文本已提供了图结构格式的数据，直接转换为输出格式返回，"
     "不要修改实体或ID名称。"
     "- 尽可能多的生成文本中提及的实体和关系信息，但不要随意创造不存在的实体和关系。\n"
-        "- 确保以第三人称书写，从客观角度描述实体名称、关系名称，以及他们的总结性描述。\n"
+    "- 确保以第三人称书写，从客观角度描述实体名称、关系名称，以及他们的总结性描述。\n"
     "- 尽可能多地使用关联上下文中的信息丰富实体和关系的内容，这非常重要。\n"
     "- 如果实体或关系的总结描述为空，不提供总结描述信息，不要生成无关的描述信息。\n"
     "- 如果提供的描述信息相互矛盾，请解决矛盾并提供一个单一、连贯的描述。\n"
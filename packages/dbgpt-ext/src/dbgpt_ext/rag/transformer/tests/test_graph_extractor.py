@@ -0,0 +1,238 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from dbgpt.core import Chunk, ModelOutput
+from dbgpt_ext.rag.transformer.graph_extractor import GraphExtractor
+
+
+@pytest.fixture
+def chunk_history():
+    history = MagicMock()
+    history.abatch_similar_search_with_scores = AsyncMock(
+        return_value=[
+            [Chunk(content="history a", score=0.9)],
+            [],
+            [Chunk(content="history c", score=0.75)],
+        ]
+    )
+    history.aload_document_with_limit = AsyncMock(return_value=[])
+    return history
+
+
+@pytest.fixture
+def embedding_fn():
+    embeddings = MagicMock()
+    embeddings.aembed_documents = AsyncMock(
+        return_value=[[1.0, 0.0], [0.0, 1.0], [0.8, 0.6]]
+    )
+    embeddings.aembed_queries = AsyncMock(
+        return_value=[[1.0, 0.0], [0.0, 1.0], [0.6, 0.8]]
+    )
+    return embeddings
+
+
+@pytest.mark.asyncio
+async def test_aload_chunk_context_batched(chunk_history):
+    extractor = GraphExtractor(MagicMock(), "mock", chunk_history, "test")
+    texts = ["a", "b", "c", "a"]
+
+    context_map = await extractor.aload_chunk_context(texts, file_id="f1")
+
+    assert context_map == {
+        "a": "Section 1:\nhistory a",
+        "b": "",
+        "c": "Section 1:\nhistory c",
+    }
+    # One batch search and one bulk load for all the unique texts
+    chunk_history.abatch_similar_search_with_scores.assert_awaited_once()
+    assert chunk_history.abatch_similar_search_with_scores.await_args.args[0] == [
+        "a",
+        "b",
+        "c",
+    ]
+    chunk_history.aload_document_with_limit.assert_awaited_once()
+    loaded = chunk_history.aload_document_with_limit.await_args.args[0]
+    assert [chunk.content for chunk in loaded] == ["a", "b", "c"]
+    assert [chunk.metadata["relevant_cnt"] for chunk in loaded] == [1, 0, 1]
+    assert all(chunk.metadata["file_id"] == "f1" for chunk in loaded)
+
+
+@pytest.mark.asyncio
+async def test_aload_chunk_context_with_preceding_texts(chunk_history, embedding_fn):
+    extractor = GraphExtractor(
+        MagicMock(),
+        "mock",
+        chunk_history,
+        "test",
+        top_k=2,
+        score_threshold=0.7,
+        embedding_fn=embedding_fn,
+    )
+
+    context_map = await extractor.aload_chunk_context(["a", "b", "c"])
+
+    embedding_fn.aembed_documents.assert_awaited_once_with(["a", "b", "c"])
+    embedding_fn.aembed_queries.assert_awaited_once_with(["a", "b", "c"])
+    # The query "c" is similar to the preceding document "b" (0.8) in the same
+    # batch, not to "a" (0.6)
+    assert context_map["c"] == "Section 1:\nb\nSection 2:\nhistory c"
+    assert context_map["b"] == ""
+    assert context_map["a"] == "Section 1:\nhistory a"
+
+
+def _mock_response(text: str) -> str:
+    return f"Entities:\n({text}#entity {text})\n"
+
+
+class _MockGraphExtractor(GraphExtractor):
+    """GraphExtractor with a mocked LLM call."""
+
+    def __init__(
+        self, chunk_history, delays=None, failures=0, failed_responses=0, **kwargs
+    ):
+        super().__init__(MagicMock(), "mock", chunk_history, "test", **kwargs)
+        self.delays = delays or {}
+        self.failures = failures
+        self.failed_responses = failed_responses
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _request_llm(self, text: str, history: str = None):
+        self.calls.append(text)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(text, 0))
+            if self.failures > 0:
+                self.failures -= 1
+                raise ValueError("mock failure")
+            if self.failed_responses > 0:
+                self.failed_responses -= 1
+                return ModelOutput(text="mock failed response", error_code=1)
+            return ModelOutput(text=_mock_response(text), error_code=0)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def empty_history():
+    history = MagicMock()
+    history.abatch_similar_search_with_scores = AsyncMock(
+        side_effect=lambda texts, *args, **kwargs: [[] for _ in texts]
+    )
+    history.aload_document_with_limit = AsyncMock(return_value=[])
+    return history
+
+
+@pytest.mark.asyncio
+async def test_aextract_iter_as_completed(empty_history):
+    extractor = _MockGraphExtractor(
+        empty_history, delays={"a": 0.2}, extraction_cache={}
+    )
+    texts = ["a", "b", "c", "d"]
+
+    results = [
+        (idx, graphs)
+        async for idx, graphs in extractor.aextract_iter(texts, max_in_flight=2)
+    ]
+
+    # The slow call does not stall the others
+    assert [idx for idx, _ in results] == [1, 2, 3, 0]
+    assert extractor.max_in_flight == 2
+    for idx, graphs in results:
+        assert graphs[0].get_vertex(texts[idx]) is not None
+
+
+@pytest.mark.asyncio
+async def test_batch_extract_cache_and_retry(empty_history):
+    cache = {}
+    extractor = _MockGraphExtractor(
+        empty_history, failures=1, extract_max_retries=1, extraction_cache=cache
+    )
+    texts = ["a", "b", "a"]
+
+    graphs_list = await extractor.batch_extract(texts, batch_size=3)
+
+    assert len(graphs_list) == 3
+    assert graphs_list[2][0].get_vertex("a") is not None
+    # "a" is extracted once, one call is retried
+    assert sorted(extractor.calls) == ["a", "a", "b"]
+    assert len(cache) == 2
+
+    # Unchanged chunks are not extracted again
+    rebuild = _MockGraphExtractor(empty_history, extraction_cache=cache)
+    graphs_list = await rebuild.batch_extract(["a", "b", "c"], batch_size=3)
+    assert rebuild.calls == ["c"]
+    assert graphs_list[0][0].get_vertex("a") is not None
+
+
+@pytest.mark.asyncio
+async def test_aextract_iter_timeout(empty_history):
+    extractor = _MockGraphExtractor(
+        empty_history,
+        delays={"a": 1},
+        extract_timeout=0.05,
+        extraction_cache={},
+    )
+    with pytest.raises(RuntimeError):
+        await extractor.batch_extract(["a"])
+
+
+@pytest.mark.asyncio
+async def test_retry_failed_response(empty_history):
+    extractor = _MockGraphExtractor(
+        empty_history, failed_responses=1, extract_max_retries=1, extraction_cache={}
+    )
+    graphs_list = await extractor.batch_extract(["a"])
+    assert extractor.calls == ["a", "a"]
+    assert graphs_list[0][0].get_vertex("a") is not None
+
+    # The failed responses are not turned into empty graphs
+    extractor = _MockGraphExtractor(
+        empty_history, failed_responses=1, extraction_cache={}
+    )
+    with pytest.raises(RuntimeError):
+        await extractor.batch_extract(["a"])
+
+
+@pytest.mark.asyncio
+async def test_extraction_cache_with_chunk_context(chunk_history):
+    cache = {}
+    chunk_history.abatch_similar_search_with_scores = AsyncMock(
+        return_value=[[Chunk(content="history a", score=0.9)]]
+    )
+    extractor = _MockGraphExtractor(chunk_history, extraction_cache=cache)
+    await extractor.batch_extract(["a"])
+    assert extractor.calls == ["a"]
+
+    # The chunk history has grown since the first load, the rebuild still hits
+    # the cache, and saves the chunk to history for the later chunks
+    chunk_history.abatch_similar_search_with_scores = AsyncMock(
+        return_value=[
+            [
+                Chunk(content="a", score=1.0),
+                Chunk(content="history a", score=0.9),
+            ]
+        ]
+    )
+    rebuild = _MockGraphExtractor(chunk_history, extraction_cache=cache)
+    await rebuild.batch_extract(["a"])
+    assert rebuild.calls == []
+    assert chunk_history.aload_document_with_limit.await_count == 2
+
+    # Another model does not share the cached extractions
+    other_model = _MockGraphExtractor(chunk_history, extraction_cache=cache)
+    other_model._model_name = "other"
+    await other_model.batch_extract(["a"])
+    assert other_model.calls == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_aextract_iter_invalid_limit(empty_history):
+    extractor = _MockGraphExtractor(empty_history, extraction_cache={})
+    with pytest.raises(ValueError):
+        await extractor.batch_extract(["a"], limit=-1)
+    assert extractor.calls == []
@@ -61,6 +61,8 @@ TRIPLET_EXTRACT_PT = (
 class TripletExtractor(LLMExtractor):
     """TripletExtractor class."""
 
+    priority = "batch"
+
     def __init__(self, llm_client: LLMClient, model_name: str):
         """Initialize the TripletExtractor."""
         super().__init__(llm_client, model_name, TRIPLET_EXTRACT_PT)
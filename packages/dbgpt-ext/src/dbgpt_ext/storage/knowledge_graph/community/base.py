@@ -3,7 +3,7 @@
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import AsyncGenerator, Dict, Iterator, List, Optional, Union
+from typing import AsyncGenerator, Dict, Iterator, List, Optional, Tuple, Union
 
 from dbgpt.storage.graph_store.base import GraphStoreBase
 from dbgpt.storage.graph_store.graph import (
@@ -33,9 +33,152 @@ class CommunityTree:
     """Represents a community tree."""
 
 
+# The label, source vertex label and target vertex label of each edge type
+EDGE_LABELS: Dict[GraphElemType, Tuple[GraphElemType, GraphElemType, GraphElemType]] = {
+    GraphElemType.DOCUMENT_INCLUDE_CHUNK: (
+        GraphElemType.INCLUDE,
+        GraphElemType.DOCUMENT,
+        GraphElemType.CHUNK,
+    ),
+    GraphElemType.CHUNK_INCLUDE_CHUNK: (
+        GraphElemType.INCLUDE,
+        GraphElemType.CHUNK,
+        GraphElemType.CHUNK,
+    ),
+    GraphElemType.CHUNK_INCLUDE_ENTITY: (
+        GraphElemType.INCLUDE,
+        GraphElemType.CHUNK,
+        GraphElemType.ENTITY,
+    ),
+    GraphElemType.CHUNK_NEXT_CHUNK: (
+        GraphElemType.NEXT,
+        GraphElemType.CHUNK,
+        GraphElemType.CHUNK,
+    ),
+    GraphElemType.RELATION: (
+        GraphElemType.RELATION,
+        GraphElemType.ENTITY,
+        GraphElemType.ENTITY,
+    ),
+}
+
+
+class GraphBatch:
+    """Vertices and edges to be written in bulk, grouped by type.
+
+    Vertices with the same id and edges with the same source, target and name
+    are merged, the last one added wins, as if they were upserted one by one.
+    """
+
+    def __init__(self):
+        """Initialize an empty graph batch."""
+        self.vertices: Dict[
+            GraphElemType, Dict[str, Union[Vertex, ParagraphChunk]]
+        ] = {}
+        self.edges: Dict[GraphElemType, Dict[Tuple[str, str, str], Edge]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of vertices and edges in the batch."""
+        return sum(len(vs) for vs in self.vertices.values()) + sum(
+            len(es) for es in self.edges.values()
+        )
+
+    def add_vertex(
+        self, vertex_type: GraphElemType, vertex: Union[Vertex, ParagraphChunk]
+    ) -> None:
+        """Add a vertex of the given type."""
+        vid = vertex.chunk_id if isinstance(vertex, ParagraphChunk) else vertex.vid
+        self.vertices.setdefault(vertex_type, {})[vid] = vertex
+
+    def add_edge(self, edge_type: GraphElemType, edge: Edge) -> None:
+        """Add an edge of the given type."""
+        if edge_type not in EDGE_LABELS:
+            raise ValueError(f"Invalid edge type: {edge_type}")
+        self.edges.setdefault(edge_type, {})[edge.triplet()] = edge
+
+    def add_graph(self, graph: Graph) -> None:
+        """Add the typed vertices and edges of a graph.
+
+        The types are read from the `vertex_type` and `edge_type` properties,
+        vertices and edges without a known type are skipped.
+        """
+        vertex_types = {
+            t.value: t
+            for t in (GraphElemType.DOCUMENT, GraphElemType.CHUNK, GraphElemType.ENTITY)
+        }
+        edge_types = {t.value: t for t in EDGE_LABELS}
+        for vertex in graph.vertices():
+            vertex_type = vertex_types.get(vertex.get_prop("vertex_type"))
+            if vertex_type:
+                self.add_vertex(vertex_type, vertex)
+        for edge in graph.edges():
+            edge_type = edge_types.get(edge.get_prop("edge_type"))
+            if edge_type:
+                self.add_edge(edge_type, edge)
+
+    def add_doc_include_chunk(self, chunk: ParagraphChunk) -> None:
+        """Add the document include chunk edge of a chunk."""
+        assert chunk.chunk_parent_id and chunk.chunk_parent_name, (
+            "Chunk parent ID and name are required (document_include_chunk)"
+        )
+        self.add_edge(
+            GraphElemType.DOCUMENT_INCLUDE_CHUNK,
+            Edge(
+                sid=chunk.chunk_parent_id,
+                tid=chunk.chunk_id,
+                name=GraphElemType.INCLUDE.value,
+                edge_type=GraphElemType.DOCUMENT_INCLUDE_CHUNK.value,
+            ),
+        )
+
+    def add_chunk_include_chunk(self, chunk: ParagraphChunk) -> None:
+        """Add the chunk include chunk edge of a chunk."""
+        assert chunk.chunk_parent_id and chunk.chunk_parent_name, (
+            "Chunk parent ID and name are required (chunk_include_chunk)"
+        )
+        self.add_edge(
+            GraphElemType.CHUNK_INCLUDE_CHUNK,
+            Edge(
+                sid=chunk.chunk_parent_id,
+                tid=chunk.chunk_id,
+                name=GraphElemType.INCLUDE.value,
+                edge_type=GraphElemType.CHUNK_INCLUDE_CHUNK.value,
+            ),
+        )
+
+    def add_chunk_next_chunk(
+        self, chunk: ParagraphChunk, next_chunk: ParagraphChunk
+    ) -> None:
+        """Add the chunk next chunk edge."""
+        self.add_edge(
+            GraphElemType.CHUNK_NEXT_CHUNK,
+            Edge(
+                sid=chunk.chunk_id,
+                tid=next_chunk.chunk_id,
+                name=GraphElemType.NEXT.value,
+                edge_type=GraphElemType.CHUNK_NEXT_CHUNK.value,
+            ),
+        )
+
+    def add_chunk_include_entity(self, chunk: ParagraphChunk, entity: Vertex) -> None:
+        """Add the chunk include entity edge."""
+        self.add_edge(
+            GraphElemType.CHUNK_INCLUDE_ENTITY,
+            Edge(
+                sid=chunk.chunk_id,
+                tid=entity.vid,
+                name=GraphElemType.INCLUDE.value,
+                edge_type=GraphElemType.CHUNK_INCLUDE_ENTITY.value,
+            ),
+        )
+
+
 class GraphStoreAdapter(ABC):
     """Community Store Adapter."""
 
+    # Default max number of vertices or edges written in one statement
+    WRITE_BATCH_SIZE = 500
+
     def __init__(self, graph_store: GraphStoreBase):
         """Initialize Community Store Adapter."""
         self._graph_store = graph_store
@@ -111,6 +254,35 @@ class GraphStoreAdapter(ABC):
     def upsert_graph(self, graph: Graph) -> None:
         """Insert graph."""
 
+    def upsert_batch(self, batch: GraphBatch, batch_size: Optional[int] = None):
+        """Write a graph batch in bulk.
+
+        Vertices and edges are written per label, at most `batch_size` of them
+        in one statement. Vertices are written before edges, so the edges can
+        refer to the vertices of the same batch.
+        """
+        batch_size = batch_size or self.WRITE_BATCH_SIZE
+        vertex_upserts = [
+            (GraphElemType.DOCUMENT, self.upsert_documents),
+            (GraphElemType.CHUNK, self.upsert_chunks),
+            (GraphElemType.ENTITY, self.upsert_entities),
+        ]
+        for vertex_type, upsert in vertex_upserts:
+            vertices = list(batch.vertices.get(vertex_type, {}).values())
+            for i in range(0, len(vertices), batch_size):
+                upsert(iter(vertices[i : i + batch_size]))
+
+        for edge_type, edge_map in batch.edges.items():
+            label, src_type, dst_type = EDGE_LABELS[edge_type]
+            edges = list(edge_map.values())
+            for i in range(0, len(edges), batch_size):
+                self.upsert_edge(
+                    iter(edges[i : i + batch_size]),
+                    label.value,
+                    src_type.value,
+                    dst_type.value,
+                )
+
     @abstractmethod
     def upsert_doc_include_chunk(
         self,
@@ -287,6 +459,10 @@ class CommunityMetastore(ABC):
     async def save(self, communities: List[Community]):
         """Save communities."""
 
+    @abstractmethod
+    async def delete(self, community_ids: List[str]):
+        """Delete communities."""
+
     @abstractmethod
     async def truncate(self):
         """Truncate all communities."""
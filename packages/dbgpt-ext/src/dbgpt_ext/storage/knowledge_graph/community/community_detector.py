@@ -0,0 +1,423 @@
+"""In-process community detection over the knowledge graph."""
+
+import hashlib
+import logging
+from array import array
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Container, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from dbgpt.storage.graph_store.graph import Edge, Graph, GraphElemType, MemoryGraph
+
+logger = logging.getLogger(__name__)
+
+# The document structure is not part of any community
+_STRUCTURE_VERTEX_TYPES = {GraphElemType.DOCUMENT.value, GraphElemType.CHUNK.value}
+_STRUCTURE_EDGE_TYPES = {
+    GraphElemType.DOCUMENT_INCLUDE_CHUNK.value,
+    GraphElemType.CHUNK_INCLUDE_CHUNK.value,
+    GraphElemType.CHUNK_INCLUDE_ENTITY.value,
+    GraphElemType.CHUNK_NEXT_CHUNK.value,
+}
+
+
+@dataclass
+class CommunityDetection:
+    """The result of a community detection run.
+
+    Attributes:
+        communities: The member vertex ids of each community.
+        dirty: The ids of the communities created or changed since the last run,
+            only these need to be summarized again.
+        removed: The ids of the communities of the last run which no longer exist.
+        full: Whether there was no previous run to compare with, all the
+            communities are dirty then.
+    """
+
+    communities: Dict[str, List[str]] = field(default_factory=dict)
+    dirty: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    full: bool = False
+
+
+class _CSRGraph:
+    """Undirected weighted graph in compressed sparse row format.
+
+    Each edge is stored in the rows of both its vertices, self-loops are kept
+    apart in `self_loops`.
+    """
+
+    def __init__(self, num_nodes: int, edges: Dict[Tuple[int, int], float]):
+        self.num_nodes = num_nodes
+        self.self_loops = array("d", [0.0]) * num_nodes
+        degrees = [0] * num_nodes
+        for (u, v), weight in edges.items():
+            if u == v:
+                self.self_loops[u] += weight
+            else:
+                degrees[u] += 1
+                degrees[v] += 1
+
+        self.offsets = array("q", [0]) * (num_nodes + 1)
+        for i in range(num_nodes):
+            self.offsets[i + 1] = self.offsets[i] + degrees[i]
+        self.targets = array("q", [0]) * self.offsets[num_nodes]
+        self.weights = array("d", [0.0]) * self.offsets[num_nodes]
+        cursor = array("q", self.offsets[:num_nodes])
+        for (u, v), weight in edges.items():
+            if u == v:
+                continue
+            for src, dst in ((u, v), (v, u)):
+                self.targets[cursor[src]] = dst
+                self.weights[cursor[src]] = weight
+                cursor[src] += 1
+
+        # The weighted degree of each node, a self-loop counts twice
+        self.strengths = array("d", [0.0]) * num_nodes
+        for i in range(num_nodes):
+            self.strengths[i] = 2 * self.self_loops[i] + sum(
+                self.weights[self.offsets[i] : self.offsets[i + 1]]
+            )
+        self.total_strength = sum(self.strengths)
+
+    def neighbors(self, node: int):
+        """Iterate the (neighbor, weight) pairs of a node."""
+        for p in range(self.offsets[node], self.offsets[node + 1]):
+            yield self.targets[p], self.weights[p]
+
+
+def _move_nodes(
+    graph: _CSRGraph,
+    membership: List[int],
+    queue_nodes: Sequence[int],
+    resolution: float,
+) -> bool:
+    """Move the queued nodes to the community with the best modularity gain.
+
+    Whenever a node moves, its neighbors outside the new community are queued
+    again, until no node can improve the modularity.
+    """
+    two_m = graph.total_strength
+    if two_m == 0:
+        return False
+    n = graph.num_nodes
+    comm_strengths = [0.0] * n
+    comm_sizes = [0] * n
+    for i in range(n):
+        comm_strengths[membership[i]] += graph.strengths[i]
+        comm_sizes[membership[i]] += 1
+    empty = [c for c in range(n) if comm_sizes[c] == 0]
+
+    queue = deque(queue_nodes)
+    queued = bytearray(n)
+    for i in queue:
+        queued[i] = 1
+
+    moved = False
+    while queue:
+        i = queue.popleft()
+        queued[i] = 0
+        current = membership[i]
+        strength = graph.strengths[i]
+        links: Dict[int, float] = {}
+        for j, weight in graph.neighbors(i):
+            if j != i:
+                links[membership[j]] = links.get(membership[j], 0.0) + weight
+
+        comm_strengths[current] -= strength
+        comm_sizes[current] -= 1
+        scale = resolution * strength / two_m
+        best = current
+        best_gain = links.get(current, 0.0) - scale * comm_strengths[current]
+        for community, weight in links.items():
+            gain = weight - scale * comm_strengths[community]
+            if gain > best_gain + 1e-12:
+                best, best_gain = community, gain
+        # Moving to an empty community has zero gain
+        if best_gain < -1e-12 and comm_sizes[current] > 0 and empty:
+            best = empty.pop()
+
+        comm_strengths[best] += strength
+        comm_sizes[best] += 1
+        if best == current:
+            continue
+        if comm_sizes[current] == 0:
+            empty.append(current)
+        membership[i] = best
+        moved = True
+        for j, _ in graph.neighbors(i):
+            if membership[j] != best and not queued[j]:
+                queued[j] = 1
+                queue.append(j)
+    return moved
+
+
+def _split_disconnected(graph: _CSRGraph, membership: List[int]) -> List[int]:
+    """Split each community into its connected components.
+
+    Returns the component of each node, labeled from 0.
+    """
+    components = [-1] * graph.num_nodes
+    label = 0
+    for start in range(graph.num_nodes):
+        if components[start] >= 0:
+            continue
+        components[start] = label
+        stack = [start]
+        while stack:
+            i = stack.pop()
+            for j, _ in graph.neighbors(i):
+                if components[j] < 0 and membership[j] == membership[i]:
+                    components[j] = label
+                    stack.append(j)
+        label += 1
+    return components
+
+
+def _aggregate(graph: _CSRGraph, partition: List[int], size: int) -> _CSRGraph:
+    """Build the graph whose nodes are the communities of the partition."""
+    edges: Dict[Tuple[int, int], float] = {}
+    for i in range(graph.num_nodes):
+        ci = partition[i]
+        if graph.self_loops[i]:
+            edges[(ci, ci)] = edges.get((ci, ci), 0.0) + graph.self_loops[i]
+        for j, weight in graph.neighbors(i):
+            if i < j:
+                key = (min(ci, partition[j]), max(ci, partition[j]))
+                edges[key] = edges.get(key, 0.0) + weight
+    return _CSRGraph(size, edges)
+
+
+def _leiden(
+    graph: _CSRGraph,
+    membership: Optional[List[int]] = None,
+    queue_nodes: Optional[Sequence[int]] = None,
+    resolution: float = 1.0,
+    max_levels: int = 10,
+) -> List[int]:
+    """Detect the communities of a graph.
+
+    Louvain style local moving and aggregation, with the refinement of Leiden
+    reduced to splitting disconnected communities, so every community found is
+    connected.
+
+    Args:
+        graph(_CSRGraph): The graph.
+        membership(Optional[List[int]]): The initial community of each node, the
+            labels must be node indexes. Each node in its own community if not
+            set.
+        queue_nodes(Optional[Sequence[int]]): The nodes to move first, all the
+            nodes if not set. Warm started runs only queue the changed nodes.
+        resolution(float): Higher resolutions lead to smaller communities.
+        max_levels(int): Max number of aggregation levels.
+
+    Returns:
+        List[int]: The community of each node, labeled from 0.
+    """
+    n = graph.num_nodes
+    membership = list(membership) if membership is not None else list(range(n))
+    queue_nodes = list(queue_nodes) if queue_nodes is not None else list(range(n))
+    node_map = list(range(n))
+    level_graph = graph
+    for _ in range(max_levels):
+        _move_nodes(level_graph, membership, queue_nodes, resolution)
+        refined = _split_disconnected(level_graph, membership)
+        size = max(refined) + 1 if refined else 0
+        node_map = [refined[node] for node in node_map]
+        if size == level_graph.num_nodes:
+            break
+
+        # The aggregated nodes start in the community they were refined from
+        representatives: Dict[int, int] = {}
+        next_membership = [0] * size
+        for i in range(level_graph.num_nodes):
+            next_membership[refined[i]] = representatives.setdefault(
+                membership[i], refined[i]
+            )
+        level_graph = _aggregate(level_graph, refined, size)
+        membership = next_membership
+        queue_nodes = list(range(size))
+    return node_map
+
+
+class LocalCommunityDetector:
+    """Incremental community detection running in process.
+
+    The detector keeps the communities of the last run. The next run starts
+    from them and only moves the vertices whose description or incident edges
+    changed, the communities with a changed content are reported as dirty.
+    State is kept in memory, the first run after a restart is a full run.
+    """
+
+    def __init__(self, resolution: float = 1.0, max_levels: int = 10):
+        """Create a local community detector.
+
+        Args:
+            resolution(float): Higher resolutions lead to smaller communities.
+            max_levels(int): Max number of aggregation levels.
+        """
+        self._resolution = resolution
+        self._max_levels = max_levels
+        self._membership: Dict[str, str] = {}
+        self._vertex_signatures: Dict[str, str] = {}
+        self._community_signatures: Dict[str, str] = {}
+        self._next_id = 0
+
+    def reset(self) -> None:
+        """Forget the communities of the last run."""
+        self._membership = {}
+        self._vertex_signatures = {}
+        self._community_signatures = {}
+        self._next_id = 0
+
+    def detect(self, graph: Graph) -> CommunityDetection:
+        """Detect the communities of the entities in the graph."""
+        vids: List[str] = []
+        index: Dict[str, int] = {}
+        descriptions: Dict[str, str] = {}
+        for vertex in graph.vertices():
+            if vertex.get_prop("vertex_type") in _STRUCTURE_VERTEX_TYPES:
+                continue
+            index[vertex.vid] = len(vids)
+            vids.append(vertex.vid)
+            descriptions[vertex.vid] = str(vertex.get_prop("description") or "")
+
+        weights: Dict[Tuple[int, int], float] = {}
+        incidents: Dict[str, List[str]] = {vid: [] for vid in vids}
+        for edge in self._entity_edges(graph, index):
+            u, v = index[edge.sid], index[edge.tid]
+            key = (min(u, v), max(u, v))
+            weights[key] = weights.get(key, 0.0) + 1.0
+            desc = "\x00".join(
+                (edge.sid, edge.tid, edge.name, str(edge.get_prop("description") or ""))
+            )
+            incidents[edge.sid].append(desc)
+            if edge.tid != edge.sid:
+                incidents[edge.tid].append(desc)
+
+        signatures = {
+            vid: _digest([vid, descriptions[vid], *sorted(incidents[vid])])
+            for vid in vids
+        }
+        full = not self._membership
+        changed = [
+            index[vid]
+            for vid in vids
+            if self._vertex_signatures.get(vid) != signatures[vid]
+        ]
+        vertices_removed = any(vid not in index for vid in self._vertex_signatures)
+
+        if not full and not changed and not vertices_removed:
+            communities: Dict[str, List[str]] = {}
+            for vid in vids:
+                communities.setdefault(self._membership[vid], []).append(vid)
+            return CommunityDetection(communities=communities)
+
+        csr = _CSRGraph(len(vids), weights)
+        if full:
+            labels = _leiden(
+                csr, resolution=self._resolution, max_levels=self._max_levels
+            )
+        else:
+            # Warm start from the last communities, new vertices are alone
+            representatives: Dict[str, int] = {}
+            membership = [
+                representatives.setdefault(self._membership[vid], i)
+                if vid in self._membership
+                else i
+                for i, vid in enumerate(vids)
+            ]
+            queue: Set[int] = set(changed)
+            for i in changed:
+                queue.update(j for j, _ in csr.neighbors(i))
+            labels = _leiden(
+                csr,
+                membership,
+                sorted(queue),
+                resolution=self._resolution,
+                max_levels=self._max_levels,
+            )
+
+        groups: Dict[int, List[str]] = {}
+        for vid, label in zip(vids, labels):
+            groups.setdefault(label, []).append(vid)
+        communities = self._assign_ids(list(groups.values()))
+
+        community_signatures = {
+            cid: _digest(sorted(signatures[vid] for vid in members))
+            for cid, members in communities.items()
+        }
+        dirty = [
+            cid
+            for cid, signature in community_signatures.items()
+            if self._community_signatures.get(cid) != signature
+        ]
+        removed = [cid for cid in self._community_signatures if cid not in communities]
+
+        self._membership = {
+            vid: cid for cid, members in communities.items() for vid in members
+        }
+        self._vertex_signatures = signatures
+        self._community_signatures = community_signatures
+        logger.info(
+            f"Detected {len(communities)} communities, {len(dirty)} dirty, "
+            f"{len(removed)} removed"
+        )
+        return CommunityDetection(
+            communities=communities, dirty=dirty, removed=removed, full=full
+        )
+
+    def subgraphs(
+        self, graph: Graph, community_ids: Sequence[str]
+    ) -> Dict[str, MemoryGraph]:
+        """Get the vertices and incident edges of the communities of last run."""
+        wanted = set(community_ids)
+        subgraphs = {cid: MemoryGraph() for cid in community_ids}
+        for vertex in graph.vertices():
+            cid = self._membership.get(vertex.vid)
+            if cid in wanted:
+                subgraphs[cid].upsert_vertex(vertex)
+        for edge in self._entity_edges(graph, self._membership):
+            added: Set[str] = set()
+            for vid in (edge.sid, edge.tid):
+                cid = self._membership[vid]
+                if cid in wanted and cid not in added:
+                    subgraphs[cid].append_edge(edge)
+                    added.add(cid)
+        return subgraphs
+
+    @staticmethod
+    def _entity_edges(graph: Graph, vertices: Container[str]) -> Iterator[Edge]:
+        for edge in graph.edges():
+            if edge.get_prop("edge_type") in _STRUCTURE_EDGE_TYPES:
+                continue
+            if edge.sid in vertices and edge.tid in vertices:
+                yield edge
+
+    def _assign_ids(self, groups: List[List[str]]) -> Dict[str, List[str]]:
+        """Give each community the id of the last community it overlaps most.
+
+        Larger communities choose first, the others get new ids, so unchanged
+        communities keep their ids between runs.
+        """
+        communities: Dict[str, List[str]] = {}
+        for members in sorted(groups, key=len, reverse=True):
+            overlaps = Counter(
+                self._membership[vid] for vid in members if vid in self._membership
+            )
+            cid = next(
+                (c for c, _ in overlaps.most_common() if c not in communities), None
+            )
+            if cid is None:
+                while str(self._next_id) in communities or (
+                    str(self._next_id) in self._community_signatures
+                ):
+                    self._next_id += 1
+                cid = str(self._next_id)
+                self._next_id += 1
+            communities[cid] = members
+        return communities
+
+
+def _digest(parts: Sequence[str]) -> str:
+    return hashlib.sha1("\x01".join(parts).encode("utf-8")).hexdigest()
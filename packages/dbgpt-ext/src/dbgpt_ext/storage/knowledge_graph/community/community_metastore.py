@@ -55,7 +55,11 @@ class BuiltinCommunityMetastore(CommunityMetastore):
     async def save(self, communities: List[Community]):
         """Save communities."""
         chunks = [
-            Chunk(id=c.id, content=c.summary, metadata={"total": len(communities)})
+            Chunk(
+                chunk_id=c.id,
+                content=c.summary,
+                metadata={"total": len(communities)},
+            )
             for c in communities
         ]
         await self._vector_store.aload_document_with_limit(
@@ -63,6 +67,13 @@ class BuiltinCommunityMetastore(CommunityMetastore):
         )
         logger.info(f"Save {len(communities)} communities")
 
+    async def delete(self, community_ids: List[str]):
+        """Delete communities."""
+        if not community_ids:
+            return
+        self._vector_store.delete_by_ids(",".join(community_ids))
+        logger.info(f"Delete {len(community_ids)} communities")
+
     async def truncate(self):
         """Truncate community metastore."""
         self._vector_store.truncate()
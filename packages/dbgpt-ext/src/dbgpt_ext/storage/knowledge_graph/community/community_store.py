@@ -5,11 +5,15 @@ import logging
 from typing import List, Optional
 
 from dbgpt.storage.vector_store.base import VectorStoreBase
+from dbgpt.util.executor_utils import blocking_func_to_async_no_executor
 from dbgpt_ext.rag.transformer.community_summarizer import CommunitySummarizer
 from dbgpt_ext.storage.knowledge_graph.community.base import (
     Community,
     GraphStoreAdapter,
 )
+from dbgpt_ext.storage.knowledge_graph.community.community_detector import (
+    LocalCommunityDetector,
+)
 from dbgpt_ext.storage.knowledge_graph.community.community_metastore import (
     BuiltinCommunityMetastore,
 )
@@ -30,10 +34,17 @@ class CommunityStore:
         max_threads: Optional[int] = 1,
         top_k: Optional[int] = 5,
         score_threshold: Optional[float] = 0.7,
+        community_detector: Optional[LocalCommunityDetector] = None,
     ):
-        """Initialize the CommunityStore class."""
+        """Initialize the CommunityStore class.
+
+        Communities are discovered by the graph store, unless a local
+        `community_detector` is given, which also lets only the changed
+        communities be summarized again.
+        """
         self._graph_store_adapter = graph_store_adapter
         self._community_summarizer = community_summarizer
+        self._community_detector = community_detector
         self._meta_store = BuiltinCommunityMetastore(
             vector_store=vector_store,
             index_name=index_name,
@@ -45,6 +56,10 @@ class CommunityStore:
 
     async def build_communities(self, batch_size: int = 1):
         """Discover communities."""
+        if self._community_detector:
+            await self._build_communities_locally(batch_size)
+            return
+
         community_ids = await self._graph_store_adapter.discover_communities()
 
         # summarize communities
@@ -63,9 +78,41 @@ class CommunityStore:
         await self._meta_store.truncate()
         await self._meta_store.save(communities)
 
-    async def _summary_community(self, community_id: str) -> Optional[Community]:
+    async def _build_communities_locally(self, batch_size: int = 1):
+        """Discover communities in process, summarize the dirty ones only."""
+        graph = self._graph_store_adapter.get_full_graph()
+        detection = await blocking_func_to_async_no_executor(
+            self._community_detector.detect, graph
+        )
+        if not detection.dirty and not detection.removed:
+            logger.info("No community changed, skip summarizing")
+            return
+
+        subgraphs = self._community_detector.subgraphs(graph, detection.dirty)
+        communities = []
+        for i in range(0, len(detection.dirty), batch_size):
+            batch_ids = detection.dirty[i : i + batch_size]
+            batch_results = await asyncio.gather(
+                *[
+                    self._summary_community(cid, Community(id=cid, data=subgraphs[cid]))
+                    for cid in batch_ids
+                ]
+            )
+            communities.extend([c for c in batch_results if c is not None])
+
+        # replace the summaries of the changed communities only
+        if detection.full:
+            await self._meta_store.truncate()
+        else:
+            await self._meta_store.delete(detection.dirty + detection.removed)
+        await self._meta_store.save(communities)
+
+    async def _summary_community(
+        self, community_id: str, community: Optional[Community] = None
+    ) -> Optional[Community]:
         """Summarize single community."""
-        community = await self._graph_store_adapter.get_community(community_id)
+        if community is None:
+            community = await self._graph_store_adapter.get_community(community_id)
         if community is None or community.data is None:
             logger.warning(f"Community {community_id} is empty")
             return None
@@ -85,6 +132,8 @@ class CommunityStore:
         """Truncate community store."""
         logger.info("Truncate community metastore")
         self._meta_store.truncate()
+        if self._community_detector:
+            self._community_detector.reset()
 
         logger.info("Truncate community summarizer")
         self._community_summarizer.truncate()
@@ -96,6 +145,8 @@ class CommunityStore:
         """Drop community store."""
         logger.info("Remove community metastore")
         self._meta_store.drop()
+        if self._community_detector:
+            self._community_detector.reset()
 
         logger.info("Remove community summarizer")
         self._community_summarizer.drop()
@@ -19,6 +19,7 @@ from dbgpt.storage.graph_store.memgraph_store import (
 from dbgpt.storage.knowledge_graph.base import ParagraphChunk
 from dbgpt_ext.storage.knowledge_graph.community.base import (
     Community,
+    GraphBatch,
     GraphStoreAdapter,
 )
 
@@ -157,6 +158,18 @@ class MemGraphStoreAdapter(GraphStoreAdapter):
         for edge in graph.edges():
             self._graph_store._graph.append_edge(edge)
 
+    def upsert_batch(self, batch: GraphBatch, batch_size: Optional[int] = None):
+        """Write the entities and relations of a graph batch.
+
+        Like the other upsert methods, the document structure is not kept in
+        memory graph store.
+        """
+        graph = self._graph_store._graph
+        for vertex in batch.vertices.get(GraphElemType.ENTITY, {}).values():
+            graph.upsert_vertex(vertex)
+        for edge in batch.edges.get(GraphElemType.RELATION, {}).values():
+            graph.append_edge(edge)
+
     def delete_document(self, chunk_ids: str) -> None:
         """Delete document in the graph."""
         pass
@@ -0,0 +1,114 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from dbgpt.storage.graph_store.graph import Edge, GraphElemType, MemoryGraph, Vertex
+from dbgpt_ext.storage.knowledge_graph.community.community_detector import (
+    LocalCommunityDetector,
+)
+from dbgpt_ext.storage.knowledge_graph.community.community_store import (
+    CommunityStore,
+)
+
+
+def _add_triplet(graph: MemoryGraph, sid: str, tid: str, name: str = "rel"):
+    for vid in (sid, tid):
+        graph.upsert_vertex(
+            Vertex(vid, name=vid, vertex_type=GraphElemType.ENTITY.value)
+        )
+    graph.append_edge(Edge(sid, tid, name, edge_type=GraphElemType.RELATION.value))
+
+
+def _two_cliques() -> MemoryGraph:
+    graph = MemoryGraph()
+    for group in ("a", "b"):
+        vids = [f"{group}{i}" for i in range(4)]
+        for i, sid in enumerate(vids):
+            for tid in vids[i + 1 :]:
+                _add_triplet(graph, sid, tid)
+    _add_triplet(graph, "a0", "b0")
+    return graph
+
+
+def _members(detection):
+    return sorted(sorted(m) for m in detection.communities.values())
+
+
+def test_detect_cliques():
+    graph = _two_cliques()
+    # The document structure is ignored
+    graph.upsert_vertex(Vertex("doc", vertex_type=GraphElemType.DOCUMENT.value))
+    graph.append_edge(
+        Edge("doc", "a1", "include", edge_type=GraphElemType.CHUNK_INCLUDE_ENTITY.value)
+    )
+
+    detection = LocalCommunityDetector().detect(graph)
+    assert detection.full
+    assert _members(detection) == [
+        ["a0", "a1", "a2", "a3"],
+        ["b0", "b1", "b2", "b3"],
+    ]
+    assert sorted(detection.dirty) == sorted(detection.communities)
+    assert detection.removed == []
+
+
+def test_detect_incremental():
+    graph = _two_cliques()
+    detector = LocalCommunityDetector()
+    first = detector.detect(graph)
+    a_id = next(c for c, m in first.communities.items() if "a1" in m)
+    b_id = next(c for c, m in first.communities.items() if "b1" in m)
+
+    # Nothing changed
+    detection = detector.detect(graph)
+    assert not detection.full
+    assert detection.dirty == [] and detection.removed == []
+
+    # A new triplet in clique b only makes its community dirty
+    _add_triplet(graph, "b1", "b4")
+    detection = detector.detect(graph)
+    assert detection.communities[a_id] == first.communities[a_id]
+    assert sorted(detection.communities[b_id]) == ["b0", "b1", "b2", "b3", "b4"]
+    assert detection.dirty == [b_id]
+
+    # A new component is a new community
+    _add_triplet(graph, "c0", "c1")
+    detection = detector.detect(graph)
+    assert len(detection.dirty) == 1
+    assert detection.dirty[0] not in (a_id, b_id)
+    assert detection.communities[detection.dirty[0]] == ["c0", "c1"]
+
+    # Removing it removes its community
+    graph.del_vertices("c0", "c1")
+    detection = detector.detect(graph)
+    assert detection.dirty == []
+    assert len(detection.removed) == 1
+
+
+@pytest.mark.asyncio
+async def test_build_communities_locally():
+    graph = _two_cliques()
+    adapter = MagicMock()
+    adapter.get_full_graph.return_value = graph
+    summarizer = MagicMock()
+    summarizer.summarize = AsyncMock(return_value="summary")
+    store = CommunityStore(
+        adapter,
+        summarizer,
+        MagicMock(),
+        community_detector=LocalCommunityDetector(),
+    )
+    store._meta_store = AsyncMock()
+
+    await store.build_communities(batch_size=1)
+    assert summarizer.summarize.await_count == 2
+    store._meta_store.truncate.assert_awaited_once()
+    assert len(store._meta_store.save.await_args.args[0]) == 2
+
+    _add_triplet(graph, "a1", "a4")
+    await store.build_communities(batch_size=1)
+    assert summarizer.summarize.await_count == 3
+    store._meta_store.delete.assert_awaited_once()
+    saved = store._meta_store.save.await_args.args[0]
+    assert [c.id for c in saved] == store._meta_store.delete.await_args.args[0]
+    adapter.discover_communities.assert_not_called()
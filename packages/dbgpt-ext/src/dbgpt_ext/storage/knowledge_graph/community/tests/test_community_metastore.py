@@ -0,0 +1,55 @@
+from typing import Dict, List
+
+import pytest
+
+from dbgpt.core import Chunk
+from dbgpt_ext.storage.knowledge_graph.community.base import Community
+from dbgpt_ext.storage.knowledge_graph.community.community_metastore import (
+    BuiltinCommunityMetastore,
+)
+
+
+class _MemoryVectorStore:
+    """Vector store keeping the chunks by id, the search returns all of them."""
+
+    def __init__(self):
+        self.chunks: Dict[str, Chunk] = {}
+
+    async def aload_document_with_limit(
+        self, chunks: List[Chunk], max_chunks_once_load: int, max_threads: int
+    ) -> List[str]:
+        for chunk in chunks:
+            self.chunks[chunk.chunk_id] = chunk
+        return [chunk.chunk_id for chunk in chunks]
+
+    def delete_by_ids(self, ids: str):
+        for chunk_id in ids.split(","):
+            self.chunks.pop(chunk_id, None)
+
+    async def asimilar_search_with_scores(
+        self, query: str, topk: int, score_threshold: float
+    ) -> List[Chunk]:
+        return list(self.chunks.values())[:topk]
+
+
+@pytest.mark.asyncio
+async def test_save_delete_search():
+    vector_store = _MemoryVectorStore()
+    metastore = BuiltinCommunityMetastore(vector_store)
+
+    await metastore.save(
+        [Community(id="c1", summary="summary 1"), Community(id="c2", summary="s2")]
+    )
+    assert set(vector_store.chunks) == {"c1", "c2"}
+
+    # A rebuilt community replaces its summary
+    await metastore.delete(["c1"])
+    await metastore.save([Community(id="c1", summary="summary 1 rebuilt")])
+    communities = await metastore.search("query")
+    assert sorted((c.id, c.summary) for c in communities) == [
+        ("c1", "summary 1 rebuilt"),
+        ("c2", "s2"),
+    ]
+
+    await metastore.delete(["c1", "c2"])
+    assert await metastore.search("query") == []
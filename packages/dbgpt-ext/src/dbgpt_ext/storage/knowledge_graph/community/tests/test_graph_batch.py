@@ -0,0 +1,90 @@
+from unittest.mock import MagicMock
+
+from dbgpt.storage.graph_store.graph import Edge, GraphElemType, MemoryGraph, Vertex
+from dbgpt.storage.knowledge_graph.base import ParagraphChunk
+from dbgpt_ext.storage.knowledge_graph.community.base import (
+    GraphBatch,
+    GraphStoreAdapter,
+)
+
+
+def _entity(vid: str) -> Vertex:
+    return Vertex(vid, name=vid, vertex_type=GraphElemType.ENTITY.value)
+
+
+def _relation(sid: str, tid: str, name: str) -> Edge:
+    return Edge(sid, tid, name, edge_type=GraphElemType.RELATION.value)
+
+
+def _chunk(chunk_id: str, parent_id: str, parent_is_document: bool):
+    return ParagraphChunk(
+        chunk_id=chunk_id,
+        chunk_name=chunk_id,
+        chunk_parent_id=parent_id,
+        chunk_parent_name=parent_id,
+        parent_is_document=parent_is_document,
+    )
+
+
+def test_graph_batch_merges_duplicates():
+    batch = GraphBatch()
+    graph = MemoryGraph()
+    graph.upsert_vertex(_entity("A"))
+    graph.upsert_vertex(_entity("B"))
+    graph.append_edge(_relation("A", "B", "knows"))
+    batch.add_graph(graph)
+
+    graph = MemoryGraph()
+    graph.upsert_vertex(_entity("B"))
+    graph.upsert_vertex(_entity("C"))
+    graph.append_edge(_relation("A", "B", "knows"))
+    graph.append_edge(_relation("B", "C", "knows"))
+    batch.add_graph(graph)
+
+    assert set(batch.vertices[GraphElemType.ENTITY]) == {"A", "B", "C"}
+    assert len(batch.edges[GraphElemType.RELATION]) == 2
+    assert len(batch) == 5
+
+
+def test_upsert_batch_groups_by_label():
+    adapter = MagicMock(WRITE_BATCH_SIZE=500)
+    batch = GraphBatch()
+    chunks = [_chunk("c0", "doc", True)] + [
+        _chunk(f"c{i}", "c0", False) for i in range(1, 5)
+    ]
+    for i, chunk in enumerate(chunks):
+        batch.add_vertex(GraphElemType.CHUNK, chunk)
+        if chunk.parent_is_document:
+            batch.add_doc_include_chunk(chunk)
+        else:
+            batch.add_chunk_include_chunk(chunk)
+        if i >= 1:
+            batch.add_chunk_next_chunk(chunks[i - 1], chunk)
+    for vid in ["A", "B", "C"]:
+        entity = _entity(vid)
+        batch.add_vertex(GraphElemType.ENTITY, entity)
+        batch.add_chunk_include_entity(chunks[0], entity)
+
+    GraphStoreAdapter.upsert_batch(adapter, batch, batch_size=2)
+
+    adapter.upsert_documents.assert_not_called()
+    # 5 chunks and 3 entities in slices of 2
+    assert [len(list(c.args[0])) for c in adapter.upsert_chunks.call_args_list] == [
+        2,
+        2,
+        1,
+    ]
+    assert [len(list(c.args[0])) for c in adapter.upsert_entities.call_args_list] == [
+        2,
+        1,
+    ]
+    labels = [c.args[1:] for c in adapter.upsert_edge.call_args_list]
+    assert labels == [
+        ("include", "document", "chunk"),
+        ("include", "chunk", "chunk"),
+        ("include", "chunk", "chunk"),
+        ("next", "chunk", "chunk"),
+        ("next", "chunk", "chunk"),
+        ("include", "chunk", "entity"),
+        ("include", "chunk", "entity"),
+    ]
@@ -2,7 +2,17 @@
 
 import json
 import logging
-from typing import Any, AsyncGenerator, Dict, Iterator, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from packaging.version import Version
 
@@ -18,6 +28,7 @@ from dbgpt.storage.knowledge_graph.base import ParagraphChunk
 from dbgpt_ext.storage.graph_store.tugraph_store import TuGraphStore
 from dbgpt_ext.storage.knowledge_graph.community.base import (
     Community,
+    GraphBatch,
     GraphStoreAdapter,
 )
 
@@ -33,6 +44,8 @@ class TuGraphStoreAdapter(GraphStoreAdapter):
     def __init__(self, graph_store: TuGraphStore):
         """Initialize TuGraph Community Store Adapter."""
         super().__init__(graph_store)
+        # The vertex labels known to have the vector index
+        self._vector_index_labels: Set[str] = set()
 
         # Create the graph
         self.create_graph(self.graph_store.get_config().name)
@@ -149,6 +162,9 @@ class TuGraphStoreAdapter(GraphStoreAdapter):
             }
             for entity in entities
         ]
+        if len(entity_list) == 0:
+            return
+
         entity_query = (
             f"CALL db.upsertVertex("
             f'"{GraphElemType.ENTITY.value}", '
@@ -157,25 +173,7 @@ class TuGraphStoreAdapter(GraphStoreAdapter):
 
         # If similarity search enabled, then ready to create vector index
         if enable_similarity_search:
-            # Check wheather the vector index exist
-            check_entity_vector_query = (
-                "CALL db.showVertexVectorIndex() "
-                "YIELD label_name, field_name "
-                f"WHERE label_name = '{GraphElemType.ENTITY.value}' "
-                "AND field_name = '_embedding' "
-                "RETURN label_name"
-            )
-            # If not exist, then create vector index
-            if self.query(check_entity_vector_query).vertex_count == 0:
-                # Get the dimension
-                dimension = len(entity_list[0].get("_embedding", []))
-                # Then create index
-                create_vector_index_query = (
-                    "CALL db.addVertexVectorIndex("
-                    f'"{GraphElemType.ENTITY.value}", "_embedding", '
-                    f"{{dimension: {dimension}}})"
-                )
-                self.graph_store.conn.run(query=create_vector_index_query)
+            self._ensure_vector_index(GraphElemType.ENTITY, entity_list)
 
         self.graph_store.conn.run(query=entity_query)
 
@@ -194,6 +192,9 @@ class TuGraphStoreAdapter(GraphStoreAdapter):
             }
             for edge in edges
         ]
+        if len(edge_list) == 0:
+            return
+
         relation_query = f"""CALL db.upsertEdge("{edge_type}",
             {{type:"{src_type}", key:"sid"}},
             {{type:"{dst_type}", key:"tid"}},
@@ -238,28 +239,40 @@ class TuGraphStoreAdapter(GraphStoreAdapter):
 
         # If similarity search enabled, then ready to create vector index
         if enable_similarity_search:
-            # Check wheather the vector index exist
-            check_chunk_vector_query = (
-                "CALL db.showVertexVectorIndex() "
-                "YIELD label_name, field_name "
-                f"WHERE label_name = '{GraphElemType.CHUNK.value}' "
-                "AND field_name = '_embedding' "
-                "RETURN label_name"
-            )
-            # If not exist, then create vector index
-            if self.query(check_chunk_vector_query).vertex_count == 0:
-                # Get the dimension
-                dimension = len(chunk_list[0].get("_embedding", []))
-                # Then create index
-                create_vector_index_query = (
-                    "CALL db.addVertexVectorIndex("
-                    f'"{GraphElemType.CHUNK.value}", "_embedding", '
-                    f"{{dimension: {dimension}}})"
-                )
-                self.graph_store.conn.run(query=create_vector_index_query)
+            self._ensure_vector_index(GraphElemType.CHUNK, chunk_list)
 
         self.graph_store.conn.run(query=chunk_query)
 
+    def _ensure_vector_index(
+        self, vertex_type: GraphElemType, vertex_list: List[Dict[str, Any]]
+    ) -> None:
+        """Create the vector index of the vertex label if it does not exist.
+
+        The check is done once per label, not on every upsert.
+        """
+        if vertex_type.value in self._vector_index_labels:
+            return
+        # Check wheather the vector index exist
+        check_vector_query = (
+            "CALL db.showVertexVectorIndex() "
+            "YIELD label_name, field_name "
+            f"WHERE label_name = '{vertex_type.value}' "
+            "AND field_name = '_embedding' "
+            "RETURN label_name"
+        )
+        # If not exist, then create vector index
+        if self.query(check_vector_query).vertex_count == 0:
+            # Get the dimension
+            dimension = len(vertex_list[0].get("_embedding", []))
+            # Then create index
+            create_vector_index_query = (
+                "CALL db.addVertexVectorIndex("
+                f'"{vertex_type.value}", "_embedding", '
+                f"{{dimension: {dimension}}})"
+            )
+            self.graph_store.conn.run(query=create_vector_index_query)
+        self._vector_index_labels.add(vertex_type.value)
+
     def upsert_documents(
         self, documents: Iterator[Union[Vertex, ParagraphChunk]]
     ) -> None:
@@ -280,6 +293,8 @@ class TuGraphStoreAdapter(GraphStoreAdapter):
             )
             for document in documents
         ]
+        if len(document_list) == 0:
+            return
 
         document_query = (
             "CALL db.upsertVertex("
@@ -316,71 +331,9 @@ class TuGraphStoreAdapter(GraphStoreAdapter):
         Args:
             graph (Graph): The graph to be added.
         """
-        # Get the iterators of all the vertices and the edges from the graph
-        documents: Iterator[Vertex] = graph.vertices(
-            filter_fn=lambda x: x.get_prop("vertex_type")
-            == GraphElemType.DOCUMENT.value
-        )
-        chunks: Iterator[Vertex] = graph.vertices(
-            filter_fn=lambda x: x.get_prop("vertex_type") == GraphElemType.CHUNK.value
-        )
-        entities: Iterator[Vertex] = graph.vertices(
-            filter_fn=lambda x: x.get_prop("vertex_type") == GraphElemType.ENTITY.value
-        )
-        doc_include_chunk: Iterator[Edge] = graph.edges(
-            filter_fn=lambda x: x.get_prop("edge_type")
-            == GraphElemType.DOCUMENT_INCLUDE_CHUNK.value
-        )
-        chunk_include_chunk: Iterator[Edge] = graph.edges(
-            filter_fn=lambda x: x.get_prop("edge_type")
-            == GraphElemType.CHUNK_INCLUDE_CHUNK.value
-        )
-        chunk_include_entity: Iterator[Edge] = graph.edges(
-            filter_fn=lambda x: x.get_prop("edge_type")
-            == GraphElemType.CHUNK_INCLUDE_ENTITY.value
-        )
-        chunk_next_chunk: Iterator[Edge] = graph.edges(
-            filter_fn=lambda x: x.get_prop("edge_type")
-            == GraphElemType.CHUNK_NEXT_CHUNK.value
-        )
-        relation: Iterator[Edge] = graph.edges(
-            filter_fn=lambda x: x.get_prop("edge_type") == GraphElemType.RELATION.value
-        )
-
-        # Upsert the vertices and the edges to the graph store
-        self.upsert_entities(entities)
-        self.upsert_chunks(chunks)
-        self.upsert_documents(documents)
-        self.upsert_edge(
-            doc_include_chunk,
-            GraphElemType.INCLUDE.value,
-            GraphElemType.DOCUMENT.value,
-            GraphElemType.CHUNK.value,
-        )
-        self.upsert_edge(
-            chunk_include_chunk,
-            GraphElemType.INCLUDE.value,
-            GraphElemType.CHUNK.value,
-            GraphElemType.CHUNK.value,
-        )
-        self.upsert_edge(
-            chunk_include_entity,
-            GraphElemType.INCLUDE.value,
-            GraphElemType.CHUNK.value,
-            GraphElemType.ENTITY.value,
-        )
-        self.upsert_edge(
-            chunk_next_chunk,
-            GraphElemType.NEXT.value,
-            GraphElemType.CHUNK.value,
-            GraphElemType.CHUNK.value,
-        )
-        self.upsert_edge(
-            relation,
-            GraphElemType.RELATION.value,
-            GraphElemType.ENTITY.value,
-            GraphElemType.ENTITY.value,
-        )
+        batch = GraphBatch()
+        batch.add_graph(graph)
+        self.upsert_batch(batch)
 
     def delete_document(self, chunk_id: str) -> None:
         """Delete document in the graph."""
@@ -1132,79 +1085,31 @@ class TuGraphStoreAdapter(GraphStoreAdapter):
         chunk: ParagraphChunk,
     ) -> None:
         """Convert chunk to document include chunk."""
-        assert chunk.chunk_parent_id and chunk.chunk_parent_name, (
-            "Chunk parent ID and name are required (document_include_chunk)"
-        )
-
-        edge = Edge(
-            sid=chunk.chunk_parent_id,
-            tid=chunk.chunk_id,
-            name=GraphElemType.INCLUDE.value,
-            edge_type=GraphElemType.DOCUMENT_INCLUDE_CHUNK.value,
-        )
-
-        self.upsert_edge(
-            edges=iter([edge]),
-            edge_type=GraphElemType.INCLUDE.value,
-            src_type=GraphElemType.DOCUMENT.value,
-            dst_type=GraphElemType.CHUNK.value,
-        )
+        batch = GraphBatch()
+        batch.add_doc_include_chunk(chunk)
+        self.upsert_batch(batch)
 
     def upsert_chunk_include_chunk(
         self,
         chunk: ParagraphChunk,
     ) -> None:
         """Convert chunk to chunk include chunk."""
-        assert chunk.chunk_parent_id and chunk.chunk_parent_name, (
-            "Chunk parent ID and name are required (chunk_include_chunk)"
-        )
-
-        edge = Edge(
-            sid=chunk.chunk_parent_id,
-            tid=chunk.chunk_id,
-            name=GraphElemType.INCLUDE.value,
-            edge_type=GraphElemType.CHUNK_INCLUDE_CHUNK.value,
-        )
-
-        self.upsert_edge(
-            edges=iter([edge]),
-            edge_type=GraphElemType.INCLUDE.value,
-            src_type=GraphElemType.CHUNK.value,
-            dst_type=GraphElemType.CHUNK.value,
-        )
+        batch = GraphBatch()
+        batch.add_chunk_include_chunk(chunk)
+        self.upsert_batch(batch)
 
     def upsert_chunk_next_chunk(
         self, chunk: ParagraphChunk, next_chunk: ParagraphChunk
     ):
         """Uperst the vertices and the edge in chunk_next_chunk."""
-        edge = Edge(
-            sid=chunk.chunk_id,
-            tid=next_chunk.chunk_id,
-            name=GraphElemType.NEXT.value,
-            edge_type=GraphElemType.CHUNK_NEXT_CHUNK.value,
-        )
-
-        self.upsert_edge(
-            edges=iter([edge]),
-            edge_type=GraphElemType.NEXT.value,
-            src_type=GraphElemType.CHUNK.value,
-            dst_type=GraphElemType.CHUNK.value,
-        )
+        batch = GraphBatch()
+        batch.add_chunk_next_chunk(chunk, next_chunk)
+        self.upsert_batch(batch)
 
     def upsert_chunk_include_entity(
         self, chunk: ParagraphChunk, entity: Vertex
     ) -> None:
         """Convert chunk to chunk include entity."""
-        edge = Edge(
-            sid=chunk.chunk_id,
-            tid=entity.vid,
-            name=GraphElemType.INCLUDE.value,
-            edge_type=GraphElemType.CHUNK_INCLUDE_ENTITY.value,
-        )
-
-        self.upsert_edge(
-            edges=iter([edge]),
-            edge_type=GraphElemType.INCLUDE.value,
-            src_type=GraphElemType.CHUNK.value,
-            dst_type=GraphElemType.ENTITY.value,
-        )
+        batch = GraphBatch()
+        batch.add_chunk_include_entity(chunk, entity)
+        self.upsert_batch(batch)
@@ -8,6 +8,7 @@ from typing import List, Optional, Tuple
 from dbgpt.core import Chunk, Embeddings, LLMClient
 from dbgpt.core.awel.flow import Parameter, ResourceCategory, register_resource
 from dbgpt.storage.graph_store.base import GraphStoreConfig
+from dbgpt.storage.graph_store.graph import GraphElemType
 from dbgpt.storage.knowledge_graph.base import ParagraphChunk
 from dbgpt.storage.vector_store.base import VectorStoreConfig
 from dbgpt.storage.vector_store.filters import MetadataFilters
@@ -18,7 +19,14 @@ from dbgpt_ext.rag.transformer.graph_embedder import GraphEmbedder
 from dbgpt_ext.rag.transformer.graph_extractor import GraphExtractor
 from dbgpt_ext.rag.transformer.text_embedder import TextEmbedder
 from dbgpt_ext.storage.graph_store.tugraph_store import TuGraphStoreConfig
+from dbgpt_ext.storage.knowledge_graph.community.base import GraphBatch
+from dbgpt_ext.storage.knowledge_graph.community.community_detector import (
+    LocalCommunityDetector,
+)
 from dbgpt_ext.storage.knowledge_graph.community.community_store import CommunityStore
+from dbgpt_ext.storage.knowledge_graph.community.memgraph_store_adapter import (
+    MemGraphStoreAdapter,
+)
 from dbgpt_ext.storage.knowledge_graph.knowledge_graph import (
     GRAPH_PARAMETERS,
     BuiltinKnowledgeGraph,
@@ -202,6 +210,10 @@ class CommunitySummaryKnowledgeGraph(BuiltinKnowledgeGraph):
         vector_store_config: Optional["VectorStoreConfig"] = None,
         kg_max_chunks_once_load: Optional[int] = 10,
         kg_max_threads: Optional[int] = 1,
+        kg_extraction_timeout: Optional[float] = None,
+        kg_extraction_max_retries: Optional[int] = 2,
+        kg_write_batch_size: Optional[int] = 500,
+        kg_community_detection: Optional[str] = None,
     ):
         """Initialize community summary knowledge graph class."""
         super().__init__(
@@ -242,6 +254,24 @@ class CommunitySummaryKnowledgeGraph(BuiltinKnowledgeGraph):
         self._community_summary_batch_size = int(
             kg_community_summary_batch_size or os.getenv("COMMUNITY_SUMMARY_BATCH_SIZE")
         )
+        self._graph_write_batch_size = int(
+            kg_write_batch_size or os.getenv("KNOWLEDGE_GRAPH_WRITE_BATCH_SIZE", 500)
+        )
+        # Detect communities in process ("local") or by the graph store
+        # ("graph_store"), the memory graph can only detect them locally
+        self._community_detection = (
+            kg_community_detection
+            or os.getenv("KNOWLEDGE_GRAPH_COMMUNITY_DETECTION")
+            or (
+                "local"
+                if isinstance(self._graph_store_adapter, MemGraphStoreAdapter)
+                else "graph_store"
+            )
+        )
+        if self._community_detection not in ("local", "graph_store"):
+            raise ValueError(
+                f"Invalid community detection: {self._community_detection}"
+            )
         self._embedding_fn = embedding_fn
         self._vector_store_config = vector_store_config
 
@@ -256,6 +286,9 @@ class CommunitySummaryKnowledgeGraph(BuiltinKnowledgeGraph):
             max_threads=kg_max_threads,
             top_k=kg_extract_top_k,
             score_threshold=kg_extract_score_threshold,
+            embedding_fn=embedding_fn,
+            extract_timeout=kg_extraction_timeout,
+            extract_max_retries=kg_extraction_max_retries,
         )
 
         self._graph_embedder = GraphEmbedder(embedding_fn)
@@ -282,6 +315,11 @@ class CommunitySummaryKnowledgeGraph(BuiltinKnowledgeGraph):
             max_threads=kg_max_threads,
             top_k=kg_community_top_k,
             score_threshold=kg_extract_score_threshold,
+            community_detector=(
+                LocalCommunityDetector()
+                if self._community_detection == "local"
+                else None
+            ),
         )
 
         self._graph_retriever = GraphRetriever(
@@ -348,23 +386,22 @@ class CommunitySummaryKnowledgeGraph(BuiltinKnowledgeGraph):
             for idx, chunk in enumerate(paragraph_chunks):
                 chunk.embedding = embeddings[idx]
 
-        # upsert the document and chunks vertices
-        self._graph_store_adapter.upsert_documents(iter([documment_chunk]))
-        self._graph_store_adapter.upsert_chunks(iter(paragraph_chunks))
-
-        # upsert the document structure
+        # upsert the document and chunks vertices, and the document structure
+        batch = GraphBatch()
+        batch.add_vertex(GraphElemType.DOCUMENT, documment_chunk)
         for chunk_index, chunk in enumerate(paragraph_chunks):
+            batch.add_vertex(GraphElemType.CHUNK, chunk)
+
             # document -> include -> chunk
             if chunk.parent_is_document:
-                self._graph_store_adapter.upsert_doc_include_chunk(chunk=chunk)
+                batch.add_doc_include_chunk(chunk)
             else:  # chunk -> include -> chunk
-                self._graph_store_adapter.upsert_chunk_include_chunk(chunk=chunk)
+                batch.add_chunk_include_chunk(chunk)
 
             # chunk -> next -> chunk
             if chunk_index >= 1:
-                self._graph_store_adapter.upsert_chunk_next_chunk(
-                    chunk=paragraph_chunks[chunk_index - 1], next_chunk=chunk
-                )
+                batch.add_chunk_next_chunk(paragraph_chunks[chunk_index - 1], chunk)
+        self._graph_store_adapter.upsert_batch(batch, self._graph_write_batch_size)
 
     async def _aload_triplet_graph(
         self, chunks: List[Chunk], file_id: Optional[str] = None
@@ -378,27 +415,25 @@ class CommunitySummaryKnowledgeGraph(BuiltinKnowledgeGraph):
 
         document_graph_enabled = self._document_graph_enabled
 
-        # Extract the triplets from the chunks, and return the list of graphs
-        # in the same order as the input texts
-        graphs_list = await self._graph_extractor.batch_extract(
+        # Extract the triplets from the chunks, the graphs of each chunk are
+        # buffered as soon as its extraction completes, and written in bulk
+        batch = GraphBatch()
+        extracted = False
+        async for idx, graphs in self._graph_extractor.aextract_iter(
             [chunk.content for chunk in chunks],
-            batch_size=self._triplet_extraction_batch_size,
+            max_in_flight=self._triplet_extraction_batch_size,
             file_id=file_id,
-        )
-        if not graphs_list:
-            raise ValueError("No graphs extracted from the chunks")
+        ):
+            extracted = True
 
-        # If enable the similarity search, add the embedding to the graphs
-        if self._graph_store.enable_similarity_search:
-            for idx, graphs in enumerate(graphs_list):
-                embeded_graphs = await self._graph_embedder.batch_embed(
+            # If enable the similarity search, add the embedding to the graphs
+            if self._graph_store.enable_similarity_search:
+                graphs = await self._graph_embedder.batch_embed(
                     inputs=graphs,
                     batch_size=self._triplet_embedding_batch_size,
                 )
-                graphs_list[idx] = embeded_graphs
 
-        # Upsert the graphs into the graph store
-        for idx, graphs in enumerate(graphs_list):
+            # Add the graphs to the batch
             for graph in graphs:
                 if document_graph_enabled:
                     # Append the chunk id to the edge
@@ -406,15 +441,22 @@ class CommunitySummaryKnowledgeGraph(BuiltinKnowledgeGraph):
                         edge.set_prop("_chunk_id", chunks[idx].chunk_id)
                         graph.append_edge(edge=edge)
 
-                # Upsert the graph
-                self._graph_store_adapter.upsert_graph(graph)
+                batch.add_graph(graph)
 
                 # chunk -> include -> entity
                 if document_graph_enabled:
                     for vertex in graph.vertices():
-                        self._graph_store_adapter.upsert_chunk_include_entity(
-                            chunk=chunks[idx], entity=vertex
-                        )
+                        batch.add_chunk_include_entity(chunks[idx], vertex)
+
+            # Upsert the batch into the graph store once it is full
+            if len(batch) >= self._graph_write_batch_size:
+                self._graph_store_adapter.upsert_batch(
+                    batch, self._graph_write_batch_size
+                )
+                batch = GraphBatch()
+        if not extracted:
+            raise ValueError("No graphs extracted from the chunks")
+        self._graph_store_adapter.upsert_batch(batch, self._graph_write_batch_size)
 
     def _load_chunks(
         self, chunks: List[ParagraphChunk]
@@ -18,6 +18,7 @@ from dbgpt.storage.vector_store.base import (
 )
 from dbgpt.storage.vector_store.filters import FilterOperator, MetadataFilters
 from dbgpt.util import string_utils
+from dbgpt.util.executor_utils import blocking_func_to_async
 from dbgpt.util.i18n_utils import _
 
 logger = logging.getLogger(__name__)
@@ -205,7 +206,7 @@ class ChromaStore(VectorStoreBase):
                 Chunk(
                     content=chroma_result[0],
                     metadata=chroma_result[1] or {},
-                    score=(1 - chroma_result[2]),
+                    score=self._distance_to_score(chroma_result[2]),
                     chunk_id=chroma_result[3],
                 )
             )
@@ -218,6 +219,65 @@ class ChromaStore(VectorStoreBase):
         ]
         return self.filter_by_score_threshold(chunks, score_threshold)
 
+    def batch_similar_search_with_scores(
+        self,
+        texts: List[str],
+        topk: int,
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[List[Chunk]]:
+        """Search similar documents with scores for multiple queries.
+
+        The queries are embedded as queries, like `similar_search_with_scores`,
+        with one `embed_queries` call, and searched with a single multi-vector
+        chroma query. The scores are the same as the ones of the single searches.
+        """
+        logger.info(f"ChromaStore batch similar search with {len(texts)} queries")
+        results: List[List[Chunk]] = [[] for _ in texts]
+        # Empty queries have no similar documents
+        query_indexes = [idx for idx, text in enumerate(texts) if text]
+        chroma_results = self._batch_query(
+            texts=[texts[idx] for idx in query_indexes], topk=topk, filters=filters
+        )
+        if not chroma_results:
+            return results
+        for idx, documents, metadatas, distances, ids in zip(
+            query_indexes,
+            chroma_results["documents"],
+            chroma_results["metadatas"],
+            chroma_results["distances"],
+            chroma_results["ids"],
+        ):
+            chunks = [
+                Chunk(
+                    content=chroma_result[0],
+                    metadata=chroma_result[1] or {},
+                    score=self._distance_to_score(chroma_result[2]),
+                    chunk_id=chroma_result[3],
+                )
+                for chroma_result in zip(documents, metadatas, distances, ids)
+            ]
+            results[idx] = self.filter_by_score_threshold(chunks, score_threshold)
+        return results
+
+    async def abatch_similar_search_with_scores(
+        self,
+        texts: List[str],
+        topk: int,
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> List[List[Chunk]]:
+        """Async search similar documents with scores for multiple queries."""
+        return await blocking_func_to_async(
+            self._executor,
+            self.batch_similar_search_with_scores,
+            texts,
+            topk,
+            score_threshold,
+            filters,
+        )
+
     async def afull_text_search(
         self, text: str, topk: int, filters: Optional[MetadataFilters] = None
     ) -> List[Chunk]:
@@ -432,6 +492,45 @@ class ChromaStore(VectorStoreBase):
             where=where_filters,
         )
 
+    def _batch_query(
+        self, texts: List[str], topk: int, filters: Optional[MetadataFilters] = None
+    ):
+        """Query Chroma collection with multiple texts at once.
+
+        Args:
+            texts(List[str]): query texts.
+            topk(int): topk.
+            filters(MetadataFilters): metadata filters.
+        Returns:
+            dict: query result, each field has one list per query text.
+        """
+        if not texts:
+            return {}
+        where_filters = self.convert_metadata_filters(filters) if filters else None
+        if self.embeddings is None:
+            raise ValueError("Chroma Embeddings is None")
+        if self._collection.count() == 0:
+            # Nothing to search, avoid embedding the queries
+            return {}
+        query_embeddings = self.embeddings.embed_queries(texts)
+        return self._collection.query(
+            query_embeddings=query_embeddings,
+            n_results=topk,
+            where=where_filters,
+        )
+
+    def _distance_to_score(self, distance: float) -> float:
+        """Convert a chroma distance to a cosine similarity score.
+
+        The embeddings are assumed to be normalized in the "l2" and "ip" spaces,
+        where the squared L2 distance is `2 - 2 * cos` and the inner product
+        distance is `1 - cos`.
+        """
+        space = (self._collection.metadata or {}).get("hnsw:space", "l2")
+        if space == "l2":
+            return 1 - distance / 2
+        return 1 - distance
+
     def _clean_persist_folder(self):
         """Clean persist folder."""
         for root, dirs, files in os.walk(self.persist_dir, topdown=False):
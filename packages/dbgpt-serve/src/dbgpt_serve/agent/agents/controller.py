@@ -35,8 +35,10 @@ from dbgpt.model.cluster import WorkerManagerFactory
 from dbgpt.model.cluster.client import DefaultLLMClient
 from dbgpt.util.executor_utils import ExecutorFactory
 from dbgpt.util.json_utils import serialize
+from dbgpt.util.stream_utils import aclosing_stream
 from dbgpt.util.tracer import TracerManager
 from dbgpt_app.dbgpt_server import system_app
+from dbgpt_app.openapi.api_view_model import Result
 from dbgpt_app.scene.base import ChatScene
 from dbgpt_serve.conversation.serve import Serve as ConversationServe
 from dbgpt_serve.core import blocking_func_to_async
@@ -723,17 +725,10 @@ class MultiAgents(BaseComponent, ABC):
         user_code: str = None,
         system_app: str = None,
     ):
-        while True:
-            queue = self.memory.queue(conv_id)
-            if not queue:
-                break
-            item = await queue.get()
-            if item == "[DONE]":
-                queue.task_done()
-                break
-            else:
+        stream = self.memory.chat_messages(conv_id)
+        async with aclosing_stream(stream):
+            async for item in stream:
                 yield item
-                await asyncio.sleep(0.005)
 
     async def stable_message(
         self, conv_id: str, user_code: str = None, system_app: str = None
@@ -800,3 +795,9 @@ def _format_vis_msg(msg: str):
 
 
 multi_agents = MultiAgents(system_app)
+
+
+@router.get("/v1/agent/memory/metrics")
+async def agent_memory_metrics():
+    """Get the gauges of the agent conversations kept in process."""
+    return Result.succ(multi_agents.memory.metrics())
@@ -0,0 +1,23 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from dbgpt.agent import GptsMemory
+
+from .. import controller
+
+
+def test_agent_memory_metrics(monkeypatch):
+    memory = GptsMemory(max_conversations=10)
+    memory.init("conv_1")
+    memory.init("conv_2")
+    monkeypatch.setattr(controller.multi_agents, "memory", memory)
+
+    app = FastAPI()
+    app.include_router(controller.router, prefix="/api")
+    response = TestClient(app).get("/api/v1/agent/memory/metrics")
+
+    assert response.status_code == 200
+    metrics = response.json()["data"]
+    assert metrics == memory.metrics()
+    assert metrics["conversations"] == 2
+    assert metrics["max_conversations"] == 10
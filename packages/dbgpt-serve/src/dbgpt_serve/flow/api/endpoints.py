@@ -1,14 +1,24 @@
 import io
 import json
 from functools import cache
-from typing import Dict, List, Literal, Optional
-
-from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from typing import Any, Dict, List, Literal, Optional
+
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+)
 from fastapi.security.http import HTTPAuthorizationCredentials, HTTPBearer
 from starlette.responses import JSONResponse, StreamingResponse
 
 from dbgpt.component import SystemApp
 from dbgpt.core.awel.flow.flow_factory import FlowCategory
+from dbgpt.core.awel.runner.profiler import get_awel_profiler
 from dbgpt.util import PaginationResult
 from dbgpt_serve.core import Result, blocking_func_to_async
 
@@ -577,6 +587,51 @@ async def flow_file_path(
         return Result.failed(f"获取Flow文件异常！{str(e)}")
 
 
+@router.get(
+    "/profile",
+    response_model=Result[Dict[str, Any]],
+    dependencies=[Depends(check_api_key)],
+)
+async def get_profile(
+    uid: Optional[str] = Query(default=None, description="flow uid"),
+    service: Service = Depends(get_service),
+) -> Result[Dict[str, Any]]:
+    """Get the AWEL profile of the operators and DAGs
+
+    Args:
+        uid (Optional[str]): Only get the profile of the flow, all if not set.
+    """
+    return Result.succ(service.get_profile(uid))
+
+
+@router.put(
+    "/profile",
+    response_model=Result[Dict[str, Any]],
+    dependencies=[Depends(check_api_key)],
+)
+async def update_profile(
+    enabled: bool = Body(embed=True, description="whether to profile the AWEL runs"),
+) -> Result[Dict[str, Any]]:
+    """Enable or disable the AWEL profiler"""
+    profiler = get_awel_profiler()
+    if enabled:
+        profiler.enable()
+    else:
+        profiler.disable()
+    return Result.succ({"enabled": profiler.enabled})
+
+
+@router.delete(
+    "/profile",
+    response_model=Result[None],
+    dependencies=[Depends(check_api_key)],
+)
+async def reset_profile() -> Result[None]:
+    """Clear the recorded AWEL profile"""
+    get_awel_profiler().reset()
+    return Result.succ(None)
+
+
 # @router.get(
 #     "/flow/notebook/file/read",
 #     response_model=Result[PaginationResult[ServerResponse]],
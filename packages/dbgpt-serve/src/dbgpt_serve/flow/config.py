@@ -40,3 +40,31 @@ class ServeConfig(BaseServeConfig):
     encrypt_key: Optional[str] = field(
         default=None, metadata={"help": _("The key to encrypt the data")}
     )
+    load_workers: int = field(
+        default=1,
+        metadata={
+            "help": _(
+                "The number of workers to build the flows concurrently at startup, "
+                "1 means building them one by one"
+            )
+        },
+    )
+    enable_profiler: bool = field(
+        default=False,
+        metadata={
+            "help": _(
+                "Whether to profile the operators and DAGs of the AWEL runs, the "
+                "profile can be queried by the serve API"
+            )
+        },
+    )
+    lazy_load: bool = field(
+        default=False,
+        metadata={
+            "help": _(
+                "Whether to build the flows without triggers on their first calls "
+                "instead of at startup, the flows with triggers are always loaded "
+                "at startup"
+            )
+        },
+    )
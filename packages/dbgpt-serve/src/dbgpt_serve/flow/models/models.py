@@ -4,7 +4,7 @@ You can define your own models and DAOs here
 
 import json
 from datetime import datetime
-from typing import Any, Dict, Union
+from typing import Any, Dict, List, Union
 
 from sqlalchemy import Column, DateTime, Integer, String, Text, UniqueConstraint
 
@@ -302,6 +302,27 @@ class ServeDao(BaseDao[ServeEntity, ServeRequest, ServerResponse]):
             session.commit()
             return self.get_one(query_request)
 
+    def update_states(
+        self, uids: List[str], state: State, error_message: str = ""
+    ) -> None:
+        """Update the states of the flows in one query.
+
+        Args:
+            uids (List[str]): The uids of the flows
+            state (State): The new state
+            error_message (str): The new error message
+        """
+        if not uids:
+            return
+        with self.session() as session:
+            session.query(ServeEntity).filter(ServeEntity.uid.in_(uids)).update(
+                {
+                    ServeEntity.state: state.value,
+                    ServeEntity.error_message: error_message[:500],
+                },
+                synchronize_session=False,
+            )
+
 
 class VariablesDao(BaseDao[VariablesEntity, VariablesRequest, VariablesResponse]):
     """The DAO class for Variables"""
@@ -30,6 +30,7 @@ class VariablesAdapter(StorageItemAdapter[StorageVariables, VariablesEntity]):
             sys_code=item.sys_code,
             user_name=item.user_name,
             description=item.description,
+            enabled=item.enabled,
         )
 
     def from_storage_format(self, model: VariablesEntity) -> StorageVariables:
@@ -48,6 +49,7 @@ class VariablesAdapter(StorageItemAdapter[StorageVariables, VariablesEntity]):
             sys_code=model.sys_code,
             user_name=model.user_name,
             description=model.description,
+            enabled=model.enabled,
         )
 
     def get_query_for_identifier(
@@ -0,0 +1,99 @@
+"""The in-memory routing table from the flow uid to its running DAG."""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+
+from dbgpt.core.awel import DAG, BaseOperator
+from dbgpt.core.awel.dag.dag_manager import DAGListener
+
+
+@dataclass(frozen=True)
+class FlowRoute:
+    """The route of a flow to the leaf operator of its running DAG."""
+
+    uid: str
+    dag_id: str
+    leaf_node: BaseOperator
+
+
+class FlowRouteTable(DAGListener):
+    """The routes of the flows, kept consistent by the DAGs registered and
+    unregistered in DAGManager.
+
+    The routes are added when the flows are called, a route is removed when its
+    DAG is unregistered or a new DAG is registered for its flow.
+    """
+
+    def __init__(self):
+        """Create a flow route table."""
+        self._lock = threading.Lock()
+        self._routes: Dict[str, FlowRoute] = {}
+        self._dag_id_to_uids: Dict[str, Set[str]] = {}
+        # Increased on every DAG change, the routes built before are not added
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Get the version of the table, get it before building a route."""
+        return self._version
+
+    def get(self, uid: str) -> Optional[FlowRoute]:
+        """Get the route of a flow."""
+        return self._routes.get(uid)
+
+    def put(self, route: FlowRoute, version: int) -> bool:
+        """Add the route of a flow, if no DAG changed since the version.
+
+        Returns:
+            bool: Whether the route is added.
+        """
+        with self._lock:
+            if version != self._version:
+                return False
+            self._routes[route.uid] = route
+            self._dag_id_to_uids.setdefault(route.dag_id, set()).add(route.uid)
+            return True
+
+    def remove(self, uid: str) -> None:
+        """Remove the route of a flow."""
+        with self._lock:
+            self._version += 1
+            self._remove(uid)
+
+    def clear(self) -> None:
+        """Remove all the routes."""
+        with self._lock:
+            self._version += 1
+            self._routes.clear()
+            self._dag_id_to_uids.clear()
+
+    def __len__(self) -> int:
+        """Get the number of the routes."""
+        return len(self._routes)
+
+    def on_register(self, dag: DAG, alias_name: Optional[str] = None) -> None:
+        """Remove the old route of the flow of the registered DAG."""
+        with self._lock:
+            self._version += 1
+            if alias_name:
+                self._remove(alias_name)
+            for uid in list(self._dag_id_to_uids.get(dag.dag_id, ())):
+                self._remove(uid)
+
+    def on_unregister(self, dag: DAG) -> None:
+        """Remove the routes to the unregistered DAG."""
+        with self._lock:
+            self._version += 1
+            for uid in list(self._dag_id_to_uids.get(dag.dag_id, ())):
+                self._remove(uid)
+
+    def _remove(self, uid: str) -> None:
+        route = self._routes.pop(uid, None)
+        if route is None:
+            return
+        uids = self._dag_id_to_uids.get(route.dag_id)
+        if uids is not None:
+            uids.discard(uid)
+            if not uids:
+                del self._dag_id_to_uids[route.dag_id]
@@ -1,7 +1,11 @@
 import json
 import logging
 import os
-from typing import AsyncIterator, Dict, List, Optional, Tuple, cast
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, cast
 
 import schedule
 from fastapi import HTTPException
@@ -11,12 +15,15 @@ from dbgpt._private.pydantic import model_to_json
 from dbgpt.agent import AgentDummyTrigger
 from dbgpt.component import SystemApp
 from dbgpt.core.awel import DAG, BaseOperator, CommonLLMHttpRequestBody
+from dbgpt.core.awel.flow.base import _get_type_cls
 from dbgpt.core.awel.flow.flow_factory import (
     FlowCategory,
     FlowFactory,
     State,
     fill_flow_panel,
 )
+from dbgpt.core.awel.runner.profiler import get_awel_profiler
+from dbgpt.core.awel.trigger.base import Trigger
 from dbgpt.core.awel.trigger.http_trigger import CommonLLMHttpTrigger
 from dbgpt.core.awel.util.chat_util import (
     _v1_create_completion_response,
@@ -34,17 +41,74 @@ from dbgpt.storage.metadata import BaseDao
 from dbgpt.storage.metadata._base_dao import QUERY_SPEC
 from dbgpt.util.dbgpts.loader import DBGPTsLoader
 from dbgpt.util.pagination_utils import PaginationResult
+from dbgpt.util.stream_utils import aclosing_stream
 from dbgpt_serve.core import BaseService, blocking_func_to_async
 
 from ..api.schemas import FlowDebugRequest, FlowInfo, ServeRequest, ServerResponse
 from ..config import SERVE_SERVICE_COMPONENT_NAME, ServeConfig
 from ..models.models import ServeDao, ServeEntity
 from .compat_service import register_compat_flow
+from .flow_routes import FlowRoute, FlowRouteTable
 
 logger = logging.getLogger(__name__)
 
 CFG = Config()
 
+# The number of the slowest flows logged in the startup load report
+_LOAD_REPORT_TOP_N = 10
+
+
+@dataclass
+class FlowLoadTiming:
+    """The timing of loading a flow at startup."""
+
+    uid: str
+    name: Optional[str]
+    build_seconds: float = 0.0
+    register_seconds: float = 0.0
+    lazy: bool = False
+    error: Optional[str] = None
+
+
+def _has_trigger(entity: ServerResponse) -> bool:
+    """Whether the flow has a trigger, e.g. a HTTP trigger or an agent trigger.
+
+    The flows with triggers are reached by their triggers or found in DAGManager
+    directly, so they can't be built lazily.
+    """
+    if not entity.flow_data:
+        return True
+    for node in entity.flow_data.nodes:
+        if not node.data.is_operator:
+            continue
+        try:
+            if issubclass(_get_type_cls(node.data.type_cls), Trigger):
+                return True
+        except Exception:
+            # Load it at startup if not sure
+            return True
+    return False
+
+
+def _log_load_report(timings: List[FlowLoadTiming], total_seconds: float) -> None:
+    lazy = sum(1 for t in timings if t.lazy)
+    failed = sum(1 for t in timings if t.error)
+    logger.info(
+        f"Loaded {len(timings) - lazy - failed} flows from db in "
+        f"{total_seconds:.3f}s, {lazy} lazy, {failed} failed"
+    )
+    # The slowest flows first, just log the top ones if not debugging
+    sorted_timings = sorted(
+        timings, key=lambda t: t.build_seconds + t.register_seconds, reverse=True
+    )
+    for i, t in enumerate(sorted_timings):
+        status = "lazy" if t.lazy else ("failed" if t.error else "running")
+        logger.log(
+            logging.INFO if i < _LOAD_REPORT_TOP_N else logging.DEBUG,
+            f"Flow {t.name}({t.uid}): {status}, build {t.build_seconds:.3f}s, "
+            f"register {t.register_seconds:.3f}s",
+        )
+
 
 class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
     """The service class for Flow"""
@@ -59,6 +123,12 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
         self._dao: ServeDao = dao
         self._flow_factory: FlowFactory = FlowFactory()
         self._dbgpts_loader: Optional[DBGPTsLoader] = None
+        self._flow_routes = FlowRouteTable()
+        self._startup_entities: Optional[List[ServerResponse]] = None
+        # The flows to be built on their first calls, by uid
+        self._lazy_flows: Dict[str, ServerResponse] = {}
+        self._lazy_lock = threading.Lock()
+        self._load_report: List[FlowLoadTiming] = []
 
         super().__init__(system_app)
 
@@ -82,6 +152,9 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
     def before_start(self):
         """Execute before the application starts"""
         super().before_start()
+        self.dag_manager.add_listener(self._flow_routes)
+        if self._serve_config.enable_profiler:
+            get_awel_profiler().enable()
         # Register the compat flow at the beginning
         register_compat_flow()
         self._pre_load_dag_from_db()
@@ -193,28 +266,128 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
                     f"Pre load requirements for DAG({entity.name}, {entity.dag_id}) "
                     f"from db error: {str(e)}"
                 )
+        # Reuse them to load the DAGs after the application starts
+        self._startup_entities = entities
 
     def load_dag_from_db(self):
-        """Load DAG from db"""
-        entities = self.dao.get_list({})
+        """Load DAG from db
+
+        The DAGs are built by `load_workers` workers concurrently, and registered one
+        by one. The flows without triggers are just recorded if `lazy_load` is enabled,
+        they are built on their first calls by uid.
+        """
+        entities = self._startup_entities or self.dao.get_list({})
+        self._startup_entities = None
+        start = time.perf_counter()
+        to_build: List[ServerResponse] = []
+        timings: List[FlowLoadTiming] = []
         for entity in entities:
-            try:
-                if entity.define_type != "json":
-                    continue
-                dag = self._flow_factory.build(entity)
-                if entity.state in [State.DEPLOYED, State.RUNNING] or (
-                    entity.version == "0.1.0" and entity.state == State.INITIALIZING
-                ):
-                    # Register the DAG
-                    self.dag_manager.register_dag(dag, entity.uid)
-                    # Update state to RUNNING
-                    entity.state = State.RUNNING
-                    entity.error_message = ""
-                    self.dao.update({"uid": entity.uid}, entity)
-            except Exception as e:
-                logger.warning(
-                    f"Load DAG({entity.name}, {entity.dag_id}) from db error: {str(e)}"
-                )
+            if entity.define_type != "json" or not (
+                entity.state in [State.DEPLOYED, State.RUNNING]
+                or (entity.version == "0.1.0" and entity.state == State.INITIALIZING)
+            ):
+                continue
+            if self._serve_config.lazy_load and not _has_trigger(entity):
+                with self._lazy_lock:
+                    self._lazy_flows[entity.uid] = entity
+                timings.append(FlowLoadTiming(entity.uid, entity.name, lazy=True))
+                continue
+            to_build.append(entity)
+
+        workers = max(1, self._serve_config.load_workers)
+        if workers > 1 and len(to_build) > 1:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="flow_loader"
+            ) as executor:
+                built = list(executor.map(self._build_dag_timed, to_build))
+        else:
+            built = [self._build_dag_timed(entity) for entity in to_build]
+
+        running_uids = []
+        for entity, (dag, timing) in zip(to_build, built):
+            timings.append(timing)
+            if dag is None:
+                continue
+            if self._register_dag_timed(dag, entity, timing):
+                running_uids.append(entity.uid)
+        # Update the states of all the running flows together
+        self.dao.update_states(running_uids, State.RUNNING)
+        self._load_report = timings
+        _log_load_report(timings, time.perf_counter() - start)
+
+    def _build_dag_timed(
+        self, entity: ServerResponse
+    ) -> Tuple[Optional[DAG], FlowLoadTiming]:
+        timing = FlowLoadTiming(entity.uid, entity.name)
+        start = time.perf_counter()
+        try:
+            return self._flow_factory.build(entity), timing
+        except Exception as e:
+            timing.error = str(e)
+            logger.warning(
+                f"Load DAG({entity.name}, {entity.dag_id}) from db error: {str(e)}"
+            )
+            return None, timing
+        finally:
+            timing.build_seconds = time.perf_counter() - start
+
+    def _register_dag_timed(
+        self, dag: DAG, entity: ServerResponse, timing: FlowLoadTiming
+    ) -> bool:
+        start = time.perf_counter()
+        try:
+            self.dag_manager.register_dag(dag, entity.uid)
+            return True
+        except Exception as e:
+            timing.error = str(e)
+            logger.warning(
+                f"Load DAG({entity.name}, {entity.dag_id}) from db error: {str(e)}"
+            )
+            return False
+        finally:
+            timing.register_seconds = time.perf_counter() - start
+
+    def _load_lazy_flow(self, flow_uid: str) -> bool:
+        """Build and register a lazily loaded flow.
+
+        Returns:
+            bool: Whether the flow is a lazily loaded flow.
+        """
+        with self._lazy_lock:
+            entity = self._lazy_flows.get(flow_uid)
+            if entity is None:
+                return False
+            dag, timing = self._build_dag_timed(entity)
+            if dag is None or not self._register_dag_timed(dag, entity, timing):
+                raise ValueError(f"Load flow {flow_uid} error: {timing.error}")
+            del self._lazy_flows[flow_uid]
+        self.dao.update_states([flow_uid], State.RUNNING)
+        logger.info(
+            f"Lazy load flow {entity.name}({flow_uid}), build "
+            f"{timing.build_seconds:.3f}s, register {timing.register_seconds:.3f}s"
+        )
+        return True
+
+    def get_load_report(self) -> List[FlowLoadTiming]:
+        """Get the timings of the flows loaded from db at startup."""
+        return list(self._load_report)
+
+    def get_profile(self, uid: Optional[str] = None) -> Dict[str, Any]:
+        """Get the AWEL profile of the flows.
+
+        Args:
+            uid (Optional[str]): Only get the profile of the flow, all the DAGs if
+                not set.
+
+        Returns:
+            Dict[str, Any]: The profile, see `AWELProfiler.snapshot`.
+        """
+        if not uid:
+            return get_awel_profiler().snapshot()
+        entity = self.get({"uid": uid})
+        if not entity:
+            raise HTTPException(status_code=404, detail=f"Flow {uid} not found")
+        return get_awel_profiler().snapshot(entity.dag_id)
 
     def _pre_load_dag_from_dbgpts(self):
         """Pre load DAG from dbgpts"""
@@ -358,6 +531,9 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
         inst = self.get(query_request)
         if inst is None:
             raise HTTPException(status_code=404, detail=f"Flow {uid} not found")
+        self._flow_routes.remove(uid)
+        with self._lazy_lock:
+            self._lazy_flows.pop(uid, None)
         if inst.state == State.RUNNING and not inst.dag_id:
             raise HTTPException(
                 status_code=404, detail=f"Running flow {uid}'s dag id not found"
@@ -444,22 +620,24 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
         """
         # Must be non-incremental
         request.incremental = False
-        async for output in self.safe_chat_stream_flow(flow_uid, request):
-            text = output.gen_text_with_thinking()
-            if text:
-                text = text.replace("\n", "\\n")
-            if output.error_code != 0:
-                yield _v1_create_completion_response(
-                    f"[SERVER_ERROR]{text}",
-                    None,
-                    model_name=request.model,
-                    stream_id=request.conv_uid,
-                )
-                break
-            else:
-                yield _v1_create_completion_response(
-                    text, None, model_name=request.model, stream_id=request.conv_uid
-                )
+        stream = self.safe_chat_stream_flow(flow_uid, request)
+        async with aclosing_stream(stream):
+            async for output in stream:
+                text = output.gen_text_with_thinking()
+                if text:
+                    text = text.replace("\n", "\\n")
+                if output.error_code != 0:
+                    yield _v1_create_completion_response(
+                        f"[SERVER_ERROR]{text}",
+                        None,
+                        model_name=request.model,
+                        stream_id=request.conv_uid,
+                    )
+                    break
+                else:
+                    yield _v1_create_completion_response(
+                        text, None, model_name=request.model, stream_id=request.conv_uid
+                    )
 
     async def chat_stream_openai(
         self, flow_uid: str, request: CommonLLMHttpRequestBody
@@ -478,27 +656,30 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
         yield f"data: {json_data}\n\n"
 
         request.incremental = True
-        async for output in self.safe_chat_stream_flow(flow_uid, request):
-            if not output.success:
-                yield f"data: {json.dumps(output.to_dict(), ensure_ascii=False)}\n\n"
-                yield "data: [DONE]\n\n"
-                return
-            text = output.text if output.has_text else ""
-            choice_data = ChatCompletionResponseStreamChoice(
-                index=0,
-                delta=DeltaMessage(
-                    role="assistant",
-                    content=text,
-                    reasoning_content=output.thinking_text,
-                ),
-            )
-            chunk = ChatCompletionStreamResponse(
-                id=conv_uid,
-                choices=[choice_data],
-                model=request.model,
-            )
-            json_data = model_to_json(chunk, exclude_unset=True, ensure_ascii=False)
-            yield f"data: {json_data}\n\n"
+        stream = self.safe_chat_stream_flow(flow_uid, request)
+        async with aclosing_stream(stream):
+            async for output in stream:
+                if not output.success:
+                    error_data = json.dumps(output.to_dict(), ensure_ascii=False)
+                    yield f"data: {error_data}\n\n"
+                    yield "data: [DONE]\n\n"
+                    return
+                text = output.text if output.has_text else ""
+                choice_data = ChatCompletionResponseStreamChoice(
+                    index=0,
+                    delta=DeltaMessage(
+                        role="assistant",
+                        content=text,
+                        reasoning_content=output.thinking_text,
+                    ),
+                )
+                chunk = ChatCompletionStreamResponse(
+                    id=conv_uid,
+                    choices=[choice_data],
+                    model=request.model,
+                )
+                json_data = model_to_json(chunk, exclude_unset=True, ensure_ascii=False)
+                yield f"data: {json_data}\n\n"
         yield "data: [DONE]\n\n"
 
     async def safe_chat_flow(
@@ -537,10 +718,10 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
         incremental = request.incremental
         try:
             task = await self._get_callable_task(flow_uid)
-            async for output in safe_chat_stream_with_dag_task(
-                task, request, incremental
-            ):
-                yield output
+            stream = safe_chat_stream_with_dag_task(task, request, incremental)
+            async with aclosing_stream(stream):
+                async for output in stream:
+                    yield output
         except HTTPException as e:
             yield ModelOutput(error_code=1, text=e.detail, incremental=incremental)
         except Exception as e:
@@ -559,15 +740,32 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
             HTTPException: If the flow is not found
             ValueError: If the flow is not a chat flow or the leaf node is not found.
         """
-        flow = self.get({"uid": flow_uid})
-        if not flow:
-            raise HTTPException(status_code=404, detail=f"Flow {flow_uid} not found")
-        dag_id = flow.dag_id
-        if not dag_id or dag_id not in self.dag_manager.dag_map:
-            raise HTTPException(
-                status_code=404, detail=f"Flow {flow_uid}'s dag id not found"
-            )
-        dag = self.dag_manager.dag_map[dag_id]
+        route = self._flow_routes.get(flow_uid)
+        if route is None:
+            if flow_uid in self._lazy_flows:
+                await blocking_func_to_async(
+                    self._system_app, self._load_lazy_flow, flow_uid
+                )
+            route = self._build_flow_route(flow_uid)
+        return route.leaf_node
+
+    def _build_flow_route(self, flow_uid: str) -> FlowRoute:
+        """Build the route of a flow and add it to the routing table."""
+        version = self._flow_routes.version
+        # The running DAG of a flow is registered with the flow uid as its alias
+        dag = self.dag_manager.get_dag(alias_name=flow_uid)
+        if dag is None:
+            flow = self.get({"uid": flow_uid})
+            if not flow:
+                raise HTTPException(
+                    status_code=404, detail=f"Flow {flow_uid} not found"
+                )
+            dag_id = flow.dag_id
+            if not dag_id or dag_id not in self.dag_manager.dag_map:
+                raise HTTPException(
+                    status_code=404, detail=f"Flow {flow_uid}'s dag id not found"
+                )
+            dag = self.dag_manager.dag_map[dag_id]
         # if (
         #     flow.flow_category != FlowCategory.CHAT_FLOW
         #     and self._parse_flow_category(dag) != FlowCategory.CHAT_FLOW
@@ -576,7 +774,13 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
         leaf_nodes = dag.leaf_nodes
         if len(leaf_nodes) != 1:
             raise ValueError("Chat Flow just support one leaf node in dag")
-        return cast(BaseOperator, leaf_nodes[0])
+        route = FlowRoute(
+            uid=flow_uid,
+            dag_id=dag.dag_id,
+            leaf_node=cast(BaseOperator, leaf_nodes[0]),
+        )
+        self._flow_routes.put(route, version)
+        return route
 
     def _parse_flow_category(self, dag: DAG) -> FlowCategory:
         """Parse the flow category
@@ -587,8 +791,6 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
         Returns:
             FlowCategory: The flow category
         """
-        from dbgpt.core.awel.flow.base import _get_type_cls
-
         triggers = dag.trigger_nodes
         leaf_nodes = dag.leaf_nodes
         if (
@@ -663,10 +865,10 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
             incremental = default_incremental
 
         try:
-            async for output in safe_chat_stream_with_dag_task(
-                task, dag_request, incremental
-            ):
-                yield output
+            stream = safe_chat_stream_with_dag_task(task, dag_request, incremental)
+            async with aclosing_stream(stream):
+                async for output in stream:
+                    yield output
         except HTTPException as e:
             yield ModelOutput(error_code=1, text=e.detail, incremental=incremental)
         except Exception as e:
@@ -675,15 +877,16 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
     async def _wrapper_chat_stream_flow_str(
         self, stream_iter: AsyncIterator[ModelOutput]
     ) -> AsyncIterator[str]:
-        async for output in stream_iter:
-            text = output.text
-            if text:
-                text = text.replace("\n", "\\n")
-            if output.error_code != 0:
-                yield f"data:[SERVER_ERROR]{text}\n\n"
-                break
-            else:
-                yield f"data:{text}\n\n"
+        async with aclosing_stream(stream_iter):
+            async for output in stream_iter:
+                text = output.text
+                if text:
+                    text = text.replace("\n", "\\n")
+                if output.error_code != 0:
+                    yield f"data:[SERVER_ERROR]{text}\n\n"
+                    break
+                else:
+                    yield f"data:{text}\n\n"
 
     async def get_flow_files(self, flow_uid: str):
         logger.info(f"get_flow_files:{flow_uid}")
@@ -126,3 +126,24 @@ async def test_api_query_by_page(client: AsyncClient):
 
 
 # Add more test cases according to your own logic
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "client",
+    [{"app_caller": client_init_caller, "client_api_key": "mock_api_key_123"}],
+    indirect=["client"],
+)
+async def test_api_profile(client: AsyncClient):
+    response = await client.put("/profile", json={"enabled": True})
+    assert response.status_code == 200
+    assert response.json()["data"] == {"enabled": True}
+
+    response = await client.get("/profile")
+    assert response.status_code == 200
+    assert response.json()["data"]["enabled"]
+
+    response = await client.delete("/profile")
+    assert response.status_code == 200
+    response = await client.put("/profile", json={"enabled": False})
+    assert response.json()["data"] == {"enabled": False}
@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from dbgpt.component import SystemApp
+from dbgpt.core.awel import DAG, MapOperator
+from dbgpt.core.awel.dag.dag_manager import DAGManager
+from dbgpt.core.awel.flow.flow_factory import FlowCategory, State
+from dbgpt.util.executor_utils import DefaultExecutorFactory
+
+from ..config import ServeConfig
+from ..service.service import Service
+
+
+def _node(type_cls: str):
+    return SimpleNamespace(data=SimpleNamespace(is_operator=True, type_cls=type_cls))
+
+
+def _entity(uid: str, category: FlowCategory = FlowCategory.COMMON, trigger=True):
+    nodes = [_node("dbgpt.core.awel.trigger.http_trigger.RequestBodyToDictOperator")]
+    if trigger:
+        nodes.append(_node("dbgpt.core.awel.trigger.http_trigger.CommonLLMHttpTrigger"))
+    entity = MagicMock()
+    entity.uid = uid
+    entity.name = f"flow_{uid}"
+    entity.dag_id = f"dag_{uid}"
+    entity.define_type = "json"
+    entity.state = State.RUNNING
+    entity.flow_category = category
+    entity.flow_data = SimpleNamespace(nodes=nodes)
+    return entity
+
+
+def _build_dag(entity) -> DAG:
+    if entity.uid == "broken":
+        raise ValueError("Broken flow")
+    with DAG(entity.dag_id) as dag:
+        MapOperator(lambda x: x)
+    return dag
+
+
+def _service(entities, **config_kwargs) -> Service:
+    system_app = SystemApp()
+    system_app.register(DefaultExecutorFactory)
+    dao = MagicMock()
+    dao.get_list.return_value = entities
+    service = Service(system_app, ServeConfig(**config_kwargs), dao=dao)
+    service._system_app = system_app
+    service._dag_manager = DAGManager(system_app, [])
+    service._flow_factory = MagicMock()
+    service._flow_factory.build.side_effect = _build_dag
+    return service
+
+
+@pytest.mark.parametrize("load_workers", [1, 4])
+def test_load_dag_from_db(load_workers: int):
+    entities = [_entity(str(i)) for i in range(8)] + [_entity("broken")]
+    service = _service(entities, load_workers=load_workers)
+    service.load_dag_from_db()
+
+    assert len(service.dag_manager.dag_map) == 8
+    # The states are updated in one query
+    service.dao.update_states.assert_called_once()
+    uids, state = service.dao.update_states.call_args[0]
+    assert sorted(uids) == [str(i) for i in range(8)]
+    assert state == State.RUNNING
+
+    report = {t.uid: t for t in service.get_load_report()}
+    assert len(report) == 9
+    assert report["broken"].error == "Broken flow"
+    assert report["0"].error is None
+
+
+@pytest.mark.asyncio
+async def test_lazy_load_flow_without_trigger():
+    entities = [
+        _entity("chat", FlowCategory.CHAT_FLOW),
+        _entity("no_trigger", trigger=False),
+    ]
+    service = _service(entities, lazy_load=True)
+    service.load_dag_from_db()
+    # The flows with triggers are loaded at startup, their routes are reachable
+    assert list(service.dag_manager.dag_map) == ["dag_chat"]
+    report = {t.uid: t for t in service.get_load_report()}
+    assert report["no_trigger"].lazy
+    assert not report["chat"].lazy
+
+    task = await service._get_callable_task("no_trigger")
+    assert task.dag.dag_id == "dag_no_trigger"
+    assert "dag_no_trigger" in service.dag_manager.dag_map
+    service.dao.update_states.assert_called_with(["no_trigger"], State.RUNNING)
+    # The route is cached
+    assert await service._get_callable_task("no_trigger") is task
@@ -0,0 +1,58 @@
+from dbgpt.component import SystemApp
+from dbgpt.core.awel import DAG, MapOperator
+from dbgpt.core.awel.dag.dag_manager import DAGManager
+
+from ..service.flow_routes import FlowRoute, FlowRouteTable
+
+
+def _build_dag(dag_id: str) -> DAG:
+    with DAG(dag_id) as dag:
+        MapOperator(lambda x: x)
+    return dag
+
+
+def _route(uid: str, dag: DAG) -> FlowRoute:
+    return FlowRoute(uid=uid, dag_id=dag.dag_id, leaf_node=dag.leaf_nodes[0])
+
+
+def test_routes_removed_on_unregister():
+    dag_manager = DAGManager(SystemApp(), [])
+    routes = FlowRouteTable()
+    dag_manager.add_listener(routes)
+
+    dag = _build_dag("dag_1")
+    dag_manager.register_dag(dag, "flow_1")
+    assert routes.put(_route("flow_1", dag), routes.version)
+    assert routes.get("flow_1").leaf_node is dag.leaf_nodes[0]
+
+    dag_manager.unregister_dag("dag_1")
+    assert routes.get("flow_1") is None
+    assert len(routes) == 0
+
+
+def test_routes_replaced_on_register():
+    dag_manager = DAGManager(SystemApp(), [])
+    routes = FlowRouteTable()
+    dag_manager.add_listener(routes)
+
+    old_dag = _build_dag("dag_1")
+    dag_manager.register_dag(old_dag, "flow_1")
+    routes.put(_route("flow_1", old_dag), routes.version)
+
+    new_dag = _build_dag("dag_2")
+    dag_manager.register_dag(new_dag, "flow_1")
+    assert routes.get("flow_1") is None
+
+
+def test_stale_route_not_added():
+    dag_manager = DAGManager(SystemApp(), [])
+    routes = FlowRouteTable()
+    dag_manager.add_listener(routes)
+
+    dag = _build_dag("dag_1")
+    dag_manager.register_dag(dag, "flow_1")
+    version = routes.version
+    # The DAG is unregistered while the route is being built
+    dag_manager.unregister_dag("dag_1")
+    assert not routes.put(_route("flow_1", dag), version)
+    assert routes.get("flow_1") is None
@@ -0,0 +1,63 @@
+import pytest
+
+from dbgpt.core.interface.variables import (
+    StorageVariables,
+    StorageVariablesProvider,
+    VariablesIdentifier,
+)
+from dbgpt.storage.metadata import db
+from dbgpt.storage.metadata.db_storage import SQLAlchemyStorage
+from dbgpt.util.serialization.json_serialization import JsonSerializer
+
+from ..models.models import VariablesEntity
+from ..models.variables_adapter import VariablesAdapter
+
+
+@pytest.fixture
+def storage():
+    db.init_db("sqlite:///:memory:")
+    db.create_all()
+    return SQLAlchemyStorage(db, VariablesEntity, VariablesAdapter(), JsonSerializer())
+
+
+def _make_provider(storage, full_keys):
+    provider = StorageVariablesProvider(storage)
+    for full_key in full_keys:
+        id = VariablesIdentifier.from_str_identifier(full_key)
+        variable = StorageVariables.from_identifier(id, f"val_{id.name}", "str", "")
+        variable.enabled = 0 if id.name == "b" else 1
+        provider.save(variable)
+    return provider
+
+
+def test_prefetch_disabled_variables(storage):
+    full_keys = ["${k:a@global}", "${k:b@global}", "${other:c@global}"]
+    provider = _make_provider(storage, full_keys)
+
+    # The disabled variable is not resolved by a single load
+    assert provider.get("${k:a@global}", None) == "val_a"
+    assert provider.get("${k:b@global}", None) is None
+
+    prefetched = StorageVariablesProvider(storage)
+    prefetched.prefetch([VariablesIdentifier.from_str_identifier(k) for k in full_keys])
+    assert prefetched.get("${k:a@global}", None) == "val_a"
+    assert prefetched.get("${k:b@global}", None) is None
+    assert prefetched.get("${other:c@global}", None) == "val_c"
+
+
+def test_prefetch_in_one_query(storage):
+    full_keys = [f"${{key_{i}:name_{i}@global}}" for i in range(5)]
+    _make_provider(storage, full_keys)
+    queries = []
+    query = storage.query
+
+    def _query(spec, cls):
+        queries.append(spec)
+        return query(spec, cls)
+
+    storage.query = _query
+    provider = StorageVariablesProvider(storage)
+    provider.prefetch([VariablesIdentifier.from_str_identifier(k) for k in full_keys])
+    # The variables of the different keys are loaded in one query
+    assert len(queries) == 1
+    assert [provider.get(k) for k in full_keys] == [f"val_name_{i}" for i in range(5)]
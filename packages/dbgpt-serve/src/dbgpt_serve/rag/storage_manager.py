@@ -110,13 +110,20 @@ class StorageManager(BaseComponent):
     def create_kg_store(
         self, index_name, llm_model: Optional[str] = None
     ) -> BuiltinKnowledgeGraph:
-        """Create knowledge graph store."""
+        """Create knowledge graph store.
+
+        The store is cached by index name, so its state in memory, e.g. the
+        communities detected locally, is kept between the loads.
+        """
         app_config = self.system_app.config.configs.get("app_config")
         rag_config = app_config.rag
         storage_config = app_config.rag.storage
         if index_name in self._store_cache:
             return self._store_cache[index_name]
         with self._cache_lock:
+            if index_name in self._store_cache:
+                return self._store_cache[index_name]
+            new_store = None
             worker_manager = self.system_app.get_component(
                 ComponentType.WORKER_MANAGER_FACTORY, WorkerManagerFactory
             ).create()
@@ -136,7 +143,7 @@ class StorageManager(BaseComponent):
                         CommunitySummaryKnowledgeGraph,
                     )
 
-                    return CommunitySummaryKnowledgeGraph(
+                    new_store = CommunitySummaryKnowledgeGraph(
                         config=storage_config.graph,
                         name=index_name,
                         llm_client=llm_client,
@@ -149,6 +156,10 @@ class StorageManager(BaseComponent):
                         kg_document_graph_enabled=rag_config.kg_document_graph_enabled,
                         kg_chunk_search_top_k=rag_config.kg_chunk_search_top_k,
                         kg_extraction_batch_size=rag_config.kg_extraction_batch_size,
+                        kg_extraction_timeout=rag_config.kg_extraction_timeout,
+                        kg_extraction_max_retries=rag_config.kg_extraction_max_retries,
+                        kg_write_batch_size=rag_config.kg_write_batch_size,
+                        kg_community_detection=rag_config.kg_community_detection,
                         kg_community_summary_batch_size=rag_config.kg_community_summary_batch_size,
                         kg_embedding_batch_size=rag_config.kg_embedding_batch_size,
                         kg_similarity_top_k=rag_config.kg_similarity_top_k,
@@ -160,11 +171,14 @@ class StorageManager(BaseComponent):
                         kg_max_chunks_once_load=rag_config.max_chunks_once_load,
                         kg_max_threads=rag_config.max_threads,
                     )
-            return BuiltinKnowledgeGraph(
-                config=storage_config.graph,
-                name=index_name,
-                llm_client=llm_client,
-            )
+            if new_store is None:
+                new_store = BuiltinKnowledgeGraph(
+                    config=storage_config.graph,
+                    name=index_name,
+                    llm_client=llm_client,
+                )
+            self._store_cache[index_name] = new_store
+            return new_store
 
     def create_full_text_store(self, index_name) -> FullTextStoreBase:
         """Create Full Text store."""
@@ -0,0 +1,113 @@
+from typing import Dict, List
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from dbgpt.core import Chunk
+from dbgpt.storage.graph_store.graph import Edge, GraphElemType, Vertex
+from dbgpt.storage.graph_store.memgraph_store import (
+    MemoryGraphStore,
+    MemoryGraphStoreConfig,
+)
+from dbgpt_ext.storage.knowledge_graph.community.base import GraphStoreAdapter
+from dbgpt_ext.storage.knowledge_graph.community.memgraph_store_adapter import (
+    MemGraphStoreAdapter,
+)
+
+from ..storage_manager import StorageManager
+
+
+class _MemoryGraphAdapter(MemGraphStoreAdapter):
+    def __init__(self):
+        graph_store = MemoryGraphStore(MemoryGraphStoreConfig())
+        graph_store.enable_similarity_search = False
+        GraphStoreAdapter.__init__(self, graph_store)
+
+    def add_triplet(self, sid: str, tid: str):
+        graph = self.graph_store._graph
+        for vid in (sid, tid):
+            graph.upsert_vertex(
+                Vertex(vid, name=vid, vertex_type=GraphElemType.ENTITY.value)
+            )
+        graph.append_edge(Edge(sid, tid, "rel", edge_type=GraphElemType.RELATION.value))
+
+    def explore_trigraph(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def explore_docgraph_with_entities(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def explore_docgraph_without_entities(self, *args, **kwargs):
+        raise NotImplementedError
+
+
+class _MemoryVectorStore:
+    def __init__(self):
+        self.chunks: Dict[str, Chunk] = {}
+
+    async def aload_document_with_limit(
+        self, chunks: List[Chunk], max_chunks_once_load: int, max_threads: int
+    ) -> List[str]:
+        for chunk in chunks:
+            self.chunks[chunk.chunk_id] = chunk
+        return [chunk.chunk_id for chunk in chunks]
+
+    def delete_by_ids(self, ids: str):
+        for chunk_id in ids.split(","):
+            self.chunks.pop(chunk_id, None)
+
+    def truncate(self):
+        self.chunks.clear()
+
+
+@pytest.fixture
+def storage_manager():
+    graph_config = MemoryGraphStoreConfig()
+    graph_config.enable_summary = True
+    vector_config = MagicMock()
+    vector_config.create_store.side_effect = lambda **kwargs: _MemoryVectorStore()
+    rag_config = MagicMock()
+    rag_config.storage.graph = graph_config
+    rag_config.storage.vector = vector_config
+    rag_config.kg_community_detection = "local"
+    rag_config.kg_extraction_timeout = None
+    system_app = MagicMock()
+    system_app.config.configs = {"app_config": MagicMock(rag=rag_config)}
+    with patch(
+        "dbgpt_ext.storage.knowledge_graph.knowledge_graph.GraphStoreAdapterFactory"
+        ".create",
+        side_effect=lambda graph_store: _MemoryGraphAdapter(),
+    ):
+        yield StorageManager(system_app)
+
+
+@pytest.mark.asyncio
+async def test_kg_store_detect_communities_incrementally(storage_manager):
+    detections = []
+
+    async def _load(triplets):
+        store = storage_manager.get_storage_connector("space", "KnowledgeGraph")
+        community_store = store._community_store
+        community_store._community_summarizer.summarize = AsyncMock(
+            return_value="summary"
+        )
+        detector = community_store._community_detector
+        detect = detector.detect
+        with patch.object(
+            detector,
+            "detect",
+            side_effect=lambda graph: (
+                detections.append(detect(graph)) or detections[-1]
+            ),
+        ):
+            for sid, tid in triplets:
+                store._graph_store_adapter.add_triplet(sid, tid)
+            await community_store.build_communities()
+        return store
+
+    store = await _load([("a0", "a1"), ("a1", "a2"), ("a0", "a2")])
+    # The second load reuses the store and its detected communities
+    assert await _load([("b0", "b1"), ("b1", "b2"), ("b0", "b2")]) is store
+    assert detections[0].full
+    assert not detections[1].full
+    assert len(detections[1].dirty) == 1
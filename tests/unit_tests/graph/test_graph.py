@@ -105,3 +105,64 @@ def test_search_depth_limit(g, vids, dir, dep, ec):
     subgraph = g.search(vids, dir, depth=dep)
     print(f"\n{subgraph.format()}")
     assert subgraph.edge_count == ec
+
+
+def test_search_deep_chain():
+    g = MemoryGraph()
+    n = 5000
+    for i in range(n):
+        g.append_edge(Edge(str(i), str(i + 1), "next"))
+
+    # deeper than the default recursion limit
+    subgraph = g.search(["0"], Direction.OUT)
+    assert subgraph.edge_count == n
+
+    subgraph = g.search([str(n)], Direction.IN, depth=10)
+    assert subgraph.edge_count == 10
+
+
+@pytest.mark.parametrize(
+    "vids, dir, frontier_limit, ec",
+    [
+        (["B"], Direction.OUT, 1, 4),
+        (["B"], Direction.BOTH, 2, 7),
+        (["A", "F"], Direction.OUT, 1, 8),
+    ],
+)
+def test_search_frontier_limit(g, vids, dir, frontier_limit, ec):
+    subgraph = g.search(vids, dir, frontier_limit=frontier_limit)
+    print(f"\n{subgraph.format()}")
+    assert subgraph.edge_count == ec
+
+
+def test_search_after_update(g):
+    assert g.search(["D"], Direction.OUT).edge_count == 0
+
+    g.append_edge(Edge("D", "A", "9"))
+    assert g.search(["D"], Direction.OUT).edge_count == 10
+
+    g.del_edges("A", "B", None)
+    assert g.search(["D"], Direction.OUT).edge_count == 3
+
+
+@pytest.mark.parametrize("dir", [Direction.OUT, Direction.IN, Direction.BOTH])
+def test_search_with_adjacency_index(g, dir):
+    # The first searches after a change traverse the edge maps
+    expected = g.search(["A", "F"], dir, depth=2, fan=2)
+    assert g._adjacency is None
+
+    # The index is rebuilt once the searches outnumber the changes
+    for _ in range(g.vertex_count + g.edge_count):
+        subgraph = g.search(["A", "F"], dir, depth=2, fan=2)
+    assert g._adjacency is not None
+    assert subgraph.format() == expected.format()
+
+
+def test_search_after_update_does_not_rebuild_index():
+    g = MemoryGraph()
+    for i in range(1000):
+        g.append_edge(Edge(str(i), str(i + 1), "next"))
+    for i in range(1000, 1010):
+        g.append_edge(Edge(str(i), str(i + 1), "next"))
+        assert g.search([str(i)], Direction.OUT).edge_count == 1
+    assert g._adjacency is None
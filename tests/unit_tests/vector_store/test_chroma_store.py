@@ -0,0 +1,68 @@
+from typing import List
+
+import pytest
+
+from dbgpt.core import Chunk, Embeddings
+
+chromadb = pytest.importorskip("chromadb")
+
+from dbgpt_ext.storage.vector_store.chroma_store import (  # noqa: E402
+    ChromaStore,
+    ChromaVectorConfig,
+)
+
+
+class _QueryAwareEmbeddings(Embeddings):
+    """Embed the queries differently from the documents, like instruct models."""
+
+    def __init__(self):
+        self.embed_queries_calls = 0
+
+    @staticmethod
+    def _embed(text: str, query: bool) -> List[float]:
+        vector = [float(text.count(c)) for c in "abcde"]
+        if query:
+            vector[0] += 1.0
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text, query=False) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text, query=True)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        self.embed_queries_calls += 1
+        return [self._embed(text, query=True) for text in texts]
+
+
+@pytest.fixture
+def store(tmp_path):
+    embeddings = _QueryAwareEmbeddings()
+    store = ChromaStore(
+        ChromaVectorConfig(persist_path=str(tmp_path)),
+        name="test_batch",
+        embedding_fn=embeddings,
+        chroma_client=chromadb.EphemeralClient(),
+    )
+    store.load_document(
+        [
+            Chunk(content=text)
+            for text in ["aab", "bbc", "ccd", "dde", "eea", "abcde", "bd"]
+        ]
+    )
+    return store
+
+
+def test_batch_similar_search_matches_single_search(store):
+    texts = ["ab", "", "cde", "e"]
+    batched = store.batch_similar_search_with_scores(texts, 3, 0.0)
+    # The queries are embedded in one call
+    assert store.embeddings.embed_queries_calls == 1
+    assert batched[1] == []
+    for text, chunks in zip(texts, batched):
+        if not text:
+            continue
+        single = store.similar_search_with_scores(text, 3, 0.0)
+        assert [c.chunk_id for c in chunks] == [c.chunk_id for c in single]
+        assert [c.score for c in chunks] == pytest.approx([c.score for c in single])